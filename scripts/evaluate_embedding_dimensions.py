@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Retrieval recall and memory of shortened dense embeddings on the corpus.
+
+The corpus is chunked like ``LiteratureStore`` does it. Each chunk's first
+sentence serves as a query for that chunk. Everything is embedded once at
+the model's full dimension. text-embedding-3 vectors shortened by the API
+equal the full vectors truncated and re-normalized, so every smaller
+dimension is derived locally without further API calls. For each dimension
+the report gives:
+
+- ``hit@k``: queries whose own chunk is among the top k
+- ``recall@k``: overlap of the top k with the full-dimension top k
+- brute-force search time per query
+- vector memory (float32, and with the configured quantization) and request
+  payload size
+
+Search is exact (NumPy), so the numbers isolate the effect of the dimension;
+use ``evaluate_vector_index.py`` for HNSW and quantization.
+
+Usage:
+    python scripts/evaluate_embedding_dimensions.py
+    python scripts/evaluate_embedding_dimensions.py --dimensions 256 512 1024 1536 --top-k 5 10
+    python scripts/evaluate_embedding_dimensions.py --offline   # hash embeddings, no API key
+"""
+
+import argparse
+import json
+import logging
+import re
+import sys
+import time
+import warnings
+from pathlib import Path
+from uuid import NAMESPACE_DNS, uuid5
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import numpy as np
+from qdrant_client import QdrantClient
+from rich.console import Console
+from rich.table import Table
+
+from src.benchmarks.fakes import HashEmbeddingService, HashSparseEmbeddingService, WordTokenizer
+from src.rag.literature_store import Document, LiteratureStore
+from src.rag.vector_index import VectorIndexConfig
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+console = Console()
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+MIN_QUERY_WORDS = 5
+
+
+def chunk_corpus(corpus: Path, store: LiteratureStore) -> list[str]:
+    """Chunk every markdown file under ``corpus``."""
+    texts = []
+    for path in sorted(corpus.rglob("*.md")):
+        document = Document(
+            id=uuid5(NAMESPACE_DNS, str(path)),
+            title=path.stem,
+            content=path.read_text(encoding="utf-8"),
+            source=str(path),
+            metadata={},
+        )
+        texts.extend(chunk.content for chunk in store._chunk_markdown(document))
+    return texts
+
+
+def first_sentence(chunk: str) -> str | None:
+    """The first prose sentence of a chunk (skipping headings and tables), if long enough."""
+    for line in chunk.splitlines():
+        line = line.strip()
+        if not line or line.startswith(("#", "|", "```")):
+            continue
+        sentence = SENTENCE_END.split(line, maxsplit=1)[0]
+        if len(sentence.split()) >= MIN_QUERY_WORDS:
+            return sentence
+    return None
+
+
+def embed(service, texts: list[str], batch_size: int = 100) -> np.ndarray:
+    """Embed texts in batches."""
+    vectors = []
+    for start in range(0, len(texts), batch_size):
+        vectors.extend(service.embed_batch(texts[start:start + batch_size]))
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def shorten(vectors: np.ndarray, dimension: int) -> np.ndarray:
+    """Truncate to ``dimension`` and re-normalize (what the API's ``dimensions`` does)."""
+    truncated = vectors[:, :dimension]
+    return truncated / np.linalg.norm(truncated, axis=1, keepdims=True)
+
+
+def top_k(chunks: np.ndarray, queries: np.ndarray, k: int) -> tuple[np.ndarray, float]:
+    """Exact cosine top-k per query and the mean search time per query."""
+    start = time.perf_counter()
+    scores = queries @ chunks.T
+    candidates = np.argpartition(-scores, min(k, scores.shape[1] - 1), axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1)
+    hits = np.take_along_axis(candidates, order, axis=1)
+    elapsed = time.perf_counter() - start
+    return hits, elapsed / len(queries)
+
+
+def evaluate(args: argparse.Namespace) -> dict:
+    """Run the evaluation and return the report."""
+    full_dimension = max(args.dimensions)
+    if args.offline:
+        service, tokenizer = HashEmbeddingService(full_dimension), WordTokenizer()
+    else:
+        from src.rag.embeddings import EmbeddingService
+
+        service, tokenizer = EmbeddingService(dimension=full_dimension), None
+    store = LiteratureStore(
+        client=QdrantClient(":memory:"),
+        dense_embeddings=service,
+        sparse_embeddings=HashSparseEmbeddingService(),
+        tokenizer=tokenizer,
+    )
+
+    chunks = chunk_corpus(Path(args.corpus), store)
+    pairs = [(i, q) for i, q in ((i, first_sentence(c)) for i, c in enumerate(chunks)) if q]
+    if not pairs:
+        raise SystemExit(f"No usable chunks under {args.corpus}")
+    logger.info(
+        f"Embedding {len(chunks)} chunks and {len(pairs)} queries at {full_dimension} dimensions"
+    )
+    chunk_vectors = embed(service, chunks)
+    query_vectors = embed(service, [q for _, q in pairs])
+    targets = np.array([i for i, _ in pairs])
+
+    index_config = VectorIndexConfig.from_settings()
+    max_k = max(args.top_k)
+    reference, _ = top_k(
+        shorten(chunk_vectors, full_dimension), shorten(query_vectors, full_dimension), max_k
+    )
+
+    rows = []
+    for dimension in sorted(args.dimensions):
+        hits, seconds = top_k(
+            shorten(chunk_vectors, dimension), shorten(query_vectors, dimension), max_k
+        )
+        row = {
+            "dimension": dimension,
+            "search_ms_per_query": round(seconds * 1000, 4),
+            "vector_mb_float32": round(len(chunks) * dimension * 4 / 1e6, 3),
+            "vector_ram_mb_configured": round(
+                index_config.ram_bytes(len(chunks), dimension) / 1e6, 3
+            ),
+            # JSON floats as sent to Qdrant (about 20 characters each)
+            "request_kb_per_vector": round(dimension * 20 / 1000, 1),
+        }
+        for k in sorted(args.top_k):
+            found = (hits[:, :k] == targets[:, None]).any(axis=1)
+            overlap = [len(set(h[:k]) & set(r[:k])) / k for h, r in zip(hits, reference)]
+            row[f"hit@{k}"] = round(float(found.mean()), 4)
+            row[f"recall@{k}"] = round(float(np.mean(overlap)), 4)
+        rows.append(row)
+
+    return {
+        "config": vars(args),
+        "chunks": len(chunks),
+        "queries": len(pairs),
+        "quantization": index_config.quantization,
+        "results": rows,
+    }
+
+
+def print_report(report: dict, ks: list[int]) -> None:
+    """Render the results as a table."""
+    counts = f"{report['chunks']} chunks, {report['queries']} queries"
+    table = Table(title=f"Dense dimension vs retrieval ({counts})")
+    table.add_column("Dim", justify="right")
+    for k in ks:
+        table.add_column(f"hit@{k}", justify="right")
+        table.add_column(f"recall@{k}", justify="right")
+    for column in ("ms/query", "float32 MB", f"RAM MB ({report['quantization']})", "KB/request"):
+        table.add_column(column, justify="right")
+    for row in report["results"]:
+        cells = [str(row["dimension"])]
+        for k in ks:
+            cells += [f"{row[f'hit@{k}']:.3f}", f"{row[f'recall@{k}']:.3f}"]
+        cells += [
+            f"{row['search_ms_per_query']:.3f}", f"{row['vector_mb_float32']:.2f}",
+            f"{row['vector_ram_mb_configured']:.2f}", f"{row['request_kb_per_vector']:.1f}",
+        ]
+        table.add_row(*cells)
+    console.print(table)
+
+
+def main():
+    """Main entry point for the evaluation script."""
+    parser = argparse.ArgumentParser(
+        description="Retrieval recall and memory of shortened dense embeddings"
+    )
+    parser.add_argument(
+        "--corpus", default="data", help="Directory of markdown files (default: data)"
+    )
+    parser.add_argument(
+        "--dimensions",
+        type=int,
+        nargs="+",
+        default=[256, 512, 1024, 1536],
+        help="Dimensions to compare; the largest is the reference (default: 256 512 1024 1536)",
+    )
+    parser.add_argument(
+        "--top-k", type=int, nargs="+", default=[5, 10], help="k values (default: 5 10)"
+    )
+    parser.add_argument(
+        "--offline", action="store_true", help="Hash embeddings and word tokenizer (no API key)"
+    )
+    parser.add_argument("--output", type=str, default=None, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", message="Payload indexes have no effect")
+    report = evaluate(args)
+    print_report(report, sorted(args.top_k))
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info(f"Report saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
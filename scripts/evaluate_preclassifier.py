@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Compare the local plan item pre-classifier with LLM categorization.
+
+Items are read from a JSONL file, one per line:
+
+    {"requirement": "...", "solution": "...", "confidence": 0.8,
+     "source": "existing", "category": "implemented"}
+
+``category`` is optional; unlabeled items are labeled by the LLM (the same
+single-item prompt PlanFormingAgent uses), which also measures LLM latency.
+A shuffled ``--train-fraction`` of the items seeds an in-memory plan item
+store; the rest are pre-classified and compared with their labels.
+
+The report covers coverage (items decided without the LLM), accuracy on the
+decided items, and per-item latency of both paths.
+
+Usage:
+    python scripts/evaluate_preclassifier.py items.jsonl
+    python scripts/evaluate_preclassifier.py items.jsonl --train-fraction 0.7 --min-agreement 0.9
+    python scripts/evaluate_preclassifier.py items.jsonl --llm --output outputs/preclassifier.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from qdrant_client import QdrantClient
+
+from src.agents.plan_forming import PlanFormingAgent
+from src.agents.plan_preclassifier import PlanItemPreClassifier
+from src.models.requirement import Requirement
+from src.models.solution import Solution, SolutionSource
+from src.rag.plan_item_store import PlanItemStore
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+
+def load_items(path: Path) -> list[dict]:
+    """Load evaluation items from JSONL."""
+    items = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            items.append(json.loads(line))
+    return items
+
+
+def to_pair(item: dict) -> tuple[Requirement, Solution]:
+    """Build the (requirement, solution) pair for an item."""
+    requirement = Requirement(content=item["requirement"])
+    solution = Solution(
+        requirement_id=requirement.id,
+        content=item["solution"],
+        confidence=float(item.get("confidence", 0.5)),
+        source=SolutionSource(item.get("source", "novel")),
+    )
+    return requirement, solution
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def latency_summary(seconds: list[float]) -> dict:
+    """Mean/p50/p95 latency in milliseconds."""
+    ms = [s * 1000 for s in seconds]
+    return {
+        "mean_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 0.5), 3),
+        "p95_ms": round(percentile(ms, 0.95), 3),
+    }
+
+
+async def llm_label(agent: PlanFormingAgent, items: list[dict]) -> tuple[list[str], list[float]]:
+    """Categorize items with the LLM, one call each, timing every call."""
+    labels, latencies = [], []
+    for item in items:
+        requirement, solution = to_pair(item)
+        start = time.perf_counter()
+        categorization = await agent._categorize_item(requirement, solution, "")
+        latencies.append(time.perf_counter() - start)
+        labels.append(categorization.get("category", "needs_research"))
+    return labels, latencies
+
+
+def evaluate(args: argparse.Namespace) -> dict:
+    """Run the evaluation and return the report."""
+    items = load_items(Path(args.items))
+    random.Random(args.seed).shuffle(items)
+    logger.info(f"Loaded {len(items)} items from {args.items}")
+
+    agent = None
+    llm_latencies: list[float] = []
+    unlabeled = [item for item in items if not item.get("category")]
+    if unlabeled or args.llm:
+        agent = PlanFormingAgent(batch_size=1)
+    if unlabeled:
+        logger.info(f"Labeling {len(unlabeled)} items with the LLM")
+        labels, llm_latencies = asyncio.run(llm_label(agent, unlabeled))
+        for item, label in zip(unlabeled, labels):
+            item["category"] = label
+
+    split = int(len(items) * args.train_fraction)
+    train, test = items[:split], items[split:]
+
+    store = PlanItemStore(client=QdrantClient(":memory:"))
+    classifier = PlanItemPreClassifier(
+        store=store,
+        min_neighbors=args.min_neighbors,
+        min_score=args.min_score,
+        min_agreement=args.min_agreement,
+    )
+    classifier.learn([(*to_pair(item), {"category": item["category"]}) for item in train])
+    logger.info(f"Seeded store with {len(train)} items; evaluating {len(test)}")
+
+    decided = correct = 0
+    local_latencies = []
+    for item in test:
+        requirement, solution = to_pair(item)
+        start = time.perf_counter()
+        decision = classifier.classify(requirement, solution)
+        local_latencies.append(time.perf_counter() - start)
+        if decision is not None:
+            decided += 1
+            correct += decision.category == item["category"]
+
+    report = {
+        "items": len(items),
+        "train": len(train),
+        "test": len(test),
+        "decided_locally": decided,
+        "coverage": round(decided / len(test), 4) if test else 0.0,
+        "accuracy_on_decided": round(correct / decided, 4) if decided else None,
+        "preclassifier_latency": latency_summary(local_latencies),
+    }
+
+    if args.llm and test:
+        labels, latencies = asyncio.run(llm_label(agent, test))
+        llm_latencies.extend(latencies)
+        agreement = sum(label == item["category"] for label, item in zip(labels, test))
+        report["llm_accuracy"] = round(agreement / len(test), 4)
+    if llm_latencies:
+        report["llm_latency"] = latency_summary(llm_latencies)
+
+    return report
+
+
+def main():
+    """Main entry point for the evaluation script."""
+    parser = argparse.ArgumentParser(
+        description="Compare the local plan item pre-classifier with LLM categorization",
+    )
+    parser.add_argument("items", help="JSONL file of plan items")
+    parser.add_argument(
+        "--train-fraction",
+        type=float,
+        default=0.5,
+        help="Items used to seed the store (default: 0.5)",
+    )
+    parser.add_argument(
+        "--min-neighbors",
+        type=int,
+        default=None,
+        help="Override settings.preclassifier_min_neighbors",
+    )
+    parser.add_argument(
+        "--min-score", type=float, default=None, help="Override settings.preclassifier_min_score"
+    )
+    parser.add_argument(
+        "--min-agreement",
+        type=float,
+        default=None,
+        help="Override settings.preclassifier_min_agreement",
+    )
+    parser.add_argument(
+        "--llm",
+        action="store_true",
+        help="Also categorize test items with the LLM (accuracy + latency)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Shuffle seed (default: 0)")
+    parser.add_argument("--output", type=str, default=None, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    report = evaluate(args)
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info(f"Report saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Recall and latency of prefetch depths in hybrid literature search.
+
+The corpus is chunked and ingested once into a temporary collection. Each
+chunk's first sentence serves as a query for that chunk. Every query is then
+searched with each prefetch setting:
+
+- fixed depths (``--depths``), e.g. the former 20 per modality
+- depths proportional to the results requested (``--factors``, at least ``--minimum``)
+- adaptive variants of the configured factor (``--flat-spreads``), which
+  widen only queries whose fused scores are flat
+
+The reference is fusion over every point (prefetch depth = collection size).
+For each setting the report gives:
+
+- ``recall@k``: overlap with the reference top k
+- ``hit@k``: the query's own chunk is in the top k
+- p50/p95 search latency (query embeddings are computed once and reused)
+- mean prefetch depth and the share of widened queries
+
+Usage:
+    python scripts/evaluate_prefetch.py --output outputs/prefetch.json
+    python scripts/evaluate_prefetch.py --top-k 3 5 10 --depths 10 20 40 80 --factors 2 4 8
+    python scripts/evaluate_prefetch.py --offline --memory   # smoke test, no API key or server
+"""
+
+import argparse
+import json
+import logging
+import re
+import statistics
+import sys
+import warnings
+from pathlib import Path
+from uuid import NAMESPACE_DNS, uuid5
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from qdrant_client import QdrantClient
+from rich.console import Console
+from rich.table import Table
+
+from src.benchmarks.fakes import HashEmbeddingService, HashSparseEmbeddingService, WordTokenizer
+from src.config import settings
+from src.rag.literature_store import Document, LiteratureStore
+from src.rag.prefetch import PrefetchConfig
+from src.rag.vector_client import create_qdrant_client
+from src.utils.telemetry import tracer
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+console = Console()
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+MIN_QUERY_WORDS = 5
+
+
+class MemoizedEmbeddings:
+    """Dense embedding service that embeds each query once, so timings cover search only."""
+
+    def __init__(self, service):
+        self.service = service
+        self.model = service.model
+        self.dimension = service.dimension
+        self._cache: dict[str, list[float]] = {}
+
+    def embed(self, text: str) -> list[float]:
+        if text not in self._cache:
+            self._cache[text] = self.service.embed(text)
+        return self._cache[text]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return self.service.embed_batch(texts)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def first_sentence(chunk: str) -> str | None:
+    """The first prose sentence of a chunk (skipping headings and tables), if long enough."""
+    for line in chunk.splitlines():
+        line = line.strip()
+        if not line or line.startswith(("#", "|", "```")):
+            continue
+        sentence = SENTENCE_END.split(line, maxsplit=1)[0]
+        if len(sentence.split()) >= MIN_QUERY_WORDS:
+            return sentence
+    return None
+
+
+def build_store(args: argparse.Namespace) -> tuple[LiteratureStore, dict]:
+    """Ingest the corpus into a fresh evaluation collection; returns the store and chunk texts."""
+    if args.offline:
+        dense, sparse = HashEmbeddingService(args.dimension), HashSparseEmbeddingService()
+        tokenizer = WordTokenizer()
+    else:
+        from src.rag.embeddings import EmbeddingService, SparseEmbeddingService
+
+        dense, sparse, tokenizer = EmbeddingService(), SparseEmbeddingService(), None
+    client = QdrantClient(":memory:") if args.memory else create_qdrant_client()
+    if client.collection_exists(args.collection):
+        client.delete_collection(args.collection)
+    store = LiteratureStore(
+        client=client,
+        dense_embeddings=MemoizedEmbeddings(dense),
+        sparse_embeddings=sparse,
+        tokenizer=tokenizer,
+        collection_name=args.collection,
+        domain_routing=False,
+        domain_collections=False,
+    )
+    store.search_cache = None  # Every search must reach Qdrant
+
+    texts = {}
+    for path in sorted(Path(args.corpus).rglob("*.md")):
+        document = Document(
+            id=uuid5(NAMESPACE_DNS, str(path)),
+            title=path.stem,
+            content=path.read_text(encoding="utf-8"),
+            source=str(path),
+            metadata={},
+        )
+        chunks = store._chunk_markdown(document)
+        store.upsert_chunks(chunks)
+        texts.update((chunk.id, chunk.content) for chunk in chunks)
+    return store, texts
+
+
+def run(store: LiteratureStore, config: PrefetchConfig, queries: list[str],
+        top_k: int) -> tuple[list, list]:
+    """Search every query with ``config``; returns the hit IDs and the search spans."""
+    store.prefetch = config
+    tracer.reset()
+    hits = [[result.chunk.id for result in store.search(query, top_k=top_k)] for query in queries]
+    spans = [span for span in tracer.spans if span.name == "search:literature"]
+    return hits, spans
+
+
+def evaluate(args: argparse.Namespace) -> dict:
+    """Run the evaluation and return the report."""
+    store, texts = build_store(args)
+    point_count = len(texts)
+    if not point_count:
+        raise SystemExit(f"No markdown files under {args.corpus}")
+
+    candidates = ((chunk_id, first_sentence(text)) for chunk_id, text in texts.items())
+    pairs = [(chunk_id, q) for chunk_id, q in candidates if q]
+    if args.queries and len(pairs) > args.queries:
+        pairs = pairs[:args.queries]
+    queries = [q for _, q in pairs]
+    targets = [point_id for point_id, _ in pairs]
+    logger.info(f"{point_count} chunks, {len(queries)} queries")
+
+    configs = [PrefetchConfig(factor=0, minimum=depth) for depth in args.depths]
+    configs += [PrefetchConfig(factor=factor, minimum=args.minimum) for factor in args.factors]
+    configs += [
+        PrefetchConfig(factor=settings.literature_prefetch_factor, minimum=args.minimum,
+                       adaptive=True, widen=args.widen, flat_spread=spread)
+        for spread in args.flat_spreads
+    ]
+
+    tracer.enable()
+    for query in queries:  # Embed every query once before timing
+        store.dense_embeddings.embed(query)
+
+    rows = []
+    for top_k in sorted(args.top_k):
+        reference, _ = run(store, PrefetchConfig(factor=0, minimum=point_count), queries, top_k)
+        for config in configs:
+            hits, spans = run(store, config, queries, top_k)
+            ms = [span.duration_us / 1000 for span in spans]
+            recall = statistics.fmean(
+                len(set(h) & set(r)) / len(r) for h, r in zip(hits, reference) if r
+            )
+            found = statistics.fmean(target in hit for hit, target in zip(hits, targets))
+            depth = statistics.fmean(span.attributes.get("prefetch", 0) for span in spans)
+            widened = statistics.fmean(bool(span.attributes.get("widened")) for span in spans)
+            rows.append({
+                "top_k": top_k,
+                "config": config.label if config.factor else f"fixed {config.minimum}",
+                "mean_depth": round(depth, 1),
+                "widened": round(widened, 3),
+                "recall": round(recall, 4),
+                "hit": round(found, 4),
+                "p50_ms": round(percentile(ms, 0.5), 3),
+                "p95_ms": round(percentile(ms, 0.95), 3),
+            })
+
+    if not args.keep:
+        store.client.delete_collection(store.collection_name)
+    return {
+        "config": vars(args),
+        "chunks": point_count,
+        "queries": len(queries),
+        "results": rows,
+    }
+
+
+def print_report(report: dict) -> None:
+    """Render the results as a table."""
+    table = Table(title=f"Prefetch depth vs recall ({report['chunks']} chunks, "
+                        f"{report['queries']} queries)")
+    for column in ("k", "Prefetch", "Mean depth", "Widened", "Recall@k", "Hit@k", "p50 ms",
+                   "p95 ms"):
+        table.add_column(column, justify="right", no_wrap=True)
+    for row in report["results"]:
+        table.add_row(
+            str(row["top_k"]), row["config"], f"{row['mean_depth']:.1f}",
+            f"{row['widened']:.1%}", f"{row['recall']:.3f}", f"{row['hit']:.3f}",
+            f"{row['p50_ms']:.2f}", f"{row['p95_ms']:.2f}",
+        )
+    console.print(table)
+
+
+def main():
+    """Main entry point for the evaluation script."""
+    parser = argparse.ArgumentParser(
+        description="Recall and latency of hybrid search prefetch depths")
+    parser.add_argument("--corpus", default="data",
+                        help="Directory of markdown files (default: data)")
+    parser.add_argument("--top-k", type=int, nargs="+", default=[3, 5, 10],
+                        help="k values (default: 3 5 10)")
+    parser.add_argument("--depths", type=int, nargs="+", default=[10, 20, 40, 80],
+                        help="Fixed prefetch depths (default: 10 20 40 80)")
+    parser.add_argument("--factors", type=float, nargs="+", default=[2, 4, 8],
+                        help="Depths per requested result (default: 2 4 8)")
+    parser.add_argument("--minimum", type=int, default=settings.literature_prefetch_min,
+                        help="Minimum depth for --factors and adaptive settings "
+                             "(default: LITERATURE_PREFETCH_MIN)")
+    parser.add_argument("--flat-spreads", type=float, nargs="*", default=[0.05, 0.1, 0.2],
+                        help="Flat-score thresholds of adaptive settings (default: 0.05 0.1 0.2)")
+    parser.add_argument("--widen", type=float, default=settings.literature_prefetch_widen,
+                        help="Depth multiplier of adaptive settings "
+                             "(default: LITERATURE_PREFETCH_WIDEN)")
+    parser.add_argument("--queries", type=int, default=0,
+                        help="Maximum number of queries (default: all)")
+    parser.add_argument("--collection", default="literature_prefetch_eval",
+                        help="Temporary collection name")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary collection")
+    parser.add_argument("--offline", action="store_true",
+                        help="Hash embeddings and word tokenizer (no API key)")
+    parser.add_argument("--dimension", type=int, default=256,
+                        help="Hash embedding dimension with --offline (default: 256)")
+    parser.add_argument("--memory", action="store_true",
+                        help="Local in-memory Qdrant instead of the configured one")
+    parser.add_argument("--output", type=str, default=None, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", message="Payload indexes have no effect")
+    report = evaluate(args)
+    print_report(report)
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info(f"Report saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Recall-vs-latency evaluation of dense index settings for the literature collection.
+
+The corpus is chunked and embedded once. Every quantization / HNSW
+combination then gets its own temporary collection, built by
+``LiteratureStore`` from a ``VectorIndexConfig``. Queries are searched
+dense-only at each search-time ``ef``, and the results are compared with
+exact (brute-force, full-precision) search.
+
+Queries are noisy copies of randomly chosen chunk vectors, so each one has a
+real neighbourhood in the corpus. ``--synthetic`` adds more noisy copies as
+extra points, to measure at a scale where HNSW and quantization matter.
+Qdrant only builds the HNSW graph once a segment passes its indexing
+threshold (about 20k 1536-d vectors by default); below that, every search
+is brute force.
+
+The report gives recall@k, p50/p95 latency per query, and an estimate of
+vector RAM for each setting.
+
+Usage:
+    python scripts/evaluate_vector_index.py --synthetic 100000
+    python scripts/evaluate_vector_index.py --quantization none scalar binary \
+        --m 16 32 --ef 32 64 128 256
+    python scripts/evaluate_vector_index.py --offline --memory   # smoke test, no API key or server
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+from uuid import NAMESPACE_DNS, uuid5
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct
+from rich.console import Console
+from rich.table import Table
+
+from src.benchmarks.fakes import HashEmbeddingService, HashSparseEmbeddingService, WordTokenizer
+from src.rag.literature_store import Document, LiteratureStore
+from src.rag.vector_client import create_qdrant_client
+from src.rag.vector_index import VectorIndexConfig
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+console = Console()
+
+UPSERT_BATCH = 512
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def connect(memory: bool) -> QdrantClient:
+    """Qdrant client from settings, or a local in-memory one."""
+    if memory:
+        return QdrantClient(":memory:")
+    return create_qdrant_client()
+
+
+def embed_corpus(corpus: Path, offline: bool, dimension: int) -> np.ndarray:
+    """Chunk every markdown file under ``corpus`` and embed the chunks (unit vectors)."""
+    if offline:
+        dense, tokenizer = HashEmbeddingService(dimension), WordTokenizer()
+    else:
+        from src.rag.embeddings import EmbeddingService
+
+        dense, tokenizer = EmbeddingService(), None
+    chunker = LiteratureStore(
+        client=QdrantClient(":memory:"),
+        dense_embeddings=dense,
+        sparse_embeddings=HashSparseEmbeddingService(),
+        tokenizer=tokenizer,
+    )
+    texts = []
+    for path in sorted(corpus.rglob("*.md")):
+        document = Document(
+            id=uuid5(NAMESPACE_DNS, str(path)),
+            title=path.stem,
+            content=path.read_text(encoding="utf-8"),
+            source=str(path),
+            metadata={},
+        )
+        texts.extend(chunk.content for chunk in chunker._chunk_markdown(document))
+    logger.info(f"Embedding {len(texts)} chunks from {corpus}")
+
+    vectors = []
+    for start in range(0, len(texts), 100):
+        vectors.extend(dense.embed_batch(texts[start:start + 100]))
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def noisy_copies(
+    vectors: np.ndarray, count: int, noise: float, rng: np.random.Generator
+) -> np.ndarray:
+    """Unit vectors near randomly chosen rows of ``vectors``."""
+    base = vectors[rng.integers(0, len(vectors), size=count)]
+    scale = noise / np.sqrt(base.shape[1])
+    copies = base + rng.standard_normal(base.shape).astype(np.float32) * scale
+    return copies / np.linalg.norm(copies, axis=1, keepdims=True)
+
+
+def build_collection(
+    client: QdrantClient, name: str, config: VectorIndexConfig, vectors: np.ndarray, timeout: float
+) -> dict:
+    """Create a collection for ``config``, load ``vectors`` and wait for indexing."""
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    store = LiteratureStore(
+        client=client,
+        dense_embeddings=HashEmbeddingService(vectors.shape[1]),
+        sparse_embeddings=HashSparseEmbeddingService(),
+        tokenizer=WordTokenizer(),
+        collection_name=name,
+        index_config=config,
+    )
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), UPSERT_BATCH):
+        batch = vectors[offset:offset + UPSERT_BATCH]
+        client.upsert(
+            collection_name=name,
+            points=[
+                PointStruct(id=offset + i, vector={store.DENSE_VECTOR_NAME: vector.tolist()})
+                for i, vector in enumerate(batch)
+            ],
+            wait=True,
+        )
+
+    # Wait for the optimizer to finish building HNSW graphs and quantized vectors
+    info = client.get_collection(name)
+    while str(info.status).lower().endswith("yellow") and time.perf_counter() - start < timeout:
+        time.sleep(0.5)
+        info = client.get_collection(name)
+    return {
+        "build_seconds": round(time.perf_counter() - start, 2),
+        "indexed_vectors": info.indexed_vectors_count or 0,
+    }
+
+
+def search(
+    client: QdrantClient,
+    name: str,
+    config: VectorIndexConfig,
+    queries: np.ndarray,
+    top_k: int,
+    hnsw_ef: int | None = None,
+    exact: bool = False,
+) -> tuple[list[set[int]], list[float]]:
+    """Dense-only search for every query; returns the hit IDs and per-query latencies."""
+    hits, latencies = [], []
+    params = config.search_params(hnsw_ef=hnsw_ef, exact=exact)
+    for query in queries:
+        start = time.perf_counter()
+        result = client.query_points(
+            collection_name=name,
+            query=query.tolist(),
+            using=LiteratureStore.DENSE_VECTOR_NAME,
+            limit=top_k,
+            search_params=params,
+        )
+        latencies.append(time.perf_counter() - start)
+        hits.append({point.id for point in result.points})
+    return hits, latencies
+
+
+def evaluate(args: argparse.Namespace) -> dict:
+    """Run the evaluation and return the report."""
+    rng = np.random.default_rng(args.seed)
+    corpus = embed_corpus(Path(args.corpus), args.offline, args.dimension)
+    if not len(corpus):
+        raise SystemExit(f"No markdown files under {args.corpus}")
+    points = corpus
+    if args.synthetic:
+        points = np.vstack([corpus, noisy_copies(corpus, args.synthetic, args.noise, rng)])
+    queries = noisy_copies(corpus, args.queries, args.noise, rng)
+    dimension = points.shape[1]
+    logger.info(f"{len(points)} points of dimension {dimension}, {len(queries)} queries")
+
+    client = connect(args.memory)
+    configs = [
+        VectorIndexConfig(
+            quantization=quantization,
+            rescore=not args.no_rescore,
+            oversampling=args.oversampling,
+            on_disk=args.on_disk,
+            hnsw_m=m,
+            hnsw_ef_construct=ef_construct,
+        )
+        for quantization in args.quantization
+        for m in args.m
+        for ef_construct in args.ef_construct
+    ]
+
+    rows = []
+    truth = None
+    for index, config in enumerate(configs):
+        name = f"{args.collection_prefix}_{index}"
+        logger.info(f"Building {name}: {config.label}")
+        build = build_collection(client, name, config, points, args.index_timeout)
+        if truth is None:
+            truth, _ = search(client, name, config, queries, args.top_k, exact=True)
+
+        for ef in args.ef:
+            hits, latencies = search(client, name, config, queries, args.top_k, hnsw_ef=ef)
+            recall = statistics.fmean(len(h & t) / len(t) for h, t in zip(hits, truth) if t)
+            ms = [s * 1000 for s in latencies]
+            rows.append({
+                "config": config.label,
+                "quantization": config.quantization,
+                "m": config.hnsw_m,
+                "ef_construct": config.hnsw_ef_construct,
+                "on_disk": config.on_disk,
+                "hnsw_ef": ef,
+                f"recall@{args.top_k}": round(recall, 4),
+                "p50_ms": round(percentile(ms, 0.5), 3),
+                "p95_ms": round(percentile(ms, 0.95), 3),
+                "vector_ram_mb": round(config.ram_bytes(len(points), dimension) / 1e6, 1),
+                **build,
+            })
+
+        if not args.keep:
+            client.delete_collection(name)
+
+    return {
+        "config": vars(args),
+        "points": len(points),
+        "dimension": dimension,
+        "queries": len(queries),
+        "results": rows,
+    }
+
+
+def print_report(report: dict, top_k: int) -> None:
+    """Render the results as a table."""
+    table = Table(title=f"Dense index: recall@{top_k} vs latency ({report['points']} points)")
+    for column in ("Config", "ef", "Recall", "p50 ms", "p95 ms", "Vector RAM MB", "Indexed"):
+        table.add_column(column, justify="right")
+    for row in report["results"]:
+        table.add_row(
+            row["config"],
+            str(row["hnsw_ef"]),
+            f"{row[f'recall@{top_k}']:.3f}",
+            f"{row['p50_ms']:.2f}",
+            f"{row['p95_ms']:.2f}",
+            f"{row['vector_ram_mb']:.1f}",
+            str(row["indexed_vectors"]),
+        )
+    console.print(table)
+
+
+def main():
+    """Main entry point for the evaluation script."""
+    parser = argparse.ArgumentParser(
+        description="Recall vs latency of quantization and HNSW settings for literature search",
+    )
+    parser.add_argument(
+        "--corpus", default="data", help="Directory of markdown files (default: data)"
+    )
+    parser.add_argument(
+        "--synthetic", type=int, default=0, help="Extra points near corpus vectors (default: 0)"
+    )
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries (default: 200)")
+    parser.add_argument(
+        "--noise",
+        type=float,
+        default=0.5,
+        help="Noise of queries/synthetic points around their chunk (default: 0.5)",
+    )
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query (default: 10)")
+    parser.add_argument("--quantization", nargs="+", default=["none", "scalar", "binary"],
+                        choices=["none", "scalar", "binary"], help="Quantization modes to compare")
+    parser.add_argument(
+        "--no-rescore", action="store_true", help="Do not re-rank quantized candidates"
+    )
+    parser.add_argument(
+        "--oversampling",
+        type=float,
+        default=2.0,
+        help="Quantized candidates per result (default: 2.0)",
+    )
+    parser.add_argument(
+        "--on-disk", action="store_true", help="Keep original vectors and payloads on disk"
+    )
+    parser.add_argument(
+        "--m", type=int, nargs="+", default=[16], help="HNSW m values (default: 16)"
+    )
+    parser.add_argument(
+        "--ef-construct",
+        type=int,
+        nargs="+",
+        default=[100],
+        help="HNSW ef_construct values (default: 100)",
+    )
+    parser.add_argument(
+        "--ef", type=int, nargs="+", default=[32, 64, 128, 256], help="Search-time ef values"
+    )
+    parser.add_argument(
+        "--index-timeout",
+        type=float,
+        default=600.0,
+        help="Seconds to wait for indexing per collection",
+    )
+    parser.add_argument(
+        "--collection-prefix", default="literature_eval", help="Prefix of the temporary collections"
+    )
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary collections")
+    parser.add_argument(
+        "--offline", action="store_true", help="Hash embeddings and word tokenizer (no API key)"
+    )
+    parser.add_argument(
+        "--dimension",
+        type=int,
+        default=1536,
+        help="Hash embedding dimension with --offline (default: 1536)",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Local in-memory Qdrant (exact search only: HNSW and quantization are ignored)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--output", type=str, default=None, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", message="Payload indexes have no effect")
+    report = evaluate(args)
+    print_report(report, args.top_k)
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info(f"Report saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,27 @@
 #!/usr/bin/env python3
 """
-Script to automate the deep research process with a hardcoded question.
+Script to run a deep research session and stream its report into the knowledge base.
+
+Completed report sections are chunked and upserted into the literature store
+while the CLI is still writing (see ``IncrementalIngestor``); chunk IDs are
+derived from the question, so re-running it updates the same points.
 """
 
+import argparse
 import asyncio
-import sys
 import logging
+import sys
 from pathlib import Path
 
 # Add project root to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
+
 load_dotenv()
 
 from src.agents.deep_researcher import DeepResearcherAgent
+from src.config import settings
 
 # Configure logging
 logging.basicConfig(
@@ -24,24 +31,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-HARDCODED_QUESTION = "Summarize the mission context for a crewed Mars expedition with emphasis on radiation protection: dominant radiation hazards per phase, and current NASA/ESA/CNSA dose limits."
+DEFAULT_QUESTION = (
+    "Summarize the mission context for a crewed Mars expedition with emphasis on radiation "
+    "protection: dominant radiation hazards per phase, and current NASA/ESA/CNSA dose limits."
+)
+
+async def run(question: str, interactive: bool) -> None:
+    agent = DeepResearcherAgent()
+    logger.info(f"Starting Deep Research with question: {question}")
+
+    hypothesis = await agent.execute(question, interactive_mode=interactive)
+
+    if hypothesis.report_path:
+        logger.info(f"Deep Research complete. Report generated at: {hypothesis.report_path}")
+    else:
+        logger.error("Deep Research finished but no report path was returned.")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run deep research and stream the report into the literature store",
+    )
+    parser.add_argument(
+        "question",
+        nargs="?",
+        default=DEFAULT_QUESTION,
+        help="Research question (default: Mars radiation context)",
+    )
+    parser.add_argument(
+        "--no-interactive", action="store_true", help="Answer every CLI follow-up with the default"
+    )
+    args = parser.parse_args()
 
-async def main():
+    # This script exists to ingest, whatever the environment says
+    settings.deep_research_ingest = True
     try:
-        agent = DeepResearcherAgent()
-        logger.info(f"Starting Deep Research with question: {HARDCODED_QUESTION}")
-        
-        # Run interactively so the user can see progress and provide input if needed (though we automate most)
-        hypothesis = await agent.execute(HARDCODED_QUESTION, interactive_mode=True)
-        
-        if hypothesis.report_path:
-            logger.info(f"Deep Research complete. Report generated at: {hypothesis.report_path}")
-        else:
-            logger.error("Deep Research finished but no report path was returned.")
-            
+        asyncio.run(run(args.question, interactive=not args.no_interactive))
     except Exception as e:
         logger.error(f"An error occurred during deep research: {e}", exc_info=True)
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
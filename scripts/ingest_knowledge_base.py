@@ -58,7 +58,11 @@ class KnowledgeBaseIngester:
             raise ValueError(f"Data directory not found: {self.data_dir}")
 
         logger.info(f"Initialized ingester for directory: {self.data_dir}")
-        logger.info(f"Qdrant host: {settings.qdrant_host}:{settings.qdrant_port}")
+        if settings.vector_backend == "embedded":
+            logger.info(f"Qdrant storage (embedded): {settings.qdrant_path}")
+        else:
+            host = settings.qdrant_url or f"{settings.qdrant_host}:{settings.qdrant_port}"
+            logger.info(f"Qdrant host: {host}")
 
     def find_markdown_files(self) -> list[Path]:
         """
@@ -86,30 +90,23 @@ class KnowledgeBaseIngester:
             # Note: This could be optimized with a dedicated query if needed
             existing_sources = set()
 
-            # Query a batch to check if collection exists and has data
-            result = self.store.client.scroll(
-                collection_name="literature",
-                limit=100,
-                with_payload=True,
-            )
-
-            points, next_offset = result
-            while points:
-                for point in points:
-                    if point.payload and "source" in point.payload:
-                        existing_sources.add(point.payload["source"])
-
-                # Check if there are more points
-                if next_offset is None:
-                    break
-
-                result = self.store.client.scroll(
-                    collection_name="literature",
-                    offset=next_offset,
-                    limit=100,
-                    with_payload=True,
-                )
-                points, next_offset = result
+            # Scroll every collection of the store (one per spec domain if enabled)
+            for collection_name in self.store.collections:
+                next_offset = None
+                while True:
+                    points, next_offset = self.store.client.scroll(
+                        collection_name=collection_name,
+                        offset=next_offset,
+                        limit=100,
+                        with_payload=["source"],
+                    )
+                    for point in points:
+                        if point.payload and "source" in point.payload:
+                            existing_sources.add(point.payload["source"])
+
+                    # Check if there are more points
+                    if next_offset is None:
+                        break
 
             logger.info(f"Found {len(existing_sources)} existing documents in knowledge base")
             return existing_sources
@@ -137,12 +134,7 @@ class KnowledgeBaseIngester:
 
             # Use the existing ingest_file method from LiteratureStore
             document = self.store.ingest_file(str(file_path))
-
-            # Count chunks by checking how many were ingested
-            # The ingest_file method returns the Document object
-            # We need to count chunks that were created
-            chunks = self.store._chunk_markdown(document)
-            num_chunks = len(chunks)
+            num_chunks = document.chunk_count
 
             logger.info(f"  ✓ Successfully ingested {num_chunks} chunks from {file_path.name}")
             return True, num_chunks
@@ -210,6 +202,12 @@ class KnowledgeBaseIngester:
             if idx % batch_size == 0:
                 logger.info(f"\n--- Progress: {idx}/{len(files)} files processed ---\n")
 
+        # Drop texts of replaced or deleted chunks from the external text store
+        text_store = self.store.text_store
+        if text_store is not None and text_store.garbage_ratio() > 0.5:
+            logger.info(f"Compacting chunk text store {text_store.directory}")
+            text_store.compact()
+
         # Final summary
         logger.info(f"\n{'='*60}")
         logger.info("INGESTION COMPLETE")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Re-embed Qdrant collections with the current (or given) dense embedding settings.
+
+Run this after changing a store's dense backend, model or dimension
+(``DENSE_EMBEDDING_BACKEND`` / ``*_EMBEDDING_BACKEND``, ``EMBEDDING_MODEL``,
+``EMBEDDING_DIMENSIONS``, ``LOCAL_EMBEDDING_MODEL``): the stores refuse to open
+collections built for another dimension. Each collection is rebuilt as
+``<name>_d<dimension>`` from the text in its payloads, and ``<name>`` becomes
+an alias of the rebuilt collection (see ``src.rag.migration``). The
+``requirements`` collection only holds the current decomposition and is
+recreated automatically, so it is not migrated.
+
+Usage:
+    python scripts/migrate_embeddings.py                      # apply the settings in .env
+    python scripts/migrate_embeddings.py --dimension 512
+    python scripts/migrate_embeddings.py --backend fastembed --collections literature
+    python scripts/migrate_embeddings.py --dry-run
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src.config import settings
+from src.rag.chunk_text_store import ChunkTextStore
+from src.rag.domain_routing import DOMAINS, GENERAL_DOMAIN, domain_collection
+from src.rag.embeddings import EmbeddingService, FastEmbedEmbeddingService
+from src.rag.literature_store import LiteratureStore
+from src.rag.migration import migrate_dense_vectors, resolve_alias, vector_size
+from src.rag.plan_item_store import PlanItemStore
+from src.rag.vector_client import create_qdrant_client
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+logger = logging.getLogger(__name__)
+
+# Literature collections, including the per-domain ones
+LITERATURE_COLLECTIONS = [
+    domain_collection(LiteratureStore.COLLECTION_NAME, domain)
+    for domain in (GENERAL_DOMAIN, *DOMAINS)
+]
+
+# Dense vector, payload text field and backend of each migratable collection
+COLLECTIONS = {
+    **{
+        name: (LiteratureStore.DENSE_VECTOR_NAME, "content", settings.literature_embedding_backend)
+        for name in LITERATURE_COLLECTIONS
+    },
+    PlanItemStore.COLLECTION_NAME: (
+        PlanItemStore.DENSE_VECTOR_NAME, "text", settings.plan_item_embedding_backend
+    ),
+}
+
+
+def build_embeddings(backend: str, model: str | None, dimension: int | None):
+    """Dense embedding service for a backend, with optional overrides."""
+    if backend == "fastembed":
+        return FastEmbedEmbeddingService(model=model)
+    return EmbeddingService(model=model, dimension=dimension)
+
+
+def main():
+    """Main entry point for the migration script."""
+    parser = argparse.ArgumentParser(
+        description="Re-embed Qdrant collections with new dense embedding settings"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["openai", "fastembed"],
+        default=None,
+        help="Dense backend for every collection (default: each store's configured backend)",
+    )
+    parser.add_argument(
+        "--model", default=None, help="Embedding model (default: the backend's configured model)"
+    )
+    parser.add_argument("--dimension", type=int, default=None,
+                        help="OpenAI output dimension (default: EMBEDDING_DIMENSIONS)")
+    parser.add_argument("--collections", nargs="+", default=list(COLLECTIONS),
+                        help=f"Collections to migrate (default: {' '.join(COLLECTIONS)})")
+    parser.add_argument(
+        "--text-field",
+        default="content",
+        help="Payload text field for collections not listed above (default: content)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=64, help="Points re-embedded per request (default: 64)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-embed even if the dimension matches (a different model of the same size)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only report current dimensions")
+    args = parser.parse_args()
+
+    client = create_qdrant_client()
+    failures = 0
+    for collection in args.collections:
+        if not client.collection_exists(collection):
+            logger.info(f"{collection}: does not exist, skipping")
+            continue
+        vector_name, text_field, store_backend = COLLECTIONS.get(
+            collection, ("dense", args.text_field, None)
+        )
+        backend = args.backend or store_backend or settings.dense_embedding_backend
+        embeddings = build_embeddings(backend, args.model, args.dimension)
+        text_store = None
+        if collection in LITERATURE_COLLECTIONS and settings.literature_text_store_path:
+            text_store = ChunkTextStore(settings.literature_text_store_path)
+        size = vector_size(client, collection, vector_name)
+        points = client.count(collection).count
+        physical = resolve_alias(client, collection)
+        logger.info(
+            f"{collection} ({physical}): {points} points, {size}-d {vector_name!r} vectors; "
+            f"{backend} {embeddings.model} gives {embeddings.dimension}-d"
+        )
+        if args.dry_run or (size == embeddings.dimension and not args.force):
+            continue
+        try:
+            target = migrate_dense_vectors(
+                client,
+                collection,
+                vector_name,
+                embeddings,
+                text_field,
+                batch_size=args.batch_size,
+                progress=lambda done: logger.info(f"  {done}/{points} points re-embedded"),
+                force=args.force,
+                text_store=text_store,
+            )
+            logger.info(f"  ✓ {collection} now points to {target}")
+        except Exception as e:
+            failures += 1
+            logger.error(f"  ✗ {collection}: {e}", exc_info=True)
+
+    if not args.dry_run and (args.backend or args.model or args.dimension):
+        logger.info("Put the same backend/model/dimension in .env before the next run")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
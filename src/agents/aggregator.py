@@ -156,6 +156,7 @@ class AggregatorAgent(BaseAgent[AggregatorInput, AggregatorOutput]):
     """
 
     N_COMBINATIONS = 3  # Number of combination candidates to generate
+    COMBINATION_DELAY = 0.25  # Seconds between candidates (encourages diversity)
 
     def __init__(self):
         super().__init__(
@@ -187,7 +188,7 @@ class AggregatorAgent(BaseAgent[AggregatorInput, AggregatorOutput]):
             )
             combinations.append(combination)
             # Small delay to encourage diverse responses
-            await asyncio.sleep(0.25)
+            await asyncio.sleep(self.COMBINATION_DELAY)
         return combinations
 
     async def _select_best_solution(
@@ -17,6 +17,9 @@ from agent_framework import Executor, WorkflowContext, handler
 from agent_framework.openai import OpenAIChatClient
 
 from src.config import settings
+from src.rag.registry import registry
+from src.utils.concurrency import llm_limiter
+from src.utils.telemetry import tracer
 
 # Type variables for input/output typing
 TInput = TypeVar("TInput")
@@ -25,16 +28,60 @@ TOutput = TypeVar("TOutput")
 
 def create_chat_client() -> OpenAIChatClient:
     """
-    Create a configured OpenAI chat client.
+    Return the shared OpenAI chat client.
+
+    The client is created once and cached in the resource registry, so every
+    agent shares its connection pool. Benchmarks register a substitute under
+    ``"chat_client"`` before building agents.
 
     Returns:
         Configured OpenAIChatClient instance
     """
-    return OpenAIChatClient(
-        model_id="gpt-5-mini"
+    return registry.get(
+        "chat_client",
+        lambda: OpenAIChatClient(
+            model_id="gpt-5-mini"
+        ),
     )
 
 
+class ManagedAgent:
+    """
+    Wrapper around a framework agent that applies process-wide policies.
+
+    Every chat call made by an agent goes through ``run`` so that the global
+    LLM concurrency budget is respected no matter which agent, phase or
+    hypothesis issued it. Other attributes are forwarded to the wrapped agent.
+    """
+
+    def __init__(self, agent: Any, name: str, model: str | None = None):
+        """
+        Initialize the wrapper.
+
+        Args:
+            agent: The underlying Microsoft Agent Framework agent
+            name: Agent name (used for diagnostics and telemetry spans)
+            model: Model ID of the chat client (used for cost estimates)
+        """
+        self._inner = agent
+        self.name = name
+        self.model = model
+
+    async def run(self, message: str, **kwargs: Any) -> Any:
+        """Run the wrapped agent inside a global LLM concurrency slot."""
+        with tracer.span(f"agent:{self.name}", "llm", model=self.model) as span:
+            async with llm_limiter.slot():
+                tracer.mark(span, "queued_ms")
+                result = await self._inner.run(message, **kwargs)
+            usage = getattr(result, "usage_details", None)
+            if usage is not None:
+                span.record_usage(None, usage.input_token_count, usage.output_token_count)
+            return result
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._inner, item)
+
+
 class BaseAgent(ABC, Generic[TInput, TOutput]):
     """
     Abstract base class for all agents.
@@ -62,10 +109,28 @@ class BaseAgent(ABC, Generic[TInput, TOutput]):
         self.chat_client = create_chat_client()
 
         # Create the agent using Microsoft Agent Framework
-        self._agent = self.chat_client.create_agent(
+        self._agent = self.create_agent(name, instructions)
+
+    def create_agent(self, name: str, instructions: str) -> ManagedAgent:
+        """
+        Create an additional chat agent sharing this agent's client.
+
+        Subclasses that need more than one system prompt (e.g. a relevance
+        checker next to a query reformer) should use this instead of calling
+        ``chat_client.create_agent`` directly.
+
+        Args:
+            name: Name of the sub-agent
+            instructions: System instructions for the sub-agent
+
+        Returns:
+            ManagedAgent wrapping the framework agent
+        """
+        agent = self.chat_client.create_agent(
             name=name,
             instructions=instructions,
         )
+        return ManagedAgent(agent, name, model=getattr(self.chat_client, "model_id", None))
 
     async def run(self, message: str) -> str:
         """
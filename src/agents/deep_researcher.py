@@ -7,17 +7,25 @@ gathering context from the RAG system and generating clarifying questions.
 Owner: [ASSIGN TEAMMATE]
 """
 
-from src.agents.base import BaseAgent
-
-from src.models.hypothesis import Hypothesis
+import asyncio
+import hashlib
+import json
 import os
+import pathlib
+import shutil
 import sys
+import tempfile
 import time
-import select
-import subprocess
-import pty
-import pathlib
-import asyncio
+import uuid
+
+from src.agents.base import BaseAgent
+from src.config import settings
+from src.models.hypothesis import Hypothesis
+from src.rag.literature_store import IncrementalIngestor
+from src.rag.registry import registry
+from src.utils.concurrency import deep_research_limiter
+from src.utils.pty_session import PtySession
+from src.utils.telemetry import tracer
 
 SYSTEM_PROMPT = """You are a Deep Research Agent specialized in scientific literature analysis.
 
@@ -40,24 +48,145 @@ Output Format:
 """
 
 
+FACET_PROMPT = """Split the research hypothesis below into {count} distinct research questions
+that together cover it without overlapping (for example physics, materials,
+operations). Each question must stand on its own without the hypothesis.
+
+Hypothesis: {hypothesis}
+
+Respond with JSON: {{"questions": ["...", "..."]}}
+"""
+
+
+# Setup prompts of the deep-research CLI, answered in order: (state, matcher, field).
+# The reply is the named session field ("question" or a session parameter),
+# or the CLI default (Enter) when the field is None or unset.
+SETUP_PROMPTS = [
+    ("WAIT_FOR_QUESTION", lambda tail: "?" in tail or "question" in tail.lower(), "question"),
+    ("WAIT_FOR_BREADTH", lambda tail: "breadth" in tail.lower() and ":" in tail, "breadth"),
+    ("WAIT_FOR_DEPTH", lambda tail: "depth" in tail.lower() and ":" in tail, "depth"),
+    (
+        "WAIT_FOR_REPORT_TYPE",
+        lambda tail: "report/answer" in tail.lower() or "generate" in tail.lower(),
+        None,
+    ),
+]
+
+# Session directories live here, inside the deep-research checkout
+SESSIONS_DIR = ".sessions"
+
+# Files the CLI writes into its working directory; never shared between sessions
+SESSION_OUTPUTS = {"report.md", "answer.md", SESSIONS_DIR}
+
+
+def _last_line(tail: str) -> str:
+    lines = [line.strip() for line in tail.splitlines() if line.strip()]
+    return lines[-1] if lines else ""
+
+
+def _awaiting_answer(tail: str) -> bool:
+    """Whether the CLI's latest output line is a follow-up question."""
+    return _last_line(tail).endswith(("?", ":"))
+
+
+def normalize_question(question: str) -> str:
+    """Lower-case, collapse whitespace and drop trailing punctuation."""
+    return " ".join(question.lower().split()).rstrip("?!. ")
+
+
+def report_cache_key(question: str, params: dict) -> str:
+    """Cache key for a research question and the parameters it was run with."""
+    payload = json.dumps({"question": normalize_question(question), **params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """
+    Deep-research reports on disk, keyed by ``report_cache_key``.
+
+    Each entry is ``<key>.md`` plus a ``<key>.json`` sidecar recording the
+    question and parameters it answers.
+    """
+
+    def __init__(self, directory: str | pathlib.Path):
+        self.directory = pathlib.Path(directory)
+
+    def get(self, key: str) -> pathlib.Path | None:
+        """Return the cached report for ``key``, if any."""
+        path = self.directory / f"{key}.md"
+        return path if path.exists() else None
+
+    def put(self, key: str, report: pathlib.Path, meta: dict) -> pathlib.Path:
+        """Copy ``report`` into the cache and return the cached path."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / f"{key}.md"
+        # Write then rename, so a concurrent reader never sees a partial report
+        partial = target.with_name(f"{key}.{uuid.uuid4().hex}.tmp")
+        shutil.copyfile(report, partial)
+        os.replace(partial, target)
+        target.with_suffix(".json").write_text(
+            json.dumps({**meta, "created_at": time.time()}, indent=2), encoding="utf-8"
+        )
+        return target
+
+
 class DeepResearcherAgent(BaseAgent[str, Hypothesis]):
     """
     Performs deep research on the hypothesis and generates clarifying questions.
 
+    Every CLI session runs in its own working directory, so sessions for
+    different hypotheses, or for different facets of one hypothesis, run in
+    parallel. Reports are cached by normalized question and parameters, and
+    (with ``settings.deep_research_ingest``) streamed into the literature
+    store section by section while the CLI writes them.
+
     Input: User hypothesis (str)
     Output: Hypothesis object with context and clarifying questions
     """
 
-    def __init__(self):
+    # Command that starts the deep-research CLI, run inside a session directory
+    CLI_COMMAND = ["npm", "start"]
+
+    # Seconds between checks of a running session's report for new sections
+    REPORT_POLL_INTERVAL = 2.0
+
+    def __init__(
+        self,
+        research_dir: str | pathlib.Path | None = None,
+        command: list[str] | None = None,
+        cache: ReportCache | None = None,
+    ):
+        """
+        Initialize the agent.
+
+        Args:
+            research_dir: Checkout of the deep-research CLI (defaults to the
+                ``deep-research`` directory next to this repository)
+            command: Command starting the CLI (defaults to ``CLI_COMMAND``)
+            cache: Report cache (defaults to ``settings.deep_research_cache_dir``
+                unless caching is disabled)
+        """
         super().__init__(
             name="deep_researcher",
             instructions=SYSTEM_PROMPT,
         )
+        self.research_dir = pathlib.Path(
+            research_dir or pathlib.Path(__file__).parents[3] / "deep-research"
+        )
+        self.command = command or self.CLI_COMMAND
+        if cache is None and settings.deep_research_cache_enabled:
+            cache = ReportCache(settings.deep_research_cache_dir)
+        self.cache = cache
 
     async def execute(self, input_data: str, interactive_mode: bool = False) -> Hypothesis:
         """
         Research the hypothesis and generate clarifying questions.
 
+        With ``settings.deep_research_facets`` above one, the hypothesis is
+        split into that many sub-questions which are researched in parallel
+        and combined into a single report. Interactive mode always runs one
+        session, since stdin can only be forwarded to one CLI.
+
         Args:
             input_data: The user's raw hypothesis text
             interactive_mode: Whether to allow manual user input during research
@@ -65,7 +194,11 @@ class DeepResearcherAgent(BaseAgent[str, Hypothesis]):
         Returns:
             Hypothesis object with context and questions populated
         """
-        report_path = await asyncio.to_thread(self._run_deep_research_cli, input_data, interactive_mode)
+        facets = 1 if interactive_mode else max(1, settings.deep_research_facets)
+        if facets == 1:
+            report_path = await self._research(input_data, interactive_mode)
+        else:
+            report_path = await self._research_facets(input_data, facets)
 
         hypothesis = Hypothesis(original_text=input_data)
         if report_path:
@@ -75,136 +208,277 @@ class DeepResearcherAgent(BaseAgent[str, Hypothesis]):
 
         return hypothesis
 
-    def _run_deep_research_cli(self, question: str, interactive: bool) -> str:
-        deep_research_dir = pathlib.Path(__file__).parents[3] / "deep-research"
-        report_file = deep_research_dir / "report.md"
-
-        if not deep_research_dir.exists():
-            print(f"[!] Error: Directory {deep_research_dir} does not exist.")
-            return ""
+    def _session_params(self) -> dict:
+        """CLI parameters that, with the question, determine a report."""
+        return {
+            "breadth": settings.deep_research_breadth,
+            "depth": settings.deep_research_depth,
+        }
 
-        print(f"[*] Starting Deep Research Automation")
-        print(f"[*] Target Directory: {deep_research_dir}")
+    async def _research_facets(self, hypothesis: str, count: int) -> str:
+        """
+        Research ``count`` facets of the hypothesis concurrently.
 
-        master_fd, slave_fd = pty.openpty()
+        Returns:
+            Path of the combined report, or "" if no facet produced one
+        """
+        key = report_cache_key(hypothesis, {**self._session_params(), "facets": count})
+        with tracer.span("deep_research:facets", "step", facets=count) as span:
+            cached = self.cache.get(key) if self.cache else None
+            if cached:
+                span.cache_hit = True
+                print(f"[*] Deep research cache hit: {cached}")
+                return str(cached)
+
+            questions = await self._split_into_facets(hypothesis, count)
+            span.attributes["questions"] = len(questions)
+            reports = await asyncio.gather(*(self._research(q) for q in questions))
+
+            found = [(q, pathlib.Path(r)) for q, r in zip(questions, reports) if r]
+            if not found:
+                return ""
+            combined = self._combine_reports(hypothesis, found)
+            if self.cache:
+                self.cache.put(key, combined, {"question": hypothesis, "facets": questions})
+            return str(combined)
+
+    async def _split_into_facets(self, hypothesis: str, count: int) -> list[str]:
+        """Ask the LLM for ``count`` sub-questions; falls back to the hypothesis itself."""
+        result = await self._agent.run(FACET_PROMPT.format(count=count, hypothesis=hypothesis))
+        text = result.text.strip()
+        if "```" in text:
+            text = text.split("```")[1].removeprefix("json").strip()
+        try:
+            questions = json.loads(text).get("questions", [])
+        except (json.JSONDecodeError, AttributeError):
+            questions = []
+
+        questions = [q.strip() for q in questions if isinstance(q, str) and q.strip()][:count]
+        if not questions:
+            print("[!] Could not split the hypothesis into facets; researching it as one question")
+            return [hypothesis]
+        return questions
+
+    def _combine_reports(
+        self, hypothesis: str, reports: list[tuple[str, pathlib.Path]]
+    ) -> pathlib.Path:
+        """Concatenate facet reports under one heading per facet."""
+        sections = [f"# Deep Research: {hypothesis}\n"]
+        for i, (question, path) in enumerate(reports, 1):
+            sections.append(
+                f"## Facet {i}: {question}\n\n{path.read_text(encoding='utf-8').strip()}\n"
+            )
+
+        combined = self.research_dir / f"report_{int(time.time())}_{uuid.uuid4().hex[:8]}.md"
+        combined.write_text("\n".join(sections), encoding="utf-8")
+        return combined
+
+    async def _research(self, question: str, interactive: bool = False) -> str:
+        """
+        Research one question, reusing a cached report when there is one.
 
-        process = subprocess.Popen(
-            ["npm", "start"],
-            cwd=str(deep_research_dir),
-            stdin=slave_fd,
-            stdout=slave_fd,
-            stderr=slave_fd,
-            close_fds=True,
-            text=True
+        Returns:
+            Path of the report, or "" if none was produced
+        """
+        params = self._session_params()
+        key = report_cache_key(question, params)
+        ingestor = self._create_ingestor(question, key) if settings.deep_research_ingest else None
+        with tracer.span("deep_research:session", "step", **params) as span:
+            cached = self.cache.get(key) if self.cache else None
+            if cached:
+                span.cache_hit = True
+                print(f"[*] Deep research cache hit: {cached}")
+                if ingestor and not ingestor.store.count_chunks(ingestor.document_id):
+                    await self._ingest(ingestor, cached.read_text(encoding="utf-8"), final=True)
+                return str(cached)
+
+            async with deep_research_limiter.slot():
+                report_path = await self._run_deep_research_cli(question, interactive, ingestor)
+            if report_path and self.cache:
+                self.cache.put(key, pathlib.Path(report_path), {"question": question, **params})
+            return report_path
+
+    def _create_ingestor(self, question: str, key: str) -> IncrementalIngestor:
+        """Ingestor for the report on ``question``; the document ID derives from the cache key."""
+        return IncrementalIngestor(
+            store=registry.literature_store(),
+            document_id=uuid.uuid5(uuid.NAMESPACE_URL, f"deep-research:{key}"),
+            source=f"deep-research/{key[:16]}.md",
+            metadata={"file_type": "md", "origin": "deep_research", "question": question},
         )
-        os.close(slave_fd)
 
-        buffer = ""
-        interaction_log = []
-        state = "WAIT_FOR_QUESTION"
+    async def _ingest(self, ingestor: IncrementalIngestor, text: str, final: bool = False) -> None:
+        """Run one ingestor update off the event loop; failures never stop the research."""
+        try:
+            upserted = await asyncio.to_thread(ingestor.update, text, final)
+        except Exception as e:
+            print(f"[!] Error ingesting deep research report: {e}")
+            return
+        if upserted:
+            print(f"[*] Ingested {upserted} report chunks ({ingestor.chunk_count} stored)")
+
+    async def _watch_report(
+        self,
+        report_file: pathlib.Path,
+        ingestor: IncrementalIngestor,
+        stop: asyncio.Event,
+    ) -> None:
+        """Ingest completed sections of ``report_file`` whenever it changes, until ``stop``."""
+        last_seen = None
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.REPORT_POLL_INTERVAL)
+            except TimeoutError:
+                pass
+            try:
+                stat = report_file.stat()
+            except FileNotFoundError:
+                continue
+            if (stat.st_mtime_ns, stat.st_size) == last_seen:
+                continue
+            last_seen = (stat.st_mtime_ns, stat.st_size)
+            await self._ingest(ingestor, report_file.read_text(encoding="utf-8", errors="replace"))
+
+    def _create_session_dir(self) -> pathlib.Path:
+        """
+        Create a private working directory for one CLI session.
 
-        print(f"[*] Process started (PID: {process.pid}). Automating initial steps...")
+        The directory links to every entry of the deep-research checkout
+        (sources, ``node_modules``, ``.env.local``) except the files the CLI
+        writes, so each session gets its own ``report.md``.
+        """
+        sessions = self.research_dir / SESSIONS_DIR
+        sessions.mkdir(exist_ok=True)
+        session_dir = pathlib.Path(tempfile.mkdtemp(prefix="session_", dir=sessions))
+        for entry in self.research_dir.iterdir():
+            if entry.name in SESSION_OUTPUTS or entry.name.startswith("report_"):
+                continue
+            (session_dir / entry.name).symlink_to(entry.resolve())
+        return session_dir
+
+    async def _run_deep_research_cli(
+        self,
+        question: str,
+        interactive: bool,
+        ingestor: IncrementalIngestor | None = None,
+    ) -> str:
+        """
+        Drive the deep-research CLI under a pty until it writes its report.
 
-        try:
-            while True:
-                if process.poll() is not None:
-                    print(f"\n[*] Process exited with code {process.returncode}")
-                    break
+        Setup prompts are answered by a state machine (``SETUP_PROMPTS``);
+        follow-up questions get the default answer unless ``interactive``, in
+        which case stdin is forwarded to the CLI. Bounded by
+        ``settings.deep_research_timeout``; cancelling the task stops the CLI.
 
-                rlist = [master_fd]
-                if state == "INTERACTIVE" and interactive:
-                    rlist.append(sys.stdin.fileno())
+        With an ``ingestor``, completed report sections are ingested while
+        the CLI runs and the final report once it exits.
 
-                read_ready, _, _ = select.select(rlist, [], [], 0.05)
+        Returns:
+            Path of the saved report, or "" if none was produced
+        """
+        if not self.research_dir.exists():
+            print(f"[!] Error: Directory {self.research_dir} does not exist.")
+            return ""
 
-                if master_fd in read_ready:
-                    try:
-                        data = os.read(master_fd, 1024)
-                    except OSError:
-                        break
-                    
-                    if not data:
-                        break
+        session_dir = self._create_session_dir()
+        report_file = session_dir / "report.md"
+        replies = {"question": question, **self._session_params()}
 
-                    text_chunk = data.decode('utf-8', errors='replace')
-                    sys.stdout.write(text_chunk)
-                    sys.stdout.flush()
-                    buffer += text_chunk
-                    
-                    if state == "INTERACTIVE":
-                        if text_chunk.strip().endswith("?") or text_chunk.strip().endswith(":"):
-                             interaction_log.append(f"Q: {text_chunk.strip()}\n")
-                             
-                             if not interactive:
-                                 print(f"\n[AUTO] Non-interactive: Sending Default (Enter)")
-                                 os.write(master_fd, b"\n")
-                                 time.sleep(0.5)
-
-                    if state == "WAIT_FOR_QUESTION":
-                        if "?" in buffer or "question" in buffer.lower():
-                            print(f"\n[AUTO] Sending Question: {question}")
-                            msg = f"{question}\n".encode('utf-8')
-                            os.write(master_fd, msg)
-                            buffer = ""
-                            state = "WAIT_FOR_BREADTH"
-
-                    elif state == "WAIT_FOR_BREADTH":
-                        if "breadth" in buffer.lower() and ":" in buffer:
-                            print(f"\n[AUTO] Sending Breadth: (default)")
-                            os.write(master_fd, b"\n")
-                            buffer = ""
-                            state = "WAIT_FOR_DEPTH"
-                    
-                    elif state == "WAIT_FOR_DEPTH":
-                        if "depth" in buffer.lower() and ":" in buffer:
-                            print(f"\n[AUTO] Sending Depth: (default)")
-                            os.write(master_fd, b"\n")
-                            buffer = ""
-                            state = "WAIT_FOR_REPORT_TYPE"
-
-                    elif state == "WAIT_FOR_REPORT_TYPE":
-                        if "report/answer" in buffer.lower() or "generate" in buffer.lower():
-                            print(f"\n[AUTO] Sending Report Type: (default)")
-                            os.write(master_fd, b"\n")
-                            buffer = ""
-                            state = "INTERACTIVE"
-                            print(f"\n[*] Initial setup complete. Entering INTERACTIVE mode. You can type now.")
-
-                if state == "INTERACTIVE" and interactive and sys.stdin.fileno() in read_ready:
-                    user_input = os.read(sys.stdin.fileno(), 1024)
-                    if user_input:
-                        os.write(master_fd, user_input)
-                        interaction_log.append(f"A: {user_input.decode('utf-8', errors='replace').strip()}\n")
-
-        except OSError as e:
-            print(f"\n[!] OS Error: {e}")
-        except KeyboardInterrupt:
-            print("\n[*] Interrupted by user.")
-        
-        if process.poll() is None:
-            process.terminate()
-            process.wait()
-
-        os.close(master_fd)
-        
-        # Save log
-        log_file = pathlib.Path("interaction_log.txt")
-        report_content = ""
-        if report_file.exists():
-             report_content = report_file.read_text(encoding='utf-8')
+        print("[*] Starting Deep Research Automation")
+        print(f"[*] Session Directory: {session_dir}")
+
+        session = await PtySession.start(self.command, cwd=str(session_dir))
+        stop_watching = asyncio.Event()
+        watcher = None
+        if ingestor:
+            watcher = asyncio.create_task(self._watch_report(report_file, ingestor, stop_watching))
+        interaction_log = []
+        loop = asyncio.get_running_loop()
+        stdin_fd = sys.stdin.fileno() if interactive else None
+        stdin_sends: set[asyncio.Task] = set()
+
+        def forward_stdin() -> None:
+            user_input = os.read(stdin_fd, 1024)
+            if user_input:
+                send = loop.create_task(session.send(user_input))
+                stdin_sends.add(send)
+                send.add_done_callback(stdin_sends.discard)
+                interaction_log.append(
+                    f"A: {user_input.decode('utf-8', errors='replace').strip()}\n"
+                )
+
+        print(f"[*] Process started (PID: {session.process.pid}). Automating initial steps...")
 
         try:
-            final_log = "".join(interaction_log)
-            if report_content:
-                final_log += "\n\n--- FINAL REPORT ---\n" + report_content
-            log_file.write_text(final_log, encoding='utf-8')
-        except Exception as e:
-            print(f"[!] Error saving interaction log: {e}")
+            async with asyncio.timeout(settings.deep_research_timeout):
+                for state, matcher, field in SETUP_PROMPTS:
+                    await session.expect(matcher, timeout=settings.deep_research_prompt_timeout)
+                    value = replies.get(field) if field else None
+                    if field == "question":
+                        print(f"\n[AUTO] Sending Question: {question}")
+                    elif value is None:
+                        print(f"\n[AUTO] {state}: sending default")
+                    else:
+                        print(f"\n[AUTO] {state}: sending {value}")
+                    session.clear()
+                    await session.send("\n" if value is None else f"{value}\n")
+
+                print("\n[*] Initial setup complete. Entering INTERACTIVE mode.")
+                if interactive:
+                    loop.add_reader(stdin_fd, forward_stdin)
+
+                while True:
+                    try:
+                        tail = await session.expect(_awaiting_answer)
+                    except EOFError:
+                        break
+                    interaction_log.append(f"Q: {_last_line(tail)}\n")
+                    session.clear()
+                    if not interactive:
+                        print("\n[AUTO] Non-interactive: Sending Default (Enter)")
+                        await session.send("\n")
+
+                returncode = await session.wait()
+                print(f"\n[*] Process exited with code {returncode}")
+
+        except TimeoutError:
+            print("\n[!] Deep research timed out")
+        except EOFError:
+            print("\n[!] Deep research exited during setup")
+        finally:
+            if interactive:
+                loop.remove_reader(stdin_fd)
+            for send in stdin_sends:
+                send.cancel()
+            await session.close()
+            stop_watching.set()
+            if watcher:
+                await watcher
 
-        if report_file.exists():
-            timestamp = int(time.time())
-            new_report_path = report_file.with_name(f"report_{timestamp}.md")
-            report_file.rename(new_report_path)
-            return str(new_report_path)
+        try:
+            # Reports and logs are named per session so parallel sessions never collide
+            stamp = f"{int(time.time())}_{session_dir.name.removeprefix('session_')}"
+            report_content = ""
+            if report_file.exists():
+                report_content = report_file.read_text(encoding='utf-8')
+            if ingestor and report_content:
+                await self._ingest(ingestor, report_content, final=True)
+
+            # Save log
+            log_file = self.research_dir / f"interaction_log_{stamp}.txt"
+            try:
+                final_log = "".join(interaction_log)
+                if report_content:
+                    final_log += "\n\n--- FINAL REPORT ---\n" + report_content
+                log_file.write_text(final_log, encoding='utf-8')
+            except Exception as e:
+                print(f"[!] Error saving interaction log: {e}")
+
+            if report_file.exists():
+                new_report_path = self.research_dir / f"report_{stamp}.md"
+                report_file.rename(new_report_path)
+                return str(new_report_path)
 
-        return ""
+            return ""
+        finally:
+            shutil.rmtree(session_dir, ignore_errors=True)
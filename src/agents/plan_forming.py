@@ -10,6 +10,7 @@ PLAN.md file, categorizing items as:
 Owner: [ASSIGN TEAMMATE]
 """
 
+import asyncio
 import json
 from datetime import datetime
 from enum import Enum
@@ -18,7 +19,9 @@ from uuid import UUID
 from pydantic import BaseModel, Field
 
 from src.agents.base import BaseAgent
+from src.agents.plan_preclassifier import PlanItemPreClassifier
 from src.agents.retriever import RetrieverAgent, RetrieverAgentInput
+from src.config import settings
 from src.models.hypothesis import Hypothesis
 from src.models.requirement import Requirement, RequirementGraph
 from src.models.solution import Solution, SolutionSource
@@ -188,23 +191,48 @@ For each solution, output valid JSON:
 """
 
 
+UNPARSED_REASONING = "Could not parse LLM response, defaulting to needs_research"
+
+
 class PlanFormingAgent(BaseAgent[PlanFormingInput, PlanFormingOutput]):
     """
     Synthesizes all subproblems and solutions into an action-oriented plan.
 
     Process:
     1. Extract all (requirement, solution) pairs from the graph
-    2. For unclear items, query KB per-item for additional context
-    3. Use LLM to categorize based on context (what needs physical work vs info synthesis)
-    4. Render PLAN.md with sections: Implemented, Needs Verification, Needs Research
+    2. Optionally pre-classify recurring items locally (``PlanItemPreClassifier``)
+       and skip the LLM for them
+    3. For unclear items, query KB per-item for additional context (concurrently)
+    4. Use LLM to categorize based on context (what needs physical work vs info
+       synthesis), ``batch_size`` items per call; items whose batched output
+       fails validation are re-categorized one at a time
+    5. Render PLAN.md with sections: Implemented, Needs Verification, Needs Research
     """
 
-    def __init__(self):
+    BATCH_SIZE = 10
+
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        pre_classifier: PlanItemPreClassifier | None = None,
+    ):
+        """
+        Initialize the plan forming agent.
+
+        Args:
+            batch_size: Items categorized per LLM call (1 disables batching)
+            pre_classifier: Local pre-classifier (defaults to one when
+                ``settings.preclassifier_enabled``)
+        """
         super().__init__(
             name="plan_former",
             instructions=SYSTEM_PROMPT,
         )
         self.retriever = RetrieverAgent()
+        self.batch_size = max(1, batch_size or self.BATCH_SIZE)
+        if pre_classifier is None and settings.preclassifier_enabled:
+            pre_classifier = PlanItemPreClassifier()
+        self.pre_classifier = pre_classifier
 
     def _extract_pairs(
         self, graph: RequirementGraph, solutions: dict[UUID, Solution]
@@ -268,11 +296,88 @@ Respond with JSON only."""
 
         response = await self._agent.run(prompt)
 
-        # Parse JSON from response
+        categorization = self._parse_json(response.text)
+        if isinstance(categorization, dict):
+            return categorization
+
+        # Default categorization if parsing fails
+        return {
+            "category": "needs_research",
+            "reasoning": UNPARSED_REASONING,
+            "verification_type": None,
+            "verification_details": None,
+            "research_questions": ["Further investigation required"],
+        }
+
+    async def _categorize_batch(
+        self,
+        items: list[tuple[Requirement, Solution, str]],
+    ) -> list[dict | None]:
+        """
+        Use one LLM call to categorize several items.
+
+        Args:
+            items: (requirement, solution, additional context) triples
+
+        Returns:
+            One categorization per item, or None where the batched output was
+            missing or failed validation
+        """
+        blocks = []
+        for number, (requirement, solution, additional_context) in enumerate(items, 1):
+            blocks.append(f"""### Item {number}
+
+Requirement: {requirement.content}
+
+Solution: {solution.content}
+
+Confidence: {solution.confidence}
+Source: {solution.source.value}
+
+Additional Context: {additional_context if additional_context else "None available"}""")
+
+        prompt = f"""Categorize each of these {len(items)} solutions independently.
+
+{chr(10).join(blocks)}
+
+Respond with a JSON array only, one object per item in the output format above,
+each with an additional "item" field holding the item number."""
+
+        response = await self._agent.run(prompt)
+        parsed = self._parse_json(response.text)
+
+        results: list[dict | None] = [None] * len(items)
+        if not isinstance(parsed, list):
+            return results
+
+        for position, entry in enumerate(parsed):
+            if not isinstance(entry, dict):
+                continue
+            number = entry.get("item", position + 1)
+            if not isinstance(number, int) or not 1 <= number <= len(items):
+                continue
+            if results[number - 1] is None and self._is_valid_categorization(entry):
+                results[number - 1] = entry
+
+        return results
+
+    def _is_valid_categorization(self, data: dict) -> bool:
+        """Check a categorization has a known category and well-typed fields."""
+        if data.get("category") not in {c.value for c in PlanCategory}:
+            return False
+        verification_type = data.get("verification_type")
+        verification_types = {v.value for v in VerificationType}
+        if verification_type is not None and verification_type not in verification_types:
+            return False
+        if not isinstance(data.get("reasoning", ""), str):
+            return False
+        questions = data.get("research_questions", [])
+        return isinstance(questions, list) and all(isinstance(q, str) for q in questions)
+
+    def _parse_json(self, text: str) -> dict | list | None:
+        """Parse JSON from an LLM response, handling markdown code blocks."""
         try:
-            # Try to extract JSON from response
-            text = response.text.strip()
-            # Handle markdown code blocks
+            text = text.strip()
             if "```json" in text:
                 text = text.split("```json")[1].split("```")[0].strip()
             elif "```" in text:
@@ -280,14 +385,38 @@ Respond with JSON only."""
 
             return json.loads(text)
         except (json.JSONDecodeError, IndexError):
-            # Default categorization if parsing fails
-            return {
-                "category": "needs_research",
-                "reasoning": "Could not parse LLM response, defaulting to needs_research",
-                "verification_type": None,
-                "verification_details": None,
-                "research_questions": ["Further investigation required"],
-            }
+            return None
+
+    async def _categorize_all(
+        self,
+        items: list[tuple[Requirement, Solution, str]],
+    ) -> list[dict]:
+        """
+        Categorize all items in concurrent batches.
+
+        Args:
+            items: (requirement, solution, additional context) triples
+
+        Returns:
+            One categorization per item, in order
+        """
+        if self.batch_size == 1:
+            return list(await asyncio.gather(*(self._categorize_item(*item) for item in items)))
+
+        batches = [
+            items[start:start + self.batch_size]
+            for start in range(0, len(items), self.batch_size)
+        ]
+        batch_results = await asyncio.gather(*(self._categorize_batch(b) for b in batches))
+        categorizations = [c for results in batch_results for c in results]
+
+        # Fall back to single-item calls only where the batched output failed
+        failed = [i for i, c in enumerate(categorizations) if c is None]
+        retried = await asyncio.gather(*(self._categorize_item(*items[i]) for i in failed))
+        for index, categorization in zip(failed, retried):
+            categorizations[index] = categorization
+
+        return categorizations
 
     def _render_markdown(
         self, output: PlanFormingOutput, hypothesis: Hypothesis
@@ -414,20 +543,41 @@ Respond with JSON only."""
         # Extract all (requirement, solution) pairs
         pairs = self._extract_pairs(input_data.graph, input_data.solutions)
 
-        # Process each pair
-        for requirement, solution in pairs:
-            # Query KB for unclear items
-            additional_context = ""
-            if self._is_unclear(solution):
-                additional_context = await self._query_kb_for_item(
-                    requirement, solution, input_data.hypothesis
-                )
-
-            # Categorize using LLM
-            categorization = await self._categorize_item(
-                requirement, solution, additional_context
-            )
-
+        # Pre-classify recurring items locally (one batched lookup, off the
+        # event loop); only the rest reach the LLM
+        categorizations: list[dict | None] = [None] * len(pairs)
+        if self.pre_classifier is not None:
+            decisions = await asyncio.to_thread(self.pre_classifier.classify_many, pairs)
+            for index, decision in enumerate(decisions):
+                if decision is not None:
+                    categorizations[index] = decision.as_categorization()
+        escalated = [i for i, c in enumerate(categorizations) if c is None]
+
+        # Query KB for unclear items
+        async def context_for(requirement: Requirement, solution: Solution) -> str:
+            if not self._is_unclear(solution):
+                return ""
+            return await self._query_kb_for_item(requirement, solution, input_data.hypothesis)
+
+        contexts = await asyncio.gather(*(context_for(*pairs[i]) for i in escalated))
+
+        # Categorize using LLM
+        llm_categorizations = await self._categorize_all(
+            [(*pairs[i], context) for i, context in zip(escalated, contexts)]
+        )
+        for index, categorization in zip(escalated, llm_categorizations):
+            categorizations[index] = categorization
+
+        # Remember LLM decisions so recurring items are pre-classified next time
+        if self.pre_classifier is not None:
+            await asyncio.to_thread(self.pre_classifier.learn, [
+                (*pairs[i], categorization)
+                for i, categorization in zip(escalated, llm_categorizations)
+                if categorization.get("reasoning") != UNPARSED_REASONING
+                and self._is_valid_categorization(categorization)
+            ])
+
+        for (requirement, solution), categorization in zip(pairs, categorizations):
             # Build PlanItem
             category_str = categorization.get("category", "needs_research")
             try:
@@ -0,0 +1,214 @@
+"""
+Local pre-classifier for plan items.
+
+Decides the category of recurring (requirement, solution) pairs without an
+LLM call, from a weighted nearest-neighbour vote over items the LLM has
+categorized before (``PlanItemStore``) plus rules from the PlanFormingAgent
+prompt. Items it is not confident about are escalated to the LLM.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from src.config import settings
+from src.models.requirement import Requirement
+from src.models.solution import Solution, SolutionSource
+from src.rag import registry
+from src.rag.plan_item_store import LabeledPlanItem, PlanItemNeighbor, PlanItemStore
+
+
+@dataclass
+class PreClassification:
+    """A category decided without the LLM."""
+
+    category: str
+    agreement: float  # Weighted vote share of the winning category (1.0 for rules)
+    neighbors: int  # Neighbours that voted (0 for rules)
+    reason: str
+    verification_type: str | None = None
+    research_questions: list[str] = field(default_factory=list)
+
+    def as_categorization(self) -> dict:
+        """Return the decision in the LLM categorization format."""
+        return {
+            "category": self.category,
+            "reasoning": self.reason,
+            "verification_type": self.verification_type,
+            "verification_details": None,
+            "research_questions": self.research_questions,
+        }
+
+
+class PlanItemPreClassifier:
+    """
+    Nearest-neighbour + rule pre-classifier for plan items.
+
+    Each neighbour votes for its category with weight
+    ``similarity * source_match * (1 - |confidence difference|)``, where
+    ``source_match`` is 1.0 for the same solution source and 0.5 otherwise.
+    """
+
+    # Prompt rule: very low confidence novel solutions need more research
+    LOW_CONFIDENCE = 0.3
+    # Prompt rule: be conservative, never mark uncertain items implemented
+    MIN_IMPLEMENTED_CONFIDENCE = 0.5
+    # A neighbour this similar is the same item seen before and may decide alone
+    REPEAT_SCORE = 0.98
+    TOP_K = 7
+
+    def __init__(
+        self,
+        store: PlanItemStore | None = None,
+        min_neighbors: int | None = None,
+        min_score: float | None = None,
+        min_agreement: float | None = None,
+    ):
+        """
+        Initialize the pre-classifier.
+
+        Args:
+            store: Store of past categorizations (defaults to the shared one)
+            min_neighbors: Voting neighbours required to decide
+            min_score: Minimum cosine similarity for a neighbour to vote
+            min_agreement: Weighted vote share required to decide
+        """
+        self.store = store or registry.plan_item_store()
+        self.min_neighbors = (
+            min_neighbors if min_neighbors is not None else settings.preclassifier_min_neighbors
+        )
+        self.min_score = min_score if min_score is not None else settings.preclassifier_min_score
+        self.min_agreement = (
+            min_agreement if min_agreement is not None else settings.preclassifier_min_agreement
+        )
+
+    @staticmethod
+    def item_text(requirement: Requirement, solution: Solution) -> str:
+        """Text embedded for a plan item."""
+        return f"{requirement.content}\n{solution.content[:500]}"
+
+    def classify(
+        self, requirement: Requirement, solution: Solution
+    ) -> PreClassification | None:
+        """
+        Categorize an item locally, if confident.
+
+        Args:
+            requirement: The requirement
+            solution: Its solution
+
+        Returns:
+            The decision, or None to escalate to the LLM
+        """
+        return self.classify_many([(requirement, solution)])[0]
+
+    def classify_many(
+        self, items: list[tuple[Requirement, Solution]]
+    ) -> list[PreClassification | None]:
+        """
+        Categorize items locally, if confident.
+
+        Items not decided by a rule are embedded and looked up in one batch.
+        Blocking (embedding and Qdrant calls); async callers run it in a thread.
+
+        Args:
+            items: (requirement, solution) pairs
+
+        Returns:
+            One decision per item, None where it escalates to the LLM
+        """
+        decisions: list[PreClassification | None] = [self._rule(solution) for _, solution in items]
+        pending = [i for i, decision in enumerate(decisions) if decision is None]
+        neighbor_lists = self.store.find_neighbors_batch(
+            [self.item_text(*items[i]) for i in pending],
+            top_k=self.TOP_K,
+            score_threshold=self.min_score,
+        )
+        for index, neighbors in zip(pending, neighbor_lists):
+            decisions[index] = self._vote(items[index][1], neighbors)
+
+        # The LLM names what to investigate; local decisions ask about the requirement itself
+        for (requirement, _), decision in zip(items, decisions):
+            if decision is not None and decision.category == "needs_research":
+                decision.research_questions = [self.research_question(requirement)]
+        return decisions
+
+    @staticmethod
+    def research_question(requirement: Requirement) -> str:
+        """Research question for an item decided ``needs_research`` locally."""
+        return f"What evidence shows how to meet this requirement: {requirement.content}?"
+
+    def _rule(self, solution: Solution) -> PreClassification | None:
+        """Decision from the prompt rules alone, if one applies."""
+        if solution.source == SolutionSource.NOVEL and solution.confidence < self.LOW_CONFIDENCE:
+            return PreClassification(
+                category="needs_research",
+                agreement=1.0,
+                neighbors=0,
+                reason=f"Novel solution with very low confidence ({solution.confidence:.2f})",
+            )
+        return None
+
+    def _vote(
+        self, solution: Solution, neighbors: list[PlanItemNeighbor]
+    ) -> PreClassification | None:
+        """Decision from the weighted vote of an item's neighbours, if confident."""
+        is_repeat = bool(neighbors) and neighbors[0].score >= self.REPEAT_SCORE
+        if len(neighbors) < self.min_neighbors and not is_repeat:
+            return None
+
+        votes: dict[str, float] = defaultdict(float)
+        verification_votes: dict[str, float] = defaultdict(float)
+        for neighbor in neighbors:
+            past = neighbor.item
+            source_match = 1.0 if past.source == solution.source.value else 0.5
+            closeness = 1.0 - min(1.0, abs(past.confidence - solution.confidence))
+            weight = neighbor.score * source_match * closeness
+            votes[past.category] += weight
+            if past.verification_type:
+                verification_votes[f"{past.category}:{past.verification_type}"] += weight
+
+        total = sum(votes.values())
+        if total <= 0:
+            return None
+        category = max(votes, key=votes.get)
+        agreement = votes[category] / total
+        if agreement < self.min_agreement:
+            return None
+        if category == "implemented" and solution.confidence < self.MIN_IMPLEMENTED_CONFIDENCE:
+            return None
+
+        verification_type = None
+        candidates = {k: v for k, v in verification_votes.items() if k.startswith(f"{category}:")}
+        if candidates:
+            verification_type = max(candidates, key=candidates.get).split(":", 1)[1]
+
+        return PreClassification(
+            category=category,
+            agreement=agreement,
+            neighbors=len(neighbors),
+            reason=(
+                f"Pre-classified from {len(neighbors)} similar past items "
+                f"({agreement:.0%} agreement)"
+            ),
+            verification_type=verification_type,
+        )
+
+    def learn(self, items: list[tuple[Requirement, Solution, dict]]) -> None:
+        """
+        Store LLM categorizations for future runs.
+
+        Args:
+            items: (requirement, solution, categorization) triples
+        """
+        self.store.add_items([
+            LabeledPlanItem(
+                text=self.item_text(requirement, solution),
+                category=categorization["category"],
+                confidence=solution.confidence,
+                source=solution.source.value,
+                verification_type=categorization.get("verification_type"),
+            )
+            for requirement, solution, categorization in items
+        ])
@@ -8,7 +8,9 @@ This agent generates implementation plans through a two-iteration process:
 Owner: [ASSIGN TEAMMATE]
 """
 
+import asyncio
 import json
+import re
 from datetime import datetime
 from uuid import UUID
 
@@ -16,18 +18,25 @@ from pydantic import BaseModel
 
 from src.agents.base import BaseAgent
 from src.agents.retriever import RetrieverAgent, RetrieverAgentInput
+from src.config import settings
 from src.models.hypothesis import Hypothesis
-from src.models.requirement import RequirementGraph, Requirement
-from src.models.solution import Solution
+from src.models.requirement import Requirement, RequirementGraph
 from src.models.research_plan import (
-    PreliminaryPlan,
-    PreliminaryPlanStep,
-    InformationGap,
     FinalPlan,
     FinalPlanStep,
+    InformationGap,
+    PreliminaryPlan,
+    PreliminaryPlanStep,
     VerificationCategory,
 )
-
+from src.models.solution import Solution
+from src.utils.context_packing import (
+    PackCandidate,
+    PackedContext,
+    default_tokenizer,
+    pack_context,
+)
+from src.utils.telemetry import tracer
 
 FIRST_ITERATION_PROMPT = """## SYSTEM INSTRUCTION FOR PlanSynthesizerAgent - ITERATION 1: GAP ANALYSIS
 
@@ -238,12 +247,25 @@ class PlanSynthesizerInput(BaseModel):
     solutions: dict[UUID, Solution]
 
 
+class ContextUsage(BaseModel):
+    """Token usage of the packed iteration-one prompt."""
+
+    budget_tokens: int
+    prompt_tokens: int
+    graph_nodes_shown: int
+    graph_nodes_total: int
+    solutions_full: int
+    solutions_digest: int
+    solutions_omitted: int
+
+
 class PlanSynthesizerOutput(BaseModel):
     """Output from the plan synthesizer agent."""
 
     preliminary_plan: PreliminaryPlan
     final_plan: FinalPlan
     plan_markdown: str
+    context_usage: ContextUsage | None = None
 
 
 class PlanSynthesizerAgent(BaseAgent[PlanSynthesizerInput, PlanSynthesizerOutput]):
@@ -257,16 +279,25 @@ class PlanSynthesizerAgent(BaseAgent[PlanSynthesizerInput, PlanSynthesizerOutput
     4. Render PLAN.md with verification markers
     """
 
+    # Gaps whose KB queries share at least this fraction of terms (Jaccard)
+    # are answered by a single retrieval
+    GAP_MERGE_THRESHOLD = 0.85
+
+    # Share of the iteration-one budget available to the requirement graph;
+    # solutions get the rest
+    GRAPH_BUDGET_SHARE = 0.3
+
     def __init__(self):
         super().__init__(
             name="plan_synthesizer",
             instructions=FIRST_ITERATION_PROMPT,
         )
         self.retriever = RetrieverAgent()
-        self._refinement_agent = self.chat_client.create_agent(
+        self._refinement_agent = self.create_agent(
             name="plan_refiner",
             instructions=SECOND_ITERATION_PROMPT,
         )
+        self._tokenizer = default_tokenizer()
 
     async def execute(self, input_data: PlanSynthesizerInput) -> PlanSynthesizerOutput:
         """
@@ -279,7 +310,7 @@ class PlanSynthesizerAgent(BaseAgent[PlanSynthesizerInput, PlanSynthesizerOutput
             PlanSynthesizerOutput with preliminary plan, final plan, and markdown
         """
         # === ITERATION 1: Gap Analysis ===
-        preliminary_plan = await self._iteration_one(
+        preliminary_plan, context_usage = await self._iteration_one(
             input_data.hypothesis,
             input_data.graph,
             input_data.solutions,
@@ -301,6 +332,7 @@ class PlanSynthesizerAgent(BaseAgent[PlanSynthesizerInput, PlanSynthesizerOutput
             preliminary_plan=preliminary_plan,
             final_plan=final_plan,
             plan_markdown=plan_markdown,
+            context_usage=context_usage,
         )
 
     async def _iteration_one(
@@ -308,7 +340,7 @@ class PlanSynthesizerAgent(BaseAgent[PlanSynthesizerInput, PlanSynthesizerOutput
         hypothesis: Hypothesis,
         graph: RequirementGraph,
         solutions: dict[UUID, Solution],
-    ) -> PreliminaryPlan:
+    ) -> tuple[PreliminaryPlan, ContextUsage]:
         """
         First iteration: Analyze what we have vs what we lack.
 
@@ -318,12 +350,14 @@ class PlanSynthesizerAgent(BaseAgent[PlanSynthesizerInput, PlanSynthesizerOutput
             solutions: Map of requirement ID to solution
 
         Returns:
-            PreliminaryPlan with gaps identified
+            PreliminaryPlan with gaps identified, and the prompt's token usage
         """
-        prompt = self._format_iteration_one_input(hypothesis, graph, solutions)
+        with tracer.span("pack:iteration_one", "step") as span:
+            prompt, usage = self._format_iteration_one_input(hypothesis, graph, solutions)
+            span.attributes.update(usage.model_dump())
         result = await self._agent.run(prompt)
         plan_dict = self._parse_json_response(result.text)
-        return self._build_preliminary_plan(plan_dict)
+        return self._build_preliminary_plan(plan_dict), usage
 
     async def _fill_gaps(
         self,
@@ -332,27 +366,72 @@ class PlanSynthesizerAgent(BaseAgent[PlanSynthesizerInput, PlanSynthesizerOutput
         """
         Query KB for each identified gap.
 
+        Gaps with near-identical queries are merged into one retrieval, and
+        up to ``max_concurrent_gap_retrievals`` retrievals run at once, so a
+        long gap list leaves room in the global ``llm_limiter`` budget for
+        other jobs. Results are applied as they arrive.
+
         Args:
             gaps: List of information gaps from preliminary plan
 
         Returns:
             Dict mapping gap ID to retrieved content
         """
-        filled = {}
 
-        for gap in gaps:
-            result = await self.retriever.execute(
-                RetrieverAgentInput(query=gap.query_for_kb, top_k=5)
-            )
+        semaphore = asyncio.Semaphore(settings.max_concurrent_gap_retrievals)
 
+        async def retrieve(group: list[InformationGap]):
+            lead = group[0]
+            async with semaphore:
+                with tracer.node(lead.id):
+                    result = await self.retriever.execute(
+                        RetrieverAgentInput(query=lead.query_for_kb, top_k=5)
+                    )
+            return group, result
+
+        filled = {}
+        groups = self._merge_gap_queries(gaps)
+
+        for next_done in asyncio.as_completed([retrieve(group) for group in groups]):
+            group, result = await next_done
             if result.success and result.chunks:
-                filled[gap.id] = result.chunks
-                gap.filled = True
-                gap.filled_content = result.chunks
-                gap.sources = result.sources
+                for gap in group:
+                    filled[gap.id] = result.chunks
+                    gap.filled = True
+                    gap.filled_content = result.chunks
+                    gap.sources = result.sources
 
         return filled
 
+    def _merge_gap_queries(
+        self,
+        gaps: list[InformationGap],
+    ) -> list[list[InformationGap]]:
+        """
+        Group gaps whose KB queries are near-identical.
+
+        Args:
+            gaps: List of information gaps
+
+        Returns:
+            Groups of gaps, in first-seen order; the first gap of each group
+            supplies the query
+        """
+        groups: list[tuple[set[str], list[InformationGap]]] = []
+
+        for gap in gaps:
+            terms = set(re.findall(r"\w+", gap.query_for_kb.lower()))
+            for group_terms, members in groups:
+                union = terms | group_terms
+                overlap = len(terms & group_terms) / len(union) if union else 1.0
+                if overlap >= self.GAP_MERGE_THRESHOLD:
+                    members.append(gap)
+                    break
+            else:
+                groups.append((terms, [gap]))
+
+        return [members for _, members in groups]
+
     async def _iteration_two(
         self,
         preliminary_plan: PreliminaryPlan,
@@ -380,12 +459,21 @@ class PlanSynthesizerAgent(BaseAgent[PlanSynthesizerInput, PlanSynthesizerOutput
         hypothesis: Hypothesis,
         graph: RequirementGraph,
         solutions: dict[UUID, Solution],
-    ) -> str:
-        """Format the input for iteration one LLM call."""
-        graph_text = self._format_graph(graph)
-        solutions_text = self._format_solutions(graph, solutions)
+    ) -> tuple[str, ContextUsage]:
+        """
+        Format the input for iteration one LLM call.
+
+        The graph outline and solutions are packed into
+        ``settings.synthesis_context_tokens`` so prompt size stays flat as
+        graphs grow.
 
-        return f"""## Problem
+        Returns:
+            The prompt and its token usage
+        """
+        budget = settings.synthesis_context_tokens
+
+        def render(graph_text: str, solutions_text: str) -> str:
+            return f"""## Problem
 {hypothesis.original_text}
 
 {f"Refined: {hypothesis.refined_text}" if hypothesis.refined_text else ""}
@@ -399,6 +487,29 @@ class PlanSynthesizerAgent(BaseAgent[PlanSynthesizerInput, PlanSynthesizerOutput
 Analyze this information and create a preliminary implementation plan with identified gaps.
 Output JSON only."""
 
+        remaining = max(0, budget - self._count_tokens(render("", "")))
+        graph_text, nodes_shown = self._format_graph(
+            graph, int(remaining * self.GRAPH_BUDGET_SHARE)
+        )
+        remaining = max(0, remaining - self._count_tokens(graph_text))
+        solutions_text, packed = self._format_solutions(graph, solutions, remaining)
+        prompt = render(graph_text, solutions_text)
+
+        usage = ContextUsage(
+            budget_tokens=budget,
+            prompt_tokens=self._count_tokens(prompt),
+            graph_nodes_shown=nodes_shown,
+            graph_nodes_total=len(graph.nodes),
+            solutions_full=len(packed.full),
+            solutions_digest=len(packed.digests),
+            solutions_omitted=len(packed.omitted),
+        )
+        return prompt, usage
+
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens in text."""
+        return len(self._tokenizer.encode(text))
+
     def _format_iteration_two_input(
         self,
         preliminary_plan: PreliminaryPlan,
@@ -445,37 +556,108 @@ Refine this plan by:
 
 Output JSON only."""
 
-    def _format_graph(self, graph: RequirementGraph) -> str:
-        """Format requirement graph as readable text."""
+    def _format_graph(
+        self, graph: RequirementGraph, max_tokens: int | None = None
+    ) -> tuple[str, int]:
+        """
+        Format requirement graph as readable text.
+
+        Levels are included from the root down while they fit in
+        ``max_tokens``; deeper subtrees are summarized by a count. Shared
+        nodes are expanded only once.
+
+        Returns:
+            The outline and the number of nodes shown
+        """
+        max_level = graph.max_depth
+        if max_tokens is not None:
+            used = 0
+            for level in sorted(graph.levels):
+                level_tokens = sum(
+                    self._count_tokens(graph.nodes[node_id].content) + 4 + level
+                    for node_id in graph.levels[level]
+                )
+                if level > 0 and used + level_tokens > max_tokens:
+                    max_level = level - 1
+                    break
+                used += level_tokens
+
         lines = []
+        expanded: set[UUID] = set()
 
         def format_node(node: Requirement, indent: int = 0):
             prefix = "  " * indent
+            if node.id in expanded:
+                lines.append(f"{prefix}- [{node.status.value}] {node.content} (shared, see above)")
+                return
+            expanded.add(node.id)
             lines.append(f"{prefix}- [{node.status.value}] {node.content}")
-            for child in graph.get_children(node.id):
+            children = graph.get_children(node.id)
+            if children and node.level >= max_level:
+                lines.append(f"{prefix}  - ... {len(children)} sub-requirements")
+                return
+            for child in children:
                 format_node(child, indent + 1)
 
         root = graph.get_root()
         format_node(root)
-        return "\n".join(lines)
+        return "\n".join(lines), len(expanded)
+
+    def _solution_priority(self, req: Requirement, solution: Solution) -> float:
+        """Rank solutions: closer to the root, more confident and shared first."""
+        return 1.0 / (1 + req.level) + solution.confidence + (0.5 if req.is_shared else 0.0)
 
     def _format_solutions(
         self,
         graph: RequirementGraph,
         solutions: dict[UUID, Solution],
-    ) -> str:
-        """Format solutions as readable text."""
-        lines = []
+        max_tokens: int | None = None,
+    ) -> tuple[str, PackedContext]:
+        """
+        Format solutions as readable text.
+
+        The highest-ranked solutions are shown in full, the rest as one-line
+        digests, and whatever does not fit even as a digest is counted only.
+
+        Returns:
+            The solutions text and the packing result
+        """
+        candidates = []
         for req_id, solution in solutions.items():
             req = graph.get_node(req_id)
             if req:
                 content_preview = solution.content[:500] + "..." if len(solution.content) > 500 else solution.content
-                lines.append(f"""
+                first_sentence = solution.content.split(". ")[0].strip()[:160]
+                candidates.append(PackCandidate(
+                    full=f"""
 Requirement: {req.content}
 Solution ({solution.source.value}, confidence={solution.confidence:.2f}):
 {content_preview}
----""")
-        return "\n".join(lines)
+---""",
+                    digest=(
+                        f"- {req.content[:120]} ({solution.source.value}, "
+                        f"confidence={solution.confidence:.2f}): {first_sentence}"
+                    ),
+                    priority=self._solution_priority(req, solution),
+                ))
+
+        digest_header = "\n### Other Solutions (digests)"
+        omitted_note = "\n({} lower-priority solutions omitted for length)"
+        if max_tokens is None:
+            budget = sum(self._count_tokens(c.full) for c in candidates)
+        else:
+            notes = self._count_tokens(digest_header)
+            notes += self._count_tokens(omitted_note.format(len(candidates)))
+            budget = max(0, max_tokens - notes)
+        packed = pack_context(candidates, budget, self._count_tokens)
+
+        lines = [c.full for c in packed.full]
+        if packed.digests:
+            lines.append(digest_header)
+            lines.extend(c.digest for c in packed.digests)
+        if packed.omitted:
+            lines.append(omitted_note.format(len(packed.omitted)))
+        return "\n".join(lines), packed
 
     def _parse_json_response(self, text: str) -> dict:
         """Parse JSON from LLM response, handling markdown code blocks."""
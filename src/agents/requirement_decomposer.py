@@ -20,9 +20,9 @@ from src.agents.similarity_checker import (
 )
 from src.models.hypothesis import Hypothesis
 from src.models.requirement import Requirement, RequirementGraph
-from src.rag.requirement_store import RequirementStore
-
-client = AsyncOpenAI()
+from src.rag.registry import registry
+from src.utils.concurrency import llm_limiter
+from src.utils.telemetry import tracer
 
 SYSTEM_PROMPT = """You are a Recursive Problem Decomposition Agent.
 
@@ -77,7 +77,8 @@ class RequirementDecomposerAgent(BaseAgent[Hypothesis, RequirementGraph]):
             name="requirement_decomposer",
             instructions=SYSTEM_PROMPT,
         )
-        self.requirement_store = RequirementStore()
+        self.requirement_store = registry.requirement_store()
+        self.client = registry.get("responses_client", AsyncOpenAI)
         self.similarity_checker = SimilarityCheckerAgent()
         self.top_k_candidates = top_k_candidates
         self.similarity_threshold = similarity_threshold
@@ -86,15 +87,15 @@ class RequirementDecomposerAgent(BaseAgent[Hypothesis, RequirementGraph]):
         """
         Execute decomposition with deduplication.
 
+        Each call indexes its requirements under its own session ID, so
+        several decompositions can share the store concurrently.
+
         Args:
             input_data: Hypothesis to decompose
 
         Returns:
             RequirementGraph with hierarchical structure and shared nodes
         """
-        # Clear store for new session
-        self.requirement_store.clear()
-
         root_text = input_data.refined_text or input_data.original_text
         root = Requirement(
             content=root_text.strip().rstrip("?"),
@@ -102,80 +103,87 @@ class RequirementDecomposerAgent(BaseAgent[Hypothesis, RequirementGraph]):
             parent_ids=[],
         )
 
+        # Scope store lookups to this decomposition session
+        session_id = str(root.id)
+
         # Initialize graph
         graph = RequirementGraph(root_id=root.id)
         graph.add_node(root)
 
         # Index root requirement
-        self.requirement_store.add_requirement(root)
+        self.requirement_store.add_requirement(root, session_id=session_id)
 
         async def process_child(
             child_content: str, parent: Requirement
         ) -> Requirement | None:
             """Process a single child: deduplicate or create new node."""
-            child_level = parent.level + 1
-
-            # Search for similar at child_level ONLY (level constraint)
-            candidates = self.requirement_store.find_similar(
-                content=child_content,
-                level=child_level,
-                top_k=self.top_k_candidates,
-                score_threshold=self.similarity_threshold,
-            )
-
-            if candidates:
-                # Use SimilarityCheckerAgent to decide
-                result = await self.similarity_checker.execute(
-                    SimilarityCheckerInput(
-                        new_content=child_content,
-                        candidates=candidates,
+            with tracer.span("dedup", "step"):
+                child_level = parent.level + 1
+
+                # Search for similar at child_level ONLY (level constraint)
+                with tracer.span("search:requirements", "search", level=child_level):
+                    candidates = self.requirement_store.find_similar(
+                        content=child_content,
+                        level=child_level,
+                        top_k=self.top_k_candidates,
+                        score_threshold=self.similarity_threshold,
+                        session_id=session_id,
                     )
-                )
 
-                if result.has_match and result.matched_id:
-                    # Link to existing node (deduplication)
-                    graph.link_existing_child(parent.id, result.matched_id)
-                    print(
-                        f"[DEDUP] Reusing existing node for: "
-                        f"{child_content[:50]}..."
+                if candidates:
+                    # Use SimilarityCheckerAgent to decide
+                    result = await self.similarity_checker.execute(
+                        SimilarityCheckerInput(
+                            new_content=child_content,
+                            candidates=candidates,
+                        )
                     )
-                    print(f"[DEDUP] Reason: {result.reason}")
-                    return None  # Don't recurse - already decomposed
-
-            # No match: create new node
-            child = Requirement(
-                content=child_content.strip(),
-                level=child_level,
-                parent_ids=[parent.id],
-            )
-            graph.add_child(parent.id, child)
-            self.requirement_store.add_requirement(child)
-            return child
+
+                    if result.has_match and result.matched_id:
+                        # Link to existing node (deduplication)
+                        graph.link_existing_child(parent.id, result.matched_id)
+                        print(
+                            f"[DEDUP] Reusing existing node for: "
+                            f"{child_content[:50]}..."
+                        )
+                        print(f"[DEDUP] Reason: {result.reason}")
+                        return None  # Don't recurse - already decomposed
+
+                # No match: create new node
+                child = Requirement(
+                    content=child_content.strip(),
+                    level=child_level,
+                    parent_ids=[parent.id],
+                )
+                graph.add_child(parent.id, child)
+                self.requirement_store.add_requirement(child, session_id=session_id)
+                return child
 
         async def recurse(req: Requirement):
             if req.level >= self.MAX_LEVEL:
                 return
 
-            # Decompose into sub-problems (returns content strings)
-            raw_children = await self.decompose_single(req)
+            with tracer.node(req.id):
+                # Decompose into sub-problems (returns content strings)
+                raw_children = await self.decompose_single(req)
 
-            if not raw_children:
-                return
+                if not raw_children:
+                    return
 
-            # Process all children in parallel
-            children = await asyncio.gather(
-                *[process_child(content, req) for content in raw_children]
-            )
+                # Process all children in parallel
+                children = await asyncio.gather(
+                    *[process_child(content, req) for content in raw_children]
+                )
 
             # Recurse into new children in parallel
             new_children = [c for c in children if c is not None]
             if new_children:
                 await asyncio.gather(*[recurse(child) for child in new_children])
 
-        await recurse(root)
-
-        # Update atomic count
-        graph.get_atomic_requirements()
+        try:
+            await recurse(root)
+        finally:
+            self.requirement_store.clear_session(session_id)
 
         return graph
 
@@ -191,13 +199,21 @@ class RequirementDecomposerAgent(BaseAgent[Hypothesis, RequirementGraph]):
         """
         print(f"Decomposing: {requirement.content}")
 
-        response = await client.responses.create(
-            model="gpt-4o-mini",
-            input=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": requirement.content},
-            ],
-        )
+        with tracer.span(
+            "llm:requirement_decomposer", "llm",
+            model="gpt-4o-mini", node_id=str(requirement.id),
+        ) as span:
+            async with llm_limiter.slot():
+                response = await self.client.responses.create(
+                    model="gpt-4o-mini",
+                    input=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": requirement.content},
+                    ],
+                )
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                span.record_usage(None, usage.input_tokens, usage.output_tokens)
 
         # Extract text from response
         text = response.output_text.strip()
@@ -7,11 +7,13 @@ using query reforming and relevance checking.
 Owner: [ASSIGN TEAMMATE]
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from src.agents.base import BaseAgent
-from src.rag import LiteratureStore
-
+from src.config import settings
+from src.rag import registry
+from src.rag.context_assembly import assemble_context
+from src.utils.context_packing import default_tokenizer
 
 QUERY_REFORM_PROMPT = """You are a query optimization agent.
 
@@ -41,13 +43,19 @@ class RetrieverAgentInput(BaseModel):
 
     query: str
     top_k: int = 5
+    # Return whole parent sections instead of individual chunks
+    parent_sections: bool = Field(default_factory=lambda: settings.retrieval_parent_sections)
+    # Token budget for the assembled context
+    max_tokens: int = Field(default_factory=lambda: settings.retrieval_context_tokens)
+    # Only search these spec domains (None: all, or as routed by the store)
+    domains: list[str] | None = None
 
 
 class RetrieverAgentOutput(BaseModel):
     """Output from the retriever agent."""
 
     success: bool
-    chunks: str  # Concatenated relevant chunks
+    chunks: str  # Assembled context, one "[Source: ...]" line per passage
     sources: list[str]  # Document titles for attribution
 
 
@@ -58,8 +66,9 @@ class RetrieverAgent(BaseAgent[RetrieverAgentInput, RetrieverAgentOutput]):
     Process:
     1. Reform query for optimal vector search
     2. Execute hybrid search via LiteratureStore
-    3. Check relevance of retrieved chunks
-    4. Return concatenated context if relevant
+    3. Assemble the hits into deduplicated, budgeted context
+    4. Check relevance of the context
+    5. Return the context if relevant
     """
 
     def __init__(self):
@@ -67,11 +76,16 @@ class RetrieverAgent(BaseAgent[RetrieverAgentInput, RetrieverAgentOutput]):
             name="retriever",
             instructions=QUERY_REFORM_PROMPT,
         )
-        self.store = LiteratureStore()
-        self._relevance_agent = self.chat_client.create_agent(
+        self.store = registry.literature_store()
+        self._relevance_agent = self.create_agent(
             name="relevance_checker",
             instructions=RELEVANCE_CHECK_PROMPT,
         )
+        self._tokenizer = default_tokenizer()
+
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens in text."""
+        return len(self._tokenizer.encode(text))
 
     async def _reform_query(self, query: str) -> str:
         """Reform the query for better vector search results."""
@@ -82,7 +96,8 @@ class RetrieverAgent(BaseAgent[RetrieverAgentInput, RetrieverAgentOutput]):
         """Check if retrieved chunks are relevant to the query."""
         input_text = f"Query: {query}\n\nChunks:\n{chunks}"
         result = await self._relevance_agent.run(input_text)
-        return "RELEVANT" in result.text.upper()
+        verdict = result.text.upper()
+        return "RELEVANT" in verdict and "NOT_RELEVANT" not in verdict
 
     async def execute(
         self, input_data: RetrieverAgentInput
@@ -100,7 +115,12 @@ class RetrieverAgent(BaseAgent[RetrieverAgentInput, RetrieverAgentOutput]):
         reformed_query = await self._reform_query(input_data.query)
 
         # Step 2: Execute hybrid search
-        results = self.store.search(reformed_query, top_k=input_data.top_k)
+        results = self.store.search(
+            reformed_query,
+            top_k=input_data.top_k,
+            parent_sections=input_data.parent_sections,
+            domains=input_data.domains,
+        )
 
         if not results:
             return RetrieverAgentOutput(
@@ -109,9 +129,10 @@ class RetrieverAgent(BaseAgent[RetrieverAgentInput, RetrieverAgentOutput]):
                 sources=[],
             )
 
-        # Step 3: Concatenate chunks and collect sources
-        chunks_text = "\n\n".join([r.chunk.content for r in results])
-        sources = list(set([r.document_title for r in results]))
+        # Step 3: Merge overlapping hits, drop near-duplicates and fit the budget
+        context = assemble_context(results, input_data.max_tokens, self._count_tokens)
+        chunks_text = context.text
+        sources = context.sources
 
         # Step 4: Check relevance
         is_relevant = await self._check_relevance(input_data.query, chunks_text)
@@ -0,0 +1,7 @@
+"""
+Offline benchmarks.
+
+Run the real orchestration code against deterministic stand-ins for OpenAI,
+the embedding models and Qdrant (in-memory local mode), so orchestration
+overhead can be measured and regressions caught without network access.
+"""
@@ -0,0 +1,229 @@
+"""
+Chunking micro-benchmark on the markdown corpus.
+
+Times ``LiteratureStore._chunk_markdown`` over every markdown file under a
+corpus directory (``data/specs`` by default) and compares it with the
+original chunker, which split on H1 headings and then by 512-token windows
+with 50 tokens of overlap (tokenizing each section twice and decoding every
+window). Besides speed it reports chunk counts, indexed tokens and how many
+chunks start or end in the middle of a line (a cut paragraph, table row or
+code line).
+
+No embeddings are computed and Qdrant runs in memory, so only chunking is
+measured.
+
+Usage:
+    python -m src.benchmarks.chunking_bench
+    python -m src.benchmarks.chunking_bench --corpus data --repeat 10
+    python -m src.benchmarks.chunking_bench --tokenizer word   # offline
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import argparse
+import json
+import re
+import time
+import warnings
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from uuid import NAMESPACE_DNS, uuid5
+
+from qdrant_client import QdrantClient
+from rich.console import Console
+from rich.table import Table
+
+from src.benchmarks.fakes import HashEmbeddingService, HashSparseEmbeddingService, WordTokenizer
+from src.rag.literature_store import Document, LiteratureStore
+
+console = Console()
+
+
+def load_corpus(corpus: Path) -> list[Document]:
+    """Read every markdown file under ``corpus`` as a Document."""
+    documents = []
+    for path in sorted(corpus.rglob("*.md")):
+        content = path.read_text(encoding="utf-8")
+        documents.append(
+            Document(
+                id=uuid5(NAMESPACE_DNS, str(path)),
+                title=path.stem,
+                content=content,
+                source=str(path),
+                metadata={"file_type": "md"},
+            )
+        )
+    return documents
+
+
+def reference_chunks(store: LiteratureStore, document: Document, max_tokens: int = 512,
+                     overlap_tokens: int = 50) -> list[str]:
+    """The original chunker: H1 sections, then token windows decoded back to text."""
+    tokenizer = store._tokenizer
+    sections = re.split(r"(?=^# )", document.content, flags=re.MULTILINE)
+    chunks = []
+    for section in (s.strip() for s in sections if s.strip()):
+        if len(tokenizer.encode(section)) <= max_tokens:
+            chunks.append(section)
+            continue
+        tokens = tokenizer.encode(section)
+        start = 0
+        while start < len(tokens):
+            end = min(start + max_tokens, len(tokens))
+            chunks.append(tokenizer.decode(tokens[start:end]))
+            if end >= len(tokens):
+                break
+            start = end - overlap_tokens
+    return chunks
+
+
+def mid_line_cuts(content: str, chunks: list[str]) -> int:
+    """Chunks that start or end inside a line of ``content`` (or cannot be located in it)."""
+    cuts = 0
+    cursor = 0
+    for chunk in chunks:
+        start = content.find(chunk, cursor)
+        if start < 0:
+            cuts += 1
+            continue
+        end = start + len(chunk)
+        cut_before = start > 0 and content[start - 1] != "\n"
+        cut_after = end < len(content) and content[end] != "\n"
+        if cut_before or cut_after:
+            cuts += 1
+        cursor = start + 1
+    return cuts
+
+
+@dataclass
+class ChunkingResult:
+    """Timings and chunk statistics for one chunker over the whole corpus."""
+
+    chunker: str
+    documents: int
+    megabytes: float
+    chunks: int
+    cold_seconds: float
+    best_seconds: float
+    indexed_tokens: int = 0
+    max_chunk_tokens: int = 0
+    mid_line_cuts: int = 0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.megabytes / self.best_seconds if self.best_seconds else 0.0
+
+
+def time_chunker(
+    name: str, chunk, documents: list[Document], repeat: int, count_tokens
+) -> ChunkingResult:
+    """Run ``chunk`` over all documents ``repeat`` times; the first run is reported as cold."""
+    timings = []
+    output = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = [chunk(document) for document in documents]
+        timings.append(time.perf_counter() - start)
+
+    megabytes = sum(len(d.content.encode("utf-8")) for d in documents) / 1_000_000
+    tokens = [count_tokens(c) for chunks in output for c in chunks]
+    return ChunkingResult(
+        chunker=name,
+        documents=len(documents),
+        megabytes=megabytes,
+        chunks=len(tokens),
+        cold_seconds=timings[0],
+        best_seconds=min(timings),
+        indexed_tokens=sum(tokens),
+        max_chunk_tokens=max(tokens, default=0),
+        mid_line_cuts=sum(mid_line_cuts(d.content, chunks) for d, chunks in zip(documents, output)),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chunking micro-benchmark on the markdown corpus")
+    parser.add_argument(
+        "--corpus", default="data/specs", help="Directory of markdown files (default: data/specs)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per chunker (default: 5)")
+    parser.add_argument("--tokenizer", choices=["cl100k", "word"], default="cl100k",
+                        help="cl100k_base (tiktoken) or the offline whitespace tokenizer")
+    parser.add_argument("--output", default="outputs/benchmarks/chunking.json",
+                        help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    if args.tokenizer == "cl100k":
+        import tiktoken
+
+        tokenizer = tiktoken.get_encoding("cl100k_base")
+    else:
+        tokenizer = WordTokenizer()
+
+    warnings.filterwarnings("ignore", message="Payload indexes have no effect")
+    documents = load_corpus(Path(args.corpus))
+    if not documents:
+        console.print(f"[red]No markdown files under {args.corpus}[/red]")
+        raise SystemExit(1)
+
+    store = LiteratureStore(
+        client=QdrantClient(":memory:"),
+        dense_embeddings=HashEmbeddingService(),
+        sparse_embeddings=HashSparseEmbeddingService(),
+        tokenizer=tokenizer,
+    )
+    reference = time_chunker(
+        "h1-windows",
+        lambda d: reference_chunks(store, d),
+        documents,
+        args.repeat,
+        store._count_tokens,
+    )
+    current = time_chunker(
+        "structure",
+        lambda d: [c.content for c in store._chunk_markdown(d)],
+        documents,
+        args.repeat,
+        store._count_tokens,
+    )
+
+    table = Table(title=f"Chunking Benchmark ({args.corpus}, {args.tokenizer})")
+    for column in (
+        "Chunker",
+        "Docs",
+        "MB",
+        "Chunks",
+        "Tokens",
+        "Max",
+        "Cuts",
+        "Cold s",
+        "Best s",
+        "MB/s",
+    ):
+        table.add_column(column, justify="right")
+    for r in (reference, current):
+        table.add_row(
+            r.chunker, str(r.documents), f"{r.megabytes:.2f}", str(r.chunks), str(r.indexed_tokens),
+            str(r.max_chunk_tokens), str(r.mid_line_cuts), f"{r.cold_seconds:.3f}",
+            f"{r.best_seconds:.3f}", f"{r.megabytes_per_second:.1f}",
+        )
+    console.print(table)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(
+            {
+                "config": vars(args),
+                "results": [
+                    {**asdict(r), "megabytes_per_second": r.megabytes_per_second}
+                    for r in (reference, current)
+                ],
+            },
+            f,
+            indent=2,
+        )
+    console.print(f"[green]✓ Report saved to {output}[/green]")
+
+
+if __name__ == "__main__":
+    main()
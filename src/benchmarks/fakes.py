@@ -0,0 +1,296 @@
+"""
+Deterministic offline stand-ins for OpenAI and the embedding models.
+
+Every fake is keyed on the content it receives (never on call order), so a
+run produces the same graph, the same plan and the same per-call latencies
+regardless of how the scheduler interleaves calls.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+from qdrant_client.models import SparseVector
+
+from src.utils.telemetry import tracer
+
+
+def stable_hash(*parts: str) -> int:
+    """64-bit hash of the given strings that is stable across processes."""
+    digest = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+# ----------------------------------------------------------------------
+# Latency
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class LatencyModel:
+    """
+    Per-call latency distribution.
+
+    Specs (seconds):
+        ``zero``                      no delay
+        ``constant:0.2``              fixed delay
+        ``uniform:0.1:0.5``           uniform between low and high
+        ``lognormal:0.8:0.5``         lognormal with the given median and sigma
+    """
+
+    kind: str = "zero"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        """Build a latency model from a ``kind:arg:arg`` spec."""
+        kind, *args = spec.split(":")
+        values = [float(x) for x in args] + [0.0, 0.0]
+        if kind not in ("zero", "constant", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        return cls(kind=kind, a=values[0], b=values[1])
+
+    def sample(self, key: str) -> float:
+        """Draw a latency for a call, seeded by the call content."""
+        if self.kind == "zero":
+            return 0.0
+        if self.kind == "constant":
+            return self.a
+        rng = random.Random(stable_hash(key))
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        return self.a * math.exp(self.b * rng.gauss(0.0, 1.0))
+
+    def __str__(self) -> str:
+        if self.kind == "zero":
+            return "zero"
+        if self.kind == "constant":
+            return f"constant:{self.a}"
+        return f"{self.kind}:{self.a}:{self.b}"
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+# ----------------------------------------------------------------------
+# Chat (Microsoft Agent Framework) fakes
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class FakeUsage:
+    """Mirrors the framework's usage details."""
+
+    input_token_count: int
+    output_token_count: int
+
+
+@dataclass
+class FakeRunResult:
+    """Mirrors the framework's agent run response."""
+
+    text: str
+    usage_details: FakeUsage
+
+
+Responder = Callable[[str], str]
+
+
+class FakeAgent:
+    """Agent whose reply is computed from the message by a responder."""
+
+    def __init__(self, name: str, responder: Responder, latency: LatencyModel):
+        self.name = name
+        self._responder = responder
+        self._latency = latency
+
+    async def run(self, message: str, **kwargs) -> FakeRunResult:
+        delay = self._latency.sample(f"{self.name}\x1f{message}")
+        if delay:
+            await asyncio.sleep(delay)
+        text = self._responder(message)
+        return FakeRunResult(
+            text=text,
+            usage_details=FakeUsage(_approx_tokens(message), _approx_tokens(text)),
+        )
+
+
+class FakeChatClient:
+    """
+    Drop-in for ``OpenAIChatClient`` that builds agents with canned replies.
+
+    Replies are chosen by agent name; unknown agents echo a short answer.
+    """
+
+    def __init__(
+        self,
+        responders: dict[str, Responder],
+        latency: LatencyModel | None = None,
+        model_id: str = "fake-chat",
+    ):
+        self.responders = responders
+        self.latency = latency or LatencyModel()
+        self.model_id = model_id
+
+    def create_agent(self, name: str, instructions: str, **kwargs) -> FakeAgent:
+        responder = self.responders.get(name)
+        if responder is None:
+            prefix = re.sub(r"_\d+$", "", name)
+            responder = self.responders.get(prefix, lambda message: f"[{name}] ok")
+        return FakeAgent(name, responder, self.latency)
+
+
+@dataclass
+class FakeResponsesUsage:
+    input_tokens: int
+    output_tokens: int
+
+
+@dataclass
+class FakeResponse:
+    output_text: str
+    usage: FakeResponsesUsage
+
+
+class _FakeResponses:
+    def __init__(self, owner: "FakeResponsesClient"):
+        self._owner = owner
+
+    async def create(self, model: str, input: list[dict], **kwargs) -> FakeResponse:
+        user_text = next(m["content"] for m in input if m["role"] == "user")
+        delay = self._owner.latency.sample(f"responses\x1f{user_text}")
+        if delay:
+            await asyncio.sleep(delay)
+        text = self._owner.responder(user_text)
+        return FakeResponse(
+            output_text=text,
+            usage=FakeResponsesUsage(
+                sum(_approx_tokens(m["content"]) for m in input), _approx_tokens(text)
+            ),
+        )
+
+
+class FakeResponsesClient:
+    """Drop-in for ``AsyncOpenAI`` exposing ``responses.create`` only."""
+
+    def __init__(self, responder: Responder, latency: LatencyModel | None = None):
+        self.responder = responder
+        self.latency = latency or LatencyModel()
+        self.responses = _FakeResponses(self)
+
+
+# ----------------------------------------------------------------------
+# Embedding fakes
+# ----------------------------------------------------------------------
+
+
+class HashEmbeddingService:
+    """
+    Deterministic dense embeddings: a unit Gaussian vector seeded by the text.
+
+    Identical texts embed identically (cosine 1.0); distinct texts are close to
+    orthogonal, so deduplication only fires on exact duplicates.
+    """
+
+    def __init__(self, dimension: int = 256, latency: LatencyModel | None = None):
+        self.model = "hash-embedding"
+        self.dimension = dimension
+        self.latency = latency or LatencyModel()
+
+    def _vector(self, text: str) -> list[float]:
+        rng = np.random.default_rng(stable_hash(text))
+        vector = rng.standard_normal(self.dimension).astype(np.float32)
+        vector /= np.linalg.norm(vector)
+        return vector.tolist()
+
+    def _wait(self, key: str) -> None:
+        # Blocking on purpose: the real client is synchronous too
+        delay = self.latency.sample(key)
+        if delay:
+            time.sleep(delay)
+
+    def embed(self, text: str) -> list[float]:
+        with tracer.span("embed:dense", "embedding", model=self.model, batch_size=1) as span:
+            self._wait(text)
+            span.record_usage(None, _approx_tokens(text), 0)
+        return self._vector(text)
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        with tracer.span(
+            "embed:dense", "embedding", model=self.model, batch_size=len(texts)
+        ) as span:
+            self._wait(texts[0])
+            span.record_usage(None, sum(_approx_tokens(t) for t in texts), 0)
+        return [self._vector(text) for text in texts]
+
+
+class HashSparseEmbeddingService:
+    """Term-frequency sparse vectors over hashed lower-cased words."""
+
+    _WORD = re.compile(r"\w+")
+
+    def embed(self, text: str) -> SparseVector:
+        counts: dict[int, float] = {}
+        for word in self._WORD.findall(text.lower()):
+            index = zlib.crc32(word.encode("utf-8")) & 0xFFFFF
+            counts[index] = counts.get(index, 0.0) + 1.0
+        indices = sorted(counts)
+        return SparseVector(indices=indices, values=[counts[i] for i in indices])
+
+    def embed_batch(self, texts: list[str]) -> list[SparseVector]:
+        return [self.embed(text) for text in texts]
+
+    def query_embed(self, text: str) -> SparseVector:
+        return self.embed(text)
+
+
+class WordTokenizer:
+    """
+    Whitespace tokenizer with the tiktoken surface the stores use.
+
+    A token is a word with its leading whitespace, so tokens concatenate back
+    to the exact text, as BPE tokens do.
+    """
+
+    PIECE = re.compile(r"\s*\S+|\s+")
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._words: list[str] = []
+
+    def encode(self, text: str) -> list[int]:
+        tokens = []
+        for word in self.PIECE.findall(text):
+            if word not in self._ids:
+                self._ids[word] = len(self._words)
+                self._words.append(word)
+            tokens.append(self._ids[word])
+        return tokens
+
+    def encode_ordinary_batch(self, texts: list[str], num_threads: int = 8) -> list[list[int]]:
+        return [self.encode(text) for text in texts]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(self._words[t] for t in tokens)
+
+    def decode_single_token_bytes(self, token: int) -> bytes:
+        return self._words[token].encode("utf-8")
+
+
+def canned_json(data: dict) -> str:
+    """Serialize a canned reply the way models usually return it."""
+    return f"```json\n{json.dumps(data)}\n```"
@@ -0,0 +1,207 @@
+"""
+RequirementGraph micro-benchmark on synthetic graphs.
+
+Builds graphs with the level shapes of ``workflow_bench`` (up to 10^5 nodes
+and more), links a fraction of the leaves to a second parent as
+deduplication does, and times the operations the workflow performs:
+
+- building the graph (``add_child`` / ``link_existing_child`` per event)
+- listing the atomic and the unsolved atomic requirements
+- marking every leaf solved (``set_status`` per event)
+- the topological order, cold and cached
+- reading every node's children and degrees
+
+Atomic and unsolved listings are compared with the original full scans of
+``nodes`` and ``children_map``. No LLM, embeddings or Qdrant are involved.
+
+Usage:
+    python -m src.benchmarks.graph_bench
+    python -m src.benchmarks.graph_bench --nodes 1000 10000 100000 --shared 0.2
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import argparse
+import json
+import random
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from uuid import UUID, uuid4
+
+from rich.console import Console
+from rich.table import Table
+
+from src.benchmarks.workflow_bench import GraphShape
+from src.models.requirement import Requirement, RequirementGraph, RequirementStatus
+
+console = Console()
+
+
+def build_graph(shape: GraphShape, shared: float, seed: int = 0) -> tuple[RequirementGraph, int]:
+    """
+    Build a graph of ``shape``; returns it and the number of graph events.
+
+    A ``shared`` fraction of the deepest level is also linked to a random
+    node of the level above, which makes those leaves shared.
+    """
+    rng = random.Random(seed)
+    root = Requirement(content="root")
+    graph = RequirementGraph(root_id=root.id)
+    graph.add_node(root)
+    events = 1
+
+    ids = [[root.id]]
+    for level in range(shape.depth):
+        next_ids: list[UUID] = [uuid4() for _ in range(shape.level_sizes[level + 1])]
+        for index, parent_id in enumerate(ids[level]):
+            for child in shape.children(level, index):
+                requirement = Requirement(
+                    id=next_ids[child], content=f"L{level + 1}#{child}", level=level + 1
+                )
+                graph.add_child(parent_id, requirement)
+                events += 1
+        ids.append(next_ids)
+
+    if shape.depth:
+        for child_id in rng.sample(ids[-1], int(shared * len(ids[-1]))):
+            graph.link_existing_child(rng.choice(ids[-2]), child_id)
+            events += 1
+    return graph, events
+
+
+def scan_atomic(graph: RequirementGraph) -> list[Requirement]:
+    """The original atomic listing: every node whose children list is empty."""
+    return [node for node in graph.nodes.values() if not graph.children_map.get(node.id, [])]
+
+
+def scan_unsolved(graph: RequirementGraph) -> list[Requirement]:
+    """The original unsolved listing: a full atomic scan filtered by status."""
+    return [req for req in scan_atomic(graph) if req.status != RequirementStatus.SOLVED]
+
+
+def best_of(repeat: int, operation) -> float:
+    """Best wall time in seconds of ``repeat`` runs of ``operation``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+@dataclass
+class GraphResult:
+    """Timings for one synthetic graph (seconds unless noted)."""
+
+    nodes: int
+    leaves: int
+    shared: int
+    events: int
+    build_seconds: float
+    build_us_per_event: float
+    atomic_indexed: float
+    atomic_scan: float
+    unsolved_indexed: float
+    unsolved_scan: float
+    set_status_us_per_event: float
+    topological_cold: float
+    topological_cached: float
+    adjacency_seconds: float
+
+
+def run_graph(nodes: int, depth: int, shared: float, repeat: int) -> GraphResult:
+    """Build one graph and time its operations."""
+    shape = GraphShape.for_nodes(nodes, depth=depth)
+    start = time.perf_counter()
+    graph, events = build_graph(shape, shared)
+    build = time.perf_counter() - start
+
+    leaves = graph.get_atomic_requirements()
+    assert len(leaves) == len(scan_atomic(graph)) == graph.atomic_count
+
+    # Solve half the leaves so the unsolved listings filter something
+    for leaf in leaves[::2]:
+        graph.set_status(leaf.id, RequirementStatus.SOLVED)
+    assert len(graph.get_unsolved_atomic()) == len(scan_unsolved(graph))
+    atomic_indexed = best_of(repeat, graph.get_atomic_requirements)
+    atomic_scan = best_of(repeat, lambda: scan_atomic(graph))
+    unsolved_indexed = best_of(repeat, graph.get_unsolved_atomic)
+    unsolved_scan = best_of(repeat, lambda: scan_unsolved(graph))
+
+    start = time.perf_counter()
+    for leaf in leaves:
+        graph.set_status(leaf.id, RequirementStatus.SOLVED)
+    set_status = time.perf_counter() - start
+
+    start = time.perf_counter()
+    order = graph.topological_order()
+    topological_cold = time.perf_counter() - start
+    assert len(order) == len(graph.nodes)
+    topological_cached = best_of(repeat, graph.topological_order)
+
+    def read_adjacency():
+        for node_id in order:
+            graph.get_children(node_id)
+            graph.in_degree(node_id)
+            graph.out_degree(node_id)
+
+    adjacency = best_of(repeat, read_adjacency)
+
+    return GraphResult(
+        nodes=graph.total_nodes,
+        leaves=len(leaves),
+        shared=graph.shared_count,
+        events=events,
+        build_seconds=build,
+        build_us_per_event=build / events * 1e6,
+        atomic_indexed=atomic_indexed,
+        atomic_scan=atomic_scan,
+        unsolved_indexed=unsolved_indexed,
+        unsolved_scan=unsolved_scan,
+        set_status_us_per_event=set_status / max(1, len(leaves)) * 1e6,
+        topological_cold=topological_cold,
+        topological_cached=topological_cached,
+        adjacency_seconds=adjacency,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="RequirementGraph micro-benchmark on synthetic graphs")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Graph sizes (default: 1000 10000 100000)")
+    parser.add_argument("--depth", type=int, default=3, help="Levels below the root (default: 3)")
+    parser.add_argument("--shared", type=float, default=0.1,
+                        help="Fraction of leaves linked to a second parent (default: 0.1)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per timed listing (default: 5)")
+    parser.add_argument("--output", default="outputs/benchmarks/graph.json",
+                        help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    results = [run_graph(nodes, args.depth, args.shared, args.repeat) for nodes in args.nodes]
+
+    title = f"RequirementGraph Benchmark (depth {args.depth}, {args.shared:.0%} shared)"
+    table = Table(title=title)
+    for column in ("Nodes", "Leaves", "Build µs", "Atomic ms", "(scan)", "Unsolved ms", "(scan)",
+                   "Status µs", "Topo ms", "(cached)", "Adj. ms"):
+        table.add_column(column, justify="right")
+    for r in results:
+        table.add_row(
+            str(r.nodes), str(r.leaves), f"{r.build_us_per_event:.1f}",
+            f"{r.atomic_indexed * 1000:.2f}", f"{r.atomic_scan * 1000:.2f}",
+            f"{r.unsolved_indexed * 1000:.2f}", f"{r.unsolved_scan * 1000:.2f}",
+            f"{r.set_status_us_per_event:.2f}", f"{r.topological_cold * 1000:.1f}",
+            f"{r.topological_cached * 1000:.3f}", f"{r.adjacency_seconds * 1000:.1f}",
+        )
+    console.print(table)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"config": vars(args), "results": [asdict(r) for r in results]}, f, indent=2)
+    console.print(f"[green]✓ Report saved to {output}[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,608 @@
+"""
+End-to-end workflow benchmark on synthetic requirement graphs.
+
+Runs synthetic hypotheses through the full ResearchWorkflow with fake chat
+clients, hash embeddings and an in-memory Qdrant, then reports wall time,
+peak memory, calls per phase and scheduler efficiency (critical path / wall
+time, where the critical path is the longest chain of dependent calls
+measured from telemetry spans).
+
+Qdrant runs in local (in-memory) mode, which evaluates payload filters in
+Python: the level-filtered dedup search is O(n) per query, so beyond a few
+thousand nodes decomposition time is dominated by the stand-in itself. It is
+reported under the ``search`` spans rather than hidden.
+
+Usage:
+    python -m src.benchmarks.workflow_bench
+    python -m src.benchmarks.workflow_bench --nodes 10 100 1000 10000
+    python -m src.benchmarks.workflow_bench --latency lognormal:0.05:0.5 --max-llm-calls 64
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import re
+import resource
+import time
+import tracemalloc
+import warnings
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from uuid import NAMESPACE_DNS, uuid5
+
+from qdrant_client import QdrantClient
+from rich.console import Console
+from rich.table import Table
+
+from src.benchmarks.fakes import (
+    FakeChatClient,
+    FakeResponsesClient,
+    HashEmbeddingService,
+    HashSparseEmbeddingService,
+    LatencyModel,
+    WordTokenizer,
+    canned_json,
+    stable_hash,
+)
+from src.models.requirement import RequirementGraph
+from src.rag.literature_store import Document, LiteratureStore
+from src.rag.registry import registry
+from src.rag.requirement_store import RequirementStore
+from src.utils.concurrency import llm_limiter
+from src.utils.telemetry import Span, tracer
+
+console = Console()
+
+TOPICS = [
+    "radiation", "shielding", "dosimetry", "habitat", "regolith", "thermal",
+    "power", "oxygen", "water", "propulsion", "landing", "communication",
+    "polyethylene", "aluminium", "solar", "particle", "crew", "exposure",
+    "structure", "pressure", "greenhouse", "battery", "nuclear", "dust",
+]
+LABEL = re.compile(r"\[L(\d+)#(\d+)\]")
+
+
+# ----------------------------------------------------------------------
+# Synthetic graph
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class GraphShape:
+    """Number of nodes per level of a synthetic requirement graph."""
+
+    level_sizes: list[int]
+
+    @classmethod
+    def for_nodes(cls, nodes: int, depth: int = 3) -> "GraphShape":
+        """
+        Build a shape with exactly ``nodes`` nodes and at most ``depth`` levels below the root.
+
+        Branching is the smallest integer that reaches the target; the last
+        level is truncated so the total matches.
+        """
+        nodes = max(1, nodes)
+        branching = 2
+        while sum(branching ** level for level in range(depth + 1)) < nodes:
+            branching += 1
+
+        sizes = [1]
+        remaining = nodes - 1
+        while remaining > 0 and len(sizes) <= depth:
+            size = min(sizes[-1] * branching, remaining)
+            sizes.append(size)
+            remaining -= size
+        return cls(level_sizes=sizes)
+
+    @property
+    def depth(self) -> int:
+        return len(self.level_sizes) - 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.level_sizes)
+
+    def children(self, level: int, index: int) -> range:
+        """Indices (at ``level + 1``) of the children of node ``index``."""
+        if level + 1 >= len(self.level_sizes):
+            return range(0)
+        parents, kids = self.level_sizes[level], self.level_sizes[level + 1]
+        per_parent, extra = divmod(kids, parents)
+        start = index * per_parent + min(index, extra)
+        count = per_parent + (1 if index < extra else 0)
+        return range(start, start + count)
+
+
+def node_text(level: int, index: int) -> str:
+    """Deterministic requirement text for a node."""
+    seed = stable_hash("node", str(level), str(index))
+    words = [TOPICS[(seed >> (5 * i)) % len(TOPICS)] for i in range(4)]
+    return (
+        f"[L{level}#{index}] How should the mission address {' '.join(words)} "
+        f"for subsystem {level}.{index}"
+    )
+
+
+def parse_label(text: str) -> tuple[int, int] | None:
+    match = LABEL.search(text)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+# ----------------------------------------------------------------------
+# Canned responders
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class BenchmarkConfig:
+    """Knobs for a benchmark run."""
+
+    depth: int = 3
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    embedding_latency: LatencyModel = field(default_factory=LatencyModel)
+    max_llm_calls: int = 64
+    shared_ratio: float = 0.0  # Fraction of children that duplicate a sibling
+    relevant_ratio: float = 0.5  # Fraction of retrievals judged relevant
+    plan_steps: int = 6
+    plan_gaps: int = 4
+    solution_words: int = 120
+    corpus_documents: int = 50
+    embedding_dimension: int = 256
+    combination_delay: float = 0.0  # AggregatorAgent.COMBINATION_DELAY
+    trace_memory: bool = False
+    verbose: bool = False
+
+
+def build_responders(shape: GraphShape, config: BenchmarkConfig) -> dict:
+    """Canned replies for every agent in the workflow, keyed by agent name."""
+
+    def filler(seed_text: str, words: int) -> str:
+        seed = stable_hash(seed_text)
+        return " ".join(TOPICS[(seed + i * 7) % len(TOPICS)] for i in range(words))
+
+    def similarity(message: str) -> str:
+        new = message.split("NEW: ", 1)[1].split("\n", 1)[0].strip()
+        existing = re.findall(r"^(\d+)\. (.*)$", message.split("EXISTING:", 1)[1], re.MULTILINE)
+        for index, text in existing:
+            if text.strip() == new:
+                return json.dumps({"reason": "Identical wording.", "match_index": int(index)})
+        return json.dumps({"reason": "No candidate asks the same question.", "match_index": -1})
+
+    def relevance(message: str) -> str:
+        query = message.split("\n", 1)[0]
+        relevant = stable_hash("relevance", query) % 1000 < config.relevant_ratio * 1000
+        return "RELEVANT" if relevant else "NOT_RELEVANT"
+
+    def proposer(message: str) -> str:
+        problem = message.rsplit("Problem: ", 1)[-1].strip()
+        return f"Proposed solution for {problem}: {filler(problem, config.solution_words)}"
+
+    def aggregator(message: str) -> str:
+        if "Which solution satisfies the problem the best?" in message:
+            return "0"
+        if "What important aspects of the problem are NOT addressed" in message:
+            return "NONE"
+        problem = message.split("Problem: ", 1)[-1].split("\n", 1)[0]
+        return f"Combined solution for {problem}: {filler(problem, config.solution_words)}"
+
+    def synthesizer(message: str) -> str:
+        steps = [
+            {
+                "step_number": i + 1,
+                "name": f"Step {i + 1}",
+                "description": filler(f"step{i}", 12),
+                "what_we_have": filler(f"have{i}", 8),
+                "what_we_lack": [filler(f"lack{i}", 6)],
+                "preliminary_approach": filler(f"approach{i}", 10),
+                "dependencies": [i] if i else [],
+                "confidence": 0.6,
+            }
+            for i in range(config.plan_steps)
+        ]
+        gaps = [
+            {
+                "description": f"Gap {i + 1}: {filler(f'gap{i}', 8)}",
+                "query_for_kb": filler(f"query{i}", 6),
+                "related_step_ids": [i % max(1, config.plan_steps) + 1],
+            }
+            for i in range(config.plan_gaps)
+        ]
+        return canned_json({
+            "problem_summary": "Synthetic benchmark problem",
+            "available_knowledge_summary": filler("knowledge", 20),
+            "steps": steps,
+            "gaps": gaps,
+            "overall_confidence": 0.6,
+        })
+
+    def refiner(message: str) -> str:
+        names = re.findall(r"^### Step (\d+): (.*)$", message, re.MULTILINE)
+        steps = [
+            {
+                "step_number": int(number),
+                "name": name,
+                "description": filler(name, 12),
+                "detailed_approach": filler(f"detail{number}", 16),
+                "expected_output": filler(f"output{number}", 6),
+                "dependencies": [],
+                "verification_category": (
+                    "information_complete" if int(number) % 2 else "requires_simulation"
+                ),
+                "verification_details": filler(f"verify{number}", 8),
+                "estimated_effort": "2 weeks",
+                "knowledge_sources": [],
+                "confidence": 0.7,
+            }
+            for number, name in names
+        ]
+        return canned_json(
+            {
+                "problem_statement": "Synthetic benchmark problem",
+                "hypothesis_refined": "Synthetic benchmark hypothesis",
+                "executive_summary": filler("summary", 30),
+                "steps": steps,
+                "total_steps": len(steps),
+                "steps_information_complete": sum(
+                    1 for s in steps if s["verification_category"] == "information_complete"
+                ),
+                "steps_requiring_verification": sum(
+                    1 for s in steps if s["verification_category"] != "information_complete"
+                ),
+                "remaining_gaps": [],
+                "overall_feasibility": "Feasible",
+                "key_risks": [filler("risk", 6)],
+                "recommended_next_actions": [filler("action", 6)],
+            }
+        )
+
+    return {
+        "similarity_checker": similarity,
+        "retriever": lambda message: message.strip(),
+        "relevance_checker": relevance,
+        "proposer": proposer,
+        "aggregator": aggregator,
+        "plan_synthesizer": synthesizer,
+        "plan_refiner": refiner,
+    }
+
+
+def build_decomposer_responder(shape: GraphShape, config: BenchmarkConfig):
+    """Canned ``{"sub_problems": [...]}`` replies that grow the target shape."""
+
+    def decompose(text: str) -> str:
+        label = parse_label(text)
+        if label is None:
+            return json.dumps({"sub_problems": []})
+        level, index = label
+        children = []
+        for child in shape.children(level, index):
+            duplicate = (
+                child > 0
+                and stable_hash("share", str(level), str(child)) % 1000 < config.shared_ratio * 1000
+            )
+            children.append(node_text(level + 1, child - 1 if duplicate else child))
+        return json.dumps({"sub_problems": children})
+
+    return decompose
+
+
+# ----------------------------------------------------------------------
+# Environment
+# ----------------------------------------------------------------------
+
+
+def install_fakes(shape: GraphShape, config: BenchmarkConfig) -> None:
+    """Register fake clients and in-memory stores in the resource registry."""
+    registry.clear()
+    # Local mode ignores payload indexes and warns about it on every store
+    warnings.filterwarnings("ignore", message="Payload indexes have no effect")
+    registry.register(
+        "chat_client",
+        FakeChatClient(build_responders(shape, config), latency=config.latency),
+    )
+    registry.register(
+        "responses_client",
+        FakeResponsesClient(build_decomposer_responder(shape, config), latency=config.latency),
+    )
+    registry.register("tokenizer", WordTokenizer())
+
+    dense = HashEmbeddingService(config.embedding_dimension, latency=config.embedding_latency)
+    sparse = HashSparseEmbeddingService()
+    literature = LiteratureStore(
+        client=QdrantClient(":memory:"),
+        dense_embeddings=dense,
+        sparse_embeddings=sparse,
+        tokenizer=registry.get("tokenizer", WordTokenizer),
+    )
+    for i in range(config.corpus_documents):
+        seed = stable_hash("doc", str(i))
+        words = " ".join(TOPICS[(seed + j * 11) % len(TOPICS)] for j in range(300))
+        literature.ingest_document(
+            Document(
+                id=uuid5(NAMESPACE_DNS, f"benchmark-doc-{i}"),
+                title=f"Synthetic document {i}",
+                content=f"# Synthetic document {i}\n\n{words}",
+                source=f"synthetic/{i}.md",
+                metadata={"file_type": "md"},
+            )
+        )
+    registry.register("literature_store", literature)
+    registry.register(
+        "requirement_store",
+        RequirementStore(client=QdrantClient(":memory:"), embeddings=dense),
+    )
+
+
+# ----------------------------------------------------------------------
+# Critical path
+# ----------------------------------------------------------------------
+
+
+def _top_level_spans(spans: list[Span]) -> list[Span]:
+    """Call/step spans whose parent is a phase (nested calls are already inside them)."""
+    phase_ids = {s.span_id for s in spans if s.kind == "phase"}
+    return [s for s in spans if s.kind != "phase" and s.parent_id in phase_ids]
+
+
+def critical_path_seconds(spans: list[Span], graph: RequirementGraph | None) -> dict[str, float]:
+    """
+    Estimate the critical path of each phase from telemetry spans.
+
+    - decomposition: per node, decompose call + slowest child dedup, chained
+      down the graph
+    - solving: per node, all of its (sequential) calls, chained up the graph
+    - other phases: untagged calls run in sequence; calls tagged with a node
+      (e.g. gap lookups) are independent, so only the slowest group counts
+    """
+    by_phase: dict[str, list[Span]] = {}
+    for span in _top_level_spans(spans):
+        by_phase.setdefault(span.phase or "unscoped", []).append(span)
+
+    result: dict[str, float] = {}
+    for phase, phase_spans in by_phase.items():
+        untagged = sum(s.duration_us for s in phase_spans if not s.node_id)
+        groups: dict[str, list[Span]] = {}
+        for span in phase_spans:
+            if span.node_id:
+                groups.setdefault(span.node_id, []).append(span)
+
+        if phase in ("decomposition", "solving") and graph is not None:
+            cost: dict[str, float] = {}
+            for node_id, group in groups.items():
+                if phase == "decomposition":
+                    own = sum(s.duration_us for s in group if s.kind != "step")
+                    steps = [s.duration_us for s in group if s.kind == "step"]
+                    cost[node_id] = own + (max(steps) if steps else 0.0)
+                else:
+                    cost[node_id] = sum(s.duration_us for s in group)
+
+            longest: dict = {}
+            for node_id in reversed(graph.topological_order()):  # Children first
+                longest[node_id] = cost.get(str(node_id), 0.0) + max(
+                    (longest[c] for c in graph.children_map.get(node_id, ())), default=0.0
+                )
+            path = longest[graph.root_id]
+        else:
+            path = max((sum(s.duration_us for s in g) for g in groups.values()), default=0.0)
+
+        result[phase] = (untagged + path) / 1_000_000
+    return result
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for one synthetic graph."""
+
+    target_nodes: int
+    nodes: int
+    depth: int
+    shared_nodes: int
+    wall_seconds: float
+    peak_memory_mb: float
+    memory_source: str
+    calls_by_phase: dict[str, dict[str, int]]
+    llm_calls: int
+    work_seconds: float
+    critical_path_seconds: float
+    critical_path_by_phase: dict[str, float]
+    plan_steps: int
+
+    @property
+    def scheduler_efficiency(self) -> float:
+        """Critical path over wall time (1.0 = no avoidable waiting)."""
+        return self.critical_path_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def parallelism(self) -> float:
+        """Average number of calls in flight."""
+        return self.work_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["scheduler_efficiency"] = round(self.scheduler_efficiency, 4)
+        data["parallelism"] = round(self.parallelism, 3)
+        return data
+
+
+async def run_benchmark(nodes: int, config: BenchmarkConfig) -> BenchmarkResult:
+    """
+    Run one synthetic hypothesis through the full workflow.
+
+    Args:
+        nodes: Target number of requirement nodes
+        config: Benchmark configuration
+
+    Returns:
+        BenchmarkResult for this graph size
+    """
+    from src.orchestration.workflow import ResearchWorkflow
+
+    shape = GraphShape.for_nodes(nodes, config.depth)
+    install_fakes(shape, config)
+    llm_limiter.set_limit(config.max_llm_calls)
+
+    class _Workflow(ResearchWorkflow):
+        """Keeps the decomposed graph for critical-path analysis."""
+
+        graph: RequirementGraph | None = None
+
+        async def _phase_decomposition(self, hypothesis):
+            self.graph = await super()._phase_decomposition(hypothesis)
+            return self.graph
+
+    workflow = _Workflow()
+    workflow.decomposer.MAX_LEVEL = shape.depth
+    workflow.aggregator.COMBINATION_DELAY = config.combination_delay
+
+    tracer.reset()
+    tracer.enable()
+    if config.trace_memory:
+        tracemalloc.start()
+
+    sink = contextlib.nullcontext() if config.verbose else contextlib.redirect_stdout(io.StringIO())
+    start = time.perf_counter()
+    with sink:
+        output = await workflow.run(node_text(0, 0), show_progress=False, deep_research=False)
+    wall = time.perf_counter() - start
+
+    if config.trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb, memory_source = peak / 2**20, "tracemalloc"
+    else:
+        # ru_maxrss is KiB on Linux; it is a process-wide high-water mark
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        memory_source = "max_rss"
+
+    spans = list(tracer.spans)
+    calls: dict[str, dict[str, int]] = {}
+    for span in spans:
+        if span.kind in ("llm", "embedding", "search"):
+            entry = calls.setdefault(
+                span.phase or "unscoped", {"llm": 0, "embedding": 0, "search": 0}
+            )
+            entry[span.kind] += 1
+
+    critical = critical_path_seconds(spans, workflow.graph)
+    graph = workflow.graph
+    return BenchmarkResult(
+        target_nodes=nodes,
+        nodes=graph.total_nodes if graph else 0,
+        depth=graph.max_depth if graph else 0,
+        shared_nodes=graph.shared_count if graph else 0,
+        wall_seconds=wall,
+        peak_memory_mb=round(peak_mb, 1),
+        memory_source=memory_source,
+        calls_by_phase=calls,
+        llm_calls=sum(1 for s in spans if s.kind == "llm"),
+        work_seconds=sum(s.duration_us for s in _top_level_spans(spans)) / 1_000_000,
+        critical_path_seconds=sum(critical.values()),
+        critical_path_by_phase=critical,
+        plan_steps=output.final_plan.total_steps,
+    )
+
+
+def print_report(results: list[BenchmarkResult]) -> None:
+    """Render benchmark results as tables."""
+    table = Table(title="Workflow Benchmark")
+    for column in ("Nodes", "Depth", "Shared", "Wall s", "Crit. s",
+                   "Effic.", "Par.", "LLM", "Peak MB"):
+        table.add_column(column, justify="right")
+    for r in results:
+        table.add_row(
+            str(r.nodes), str(r.depth), str(r.shared_nodes), f"{r.wall_seconds:.2f}",
+            f"{r.critical_path_seconds:.2f}", f"{r.scheduler_efficiency:.1%}",
+            f"{r.parallelism:.2f}", str(r.llm_calls), f"{r.peak_memory_mb:.0f}",
+        )
+    console.print(table)
+
+    calls = Table(title="Calls per Phase (llm / embedding / search)")
+    calls.add_column("Nodes", justify="right")
+    phases = sorted({p for r in results for p in r.calls_by_phase})
+    for phase in phases:
+        calls.add_column(phase, justify="right")
+    for r in results:
+        row = [str(r.nodes)]
+        for phase in phases:
+            c = r.calls_by_phase.get(phase)
+            row.append(f"{c['llm']} / {c['embedding']} / {c['search']}" if c else "-")
+        calls.add_row(*row)
+    console.print(calls)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Offline end-to-end workflow benchmark on synthetic requirement graphs",
+    )
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Target graph sizes (default: 10 100 1000)")
+    parser.add_argument("--depth", type=int, default=3, help="Maximum graph depth below the root")
+    parser.add_argument(
+        "--latency",
+        default="lognormal:0.02:0.5",
+        help="Chat latency: zero | constant:S | uniform:LO:HI | lognormal:MEDIAN:SIGMA",
+    )
+    parser.add_argument(
+        "--embedding-latency", default="zero", help="Embedding latency (same syntax)"
+    )
+    parser.add_argument(
+        "--max-llm-calls", type=int, default=64, help="Global LLM concurrency budget"
+    )
+    parser.add_argument("--shared-ratio", type=float, default=0.0,
+                        help="Fraction of children duplicating a sibling (exercises deduplication)")
+    parser.add_argument("--relevant-ratio", type=float, default=0.5,
+                        help="Fraction of retrievals judged relevant")
+    parser.add_argument("--combination-delay", type=float, default=0.0,
+                        help="Aggregator delay between candidates (production: 0.25)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Measure per-run peak with tracemalloc (slower) instead of max RSS")
+    parser.add_argument("--verbose", action="store_true", help="Show workflow output")
+    parser.add_argument("--output", default="outputs/benchmarks/workflow.json",
+                        help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    config = BenchmarkConfig(
+        depth=args.depth,
+        latency=LatencyModel.parse(args.latency),
+        embedding_latency=LatencyModel.parse(args.embedding_latency),
+        max_llm_calls=args.max_llm_calls,
+        shared_ratio=args.shared_ratio,
+        relevant_ratio=args.relevant_ratio,
+        combination_delay=args.combination_delay,
+        trace_memory=args.trace_memory,
+        verbose=args.verbose,
+    )
+
+    results = []
+    for nodes in args.nodes:
+        console.print(f"[blue]Running {nodes}-node graph...[/blue]")
+        results.append(asyncio.run(run_benchmark(nodes, config)))
+
+    print_report(results)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(
+            {
+                "config": {**asdict(config), "latency": str(config.latency),
+                           "embedding_latency": str(config.embedding_latency)},
+                "results": [r.to_dict() for r in results],
+            },
+            f,
+            indent=2,
+        )
+    console.print(f"[green]✓ Report saved to {output}[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,15 +18,104 @@ class Settings(BaseSettings):
     llm_model: str = "gpt-4.1-mini"
 
     # Qdrant Vector Database
+    vector_backend: str = "server"  # server (URL or host:port) | embedded (in-process, qdrant_path)
+    qdrant_path: str = "qdrant_storage"  # Embedded storage directory, or ":memory:"
     qdrant_url: str = "" 
     qdrant_api_key: str = ""
     qdrant_host: str = "localhost"
     qdrant_port: int = 6333
 
+    # Dense embeddings (changing the model or dimension needs scripts/migrate_embeddings.py)
+    dense_embedding_backend: str = "openai"  # openai | fastembed (local ONNX)
+    embedding_model: str = "text-embedding-3-small"
+    embedding_dimensions: int = 1536
+    local_embedding_model: str = "BAAI/bge-small-en-v1.5"  # 384-d
+    local_embedding_batch_size: int = 256
+    local_embedding_parallel: int | None = None  # Worker processes for large batches; 0 = all cores
+    # BM25 sparse embeddings
+    sparse_embedding_batch_size: int = 256
+    sparse_embedding_parallel: int | None = None  # Processes for large batches; 0 = all cores
+    sparse_query_cache_size: int = 1024  # Query embeddings kept; 0 disables the cache
+    # Per-store backends (None follows dense_embedding_backend)
+    literature_embedding_backend: str | None = None
+    requirement_embedding_backend: str | None = None
+    plan_item_embedding_backend: str | None = None
+
     # Workflow Configuration
     max_refinement_iterations: int = 5
     proposer_count: int = 3
 
+    # Deep research CLI
+    deep_research_timeout: float = 1800.0  # Whole session, seconds
+    deep_research_prompt_timeout: float = 120.0  # Each setup prompt, seconds
+    deep_research_breadth: int | None = None  # None keeps the CLI default
+    deep_research_depth: int | None = None  # None keeps the CLI default
+    deep_research_facets: int = 1  # Sub-questions researched in parallel per hypothesis
+    deep_research_cache_enabled: bool = True
+    deep_research_cache_dir: str = "outputs/deep_research_cache"
+    # Stream reports into the literature store as they are written
+    deep_research_ingest: bool = True
+
+    # Literature collection dense index (quantization: none | scalar | binary)
+    literature_quantization: str = "none"
+    # Re-rank quantized candidates with the original vectors
+    literature_quantization_rescore: bool = True
+    literature_quantization_oversampling: float = 2.0
+    literature_on_disk: bool = False  # Original vectors and payloads on disk
+    literature_hnsw_m: int = 16
+    literature_hnsw_ef_construct: int = 100
+    literature_hnsw_ef: int | None = None  # Search-time ef; None keeps the Qdrant default
+
+    # Literature search result cache (size 0 disables); queries within the
+    # cosine distance radius of a cached one reuse its results
+    literature_search_cache_size: int = 256
+    literature_search_cache_radius: float = 0.05
+    # Seconds between checks of the collection version other processes publish
+    # when they ingest (0 checks on every search)
+    literature_version_check_seconds: float = 5.0
+    # Directory of the external chunk text store; empty keeps texts in Qdrant payloads
+    literature_text_store_path: str = ""
+    # Spec domains (data/specs/<domain>): route queries to the closest domains
+    # (plus those within the margin), and/or keep one collection per domain
+    literature_domain_routing: bool = False
+    literature_domain_margin: float = 0.05
+    literature_domain_collections: bool = False
+    # Hybrid search prefetch: factor x requested results per modality (at least
+    # the minimum); adaptive mode widens queries whose fused scores are flat
+    literature_prefetch_factor: float = 4.0
+    literature_prefetch_min: int = 10
+    literature_prefetch_adaptive: bool = False
+    literature_prefetch_widen: float = 4.0
+    literature_prefetch_flat_spread: float = 0.1
+
+    # Retrieval
+    retrieval_parent_sections: bool = False  # Return parent sections (H1 > H2) instead of chunks
+    retrieval_context_tokens: int = 4000  # Budget for the context assembled from one retrieval
+
+    # Prompt budgets
+    synthesis_context_tokens: int = 16000  # Graph + solutions in the first synthesis prompt
+
+    # Concurrency
+    max_concurrent_llm_calls: int = 16  # Global budget shared by all agents
+    batch_concurrency: int = 4  # Hypotheses in flight for `batch`
+    max_concurrent_deep_research: int = 4  # Deep-research CLI sessions across all hypotheses
+    max_concurrent_gap_retrievals: int = 4  # Gap lookups in flight per plan synthesis
+
+    # Local service (`serve`)
+    serve_host: str = "127.0.0.1"
+    serve_port: int = 8080
+    serve_workers: int = 2  # Jobs run concurrently by the worker pool
+
+    # Plan item pre-classification (nearest neighbours over past LLM labels)
+    preclassifier_enabled: bool = False
+    preclassifier_min_neighbors: int = 3
+    preclassifier_min_score: float = 0.85  # Cosine similarity for a neighbour to vote
+    preclassifier_min_agreement: float = 0.8  # Weighted vote share needed to skip the LLM
+
+    # Telemetry
+    telemetry_enabled: bool = False  # Record per-call spans (or pass --trace)
+    telemetry_dir: str = "outputs/telemetry"
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
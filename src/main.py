@@ -5,16 +5,25 @@ This module provides the command-line interface for running the research
 plan generator.
 
 Usage:
-    python -m src.main "Your research hypothesis here"
-    python -m src.main "Your hypothesis" --model gpt-5
-    python -m src.main "Your hypothesis" --papers ./data/papers/
+    python -m src.main run "Your research hypothesis here"
+    python -m src.main run "Your hypothesis" --model gpt-5
+    python -m src.main run "Your hypothesis" --papers ./data/papers/
+    python -m src.main run "Your hypothesis" --trace
+    python -m src.main run "Your hypothesis" --record outputs/run.cassette
+    python -m src.main run "Your hypothesis" --replay outputs/run.cassette --skip-deep-research
+    python -m src.main batch hypotheses.txt --concurrency 4
+    python -m src.main serve --port 8080 --workers 2
 
 Owner: [ASSIGN TEAMMATE]
 """
 
+import asyncio
+from pathlib import Path
+
 import typer
 from rich.console import Console
 from rich.panel import Panel
+from rich.table import Table
 
 from src.config import settings
 
@@ -25,12 +34,84 @@ app = typer.Typer(
 console = Console()
 
 
+def _export_trace() -> None:
+    """Export recorded telemetry spans and print per-phase totals."""
+    from src.utils.telemetry import tracer
+
+    if not tracer.enabled or not tracer.spans:
+        return
+
+    jsonl_path, chrome_path = tracer.export()
+    table = Table(title="Telemetry by Phase")
+    table.add_column("Phase")
+    table.add_column("Calls", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Prompt tok", justify="right")
+    table.add_column("Completion tok", justify="right")
+    table.add_column("Cost ($)", justify="right")
+    table.add_column("Cache hits", justify="right")
+    for phase, totals in tracer.summary().items():
+        table.add_row(
+            phase,
+            str(totals["calls"]),
+            f"{totals['seconds']:.1f}",
+            str(totals["prompt_tokens"]),
+            str(totals["completion_tokens"]),
+            f"{totals['cost_usd']:.4f}",
+            str(totals["cache_hits"]),
+        )
+    console.print(table)
+    console.print(f"[green]✓ Spans saved to {jsonl_path}[/green]")
+    console.print(f"[green]✓ Chrome trace saved to {chrome_path}[/green]")
+
+
+def _install_cassette(record: str | None, replay: str | None) -> None:
+    """Route LLM and embedding traffic through a cassette, if requested."""
+    from src.utils.cassette import install_cassette
+
+    if record and replay:
+        console.print("[red]Error: --record and --replay are mutually exclusive[/red]")
+        raise typer.Exit(1)
+    if replay and not Path(replay).exists():
+        console.print(f"[red]Error: Cassette not found: {replay}[/red]")
+        raise typer.Exit(1)
+    if record:
+        install_cassette(record, "record")
+        console.print(f"[yellow]Recording LLM and embedding traffic to {record}[/yellow]")
+    elif replay:
+        install_cassette(replay, "replay")
+        console.print(f"[yellow]Replaying LLM and embedding traffic from {replay}[/yellow]")
+
+
+def _close_cassette() -> None:
+    """Close the installed cassette and report hit/miss counts."""
+    from src.utils.cassette import close_cassette
+
+    cassette = close_cassette()
+    if cassette is None:
+        return
+    if cassette.mode == "record":
+        console.print(f"[green]✓ Recorded {cassette.recorded} calls to {cassette.path}[/green]")
+    else:
+        console.print(f"[green]✓ Replayed {cassette.hits} calls ({cassette.misses} misses)[/green]")
+
+
 @app.command()
 def run(
     hypothesis: str = typer.Argument(..., help="The research hypothesis to analyze"),
     model: str = typer.Option(None, "--model", "-m", help="LLM model to use"),
     papers: str = typer.Option(None, "--papers", "-p", help="Path to papers directory for RAG"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose output"),
+    trace: bool = typer.Option(False, "--trace", help="Record per-call telemetry spans"),
+    skip_deep_research: bool = typer.Option(
+        False, "--skip-deep-research", help="Decompose the hypothesis directly"
+    ),
+    record: str = typer.Option(
+        None, "--record", help="Record LLM and embedding traffic to a cassette"
+    ),
+    replay: str = typer.Option(
+        None, "--replay", help="Answer LLM and embedding calls from a cassette"
+    ),
 ) -> None:
     """
     Generate a research plan from a hypothesis.
@@ -42,17 +123,13 @@ def run(
     4. Solve atomic requirements
     5. Generate final research plan
     """
-    # TODO: Implement the main workflow orchestration
-    # 1. Initialize the workflow orchestrator
-    # 2. Run deep research agent
-    # 3. Handle user clarifications (if any)
-    # 4. Run requirement decomposition
-    # 5. Run solver phase
-    # 6. Aggregate and synthesize plan
-    # 7. Output the final research plan
+    from src.orchestration.workflow import ResearchWorkflow
+    from src.utils.telemetry import tracer
 
     if model:
         settings.llm_model = model
+    if trace:
+        tracer.enable()
 
     console.print(Panel(f"[bold blue]Research Hypothesis:[/bold blue]\n{hypothesis}"))
     console.print(f"\n[yellow]Using model: {settings.llm_model}[/yellow]")
@@ -60,9 +137,188 @@ def run(
     if papers:
         console.print(f"[yellow]Papers directory: {papers}[/yellow]")
 
-    # TODO: Replace with actual workflow execution
-    console.print("\n[red]TODO: Implement workflow orchestration[/red]")
-    console.print("See src/orchestration/workflow.py")
+    _install_cassette(record, replay)
+    try:
+        workflow = ResearchWorkflow()
+        output = asyncio.run(workflow.run(hypothesis, deep_research=not skip_deep_research))
+    finally:
+        _close_cassette()
+
+    plan_path = Path("outputs") / "PLAN.md"
+    plan_path.parent.mkdir(parents=True, exist_ok=True)
+    plan_path.write_text(output.plan_markdown, encoding="utf-8")
+    console.print(f"\n[green]✓ Plan saved to {plan_path}[/green]")
+    _export_trace()
+
+
+@app.command()
+def batch(
+    hypotheses_file: str = typer.Argument(
+        ..., help="File with one hypothesis per line (or .json / .jsonl)"
+    ),
+    concurrency: int = typer.Option(None, "--concurrency", "-c", help="Hypotheses in flight"),
+    max_llm_calls: int = typer.Option(
+        None, "--max-llm-calls", help="Global LLM concurrency budget"
+    ),
+    model: str = typer.Option(None, "--model", "-m", help="LLM model to use"),
+    output_dir: str = typer.Option(
+        "outputs/batch", "--output-dir", "-o", help="Where to write plans and the report"
+    ),
+    skip_deep_research: bool = typer.Option(
+        False, "--skip-deep-research", help="Decompose hypotheses directly"
+    ),
+    trace: bool = typer.Option(False, "--trace", help="Record per-call telemetry spans"),
+    record: str = typer.Option(
+        None, "--record", help="Record LLM and embedding traffic to a cassette"
+    ),
+    replay: str = typer.Option(
+        None, "--replay", help="Answer LLM and embedding calls from a cassette"
+    ),
+) -> None:
+    """
+    Run many hypotheses concurrently in one process.
+
+    Agents, stores and caches are built once and shared by every hypothesis.
+    Each plan is written to OUTPUT_DIR/<id>_PLAN.md and a per-hypothesis and
+    aggregate throughput report to OUTPUT_DIR/batch_report.json.
+
+    Examples:
+        python -m src.main batch hypotheses.txt
+        python -m src.main batch variants.jsonl --concurrency 8 --max-llm-calls 32
+    """
+    from src.orchestration.batch import BatchRunner, load_batch_file
+    from src.utils.concurrency import llm_limiter
+    from src.utils.telemetry import tracer
+
+    if not Path(hypotheses_file).exists():
+        console.print(f"[red]Error: File not found: {hypotheses_file}[/red]")
+        raise typer.Exit(1)
+
+    if model:
+        settings.llm_model = model
+    if max_llm_calls:
+        llm_limiter.set_limit(max_llm_calls)
+    if trace:
+        tracer.enable()
+
+    try:
+        items = load_batch_file(hypotheses_file)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    if not items:
+        console.print(f"[yellow]No hypotheses found in {hypotheses_file}[/yellow]")
+        return
+
+    _install_cassette(record, replay)
+    try:
+        runner = BatchRunner(
+            concurrency=concurrency,
+            output_dir=output_dir,
+            deep_research=not skip_deep_research,
+        )
+        console.print(
+            f"[blue]Running {len(items)} hypotheses "
+            f"(concurrency {runner.concurrency}, LLM budget {llm_limiter.limit})...[/blue]\n"
+        )
+        report = asyncio.run(runner.run(items))
+    finally:
+        _close_cassette()
+
+    table = Table(title="Batch Results")
+    table.add_column("ID")
+    table.add_column("Hypothesis")
+    table.add_column("Status")
+    table.add_column("Wall (s)", justify="right")
+    table.add_column("Steps", justify="right")
+    for result in report.results:
+        status = "[green]ok[/green]" if result.success else f"[red]{result.error}[/red]"
+        table.add_row(
+            result.item_id,
+            result.hypothesis[:60],
+            status,
+            f"{result.wall_seconds:.1f}",
+            str(result.total_steps),
+        )
+    console.print(table)
+
+    summary = report.summary()
+    console.print(f"\n{'='*60}")
+    console.print("[bold green]BATCH COMPLETE[/bold green]")
+    console.print(f"{'='*60}")
+    console.print(f"Hypotheses:           {summary['total']}")
+    console.print(f"[green]Succeeded:            {summary['succeeded']}[/green]")
+    console.print(f"[red]Failed:               {summary['failed']}[/red]")
+    console.print(f"Wall time:            {summary['wall_seconds']}s")
+    console.print(f"Throughput:           {summary['throughput_per_hour']} hypotheses/hour")
+    console.print(f"Concurrency speedup:  {summary['speedup']}x")
+    console.print(f"Peak LLM calls:       {summary['peak_llm_calls_in_flight']}")
+    console.print(f"Report:               {Path(output_dir) / 'batch_report.json'}")
+    console.print(f"{'='*60}\n")
+    _export_trace()
+
+    if report.failed > 0:
+        raise typer.Exit(1)
+
+
+@app.command()
+def serve(
+    host: str = typer.Option(
+        None, "--host", help="Interface to bind (default: settings.serve_host)"
+    ),
+    port: int = typer.Option(
+        None, "--port", "-p", help="Port to bind (default: settings.serve_port)"
+    ),
+    workers: int = typer.Option(None, "--workers", "-w", help="Jobs run concurrently"),
+    max_llm_calls: int = typer.Option(
+        None, "--max-llm-calls", help="Global LLM concurrency budget"
+    ),
+    model: str = typer.Option(None, "--model", "-m", help="LLM model to use"),
+    trace: bool = typer.Option(
+        False, "--trace", help="Record telemetry spans (exported on shutdown)"
+    ),
+) -> None:
+    """
+    Run a long-lived local service with a job queue and worker pool.
+
+    Agents, the literature store and caches stay warm between jobs. Submit
+    hypotheses with POST /jobs and poll GET /jobs/{id} or stream
+    GET /jobs/{id}/events (server-sent events).
+
+    Examples:
+        python -m src.main serve
+        python -m src.main serve --port 9000 --workers 4
+        curl -X POST localhost:8080/jobs -d '{"hypothesis": "...", "priority": 5}'
+    """
+    from src.orchestration.http_api import ResearchHttpServer
+    from src.orchestration.service import ResearchService
+    from src.utils.concurrency import llm_limiter
+    from src.utils.telemetry import tracer
+
+    if model:
+        settings.llm_model = model
+    if max_llm_calls:
+        llm_limiter.set_limit(max_llm_calls)
+    if trace:
+        tracer.enable()
+
+    host = host or settings.serve_host
+    port = port or settings.serve_port
+
+    console.print("[blue]Warming up agents and stores...[/blue]")
+    service = ResearchService(workers=workers)
+    server = ResearchHttpServer(service, host=host, port=port)
+
+    console.print(
+        f"[green]✓ Serving on http://{host}:{port} "
+        f"({service.worker_count} workers, LLM budget {llm_limiter.limit})[/green]"
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Service stopped[/yellow]")
+    finally:
+        _export_trace()
 
 
 @app.command()
@@ -109,9 +365,11 @@ def ingest(
                 return
 
             document = store.ingest_file(str(path_obj))
-            chunks = store._chunk_markdown(document)
 
-            console.print(f"[green]✓ Successfully ingested {len(chunks)} chunks from {path_obj.name}[/green]")
+            console.print(
+                f"[green]✓ Successfully ingested {document.chunk_count} chunks "
+                f"from {path_obj.name}[/green]"
+            )
 
         else:
             # Directory ingestion - find all markdown files
@@ -145,8 +403,7 @@ def ingest(
                     console.print(f"[{idx}/{len(md_files)}] Ingesting: {relative_path}")
 
                     document = store.ingest_file(str(md_file))
-                    chunks = store._chunk_markdown(document)
-                    num_chunks = len(chunks)
+                    num_chunks = document.chunk_count
 
                     stats["success"] += 1
                     stats["chunks"] += num_chunks
@@ -8,6 +8,7 @@ that allows shared nodes (deduplication).
 Owner: [ASSIGN TEAMMATE]
 """
 
+from dataclasses import dataclass, field
 from enum import Enum
 from uuid import UUID, uuid4
 
@@ -52,6 +53,28 @@ class Requirement(BaseModel):
     solution_id: UUID | None = None
 
 
+@dataclass
+class GraphIndex:
+    """
+    Indexes over a requirement graph, kept current by its methods.
+
+    Dicts with None values serve as insertion-ordered sets.
+
+    Attributes:
+        children: Node -> child IDs (``children_map`` as sets)
+        parents: Node -> parent IDs (``parent_ids`` as sets)
+        leaves: Atomic nodes
+        unsolved_leaves: Atomic nodes not yet solved
+        topological: Cached topological order (None after a structural change)
+    """
+
+    children: dict[UUID, set[UUID]] = field(default_factory=dict)
+    parents: dict[UUID, set[UUID]] = field(default_factory=dict)
+    leaves: dict[UUID, None] = field(default_factory=dict)
+    unsolved_leaves: dict[UUID, None] = field(default_factory=dict)
+    topological: tuple[UUID, ...] | None = None
+
+
 class RequirementGraph(BaseModel):
     """
     The complete requirement graph for a hypothesis.
@@ -59,6 +82,14 @@ class RequirementGraph(BaseModel):
     Maintains all nodes in a flat registry with level-based organization.
     Atomic nodes can be shared across multiple parents through deduplication.
 
+    Besides the serialized fields, the graph keeps a ``GraphIndex`` that is
+    updated on every change, so workflow bookkeeping is O(1) per event:
+    child and parent ID sets for membership checks, the leaves (atomic
+    nodes) and the leaves not yet solved, in insertion order. The
+    topological order is computed once per structural change. The index is
+    rebuilt when a graph is constructed or loaded. Set statuses with
+    ``set_status`` so the unsolved leaves stay current.
+
     Attributes:
         root_id: ID of the root requirement (level 0)
         nodes: Flat registry of all nodes by ID
@@ -68,6 +99,7 @@ class RequirementGraph(BaseModel):
         atomic_count: Number of atomic (leaf) requirements
         shared_count: Number of deduplicated (shared) nodes
         max_depth: Maximum depth of the graph
+        index: Derived indexes (not serialized)
     """
 
     root_id: UUID
@@ -80,6 +112,26 @@ class RequirementGraph(BaseModel):
     shared_count: int = 0
     max_depth: int = 0
 
+    # Derived from the fields above; not serialized. A regular field rather
+    # than a private attribute, which pydantic resolves through __getattr__.
+    index: GraphIndex = Field(default_factory=GraphIndex, exclude=True, repr=False)
+
+    def model_post_init(self, __context) -> None:
+        """Build the indexes of a constructed or loaded graph."""
+        children = {node_id: set(child_ids) for node_id, child_ids in self.children_map.items()}
+        leaves = {node_id: None for node_id in self.nodes if not children.get(node_id)}
+        self.index = GraphIndex(
+            children=children,
+            parents={node_id: set(node.parent_ids) for node_id, node in self.nodes.items()},
+            leaves=leaves,
+            unsolved_leaves={
+                node_id: None
+                for node_id in leaves
+                if self.nodes[node_id].status != RequirementStatus.SOLVED
+            },
+        )
+        self.atomic_count = len(leaves)
+
     def add_node(self, node: Requirement) -> None:
         """
         Add a node to the graph.
@@ -95,10 +147,36 @@ class RequirementGraph(BaseModel):
 
         if node.id not in self.children_map:
             self.children_map[node.id] = []
+            self.index.children[node.id] = set()
+        self.index.parents[node.id] = set(node.parent_ids)
+
+        if not self.index.children[node.id]:
+            self.index.leaves[node.id] = None
+            if node.status != RequirementStatus.SOLVED:
+                self.index.unsolved_leaves[node.id] = None
+        self.index.topological = None
 
         self.total_nodes += 1
+        self.atomic_count = len(self.index.leaves)
         self.max_depth = max(self.max_depth, node.level)
 
+    def _link(self, parent_id: UUID, child_id: UUID) -> None:
+        """Record the edge ``parent_id -> child_id`` in the children map and the indexes."""
+        if parent_id not in self.children_map:
+            self.children_map[parent_id] = []
+            self.index.children[parent_id] = set()
+        if child_id in self.index.children[parent_id]:
+            return
+        self.children_map[parent_id].append(child_id)
+        self.index.children[parent_id].add(child_id)
+        self.index.parents.setdefault(child_id, set()).add(parent_id)
+
+        # The parent is no longer atomic
+        self.index.leaves.pop(parent_id, None)
+        self.index.unsolved_leaves.pop(parent_id, None)
+        self.atomic_count = len(self.index.leaves)
+        self.index.topological = None
+
     def add_child(self, parent_id: UUID, child: Requirement) -> None:
         """
         Add a new child to a parent node.
@@ -113,10 +191,7 @@ class RequirementGraph(BaseModel):
             child.parent_ids.append(parent_id)
 
         self.add_node(child)
-
-        if parent_id not in self.children_map:
-            self.children_map[parent_id] = []
-        self.children_map[parent_id].append(child.id)
+        self._link(parent_id, child.id)
 
     def link_existing_child(self, parent_id: UUID, existing_child_id: UUID) -> None:
         """
@@ -133,15 +208,30 @@ class RequirementGraph(BaseModel):
         if not existing:
             return
 
-        if parent_id not in existing.parent_ids:
+        if parent_id not in self.index.parents[existing_child_id]:
             existing.parent_ids.append(parent_id)
             existing.is_shared = True
             self.shared_count += 1
 
-        if parent_id not in self.children_map:
-            self.children_map[parent_id] = []
-        if existing_child_id not in self.children_map[parent_id]:
-            self.children_map[parent_id].append(existing_child_id)
+        self._link(parent_id, existing_child_id)
+
+    def set_status(self, node_id: UUID, status: RequirementStatus) -> None:
+        """
+        Set a node's status and keep the unsolved atomic index current.
+
+        Every status change of a node in the graph goes through here;
+        assigning ``status`` directly leaves the index stale.
+
+        Args:
+            node_id: ID of the requirement
+            status: Its new status
+        """
+        self.nodes[node_id].status = status
+        if node_id in self.index.leaves:
+            if status == RequirementStatus.SOLVED:
+                self.index.unsolved_leaves.pop(node_id, None)
+            else:
+                self.index.unsolved_leaves[node_id] = None
 
     def get_node(self, node_id: UUID) -> Requirement | None:
         """Get a node by ID."""
@@ -159,10 +249,9 @@ class RequirementGraph(BaseModel):
             node_id: ID of the parent node
 
         Returns:
-            List of child requirements
+            List of child requirements, in the order they were linked
         """
-        child_ids = self.children_map.get(node_id, [])
-        return [self.nodes[cid] for cid in child_ids if cid in self.nodes]
+        return [self.nodes[cid] for cid in self.children_map.get(node_id, ()) if cid in self.nodes]
 
     def get_parents(self, node_id: UUID) -> list[Requirement]:
         """
@@ -179,6 +268,18 @@ class RequirementGraph(BaseModel):
             return []
         return [self.nodes[pid] for pid in node.parent_ids if pid in self.nodes]
 
+    def out_degree(self, node_id: UUID) -> int:
+        """Number of children of a node."""
+        return len(self.index.children.get(node_id, ()))
+
+    def in_degree(self, node_id: UUID) -> int:
+        """Number of parents of a node."""
+        return len(self.index.parents.get(node_id, ()))
+
+    def is_atomic(self, node_id: UUID) -> bool:
+        """Whether a node is atomic (a leaf)."""
+        return node_id in self.index.leaves
+
     def get_atomic_requirements(self) -> list[Requirement]:
         """
         Return all atomic (leaf) requirements.
@@ -188,20 +289,44 @@ class RequirementGraph(BaseModel):
         Returns:
             List of atomic requirements
         """
-        atomic = []
-        for node in self.nodes.values():
-            children = self.children_map.get(node.id, [])
-            if not children:
-                atomic.append(node)
-        self.atomic_count = len(atomic)
-        return atomic
+        return [self.nodes[node_id] for node_id in self.index.leaves]
 
     def get_unsolved_atomic(self) -> list[Requirement]:
-        """Return atomic requirements that haven't been solved yet."""
-        return [
-            req for req in self.get_atomic_requirements()
-            if req.status != RequirementStatus.SOLVED
-        ]
+        """
+        Return atomic requirements that haven't been solved yet.
+
+        Read from the index, so statuses must be changed through ``set_status``.
+        """
+        return [self.nodes[node_id] for node_id in self.index.unsolved_leaves]
+
+    def topological_order(self) -> tuple[UUID, ...]:
+        """
+        Node IDs with every parent before its children.
+
+        Computed once after each structural change (Kahn's algorithm, ties in
+        insertion order). Reverse it for bottom-up traversal.
+
+        Raises:
+            ValueError: If deduplication linked a node below its own descendant
+        """
+        if self.index.topological is None:
+            remaining = dict.fromkeys(self.nodes, 0)
+            for parent_id, child_ids in self.children_map.items():
+                if parent_id in remaining:
+                    for child_id in child_ids:
+                        if child_id in remaining:
+                            remaining[child_id] += 1
+            order = [node_id for node_id, degree in remaining.items() if degree == 0]
+            for node_id in order:  # The list grows while it is walked
+                for child_id in self.children_map.get(node_id, ()):
+                    if child_id in remaining:
+                        remaining[child_id] -= 1
+                        if remaining[child_id] == 0:
+                            order.append(child_id)
+            if len(order) != len(self.nodes):
+                raise ValueError("Requirement graph has a cycle")
+            self.index.topological = tuple(order)
+        return self.index.topological
 
     def get_level_nodes(self, level: int) -> list[Requirement]:
         """
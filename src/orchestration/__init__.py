@@ -5,7 +5,17 @@ This module coordinates agent execution and manages the overall research workflo
 """
 
 from src.orchestration.workflow import ResearchWorkflow
+from src.orchestration.batch import BatchRunner, BatchReport, load_batch_file
+from src.orchestration.service import ResearchService, Job, JobStatus
+from src.orchestration.http_api import ResearchHttpServer
 
 __all__ = [
     "ResearchWorkflow",
+    "BatchRunner",
+    "BatchReport",
+    "load_batch_file",
+    "ResearchService",
+    "Job",
+    "JobStatus",
+    "ResearchHttpServer",
 ]
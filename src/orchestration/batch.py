@@ -0,0 +1,264 @@
+"""
+Multi-hypothesis batch runner.
+
+Runs many hypotheses through one ResearchWorkflow in a single process so
+agent construction, the BM25 model, Qdrant connections and caches are paid
+for once. Hypotheses run concurrently up to ``settings.batch_concurrency``,
+while every LLM call still goes through the global ``llm_limiter`` budget.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from src.config import settings
+from src.orchestration.workflow import ResearchWorkflow
+from src.utils.concurrency import llm_limiter
+
+
+@dataclass
+class BatchItem:
+    """A single hypothesis to run in a batch."""
+
+    index: int
+    hypothesis: str
+    item_id: str = ""
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of running a single hypothesis."""
+
+    index: int
+    item_id: str
+    hypothesis: str
+    success: bool
+    wall_seconds: float
+    plan_path: str | None = None
+    total_steps: int = 0
+    error: str | None = None
+
+
+@dataclass
+class BatchReport:
+    """Per-hypothesis results plus aggregate throughput."""
+
+    results: list[BatchItemResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    concurrency: int = 1
+    peak_llm_calls_in_flight: int = 0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for r in self.results if r.success)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+    @property
+    def throughput_per_hour(self) -> float:
+        """Completed hypotheses per hour of batch wall time."""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return self.succeeded * 3600 / self.wall_seconds
+
+    @property
+    def speedup(self) -> float:
+        """Sum of per-hypothesis wall times divided by batch wall time."""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return sum(r.wall_seconds for r in self.results) / self.wall_seconds
+
+    def summary(self) -> dict:
+        """Aggregate statistics as a JSON-serializable dict."""
+        latencies = [r.wall_seconds for r in self.results if r.success]
+        return {
+            "total": len(self.results),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "concurrency": self.concurrency,
+            "wall_seconds": round(self.wall_seconds, 2),
+            "throughput_per_hour": round(self.throughput_per_hour, 2),
+            "speedup": round(self.speedup, 2),
+            "latency_mean_seconds": round(statistics.mean(latencies), 2) if latencies else None,
+            "latency_median_seconds": round(statistics.median(latencies), 2) if latencies else None,
+            "latency_max_seconds": round(max(latencies), 2) if latencies else None,
+            "peak_llm_calls_in_flight": self.peak_llm_calls_in_flight,
+        }
+
+    def save(self, file_path: str) -> None:
+        """Save per-hypothesis results and the aggregate summary as JSON."""
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "summary": self.summary(),
+            "results": [asdict(r) for r in self.results],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+def _parse_entry(entry, where: str) -> tuple[str, str]:
+    """Hypothesis text and ID of one JSON entry (a string or an object)."""
+    if isinstance(entry, str):
+        text, item_id = entry, ""
+    elif isinstance(entry, dict) and isinstance(entry.get("hypothesis"), str):
+        text, item_id = entry["hypothesis"], str(entry.get("id", ""))
+    else:
+        raise ValueError(f"{where}: expected a string or an object with a 'hypothesis' string")
+    if not text.strip():
+        raise ValueError(f"{where}: empty hypothesis")
+    return text.strip(), item_id
+
+
+def load_batch_file(file_path: str) -> list[BatchItem]:
+    """
+    Load hypotheses from a file.
+
+    Supported formats:
+    - ``.json``: an array of hypothesis strings or objects with a
+      ``hypothesis`` key and optional ``id``
+    - ``.jsonl``: one such string or object per line
+    - anything else: one hypothesis per line
+
+    Blank lines and, outside ``.json``, ``#`` comment lines are skipped.
+
+    Args:
+        file_path: Path to the hypotheses file
+
+    Returns:
+        List of batch items in file order
+
+    Raises:
+        ValueError: If an entry is not valid JSON or has no hypothesis; the
+            message names the file and line (or array position)
+    """
+    path = Path(file_path)
+    entries: list[tuple[str, str]] = []
+
+    if path.suffix == ".json":
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: invalid JSON ({e})") from e
+        if not isinstance(data, list):
+            raise ValueError(f"{path}: expected an array of hypotheses")
+        entries = [_parse_entry(entry, f"{path}[{i}]") for i, entry in enumerate(data)]
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if path.suffix != ".jsonl":
+                    entries.append((line, ""))
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{number}: invalid JSON ({e})") from e
+                entries.append(_parse_entry(entry, f"{path}:{number}"))
+
+    return [
+        BatchItem(index=index, hypothesis=text, item_id=item_id or f"{index:03d}")
+        for index, (text, item_id) in enumerate(entries)
+    ]
+
+
+class BatchRunner:
+    """
+    Runs many hypotheses concurrently through one shared workflow.
+
+    Usage:
+        runner = BatchRunner(concurrency=4)
+        report = await runner.run(load_batch_file("hypotheses.txt"))
+    """
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        output_dir: str = "outputs/batch",
+        deep_research: bool = True,
+        workflow: ResearchWorkflow | None = None,
+    ):
+        """
+        Initialize the batch runner.
+
+        Args:
+            concurrency: Hypotheses in flight (defaults to settings.batch_concurrency)
+            output_dir: Directory for PLAN.md files and the batch report
+            deep_research: Whether to run Phase 1 for every hypothesis
+            workflow: Workflow to reuse (built once if not given)
+        """
+        self.concurrency = max(1, concurrency or settings.batch_concurrency)
+        self.output_dir = Path(output_dir)
+        self.deep_research = deep_research
+        self.workflow = workflow or ResearchWorkflow()
+
+    async def _run_item(
+        self, item: BatchItem, semaphore: asyncio.Semaphore
+    ) -> BatchItemResult:
+        """Run a single hypothesis under the batch semaphore."""
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                output = await self.workflow.run(
+                    item.hypothesis,
+                    show_progress=False,
+                    deep_research=self.deep_research,
+                )
+            except Exception as e:
+                return BatchItemResult(
+                    index=item.index,
+                    item_id=item.item_id,
+                    hypothesis=item.hypothesis,
+                    success=False,
+                    wall_seconds=time.perf_counter() - start,
+                    error=f"{type(e).__name__}: {e}",
+                )
+
+            plan_path = self.output_dir / f"{item.item_id}_PLAN.md"
+            plan_path.parent.mkdir(parents=True, exist_ok=True)
+            plan_path.write_text(output.plan_markdown, encoding="utf-8")
+
+            return BatchItemResult(
+                index=item.index,
+                item_id=item.item_id,
+                hypothesis=item.hypothesis,
+                success=True,
+                wall_seconds=time.perf_counter() - start,
+                plan_path=str(plan_path),
+                total_steps=output.final_plan.total_steps,
+            )
+
+    async def run(self, items: list[BatchItem]) -> BatchReport:
+        """
+        Run all hypotheses and collect the report.
+
+        Args:
+            items: Hypotheses to run
+
+        Returns:
+            BatchReport with per-hypothesis results in input order
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        start = time.perf_counter()
+
+        results = await asyncio.gather(
+            *[self._run_item(item, semaphore) for item in items]
+        )
+
+        report = BatchReport(
+            results=sorted(results, key=lambda r: r.index),
+            wall_seconds=time.perf_counter() - start,
+            concurrency=self.concurrency,
+            peak_llm_calls_in_flight=llm_limiter.peak_in_flight,
+        )
+        report.save(str(self.output_dir / "batch_report.json"))
+        return report
@@ -0,0 +1,209 @@
+"""
+Minimal local HTTP API for the research service.
+
+A small HTTP/1.1 server on ``asyncio.start_server`` so the API shares the
+event loop with the worker pool and needs no web framework. Intended for a
+trusted local network (an internal UI), not for public exposure.
+
+Endpoints:
+    GET    /health               Service load and queue depth
+    GET    /jobs                 List retained jobs
+    POST   /jobs                 Submit {"hypothesis", "priority"?, "deep_research"?}
+    GET    /jobs/{id}            Job status and per-phase progress
+    GET    /jobs/{id}/result     Plan markdown and final plan (409 until finished)
+    GET    /jobs/{id}/events     Server-sent event stream of job progress
+    DELETE /jobs/{id}            Cancel a queued or running job
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import asyncio
+import json
+from http import HTTPStatus
+
+from src.orchestration.service import JobStatus, ResearchService
+
+MAX_BODY_BYTES = 1_000_000
+
+
+class HttpError(Exception):
+    """An error that maps directly to an HTTP response."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ResearchHttpServer:
+    """
+    Serves the ResearchService over HTTP.
+
+    Usage:
+        server = ResearchHttpServer(service, host="127.0.0.1", port=8080)
+        await server.serve_forever()
+    """
+
+    def __init__(self, service: ResearchService, host: str = "127.0.0.1", port: int = 8080):
+        """
+        Initialize the server.
+
+        Args:
+            service: The research service to expose
+            host: Interface to bind
+            port: TCP port to bind
+        """
+        self.service = service
+        self.host = host
+        self.port = port
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        """Start the service workers and begin accepting connections."""
+        await self.service.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        """Start and serve until cancelled."""
+        await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.service.stop()
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, path, body = await self._read_request(reader)
+            await self._dispatch(method, path, body, writer)
+        except HttpError as e:
+            await self._send_json(writer, e.status, {"error": e.message})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            await self._send_json(
+                writer, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+            )
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> tuple[str, str, bytes]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+        method, target, _ = parts
+
+        headers: dict[str, str] = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", "0") or 0)
+        if length > MAX_BODY_BYTES:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+
+        path = target.split("?", 1)[0].rstrip("/") or "/"
+        return method.upper(), path, body
+
+    async def _dispatch(
+        self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        segments = [s for s in path.split("/") if s]
+
+        if segments == ["health"] and method == "GET":
+            await self._send_json(writer, HTTPStatus.OK, self.service.stats())
+            return
+
+        if segments == ["jobs"]:
+            if method == "GET":
+                jobs = [job.to_dict() for job in self.service.list_jobs()]
+                await self._send_json(writer, HTTPStatus.OK, {"jobs": jobs})
+                return
+            if method == "POST":
+                await self._submit(body, writer)
+                return
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed")
+
+        if len(segments) >= 2 and segments[0] == "jobs":
+            job = self.service.get_job(segments[1])
+            if not job:
+                raise HttpError(HTTPStatus.NOT_FOUND, "Unknown job")
+
+            if len(segments) == 2 and method == "GET":
+                await self._send_json(writer, HTTPStatus.OK, job.to_dict())
+                return
+            if len(segments) == 2 and method == "DELETE":
+                cancelled = await self.service.cancel(job.id)
+                status = HTTPStatus.OK if cancelled else HTTPStatus.CONFLICT
+                await self._send_json(writer, status, job.to_dict())
+                return
+            if segments[2:] == ["result"] and method == "GET":
+                if job.status != JobStatus.SUCCEEDED:
+                    raise HttpError(HTTPStatus.CONFLICT, f"Job is {job.status.value}")
+                await self._send_json(writer, HTTPStatus.OK, job.to_dict(include_result=True))
+                return
+            if segments[2:] == ["events"] and method == "GET":
+                await self._stream_events(job.id, writer)
+                return
+
+        raise HttpError(HTTPStatus.NOT_FOUND, f"No route for {method} {path}")
+
+    async def _submit(self, body: bytes, writer: asyncio.StreamWriter) -> None:
+        try:
+            data = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Body must be JSON")
+
+        hypothesis = str(data.get("hypothesis", "")).strip()
+        if not hypothesis:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "'hypothesis' is required")
+        try:
+            priority = int(data.get("priority", 0))
+        except (TypeError, ValueError):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "'priority' must be an integer")
+
+        job = await self.service.submit(
+            hypothesis,
+            priority=priority,
+            deep_research=bool(data.get("deep_research", True)),
+        )
+        await self._send_json(writer, HTTPStatus.ACCEPTED, job.to_dict())
+
+    async def _stream_events(self, job_id: str, writer: asyncio.StreamWriter) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        await writer.drain()
+        async for event in self.service.stream_events(job_id):
+            payload = json.dumps(event)
+            writer.write(f"event: {event['type']}\ndata: {payload}\n\n".encode("utf-8"))
+            await writer.drain()
+
+    async def _send_json(
+        self, writer: asyncio.StreamWriter, status: HTTPStatus, data: dict
+    ) -> None:
+        body = json.dumps(data).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode("latin-1")
+        writer.write(head + body)
+        await writer.drain()
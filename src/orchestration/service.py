@@ -0,0 +1,301 @@
+"""
+Long-running research service: priority job queue and worker pool.
+
+Keeps one ResearchWorkflow (and therefore every agent, the LiteratureStore
+and its caches) warm for the lifetime of the process and runs submitted
+hypotheses on a bounded pool of asyncio workers. The HTTP layer lives in
+``src.orchestration.http_api``.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator
+from uuid import uuid4
+
+from src.config import settings
+from src.orchestration.workflow import ResearchWorkflow
+from src.utils.concurrency import llm_limiter
+
+PHASES = ["deep_research", "clarification", "decomposition", "solving", "synthesis"]
+
+
+class JobStatus(str, Enum):
+    """Lifecycle status of a job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+TERMINAL_STATUSES = {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+
+@dataclass
+class Job:
+    """A hypothesis submitted to the service."""
+
+    id: str
+    hypothesis: str
+    priority: int = 0
+    deep_research: bool = True
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    phases: dict[str, dict] = field(default_factory=dict)
+    plan_markdown: str | None = None
+    final_plan: dict | None = None
+    error: str | None = None
+    events: list[dict] = field(default_factory=list)
+
+    def to_dict(self, include_result: bool = False) -> dict:
+        """JSON-serializable view of the job."""
+        data = {
+            "id": self.id,
+            "hypothesis": self.hypothesis,
+            "priority": self.priority,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "phases": self.phases,
+            "error": self.error,
+        }
+        if include_result:
+            data["plan_markdown"] = self.plan_markdown
+            data["final_plan"] = self.final_plan
+        return data
+
+
+class ResearchService:
+    """
+    Priority job queue with a bounded worker pool over a warm workflow.
+
+    Higher ``priority`` values run first; equal priorities run in submission
+    order. Progress is published as events that can be polled via
+    ``get_job`` or streamed via ``stream_events``.
+    """
+
+    MAX_FINISHED_JOBS = 200  # Finished jobs retained for polling
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        workflow: ResearchWorkflow | None = None,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            workers: Number of concurrent jobs (defaults to settings.serve_workers)
+            workflow: Workflow to reuse (built once if not given)
+        """
+        self.worker_count = max(1, workers or settings.serve_workers)
+        self.workflow = workflow or ResearchWorkflow()
+        self.jobs: dict[str, Job] = {}
+        self._queue: asyncio.PriorityQueue | None = None
+        self._sequence = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self._running: dict[str, asyncio.Task] = {}
+        self._changed: asyncio.Event | None = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        """Create the queue and launch the worker pool."""
+        self._queue = asyncio.PriorityQueue()
+        self._changed = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.worker_count)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel running jobs and stop all workers."""
+        self._stopping = True
+        for task in list(self._running.values()):
+            task.cancel()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def submit(
+        self, hypothesis: str, priority: int = 0, deep_research: bool = True
+    ) -> Job:
+        """
+        Queue a hypothesis for processing.
+
+        Args:
+            hypothesis: Research hypothesis text
+            priority: Higher runs first
+            deep_research: Whether to run Phase 1 for this job
+
+        Returns:
+            The queued Job
+        """
+        job = Job(
+            id=uuid4().hex,
+            hypothesis=hypothesis,
+            priority=priority,
+            deep_research=deep_research,
+            phases={phase: {"status": "pending"} for phase in PHASES},
+        )
+        self.jobs[job.id] = job
+        self._prune_finished()
+        await self._queue.put((-priority, next(self._sequence), job.id))
+        self._emit(job, "queued", {"priority": priority})
+        return job
+
+    def get_job(self, job_id: str) -> Job | None:
+        """Return a job by ID."""
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> list[Job]:
+        """Return all retained jobs, newest first."""
+        return sorted(self.jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    async def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        Returns:
+            True if the job was cancelled, False if unknown or already finished
+        """
+        job = self.jobs.get(job_id)
+        if not job or job.status in TERMINAL_STATUSES:
+            return False
+
+        task = self._running.get(job_id)
+        if task:
+            task.cancel()
+        else:
+            self._finish(job, JobStatus.CANCELLED)
+        return True
+
+    def stats(self) -> dict:
+        """Service health and load figures."""
+        counts = {status.value: 0 for status in JobStatus}
+        for job in self.jobs.values():
+            counts[job.status.value] += 1
+        return {
+            "workers": self.worker_count,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "jobs": counts,
+            "llm_calls_in_flight": llm_limiter.in_flight,
+            "llm_call_budget": llm_limiter.limit,
+        }
+
+    async def stream_events(self, job_id: str) -> AsyncIterator[dict]:
+        """
+        Yield a job's events as they are published, ending when it finishes.
+
+        Events already published are replayed first.
+        """
+        job = self.jobs.get(job_id)
+        if not job:
+            return
+
+        sent = 0
+        while True:
+            pending = job.events[sent:]
+            for event in pending:
+                yield event
+            sent += len(pending)
+            if job.status in TERMINAL_STATUSES and sent >= len(job.events):
+                return
+            if len(job.events) == sent:
+                await self._changed.wait()
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    async def _worker(self, worker_id: int) -> None:
+        """Pull jobs off the queue forever."""
+        while True:
+            _, _, job_id = await self._queue.get()
+            try:
+                job = self.jobs.get(job_id)
+                if not job or job.status != JobStatus.QUEUED:
+                    continue
+                task = asyncio.create_task(self._run_job(job))
+                self._running[job.id] = task
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    # Either this job was cancelled (keep working) or the
+                    # service is stopping (propagate)
+                    if self._stopping:
+                        raise
+                finally:
+                    self._running.pop(job.id, None)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job: Job) -> None:
+        """Run one job through the shared workflow."""
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        self._emit(job, "started", {})
+
+        def on_phase(phase: str, status: str) -> None:
+            now = time.time()
+            entry = job.phases.setdefault(phase, {})
+            entry["status"] = status
+            entry["started_at" if status == "started" else "finished_at"] = now
+            self._emit(job, "phase", {"phase": phase, "status": status})
+
+        try:
+            output = await self.workflow.run(
+                job.hypothesis,
+                show_progress=False,
+                deep_research=job.deep_research,
+                progress_callback=on_phase,
+            )
+        except asyncio.CancelledError:
+            self._finish(job, JobStatus.CANCELLED)
+            raise
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            self._finish(job, JobStatus.FAILED)
+            return
+
+        job.plan_markdown = output.plan_markdown
+        job.final_plan = output.final_plan.model_dump(mode="json")
+        self._finish(job, JobStatus.SUCCEEDED)
+
+    def _finish(self, job: Job, status: JobStatus) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        details: dict[str, Any] = {}
+        if job.error:
+            details["error"] = job.error
+        if job.started_at:
+            details["wall_seconds"] = round(job.finished_at - job.started_at, 2)
+        self._emit(job, status.value, details)
+
+    def _emit(self, job: Job, event_type: str, data: dict) -> None:
+        """Publish an event and wake every stream waiting for one."""
+        job.events.append(
+            {"seq": len(job.events), "type": event_type, "time": time.time(), **data}
+        )
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _prune_finished(self) -> None:
+        finished = [j for j in self.jobs.values() if j.status in TERMINAL_STATUSES]
+        if len(finished) <= self.MAX_FINISHED_JOBS:
+            return
+        finished.sort(key=lambda j: j.finished_at or 0)
+        for job in finished[: len(finished) - self.MAX_FINISHED_JOBS]:
+            del self.jobs[job.id]
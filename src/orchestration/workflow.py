@@ -7,25 +7,33 @@ from hypothesis to final research plan.
 Owner: [ASSIGN TEAMMATE]
 """
 
+from typing import Callable
 from uuid import UUID
+
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+from src.agents.aggregator import AggregatorAgent, AggregatorInput
+from src.agents.deep_researcher import DeepResearcherAgent
+from src.agents.plan_synthesizer import (
+    PlanSynthesizerAgent,
+    PlanSynthesizerInput,
+    PlanSynthesizerOutput,
+)
+from src.agents.proposer import ProposerAgent, ProposerInput
+from src.agents.requirement_decomposer import RequirementDecomposerAgent
+from src.agents.retriever import RetrieverAgent, RetrieverAgentInput
 from src.config import settings
 from src.models.hypothesis import Hypothesis
 from src.models.requirement import Requirement, RequirementGraph, RequirementStatus
-from src.models.research_plan import ResearchPlan
 from src.models.solution import Solution, SolutionSource
-
-from src.agents.deep_researcher import DeepResearcherAgent
-from src.agents.requirement_decomposer import RequirementDecomposerAgent
-from src.agents.proposer import ProposerAgent, ProposerInput
-from src.agents.aggregator import AggregatorAgent, AggregatorInput
-from src.agents.plan_synthesizer import PlanSynthesizerAgent
-from src.agents.retriever import RetrieverAgent, RetrieverAgentInput
+from src.utils.telemetry import tracer
 
 console = Console()
 
+# Called as progress_callback(phase, status) with status "started" or "completed"
+ProgressCallback = Callable[[str, str], None]
+
 
 class ResearchWorkflow:
     """
@@ -36,6 +44,9 @@ class ResearchWorkflow:
     2. Requirement Decomposition - Build requirement graph with deduplication
     3. Bottom-up Solving - Level-by-level solving from leaves to root
     4. Synthesis - Generate final research plan
+
+    A single instance can run several hypotheses concurrently: agents are
+    stateless between calls and share the stores from the resource registry.
     """
 
     def __init__(self):
@@ -49,36 +60,66 @@ class ResearchWorkflow:
             ProposerAgent(i) for i in range(settings.proposer_count)
         ]
 
-    async def run(self, hypothesis_text: str) -> ResearchPlan:
+    async def run(
+        self,
+        hypothesis_text: str,
+        show_progress: bool = True,
+        deep_research: bool = True,
+        progress_callback: ProgressCallback | None = None,
+    ) -> PlanSynthesizerOutput:
         """
         Execute the complete research workflow.
 
         Args:
             hypothesis_text: The user's research hypothesis
+            show_progress: Whether to render the live progress display
+                (disable when several runs share the terminal)
+            deep_research: Whether to run Phase 1; when False the raw
+                hypothesis is decomposed directly
+            progress_callback: Optional hook notified when each phase starts
+                and completes (used by the local service for job progress)
 
         Returns:
-            Complete ResearchPlan
+            PlanSynthesizerOutput with the final plan and PLAN.md markdown
         """
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
+            disable=not show_progress,
         ) as progress:
+
+            def start(phase: str, description: str):
+                if progress_callback:
+                    progress_callback(phase, "started")
+                return progress.add_task(description, total=None)
+
+            def finish(phase: str, task) -> None:
+                progress.update(task, completed=True)
+                if progress_callback:
+                    progress_callback(phase, "completed")
+
             # Phase 1: Deep Research
-            task = progress.add_task("Phase 1: Deep Research...", total=None)
-            hypothesis = await self._phase_deep_research(hypothesis_text)
-            progress.update(task, completed=True)
+            task = start("deep_research", "Phase 1: Deep Research...")
+            with tracer.phase("deep_research"):
+                if deep_research:
+                    hypothesis = await self._phase_deep_research(hypothesis_text)
+                else:
+                    hypothesis = Hypothesis(original_text=hypothesis_text)
+            finish("deep_research", task)
 
             # Phase 2: User Clarification (if needed)
             if hypothesis.clarifying_questions:
-                task = progress.add_task("Phase 2: Getting clarifications...", total=None)
-                hypothesis = await self._phase_clarification(hypothesis)
-                progress.update(task, completed=True)
+                task = start("clarification", "Phase 2: Getting clarifications...")
+                with tracer.phase("clarification"):
+                    hypothesis = await self._phase_clarification(hypothesis)
+                finish("clarification", task)
 
             # Phase 3: Requirement Decomposition (now builds graph with deduplication)
-            task = progress.add_task("Phase 3: Decomposing requirements...", total=None)
-            req_graph = await self._phase_decomposition(hypothesis)
-            progress.update(task, completed=True)
+            task = start("decomposition", "Phase 3: Decomposing requirements...")
+            with tracer.phase("decomposition"):
+                req_graph = await self._phase_decomposition(hypothesis)
+            finish("decomposition", task)
 
             console.print(
                 f"[green]Graph built: {req_graph.total_nodes} nodes, "
@@ -87,17 +128,16 @@ class ResearchWorkflow:
             )
 
             # Phase 4: Bottom-up Solving (combines context search, solving, aggregation)
-            task = progress.add_task("Phase 4: Bottom-up solving...", total=None)
-            solutions = await self._phase_bottom_up_solving(req_graph)
-            progress.update(task, completed=True)
-
-            # Root solution is the final aggregation
-            root_solution = solutions.get(req_graph.root_id)
+            task = start("solving", "Phase 4: Bottom-up solving...")
+            with tracer.phase("solving"):
+                solutions = await self._phase_bottom_up_solving(req_graph)
+            finish("solving", task)
 
             # Phase 5: Plan Synthesis
-            task = progress.add_task("Phase 5: Synthesizing research plan...", total=None)
-            plan = await self._phase_synthesis(hypothesis, root_solution)
-            progress.update(task, completed=True)
+            task = start("synthesis", "Phase 5: Synthesizing research plan...")
+            with tracer.phase("synthesis"):
+                plan = await self._phase_synthesis(hypothesis, req_graph, solutions)
+            finish("synthesis", task)
 
         return plan
 
@@ -152,39 +192,40 @@ class ResearchWorkflow:
                 )
                 continue
 
-            # Check RAG for existing solution
-            retrieval_result = await self.retriever.execute(
-                RetrieverAgentInput(query=req.content, top_k=5)
-            )
-
-            if retrieval_result.success and retrieval_result.chunks:
-                # Found relevant existing knowledge - create solution from it
-                solution = Solution(
-                    requirement_id=req.id,
-                    content=retrieval_result.chunks,
-                    reasoning_chain=[
-                        f"Retrieved from: {', '.join(retrieval_result.sources)}"
-                    ],
-                    source=SolutionSource.EXISTING,
-                    confidence=0.7,
-                )
-            else:
-                # Generate novel solution
-                context = retrieval_result.chunks if retrieval_result.success else ""
-                proposer = self.proposers[0]
-                result = await proposer.execute(
-                    ProposerInput(requirement=req, context=context)
+            with tracer.node(req.id):
+                # Check RAG for existing solution
+                retrieval_result = await self.retriever.execute(
+                    RetrieverAgentInput(query=req.content, top_k=5)
                 )
-                solution = result.solution
+
+                if retrieval_result.success and retrieval_result.chunks:
+                    # Found relevant existing knowledge - create solution from it
+                    solution = Solution(
+                        requirement_id=req.id,
+                        content=retrieval_result.chunks,
+                        reasoning_chain=[
+                            f"Retrieved from: {', '.join(retrieval_result.sources)}"
+                        ],
+                        source=SolutionSource.EXISTING,
+                        confidence=0.7,
+                    )
+                else:
+                    # Generate novel solution
+                    context = retrieval_result.chunks if retrieval_result.success else ""
+                    proposer = self.proposers[0]
+                    result = await proposer.execute(
+                        ProposerInput(requirement=req, context=context)
+                    )
+                    solution = result.solution
 
             solutions[req.id] = solution
             req.solution_id = solution.id
-            req.status = RequirementStatus.SOLVED
+            graph.set_status(req.id, RequirementStatus.SOLVED)
 
         # Step 2: Bottom-up aggregation level by level
         for level in range(graph.max_depth - 1, -1, -1):
             level_nodes = graph.get_level_nodes(level)
-            non_leaf_nodes = [n for n in level_nodes if graph.get_children(n.id)]
+            non_leaf_nodes = [n for n in level_nodes if graph.out_degree(n.id)]
 
             if non_leaf_nodes:
                 console.print(
@@ -218,29 +259,39 @@ class ResearchWorkflow:
                         unique_solutions.append(sol)
                         seen_ids.add(sol.id)
 
-                # Get additional context
-                retrieval_result = await self.retriever.execute(
-                    RetrieverAgentInput(query=node.content, top_k=5)
-                )
-                knowledge = retrieval_result.chunks if retrieval_result.success else ""
-
-                # Aggregate
-                agg_result = await self.aggregator.execute(
-                    AggregatorInput(
-                        parent_requirement=node,
-                        child_solutions=unique_solutions,
-                        knowledge=knowledge,
+                with tracer.node(node.id):
+                    # Get additional context
+                    retrieval_result = await self.retriever.execute(
+                        RetrieverAgentInput(query=node.content, top_k=5)
+                    )
+                    knowledge = retrieval_result.chunks if retrieval_result.success else ""
+
+                    # Aggregate
+                    agg_result = await self.aggregator.execute(
+                        AggregatorInput(
+                            parent_requirement=node,
+                            child_solutions=unique_solutions,
+                            knowledge=knowledge,
+                        )
                     )
-                )
 
                 solutions[node.id] = agg_result.solution
                 node.solution_id = agg_result.solution.id
-                node.status = RequirementStatus.SOLVED
+                graph.set_status(node.id, RequirementStatus.SOLVED)
 
         return solutions
 
     async def _phase_synthesis(
-        self, hypothesis: Hypothesis, root_solution: Solution | None
-    ) -> ResearchPlan:
+        self,
+        hypothesis: Hypothesis,
+        graph: RequirementGraph,
+        solutions: dict[UUID, Solution],
+    ) -> PlanSynthesizerOutput:
         """Phase 5: Synthesize final research plan."""
-        return await self.synthesizer.execute(hypothesis, root_solution)
+        return await self.synthesizer.execute(
+            PlanSynthesizerInput(
+                hypothesis=hypothesis,
+                graph=graph,
+                solutions=solutions,
+            )
+        )
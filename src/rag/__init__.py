@@ -4,15 +4,28 @@ RAG (Retrieval-Augmented Generation) module.
 Handles literature storage, embedding generation, and context retrieval.
 """
 
-from src.rag.literature_store import LiteratureStore, RetrievalResult
-from src.rag.embeddings import EmbeddingService, SparseEmbeddingService
-from src.rag.requirement_store import RequirementStore, RequirementCandidate
+from src.rag.context_assembly import AssembledContext, ContextSpan, assemble_context
+from src.rag.embeddings import EmbeddingService, FastEmbedEmbeddingService, SparseEmbeddingService
+from src.rag.literature_store import IncrementalIngestor, LiteratureStore, RetrievalResult
+from src.rag.plan_item_store import LabeledPlanItem, PlanItemNeighbor, PlanItemStore
+from src.rag.registry import ResourceRegistry, registry
+from src.rag.requirement_store import RequirementCandidate, RequirementStore
 
 __all__ = [
     "LiteratureStore",
     "RetrievalResult",
+    "IncrementalIngestor",
+    "AssembledContext",
+    "ContextSpan",
+    "assemble_context",
     "EmbeddingService",
+    "FastEmbedEmbeddingService",
     "SparseEmbeddingService",
     "RequirementStore",
     "RequirementCandidate",
+    "PlanItemStore",
+    "LabeledPlanItem",
+    "PlanItemNeighbor",
+    "ResourceRegistry",
+    "registry",
 ]
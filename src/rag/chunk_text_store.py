@@ -0,0 +1,235 @@
+"""
+Append-only, memory-mapped store of chunk texts keyed by chunk ID.
+
+With ``LITERATURE_TEXT_STORE_PATH`` set, the literature collection keeps only
+the small payload fields (IDs, offsets, headings, title) in Qdrant and the
+chunk text here. Qdrant then holds less in memory, each search transfers less,
+and text is read only for the results finally returned.
+
+Layout of the directory:
+
+- ``chunks.dat``: records of ``<chunk UUID (16 bytes)><length (4 bytes)><UTF-8 text>``,
+  only ever appended to. A replaced chunk gets a new record.
+- ``chunks.idx``: a header with a random generation ID, then fixed-size
+  records ``<chunk UUID><text offset (8 bytes)><length (4 bytes)>``
+  appended after the data they point to. A length of -1 marks a deletion.
+
+Reads go through an ``mmap`` of the data file. The index is loaded into a
+dict on open. Records appended later, including by another process, are
+picked up when a lookup misses. The index can always be rebuilt from the data
+file, which is what ``compact`` relies on. Compaction replaces both files and
+starts a new generation; a handle that finds another generation in the index
+header reloads the index from the start and remaps the data file.
+Only one process should write at a time, as with the embedded Qdrant backend.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Iterable
+from uuid import UUID, uuid4
+
+DATA_HEADER = struct.Struct("<16sI")  # chunk UUID, text length in bytes
+INDEX_RECORD = struct.Struct("<16sQi")  # chunk UUID, text offset, length (-1: deleted)
+INDEX_HEADER = struct.Struct("<8s16s")  # magic, generation ID (new on every rebuild)
+INDEX_MAGIC = b"CHUNKIDX"
+DELETED = -1
+
+
+class ChunkTextStore:
+    """Chunk texts in an append-only file with an offset index."""
+
+    DATA_FILE = "chunks.dat"
+    INDEX_FILE = "chunks.idx"
+
+    def __init__(self, directory: str | Path):
+        """
+        Open (or create) the store.
+
+        Args:
+            directory: Directory holding the data and index files
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._data_path = self.directory / self.DATA_FILE
+        self._index_path = self.directory / self.INDEX_FILE
+        self._data_path.touch()
+        self._offsets: dict[UUID, tuple[int, int]] = {}
+        self._index_size = 0
+        self._generation: bytes | None = None  # Generation of the index the offsets came from
+        self._map: mmap.mmap | None = None
+        self._lock = threading.Lock()
+        if self._read_generation() is None:
+            self._rebuild_index()  # Missing, or written without a header
+        self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, chunk_id: UUID) -> bool:
+        return chunk_id in self._offsets
+
+    def _read_generation(self, f=None) -> bytes | None:
+        """Generation ID in the index header (None if there is no valid header)."""
+        if f is None:
+            try:
+                with open(self._index_path, "rb") as f:
+                    return self._read_generation(f)
+            except FileNotFoundError:
+                return None
+        header = f.read(INDEX_HEADER.size)
+        if len(header) < INDEX_HEADER.size:
+            return None
+        magic, generation = INDEX_HEADER.unpack(header)
+        return generation if magic == INDEX_MAGIC else None
+
+    def _load_index(self) -> None:
+        """Read index records appended since the last load, or all of them after a compaction."""
+        try:
+            f = open(self._index_path, "rb")
+        except FileNotFoundError:
+            return  # Another handle is compacting; keep the current view
+        with f:
+            generation = self._read_generation(f)
+            if generation is None:
+                return
+            if generation != self._generation:
+                # A new index goes with a new data file: start over
+                self._offsets.clear()
+                self._index_size = INDEX_HEADER.size
+                self._generation = generation
+                if self._map is not None:
+                    self._map.close()
+                    self._map = None
+            f.seek(self._index_size)
+            data = f.read()
+        usable = len(data) - len(data) % INDEX_RECORD.size  # Ignore a record still being written
+        for raw_id, offset, length in INDEX_RECORD.iter_unpack(data[:usable]):
+            if length == DELETED:
+                self._offsets.pop(UUID(bytes=raw_id), None)
+            else:
+                self._offsets[UUID(bytes=raw_id)] = (offset, length)
+        self._index_size += usable
+
+    def _rebuild_index(self) -> None:
+        """Write a fresh index from the data file (the last record of each chunk wins)."""
+        offsets: dict[bytes, tuple[int, int]] = {}
+        with open(self._data_path, "rb") as f:
+            data = f.read()
+        position = 0
+        while position + DATA_HEADER.size <= len(data):
+            raw_id, length = DATA_HEADER.unpack_from(data, position)
+            start = position + DATA_HEADER.size
+            if start + length > len(data):
+                break  # Truncated final record
+            offsets[raw_id] = (start, length)
+            position = start + length
+        partial = self._index_path.with_suffix(".idx.tmp")
+        partial.write_bytes(
+            INDEX_HEADER.pack(INDEX_MAGIC, uuid4().bytes)
+            + b"".join(INDEX_RECORD.pack(raw_id, *entry) for raw_id, entry in offsets.items())
+        )
+        os.replace(partial, self._index_path)
+
+    def _view(self, end: int) -> mmap.mmap:
+        """Memory map of the data file covering at least ``end`` bytes."""
+        if self._map is None or len(self._map) < end:
+            if self._map is not None:
+                self._map.close()
+            with open(self._data_path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def put_many(self, texts: Iterable[tuple[UUID, str]]) -> None:
+        """Append texts, replacing earlier ones with the same chunk IDs."""
+        encoded = [(chunk_id, text.encode("utf-8")) for chunk_id, text in texts]
+        if not encoded:
+            return
+        with self._lock:
+            self._load_index()
+            with open(self._data_path, "ab") as f:
+                position = f.seek(0, os.SEEK_END)
+                records, entries = [], []
+                for chunk_id, data in encoded:
+                    records.append(DATA_HEADER.pack(chunk_id.bytes, len(data)))
+                    records.append(data)
+                    position += DATA_HEADER.size
+                    entries.append((chunk_id, position, len(data)))
+                    position += len(data)
+                f.write(b"".join(records))
+            # The index is written after the data, so it never points past the end of the file
+            with open(self._index_path, "ab") as f:
+                f.write(b"".join(
+                    INDEX_RECORD.pack(c.bytes, offset, length) for c, offset, length in entries
+                ))
+                self._index_size += len(entries) * INDEX_RECORD.size
+            for chunk_id, offset, length in entries:
+                self._offsets[chunk_id] = (offset, length)
+
+    def get_many(self, chunk_ids: Iterable[UUID]) -> dict[UUID, str]:
+        """Texts of the given chunks; unknown IDs are left out."""
+        chunk_ids = list(chunk_ids)
+        with self._lock:
+            stale = self._read_generation() not in (self._generation, None)
+            if stale or any(chunk_id not in self._offsets for chunk_id in chunk_ids):
+                self._load_index()
+            found = [(c, self._offsets[c]) for c in chunk_ids if c in self._offsets]
+            if not found:
+                return {}
+            view = self._view(max(offset + length for _, (offset, length) in found))
+            return {
+                c: view[offset:offset + length].decode("utf-8") for c, (offset, length) in found
+            }
+
+    def delete_many(self, chunk_ids: Iterable[UUID]) -> None:
+        """Forget chunks; their text stays in the data file until ``compact``."""
+        with self._lock:
+            self._load_index()
+            deleted = [c for c in chunk_ids if self._offsets.pop(c, None) is not None]
+            if deleted:
+                with open(self._index_path, "ab") as f:
+                    f.write(b"".join(INDEX_RECORD.pack(c.bytes, 0, DELETED) for c in deleted))
+                    self._index_size += len(deleted) * INDEX_RECORD.size
+
+    def garbage_ratio(self) -> float:
+        """Share of the data file taken by replaced or deleted texts."""
+        with self._lock:
+            self._load_index()
+        total = self._data_path.stat().st_size
+        live = sum(DATA_HEADER.size + length for _, length in self._offsets.values())
+        return 1 - live / total if total else 0.0
+
+    def compact(self) -> None:
+        """
+        Rewrite the data file with only the live texts.
+
+        The index is removed before the data file is replaced and rebuilt
+        afterwards, so an interrupted compaction leaves a data file the next
+        open re-indexes.
+        """
+        with self._lock:
+            self._load_index()
+            view = self._view(self._data_path.stat().st_size) if self._offsets else None
+            partial = self._data_path.with_suffix(".dat.tmp")
+            with open(partial, "wb") as f:
+                for chunk_id, (offset, length) in self._offsets.items():
+                    f.write(DATA_HEADER.pack(chunk_id.bytes, length))
+                    f.write(view[offset:offset + length])
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._index_path.unlink(missing_ok=True)
+            os.replace(partial, self._data_path)
+            self._rebuild_index()
+            self._load_index()  # A new generation: reloaded from the start
+
+    def close(self) -> None:
+        """Release the memory map."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
@@ -0,0 +1,249 @@
+"""
+Context assembly for retrieved chunks.
+
+Turns ranked retrieval results into prompt context: neighbouring chunks of
+the same document are merged into one span (their overlapping windows are
+stored once), near-duplicate spans from different documents are dropped in
+favour of the better-ranked one, and the spans are packed into a token
+budget with a source line on each.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable
+from uuid import UUID
+
+from src.rag.literature_store import RetrievalResult
+from src.utils.context_packing import PackCandidate, pack_context
+
+# Spans whose word shingles overlap at least this much (relative to the
+# smaller span) are near-duplicates
+DUPLICATE_THRESHOLD = 0.85
+
+# Words per shingle for near-duplicate detection
+SHINGLE_SIZE = 3
+
+# Chunks of one document separated by at most this many characters
+# (whitespace between stripped chunks) are merged into one span
+MAX_GAP_CHARS = 2
+
+# Shortest suffix/prefix match accepted as the overlap between two chunks
+# that carry no character offsets
+MIN_OVERLAP_CHARS = 20
+
+WORD = re.compile(r"\w+")
+
+
+@dataclass
+class ContextSpan:
+    """A contiguous passage of one document built from one or more hits."""
+
+    document_id: UUID
+    title: str
+    content: str
+    score: float
+    heading_path: list[str] = field(default_factory=list)
+    chunk_indices: list[int] = field(default_factory=list)
+    start: int | None = None  # Character offsets into the document, if known
+    end: int | None = None
+    duplicates: list[str] = field(default_factory=list)  # Titles of dropped near-duplicates
+
+    @property
+    def source(self) -> str:
+        """Attribution line: title and heading path."""
+        path = " > ".join(self.heading_path)
+        return f"{self.title} > {path}" if path else self.title
+
+
+@dataclass
+class AssembledContext:
+    """Packed context text and the spans it was built from."""
+
+    text: str
+    spans: list[ContextSpan] = field(default_factory=list)  # Included, in rank order
+    omitted: list[ContextSpan] = field(default_factory=list)
+    tokens: int = 0
+    chunks: int = 0  # Retrieval results the spans were built from
+
+    @property
+    def sources(self) -> list[str]:
+        """Distinct document titles of the included spans (and their duplicates)."""
+        titles = [s.title for s in self.spans] + [t for s in self.spans for t in s.duplicates]
+        return list(dict.fromkeys(titles))
+
+
+def _common_prefix(paths: list[list[str]]) -> list[str]:
+    prefix = list(paths[0]) if paths else []
+    for path in paths[1:]:
+        while prefix and path[: len(prefix)] != prefix:
+            prefix.pop()
+    return prefix
+
+
+def _text_overlap(left: str, right: str) -> int:
+    """Length of the longest suffix of ``left`` that is a prefix of ``right``."""
+    probe = right[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return 0
+    position = left.find(probe, max(0, len(left) - len(right)))
+    while position >= 0:
+        if right.startswith(left[position:]):
+            return len(left) - position
+        position = left.find(probe, position + 1)
+    return 0
+
+
+def _span(result: RetrievalResult) -> ContextSpan:
+    chunk = result.chunk
+    return ContextSpan(
+        document_id=chunk.document_id,
+        title=result.document_title,
+        content=chunk.content,
+        score=result.score,
+        heading_path=list(chunk.metadata.get("heading_path", [])),
+        chunk_indices=[chunk.chunk_index],
+        start=chunk.metadata.get("char_start"),
+        end=chunk.metadata.get("char_end"),
+    )
+
+
+def _join(left: ContextSpan, right: ContextSpan) -> bool:
+    """Append ``right`` to ``left`` if they are adjacent or overlapping; return whether it was."""
+    if left.start is not None and right.start is not None:
+        if right.start > left.end + MAX_GAP_CHARS:
+            return False
+        if right.end <= left.end:
+            pass  # Contained
+        elif right.start >= left.end:
+            left.content += "\n" * (right.start - left.end) + right.content
+        else:
+            left.content += right.content[left.end - right.start:]
+        left.end = max(left.end, right.end)
+    else:
+        if right.chunk_indices[0] != left.chunk_indices[-1] + 1:
+            return False
+        overlap = _text_overlap(left.content, right.content)
+        left.content += right.content[overlap:] if overlap else "\n\n" + right.content
+
+    left.score = max(left.score, right.score)
+    left.chunk_indices.extend(right.chunk_indices)
+    left.heading_path = _common_prefix([left.heading_path, right.heading_path])
+    return True
+
+
+def merge_adjacent(results: list[RetrievalResult]) -> list[ContextSpan]:
+    """
+    Merge hits from the same document that overlap or touch.
+
+    Hits with character offsets are merged on them; older chunks without
+    offsets are merged when their ``chunk_index`` values are consecutive,
+    removing the overlapping window text.
+
+    Args:
+        results: Retrieval results
+
+    Returns:
+        Spans ranked by their best hit's score
+    """
+    by_document: dict[UUID, list[ContextSpan]] = {}
+    for result in results:
+        by_document.setdefault(result.chunk.document_id, []).append(_span(result))
+
+    spans = []
+    for members in by_document.values():
+        members.sort(key=lambda s: (s.start if s.start is not None else -1, s.chunk_indices[0]))
+        merged = [members[0]]
+        for span in members[1:]:
+            if not _join(merged[-1], span):
+                merged.append(span)
+        spans.extend(merged)
+    return sorted(spans, key=lambda s: s.score, reverse=True)
+
+
+def _shingles(text: str) -> set[tuple[str, ...]]:
+    words = WORD.findall(text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {tuple(words)}
+    return {tuple(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def drop_near_duplicates(
+    spans: list[ContextSpan], threshold: float = DUPLICATE_THRESHOLD
+) -> list[ContextSpan]:
+    """
+    Drop spans whose text is mostly contained in a better-ranked span.
+
+    The kept span records the dropped span's title so attribution survives.
+
+    Args:
+        spans: Spans in rank order
+        threshold: Shared shingles relative to the smaller span
+
+    Returns:
+        The kept spans, in rank order
+    """
+    kept: list[tuple[ContextSpan, set]] = []
+    for span in spans:
+        shingles = _shingles(span.content)
+        for other, other_shingles in kept:
+            smaller = min(len(shingles), len(other_shingles)) or 1
+            if len(shingles & other_shingles) / smaller >= threshold:
+                if span.title != other.title and span.title not in other.duplicates:
+                    other.duplicates.append(span.title)
+                break
+        else:
+            kept.append((span, shingles))
+    return [span for span, _ in kept]
+
+
+def _render(span: ContextSpan, text: str) -> str:
+    return f"[Source: {span.source}]\n{text}"
+
+
+def assemble_context(
+    results: list[RetrievalResult],
+    budget: int,
+    count_tokens: Callable[[str], int],
+    duplicate_threshold: float = DUPLICATE_THRESHOLD,
+) -> AssembledContext:
+    """
+    Build prompt context from retrieval results.
+
+    Adjacent hits are merged, near-duplicates dropped, and the spans packed
+    into ``budget`` tokens: spans that do not fit in full are reduced to
+    their first sentence, and the rest are left out.
+
+    Args:
+        results: Retrieval results in rank order
+        budget: Token budget for the context
+        count_tokens: Token counter
+        duplicate_threshold: See ``drop_near_duplicates``
+
+    Returns:
+        AssembledContext with the text and the included/omitted spans
+    """
+    spans = drop_near_duplicates(merge_adjacent(results), duplicate_threshold)
+
+    candidates = []
+    for rank, span in enumerate(spans):
+        first_sentence = span.content.split(". ")[0].strip()[:160]
+        candidates.append(PackCandidate(
+            full=_render(span, span.content),
+            digest=_render(span, first_sentence + "..."),
+            priority=-rank,
+            key=span,
+        ))
+    packed = pack_context(candidates, budget, count_tokens)
+
+    included = sorted(packed.full + packed.digests, key=lambda c: c.priority, reverse=True)
+    in_full = {id(c) for c in packed.full}
+    texts = [c.full if id(c) in in_full else c.digest for c in included]
+    return AssembledContext(
+        text="\n\n".join(texts),
+        spans=[c.key for c in included],
+        omitted=[c.key for c in packed.omitted],
+        tokens=packed.tokens,
+        chunks=len(results),
+    )
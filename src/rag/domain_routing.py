@@ -0,0 +1,121 @@
+"""
+Domain tagging, query routing and client-side fusion for literature search.
+
+The specs corpus is split into subdomains (``data/specs/<domain>/``). Every
+chunk gets a ``domain`` payload field at ingestion, derived from its source
+path. Chunks outside the specs, such as deep-research reports, get
+``GENERAL_DOMAIN``.
+
+``DomainRouter`` keeps one unit centroid of dense vectors per spec domain. A
+query goes to the closest domain and to every other domain within ``margin``
+of it, so ambiguous queries fan out and clear ones search one slice.
+General chunks are always searched.
+
+With per-domain collections, the store searches several collections and
+merges their hits with ``dbsf_fuse``. It applies the same distribution-based
+score fusion Qdrant uses within one collection, over the dense and sparse
+candidates of all of them.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import statistics
+from pathlib import PurePath
+from typing import Any
+
+import numpy as np
+
+DOMAINS = ("dosimetry", "radiation-shielding", "system-engineering")
+GENERAL_DOMAIN = "general"
+
+
+def domain_of(source: str) -> str:
+    """Spec domain of a source path (``.../specs/<domain>/...``), or ``GENERAL_DOMAIN``."""
+    parts = PurePath(source).parts
+    for i, part in enumerate(parts[:-1]):
+        if part == "specs" and parts[i + 1] in DOMAINS:
+            return parts[i + 1]
+    return GENERAL_DOMAIN
+
+
+def domain_collection(base: str, domain: str) -> str:
+    """Name of the per-domain collection for ``domain`` (general chunks stay in ``base``)."""
+    if domain == GENERAL_DOMAIN:
+        return base
+    return f"{base}_{domain.replace('-', '_')}"
+
+
+class DomainRouter:
+    """Routes a query embedding to the spec domains it is closest to."""
+
+    def __init__(self, margin: float = 0.05):
+        """
+        Initialize the router.
+
+        Args:
+            margin: Domains whose centroid similarity is within this of the
+                best one are searched too
+        """
+        self.margin = margin
+        self.centroids: dict[str, np.ndarray] = {}
+
+    def fit(self, vectors: dict[str, list[list[float]]]) -> None:
+        """Compute the centroid of each domain's dense vectors, dropping domains without any."""
+        self.centroids = {}
+        for domain, rows in vectors.items():
+            if not rows:
+                continue
+            array = np.asarray(rows, dtype=np.float32)
+            array /= np.maximum(np.linalg.norm(array, axis=1, keepdims=True), 1e-12)
+            centroid = array.mean(axis=0)
+            self.centroids[domain] = centroid / max(float(np.linalg.norm(centroid)), 1e-12)
+
+    def route(self, vector: list[float]) -> list[str] | None:
+        """
+        Spec domains to search for a query embedding, best first.
+
+        Returns:
+            The closest domain and those within ``margin`` of it, or None
+            (search everything) before any domain has been fitted
+        """
+        if not self.centroids:
+            return None
+        query = np.asarray(vector, dtype=np.float32)
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+        scores = {domain: float(centroid @ query) for domain, centroid in self.centroids.items()}
+        best = max(scores.values())
+        close = [domain for domain, score in scores.items() if score >= best - self.margin]
+        return sorted(close, key=lambda domain: -scores[domain])
+
+
+def dbsf_fuse(ranked_lists: list[list[Any]], limit: int) -> list[Any]:
+    """
+    Distribution-based score fusion of scored points from several searches.
+
+    Each list's scores are normalized to ``mean ± 3 std`` and summed per
+    point ID, as Qdrant's ``Fusion.DBSF`` does. The returned points keep
+    their payload and carry the fused score.
+
+    Args:
+        ranked_lists: Scored points (``id``, ``score``) per search
+        limit: Number of points to return
+
+    Returns:
+        The best ``limit`` points by fused score
+    """
+    fused: dict[Any, float] = {}
+    points: dict[Any, Any] = {}
+    for ranked in ranked_lists:
+        if not ranked:
+            continue
+        scores = [point.score for point in ranked]
+        mean = statistics.fmean(scores)
+        spread = 3 * statistics.pstdev(scores)
+        for point in ranked:
+            normalized = 0.5 if spread == 0 else (point.score - (mean - spread)) / (2 * spread)
+            fused[point.id] = fused.get(point.id, 0.0) + normalized
+            known = points.get(point.id)
+            if known is None or (point.payload is not None and known.payload is None):
+                points[point.id] = point
+    best = sorted(fused, key=lambda point_id: -fused[point_id])[:limit]
+    return [points[point_id].model_copy(update={"score": fused[point_id]}) for point_id in best]
@@ -4,30 +4,51 @@ Embedding generation service.
 Owner: [ASSIGN TEAMMATE]
 """
 
+import threading
+from collections import OrderedDict
+
+from fastembed import SparseTextEmbedding, TextEmbedding
 from openai import OpenAI
-from fastembed import SparseTextEmbedding
 from qdrant_client.models import SparseVector
 
 from src.config import settings
+from src.utils.telemetry import tracer
+
+# Full output dimension of the OpenAI embedding models
+NATIVE_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
 
 
 class EmbeddingService:
     """
     Service for generating text embeddings using OpenAI.
 
-    Uses text-embedding-3-small by default for cost efficiency.
+    Uses text-embedding-3-small by default for cost efficiency. The
+    text-embedding-3 models can return shortened vectors (``dimension``
+    below the native size) that are still normalized and usable with cosine.
     """
 
-    def __init__(self, model: str = "text-embedding-3-small"):
+    def __init__(self, model: str | None = None, dimension: int | None = None):
         """
         Initialize the embedding service.
 
         Args:
-            model: The embedding model to use
+            model: The embedding model to use (default ``settings.embedding_model``)
+            dimension: Output dimension (default ``settings.embedding_dimensions``)
         """
-        self.model = model
+        self.model = model or settings.embedding_model
         self.client = OpenAI(api_key=settings.openai_api_key)
-        self.dimension = 1536  # Default for text-embedding-3-small
+        self.dimension = dimension or settings.embedding_dimensions
+        native = NATIVE_DIMENSIONS.get(self.model)
+        if native is not None and self.dimension > native:
+            raise ValueError(
+                f"{self.model} returns at most {native} dimensions, not {self.dimension}"
+            )
+        # Only ask for shortened vectors when needed (ada-002 rejects the parameter)
+        self._request_options = {"dimensions": self.dimension} if self.dimension != native else {}
 
     def embed(self, text: str) -> list[float]:
         """
@@ -39,10 +60,13 @@ class EmbeddingService:
         Returns:
             Embedding vector
         """
-        response = self.client.embeddings.create(
-            model=self.model,
-            input=text,
-        )
+        with tracer.span("embed:dense", "embedding", model=self.model, batch_size=1) as span:
+            response = self.client.embeddings.create(
+                model=self.model,
+                input=text,
+                **self._request_options,
+            )
+            span.record_usage(None, response.usage.prompt_tokens, 0)
         return response.data[0].embedding
 
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
@@ -57,23 +81,189 @@ class EmbeddingService:
         """
         if not texts:
             return []
-        response = self.client.embeddings.create(
+        with tracer.span(
+            "embed:dense", "embedding", model=self.model, batch_size=len(texts)
+        ) as span:
+            response = self.client.embeddings.create(
+                model=self.model,
+                input=texts,
+                **self._request_options,
+            )
+            span.record_usage(None, response.usage.prompt_tokens, 0)
+        return [item.embedding for item in response.data]
+
+
+class FastEmbedEmbeddingService:
+    """
+    Service for generating dense embeddings locally with a FastEmbed ONNX model.
+
+    Queries embed in-process in a few milliseconds with no API round trip or
+    rate limit. Large batches can be spread over worker processes. The model
+    is downloaded and loaded on first use; its dimension is known before that.
+    """
+
+    def __init__(
+        self,
+        model: str | None = None,
+        batch_size: int | None = None,
+        parallel: int | None = None,
+        threads: int | None = None,
+    ):
+        """
+        Initialize the local embedding service.
+
+        Args:
+            model: FastEmbed model name (default ``settings.local_embedding_model``)
+            batch_size: Texts per ONNX inference call (default
+                ``settings.local_embedding_batch_size``)
+            parallel: Worker processes for large batches; 0 uses every core and
+                None embeds in-process (default ``settings.local_embedding_parallel``)
+            threads: ONNX runtime threads per process (default: runtime's choice)
+        """
+        self.model = model or settings.local_embedding_model
+        self.batch_size = batch_size or settings.local_embedding_batch_size
+        self.parallel = parallel if parallel is not None else settings.local_embedding_parallel
+        self.threads = threads
+        supported = {m["model"]: m["dim"] for m in TextEmbedding.list_supported_models()}
+        if self.model not in supported:
+            raise ValueError(f"FastEmbed does not support dense model {self.model!r}")
+        self.dimension = supported[self.model]
+        self._embedder: TextEmbedding | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def embedder(self) -> TextEmbedding:
+        """The loaded FastEmbed model."""
+        with self._lock:
+            if self._embedder is None:
+                self._embedder = TextEmbedding(model_name=self.model, threads=self.threads)
+            return self._embedder
+
+    def embed(self, text: str) -> list[float]:
+        """
+        Generate embedding for a single text.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        with tracer.span("embed:dense", "embedding", model=self.model, batch_size=1):
+            vector = next(iter(self.embedder.embed([text], batch_size=1)))
+        return vector.tolist()
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """
+        Generate embeddings for multiple texts.
+
+        Batches larger than ``batch_size`` go to the worker processes when
+        ``parallel`` is set; smaller ones are not worth the process start-up.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            List of embedding vectors
+        """
+        if not texts:
+            return []
+        parallel = self.parallel if len(texts) > self.batch_size else None
+        with tracer.span(
+            "embed:dense",
+            "embedding",
             model=self.model,
-            input=texts,
+            batch_size=len(texts),
+            parallel=parallel or 1,
+        ):
+            vectors = self.embedder.embed(texts, batch_size=self.batch_size, parallel=parallel)
+            return [vector.tolist() for vector in vectors]
+
+
+DENSE_BACKENDS = {
+    "openai": EmbeddingService,
+    "fastembed": FastEmbedEmbeddingService,
+}
+
+
+def create_dense_embeddings(backend: str) -> EmbeddingService | FastEmbedEmbeddingService:
+    """
+    Build a dense embedding service for a backend.
+
+    Args:
+        backend: "openai" or "fastembed"
+
+    Returns:
+        The embedding service, configured from settings
+    """
+    if backend not in DENSE_BACKENDS:
+        raise ValueError(
+            f"Unknown dense embedding backend {backend!r}; "
+            f"expected one of {', '.join(DENSE_BACKENDS)}"
         )
-        return [item.embedding for item in response.data]
+    return DENSE_BACKENDS[backend]()
 
 
 class SparseEmbeddingService:
     """
     Service for generating BM25 sparse embeddings using FastEmbed.
 
-    Used for keyword-based retrieval in hybrid search.
+    Used for keyword-based retrieval in hybrid search. Large ingestion
+    batches can be spread over worker processes, as for the dense FastEmbed
+    backend. Query embeddings are cached, since agents repeat queries and
+    BM25 query vectors only depend on the text. The model is loaded on first
+    use.
     """
 
-    def __init__(self):
-        """Initialize the sparse embedding service with BM25 model."""
-        self.model = SparseTextEmbedding(model_name="Qdrant/bm25")
+    def __init__(
+        self,
+        model: str = "Qdrant/bm25",
+        batch_size: int | None = None,
+        parallel: int | None = None,
+        query_cache_size: int | None = None,
+    ):
+        """
+        Initialize the sparse embedding service.
+
+        Args:
+            model: FastEmbed sparse model name
+            batch_size: Texts per embedding call (default ``settings.sparse_embedding_batch_size``)
+            parallel: Worker processes for large batches; 0 uses every core and
+                None embeds in-process (default ``settings.sparse_embedding_parallel``)
+            query_cache_size: Query embeddings kept; 0 disables the cache
+                (default ``settings.sparse_query_cache_size``)
+        """
+        self.model = model
+        self.batch_size = batch_size or settings.sparse_embedding_batch_size
+        self.parallel = parallel if parallel is not None else settings.sparse_embedding_parallel
+        self.query_cache_size = (
+            query_cache_size if query_cache_size is not None else settings.sparse_query_cache_size
+        )
+        self._embedder: SparseTextEmbedding | None = None
+        self._queries: OrderedDict[str, SparseVector] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def embedder(self) -> SparseTextEmbedding:
+        """The loaded FastEmbed model."""
+        with self._lock:
+            if self._embedder is None:
+                self._embedder = SparseTextEmbedding(model_name=self.model)
+            return self._embedder
+
+    @staticmethod
+    def _to_sparse_vector(embedding) -> SparseVector:
+        """
+        Convert a FastEmbed embedding without re-validating it.
+
+        The arrays are already int32 indices and float32 values, so one
+        ``tolist`` each is the only copy. Pydantic validation of the lists
+        (or, slower still, of the arrays) would only repeat the type checks.
+        """
+        return SparseVector.model_construct(
+            indices=embedding.indices.tolist(),
+            values=embedding.values.tolist(),
+        )
 
     def embed(self, text: str) -> SparseVector:
         """
@@ -85,16 +275,15 @@ class SparseEmbeddingService:
         Returns:
             SparseVector with indices and values
         """
-        embedding = list(self.model.embed([text]))[0]
-        return SparseVector(
-            indices=embedding.indices.tolist(),
-            values=embedding.values.tolist(),
-        )
+        return self.embed_batch([text])[0]
 
     def embed_batch(self, texts: list[str]) -> list[SparseVector]:
         """
         Generate sparse embeddings for multiple texts.
 
+        Batches larger than ``batch_size`` go to the worker processes when
+        ``parallel`` is set; smaller ones are not worth the process start-up.
+
         Args:
             texts: List of texts to embed
 
@@ -103,14 +292,11 @@ class SparseEmbeddingService:
         """
         if not texts:
             return []
-        embeddings = list(self.model.embed(texts))
-        return [
-            SparseVector(
-                indices=emb.indices.tolist(),
-                values=emb.values.tolist(),
-            )
-            for emb in embeddings
-        ]
+        parallel = self.parallel if len(texts) > self.batch_size else None
+        with tracer.span("embed:sparse", "embedding", model=self.model, batch_size=len(texts),
+                         parallel=parallel or 1):
+            embeddings = self.embedder.embed(texts, batch_size=self.batch_size, parallel=parallel)
+            return [self._to_sparse_vector(embedding) for embedding in embeddings]
 
     def query_embed(self, text: str) -> SparseVector:
         """
@@ -120,10 +306,21 @@ class SparseEmbeddingService:
             text: Query text to embed
 
         Returns:
-            SparseVector with indices and values
+            SparseVector with indices and values (shared with the cache; do
+            not modify)
         """
-        embedding = list(self.model.query_embed(text))[0]
-        return SparseVector(
-            indices=embedding.indices.tolist(),
-            values=embedding.values.tolist(),
-        )
+        with self._lock:
+            cached = self._queries.get(text)
+            if cached is not None:
+                self._queries.move_to_end(text)
+        with tracer.span("embed:sparse", "embedding", model=self.model, batch_size=1) as span:
+            span.cache_hit = cached is not None
+            if cached is not None:
+                return cached
+            vector = self._to_sparse_vector(next(iter(self.embedder.query_embed(text))))
+        if self.query_cache_size > 0:
+            with self._lock:
+                self._queries[text] = vector
+                while len(self._queries) > self.query_cache_size:
+                    self._queries.popitem(last=False)
+        return vector
@@ -4,25 +4,57 @@ Literature knowledge store using Qdrant.
 Owner: [ASSIGN TEAMMATE]
 """
 
+import bisect
+import hashlib
+import itertools
 import re
-from dataclasses import dataclass
-from uuid import UUID, uuid4, uuid5, NAMESPACE_DNS
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import NAMESPACE_DNS, UUID, uuid4, uuid5
 
-import tiktoken
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
+    CollectionParamsDiff,
+    Disabled,
     Distance,
-    VectorParams,
-    SparseVectorParams,
+    FieldCondition,
+    Filter,
+    Fusion,
+    FusionQuery,
+    MatchAny,
+    MatchValue,
     Modifier,
+    PayloadSchemaType,
+    PointIdsList,
     PointStruct,
     Prefetch,
-    FusionQuery,
-    Fusion,
+    QueryRequest,
+    SparseVectorParams,
+    VectorParams,
+    VectorParamsDiff,
 )
 
 from src.config import settings
+from src.rag.chunk_text_store import ChunkTextStore
+from src.rag.domain_routing import (
+    DOMAINS,
+    GENERAL_DOMAIN,
+    DomainRouter,
+    dbsf_fuse,
+    domain_collection,
+    domain_of,
+)
 from src.rag.embeddings import EmbeddingService, SparseEmbeddingService
+from src.rag.markdown_structure import Block, Section, build_sections, parse_blocks
+from src.rag.migration import check_dimension
+from src.rag.prefetch import PrefetchConfig
+from src.rag.registry import registry
+from src.rag.search_cache import SearchCache
+from src.rag.vector_index import VectorIndexConfig
+from src.utils.context_packing import default_tokenizer
+from src.utils.telemetry import tracer
 
 
 @dataclass
@@ -34,6 +66,7 @@ class Document:
     content: str
     source: str  # File path or URL
     metadata: dict
+    chunk_count: int = 0  # Set when the document is ingested
 
 
 @dataclass
@@ -61,42 +94,147 @@ class LiteratureStore:
     Vector store for literature/papers using Qdrant.
 
     Handles:
-    - Document ingestion and chunking
+    - Document ingestion and structure-aware chunking
     - Embedding storage (dense + sparse for hybrid search)
-    - Hybrid similarity search with DBSF fusion
+    - Hybrid similarity search with DBSF fusion, optionally returning the
+      parent sections of the matching chunks
+    - Optionally, chunk texts in a local ``ChunkTextStore`` instead of the
+      Qdrant payload
+    - Domain-filtered search (see ``src.rag.domain_routing``), optionally
+      routed by query and with one collection per spec domain
     """
 
     COLLECTION_NAME = "literature"
     DENSE_VECTOR_NAME = "dense"
     SPARSE_VECTOR_NAME = "sparse"
 
-    def __init__(self):
-        """Initialize the literature store."""
-        if settings.qdrant_url:
-            self.client = QdrantClient(
-                url=settings.qdrant_url,
-                api_key=settings.qdrant_api_key,
-            )
-        else:
-            self.client = QdrantClient(
-                host=settings.qdrant_host,
-                port=settings.qdrant_port,
-            )
-        self.dense_embeddings = EmbeddingService()
-        self.sparse_embeddings = SparseEmbeddingService()
-        self._tokenizer = tiktoken.get_encoding("cl100k_base")
+    # A chunk's parent section is its heading path cut to this depth (H1 > H2)
+    PARENT_HEADING_DEPTH = 2
+    # Parent sections longer than this are not expanded; the chunk is returned instead
+    PARENT_MAX_TOKENS = 2048
+    # Extra hits fetched per requested parent, since several hits share a parent
+    PARENT_OVERSAMPLE = 3
+    # Dense vectors per domain averaged into the router's centroids
+    ROUTER_SAMPLE = 256
+    # Base collection metadata key of the version writers publish
+    VERSION_METADATA_KEY = "literature_version"
+
+    def __init__(
+        self,
+        client: QdrantClient | None = None,
+        dense_embeddings: EmbeddingService | None = None,
+        sparse_embeddings: SparseEmbeddingService | None = None,
+        tokenizer: Any = None,
+        collection_name: str | None = None,
+        index_config: VectorIndexConfig | None = None,
+        search_cache: SearchCache | None = None,
+        text_store: ChunkTextStore | None = None,
+        domain_routing: bool | None = None,
+        domain_collections: bool | None = None,
+        prefetch: PrefetchConfig | None = None,
+        version_check_seconds: float | None = None,
+    ):
+        """
+        Initialize the literature store.
+
+        Every dependency defaults to the production one built from settings;
+        benchmarks pass in-memory or deterministic substitutes.
+
+        Args:
+            client: Qdrant client (default: the shared one for ``VECTOR_BACKEND``)
+            dense_embeddings: Dense embedding service (default: the shared one for
+                ``LITERATURE_EMBEDDING_BACKEND``)
+            sparse_embeddings: Sparse (BM25) embedding service
+            tokenizer: Tokenizer with ``encode``/``decode`` (tiktoken-compatible)
+            collection_name: Qdrant collection (default ``COLLECTION_NAME``)
+            index_config: Dense vector quantization, storage and HNSW settings
+                (default from settings)
+            search_cache: Query-result cache (default from settings; disabled
+                when ``LITERATURE_SEARCH_CACHE_SIZE`` is 0)
+            text_store: External store for chunk texts (default: one at
+                ``LITERATURE_TEXT_STORE_PATH`` if set; otherwise texts stay in
+                the Qdrant payload)
+            domain_routing: Restrict searches without explicit domains to the
+                domains the query is routed to (default ``LITERATURE_DOMAIN_ROUTING``)
+            domain_collections: Keep each spec domain in its own collection,
+                ``<collection>_<domain>`` (default ``LITERATURE_DOMAIN_COLLECTIONS``)
+            prefetch: Candidates fetched per modality before fusion (default
+                from settings)
+            version_check_seconds: Interval between checks of the version
+                other processes publish (default ``LITERATURE_VERSION_CHECK_SECONDS``)
+        """
+        self.client = client if client is not None else registry.qdrant_client()
+        self.dense_embeddings = dense_embeddings or registry.dense_embeddings(
+            settings.literature_embedding_backend
+        )
+        self.sparse_embeddings = sparse_embeddings or SparseEmbeddingService()
+        self._tokenizer = tokenizer or default_tokenizer()
+        self._token_lengths: dict[int, int] = {}
+        self.collection_name = collection_name or self.COLLECTION_NAME
+        self.index_config = index_config or VectorIndexConfig.from_settings()
+        self.prefetch = prefetch or PrefetchConfig.from_settings()
+        if search_cache is None:
+            search_cache = SearchCache.from_settings()
+        self.search_cache = search_cache
+        if text_store is None and settings.literature_text_store_path:
+            text_store = ChunkTextStore(settings.literature_text_store_path)
+        self.text_store = text_store
+        # Raised on every write and published in the collection metadata, so
+        # cached search results of older contents are dropped in every process
+        self.version = 0
+        self.version_check_seconds = (
+            version_check_seconds if version_check_seconds is not None
+            else settings.literature_version_check_seconds
+        )
+        self._version_checked_at = float("-inf")
+        if domain_collections is None:
+            domain_collections = settings.literature_domain_collections
+        self.shards = (
+            {domain: domain_collection(self.collection_name, domain) for domain in DOMAINS}
+            if domain_collections else {}
+        )
+        self._executor = None
+        if self.shards:
+            self._executor = ThreadPoolExecutor(len(self.collections), "literature-shard")
+        if domain_routing is None:
+            domain_routing = settings.literature_domain_routing
+        self.router = DomainRouter(settings.literature_domain_margin) if domain_routing else None
+        self._router_version = -1
         self._ensure_collection()
 
+    @property
+    def collections(self) -> list[str]:
+        """Every collection of the store (the base one first)."""
+        return [self.collection_name, *self.shards.values()]
+
+    def _collection_of(self, domain: str | None) -> str:
+        """Collection holding chunks of ``domain``."""
+        return self.shards.get(domain, self.collection_name)
+
     def _ensure_collection(self) -> None:
-        """Create the collection if it doesn't exist."""
-        collections = self.client.get_collections()
-        if self.COLLECTION_NAME not in [c.name for c in collections.collections]:
+        """
+        Create the store's collections if they don't exist.
+
+        Raises:
+            DimensionMismatchError: If one exists with another dense dimension
+        """
+        for name in self.collections:
+            self._ensure_one_collection(name)
+
+    def _ensure_one_collection(self, name: str) -> None:
+        """Create one collection if it doesn't exist."""
+        if self.client.collection_exists(name):
+            check_dimension(
+                self.client, name, self.DENSE_VECTOR_NAME, self.dense_embeddings.dimension
+            )
+        else:
             self.client.create_collection(
-                collection_name=self.COLLECTION_NAME,
+                collection_name=name,
                 vectors_config={
                     self.DENSE_VECTOR_NAME: VectorParams(
                         size=self.dense_embeddings.dimension,
                         distance=Distance.COSINE,
+                        on_disk=self.index_config.on_disk,
                     )
                 },
                 sparse_vectors_config={
@@ -104,6 +242,32 @@ class LiteratureStore:
                         modifier=Modifier.IDF,
                     )
                 },
+                hnsw_config=self.index_config.hnsw_config(),
+                quantization_config=self.index_config.quantization_config(),
+                on_disk_payload=self.index_config.on_disk,
+            )
+            for field_name in ("document_id", "parent_id", "domain"):
+                self.client.create_payload_index(
+                    collection_name=name,
+                    field_name=field_name,
+                    field_schema=PayloadSchemaType.KEYWORD,
+                )
+
+    def apply_index_config(self) -> None:
+        """
+        Apply ``index_config`` to the existing collections.
+
+        Qdrant rebuilds the HNSW graph and quantized vectors in the
+        background; searches keep working while it does.
+        """
+        config = self.index_config
+        for name in self.collections:
+            self.client.update_collection(
+                collection_name=name,
+                vectors_config={self.DENSE_VECTOR_NAME: VectorParamsDiff(on_disk=config.on_disk)},
+                collection_params=CollectionParamsDiff(on_disk_payload=config.on_disk),
+                hnsw_config=config.hnsw_config(),
+                quantization_config=config.quantization_config() or Disabled.DISABLED,
             )
 
     def _count_tokens(self, text: str) -> int:
@@ -117,105 +281,248 @@ class LiteratureStore:
         overlap_tokens: int = 50,
     ) -> list[DocumentChunk]:
         """
-        Split markdown document into chunks.
+        Split markdown document into structure-aware chunks.
 
-        Primary split: H1 headings (# )
-        Secondary split: Token limit with overlap
+        Sections (H1-H3) that fit in ``max_tokens`` become one chunk, and
+        small sibling sections are packed together; H1 sections are never
+        merged with each other. Larger sections are packed block by block
+        (paragraphs, lists, tables, code), and only a block that alone
+        exceeds the limit is split: at line boundaries where possible,
+        otherwise by token windows with overlap. All blocks are tokenized in
+        one batch call.
+
+        Each chunk is an exact slice of the document; its payload records
+        the heading path, character offsets and the parent section (see
+        ``PARENT_HEADING_DEPTH``) used by ``search(parent_sections=True)``.
 
         Args:
             document: Document to chunk
             max_tokens: Maximum tokens per chunk
-            overlap_tokens: Overlap between chunks when splitting by token limit
+            overlap_tokens: Overlap between windows of a block split by token limit
 
         Returns:
             List of document chunks
         """
-        content = document.content
+        text = document.content
+        blocks = parse_blocks(text)
+        for block, tokens in zip(blocks, self._encode_batch([text[b.start:b.end] for b in blocks])):
+            block.tokens = tokens
+        root, sections = build_sections(blocks)
+
         chunks = []
-        chunk_index = 0
-
-        # Split on H1 headings (# at start of line)
-        h1_pattern = r"(?=^# )"
-        sections = re.split(h1_pattern, content, flags=re.MULTILINE)
-
-        # Filter empty sections
-        sections = [s.strip() for s in sections if s.strip()]
-
-        for section in sections:
-            section_tokens = self._count_tokens(section)
-
-            if section_tokens <= max_tokens:
-                # Section fits in one chunk
-                chunks.append(
-                    DocumentChunk(
-                        id=uuid5(document.id, str(chunk_index)),
-                        document_id=document.id,
-                        content=section,
-                        chunk_index=chunk_index,
-                        metadata={
-                            **document.metadata,
-                            "source": document.source,
-                            "title": document.title,
-                        },
-                    )
+        spans = self._merge_spans(
+            text, self._pack_section(text, root, max_tokens, overlap_tokens), max_tokens
+        )
+        for start, end, path, _ in spans:
+            # Trim surrounding whitespace so the offsets match the content
+            content = text[start:end]
+            start += len(content) - len(content.lstrip())
+            content = content.strip()
+            if not content:
+                continue
+
+            parent_path = tuple(path[: self.PARENT_HEADING_DEPTH])
+            parent = sections[parent_path]
+            chunk_index = len(chunks)
+            chunks.append(
+                DocumentChunk(
+                    id=uuid5(document.id, str(chunk_index)),
+                    document_id=document.id,
+                    content=content,
+                    chunk_index=chunk_index,
+                    metadata={
+                        **document.metadata,
+                        "source": document.source,
+                        "title": document.title,
+                        "domain": document.metadata.get("domain") or domain_of(document.source),
+                        "heading_path": list(path),
+                        "parent_id": str(
+                            uuid5(document.id, "\x1f".join(("section", *parent_path)))
+                        ),
+                        "parent_tokens": parent.token_count,
+                        "char_start": start,
+                        "char_end": start + len(content),
+                    },
                 )
-                chunk_index += 1
+            )
+
+        return chunks
+
+    def _pack_section(
+        self,
+        text: str,
+        section: Section,
+        max_tokens: int,
+        overlap_tokens: int,
+    ) -> list[tuple[int, int, list[str], int]]:
+        """
+        Pack a section into (start, end, heading path, tokens) spans of at most ``max_tokens``.
+
+        The section's own blocks and its subsections are packed in order;
+        subsections that fit go in whole, larger ones are packed recursively.
+        """
+        if section.empty:
+            return []
+        if section.token_count <= max_tokens and section.level > 0:
+            return [(section.start, section.end, section.path, section.token_count)]
+
+        spans = []
+        group: list[Block | Section] = []
+        group_tokens = 0
+
+        def flush() -> None:
+            nonlocal group, group_tokens
+            if group:
+                # A group holding one subsection is labelled with that subsection's path
+                only = group[0] if len(group) == 1 and isinstance(group[0], Section) else None
+                group_path = only.path if only else section.path
+                spans.append((group[0].start, group[-1].end, group_path, group_tokens))
+            group, group_tokens = [], 0
+
+        for unit in [*section.blocks, *section.children]:
+            if isinstance(unit, Section):
+                tokens = unit.token_count
+                if tokens > max_tokens:
+                    flush()
+                    spans.extend(self._pack_section(text, unit, max_tokens, overlap_tokens))
+                    continue
+                # H1 sections always stand alone
+                standalone = unit.level == 1
             else:
-                # Section too large, split by token limit with overlap
-                sub_chunks = self._split_by_tokens(
-                    section, max_tokens, overlap_tokens
+                tokens = len(unit.tokens) + 1
+                if tokens > max_tokens:
+                    # Carry a short lead-in (e.g. the heading) into the block's first window
+                    lead = group[0].start if group and group_tokens <= max_tokens // 2 else None
+                    budget = max_tokens - group_tokens if lead is not None else max_tokens
+                    if lead is None:
+                        flush()
+                    windows = self._split_block(text, unit, max_tokens, overlap_tokens, budget)
+                    if lead is not None:
+                        windows[0] = (lead, windows[0][1], windows[0][2] + group_tokens)
+                    spans.extend((start, end, section.path, n) for start, end, n in windows)
+                    group, group_tokens = [], 0
+                    continue
+                standalone = False
+
+            if group and (standalone or group_tokens + tokens > max_tokens
+                          or (isinstance(group[-1], Section) and group[-1].level == 1)):
+                flush()
+            group.append(unit)
+            group_tokens += tokens
+
+        flush()
+        return spans
+
+    def _merge_spans(
+        self,
+        text: str,
+        spans: list[tuple[int, int, list[str], int]],
+        max_tokens: int,
+    ) -> list[tuple[int, int, list[str], int]]:
+        """
+        Merge neighbouring spans that fit together and belong to the same
+        parent section, labelled with the common part of their heading paths.
+        A span of headings only (e.g. a document title left before a large
+        section) is merged into the span after it.
+        """
+        merged = []
+        for span in spans:
+            if merged:
+                start, end, path, tokens = merged[-1]
+                lead_in = all(
+                    line.startswith("#") for line in text[start:end].splitlines() if line.strip()
                 )
-                for sub_chunk in sub_chunks:
-                    chunks.append(
-                        DocumentChunk(
-                            id=uuid5(document.id, str(chunk_index)),
-                            document_id=document.id,
-                            content=sub_chunk,
-                            chunk_index=chunk_index,
-                            metadata={
-                                **document.metadata,
-                                "source": document.source,
-                                "title": document.title,
-                            },
-                        )
-                    )
-                    chunk_index += 1
+                same_parent = (
+                    path[: self.PARENT_HEADING_DEPTH] == span[2][: self.PARENT_HEADING_DEPTH]
+                )
+                if (lead_in or same_parent) and tokens + span[3] <= max_tokens:
+                    shared = itertools.takewhile(lambda p: p[0] == p[1], zip(path, span[2]))
+                    common = [a for a, _ in shared]
+                    merged[-1] = (start, span[1], span[2] if lead_in else common, tokens + span[3])
+                    continue
+            merged.append(span)
+        return merged
 
-        return chunks
+    def _encode_batch(self, texts: list[str]) -> list[list[int]]:
+        """Tokenize texts in one call (tiktoken's threaded batch API when available)."""
+        encode_batch = getattr(self._tokenizer, "encode_ordinary_batch", None)
+        if encode_batch is not None:
+            return encode_batch(texts)
+        return [self._tokenizer.encode(text) for text in texts]
 
-    def _split_by_tokens(
+    def _token_byte_length(self, token: int) -> int:
+        """UTF-8 length of a token's text, memoized per store."""
+        length = self._token_lengths.get(token)
+        if length is None:
+            length = len(self._tokenizer.decode_single_token_bytes(token))
+            self._token_lengths[token] = length
+        return length
+
+    def _split_block(
         self,
         text: str,
+        block: Block,
         max_tokens: int,
         overlap_tokens: int,
-    ) -> list[str]:
+        first_budget: int,
+    ) -> list[tuple[int, int]]:
         """
-        Split text into chunks by token count with overlap.
+        Split an oversized block into windows of at most ``max_tokens`` tokens.
+
+        Token boundaries become byte offsets into the block (tokens
+        concatenate to its exact bytes), so windows are plain slices. A
+        window ends at the last line break that fits, so tables, lists and
+        code split between rows, items and lines without overlap; text with
+        no line break in range is cut at the token limit and the next
+        window overlaps it by ``overlap_tokens``.
 
         Args:
-            text: Text to split
-            max_tokens: Maximum tokens per chunk
-            overlap_tokens: Number of overlapping tokens between chunks
+            text: Document text
+            block: Block to split (with ``tokens``)
+            max_tokens: Maximum tokens per window
+            overlap_tokens: Overlap between windows cut at the token limit
+            first_budget: Token budget of the first window
 
         Returns:
-            List of text chunks
+            (start, end, tokens) with character offsets into ``text``
         """
-        tokens = self._tokenizer.encode(text)
-        chunks = []
-        start = 0
+        data = text[block.start:block.end].encode("utf-8")
+        offsets = [0, *itertools.accumulate(self._token_byte_length(t) for t in block.tokens)]
+        line_breaks = [match.end() for match in re.finditer(rb"\n", data)]
 
-        while start < len(tokens):
-            end = min(start + max_tokens, len(tokens))
-            chunk_tokens = tokens[start:end]
-            chunks.append(self._tokenizer.decode(chunk_tokens))
+        def snap(offset: int) -> int:
+            # Skip UTF-8 continuation bytes (0b10xxxxxx)
+            while offset < len(data) and data[offset] & 0xC0 == 0x80:
+                offset += 1
+            return offset
 
-            if end >= len(tokens):
-                break
+        def char_offset(offset: int) -> int:
+            return block.start + len(data[:offset].decode("utf-8"))
 
-            # Move start forward, keeping overlap
-            start = end - overlap_tokens
+        windows = []
+        start, start_token, budget = 0, 0, max(1, first_budget)
+        while start < len(data):
+            limit_token = min(start_token + budget, len(block.tokens))
+            if limit_token >= len(block.tokens):
+                end, at_line = len(data), True
+            else:
+                limit = offsets[limit_token]
+                k = bisect.bisect_right(line_breaks, limit) - 1
+                at_line = k >= 0 and line_breaks[k] > start
+                end = line_breaks[k] if at_line else snap(limit)
 
-        return chunks
+            end_token = bisect.bisect_left(offsets, end)
+            windows.append((char_offset(start), char_offset(end), end_token - start_token))
+            if end >= len(data):
+                break
+            if at_line:
+                start = end
+            else:
+                start = snap(offsets[max(limit_token - overlap_tokens, start_token + 1)])
+            start_token = bisect.bisect_right(offsets, start) - 1
+            budget = max_tokens
+
+        return windows
 
     def ingest_document(self, document: Document) -> int:
         """
@@ -225,11 +532,24 @@ class LiteratureStore:
             document: The document to ingest
 
         Returns:
-            Number of chunks created
+            Number of chunks created (also stored in ``document.chunk_count``)
+        """
+        document.chunk_count = self.upsert_chunks(self._chunk_markdown(document))
+        return document.chunk_count
+
+    def upsert_chunks(self, chunks: list[DocumentChunk]) -> int:
         """
-        # Chunk the document
-        chunks = self._chunk_markdown(document)
+        Embed chunks and upsert them (a chunk with an existing ID is replaced).
+
+        With a ``text_store``, the chunk text goes there and the Qdrant payload
+        only holds metadata.
+
+        Args:
+            chunks: Chunks to store
 
+        Returns:
+            Number of chunks upserted
+        """
         if not chunks:
             return 0
 
@@ -238,10 +558,13 @@ class LiteratureStore:
         dense_vectors = self.dense_embeddings.embed_batch(chunk_texts)
         sparse_vectors = self.sparse_embeddings.embed_batch(chunk_texts)
 
-        # Create points for Qdrant
-        points = []
+        if self.text_store is not None:
+            self.text_store.put_many((chunk.id, chunk.content) for chunk in chunks)
+
+        # Create points for Qdrant, grouped by the collection of their domain
+        points: dict[str, list[PointStruct]] = {}
         for i, chunk in enumerate(chunks):
-            points.append(
+            points.setdefault(self._collection_of(chunk.metadata.get("domain")), []).append(
                 PointStruct(
                     id=chunk.id,
                     vector={
@@ -250,21 +573,76 @@ class LiteratureStore:
                     },
                     payload={
                         "document_id": str(chunk.document_id),
-                        "content": chunk.content,
                         "chunk_index": chunk.chunk_index,
+                        **({} if self.text_store is not None else {"content": chunk.content}),
                         **chunk.metadata,
                     },
                 )
             )
 
         # Upsert to Qdrant
-        self.client.upsert(
-            collection_name=self.COLLECTION_NAME,
-            points=points,
-        )
+        for collection_name, collection_points in points.items():
+            self.client.upsert(
+                collection_name=collection_name,
+                points=collection_points,
+            )
+        self._bump_version()
 
         return len(chunks)
 
+    def delete_chunks(self, chunk_ids: list[UUID]) -> None:
+        """Delete chunks by ID."""
+        if chunk_ids:
+            for collection_name in self.collections:
+                self.client.delete(
+                    collection_name=collection_name,
+                    points_selector=PointIdsList(points=[str(i) for i in chunk_ids]),
+                )
+            if self.text_store is not None:
+                self.text_store.delete_many(UUID(str(i)) for i in chunk_ids)
+            self._bump_version()
+
+    def _published_version(self) -> int:
+        """Version last published in the base collection's metadata (0 if none)."""
+        metadata = self.client.get_collection(self.collection_name).config.metadata or {}
+        return int(metadata.get(self.VERSION_METADATA_KEY, 0))
+
+    def _bump_version(self) -> None:
+        """
+        Raise the version after a write and publish it for other processes.
+
+        Versions are nanosecond timestamps (or one more than the last seen,
+        if larger), so writers in different processes keep raising it. Only
+        published when a cache or router depends on it.
+        """
+        if self.search_cache is None and self.router is None:
+            self.version += 1
+            return
+        self.version = max(self.version + 1, self._published_version() + 1, time.time_ns())
+        self.client.update_collection(
+            collection_name=self.collection_name,
+            metadata={self.VERSION_METADATA_KEY: self.version},
+        )
+
+    def _check_version(self) -> None:
+        """Adopt a version published by another process, at most every ``version_check_seconds``."""
+        if self.search_cache is None and self.router is None:
+            return  # Nothing depends on the version
+        now = time.monotonic()
+        if now - self._version_checked_at >= self.version_check_seconds:
+            self._version_checked_at = now
+            self.version = max(self.version, self._published_version())
+
+    def count_chunks(self, document_id: UUID) -> int:
+        """Number of stored chunks belonging to a document."""
+        document_filter = Filter(
+            must=[FieldCondition(key="document_id", match=MatchValue(value=str(document_id)))]
+        )
+        return sum(
+            self.client.count(collection_name=name, count_filter=document_filter, exact=True).count
+            for name in self.collections
+        )
+
     def ingest_file(self, file_path: str) -> Document:
         """
         Ingest a file (PDF, Markdown, etc.) into the store.
@@ -273,7 +651,7 @@ class LiteratureStore:
             file_path: Path to the file
 
         Returns:
-            The created Document
+            The created Document, with ``chunk_count`` set
         """
         with open(file_path, "r", encoding="utf-8") as f:
             content = f.read()
@@ -297,50 +675,92 @@ class LiteratureStore:
         self,
         query: str,
         top_k: int = 5,
+        parent_sections: bool = False,
+        domains: list[str] | None = None,
     ) -> list[RetrievalResult]:
         """
         Search for relevant document chunks using hybrid search.
 
         Combines dense (semantic) and sparse (BM25 keyword) search
-        with DBSF fusion.
+        with DBSF fusion. Results are served from ``search_cache`` when the
+        same query, or one within its cosine radius, was searched since the
+        last write. With a ``text_store``, chunk text is read only for the
+        results returned.
+
+        Without explicit ``domains``, a store with a ``router`` searches the
+        domains the query is routed to, plus general chunks. Per-domain
+        collections are searched in parallel and fused client-side.
 
         Args:
             query: Search query
             top_k: Number of results to return
+            parent_sections: Return the parent section of each hit (merged
+                from its chunks) instead of the chunk, one result per section;
+                sections over ``PARENT_MAX_TOKENS`` fall back to the chunk
+            domains: Only search chunks of these domains (see ``DOMAINS``
+                and ``GENERAL_DOMAIN``)
 
         Returns:
             List of retrieval results
         """
-        # Generate query embeddings
-        dense_vector = self.dense_embeddings.embed(query)
-        sparse_vector = self.sparse_embeddings.query_embed(query)
+        limit = top_k * self.PARENT_OVERSAMPLE if parent_sections else top_k
+        params = (top_k, parent_sections, tuple(domains) if domains is not None else None)
+        self._check_version()
+        cache, version = self.search_cache, self.version
+        with tracer.span("search:literature", "search", top_k=top_k) as span:
+            cached = cache.get(query, params, version) if cache is not None else None
+            if cached is not None:
+                span.cache_hit = True
+                span.attributes["cache"] = "exact"
+                return cached
 
-        # Hybrid search with DBSF fusion
-        results = self.client.query_points(
-            collection_name=self.COLLECTION_NAME,
-            prefetch=[
-                Prefetch(
-                    query=sparse_vector,
-                    using=self.SPARSE_VECTOR_NAME,
-                    limit=20,
-                ),
-                Prefetch(
-                    query=dense_vector,
-                    using=self.DENSE_VECTOR_NAME,
-                    limit=20,
-                ),
-            ],
-            query=FusionQuery(fusion=Fusion.DBSF),
-            limit=top_k,
-            with_payload=True,
-        )
+            # Generate query embeddings
+            dense_vector = self.dense_embeddings.embed(query)
+            cached = cache.nearest(dense_vector, params, version) if cache is not None else None
+            if cached is not None:
+                span.cache_hit = True
+                span.attributes["cache"] = "semantic"
+                return cached
+
+            if domains is None and self.router is not None:
+                routed = self._route(dense_vector)
+                if routed is not None:
+                    domains = [*routed, GENERAL_DOMAIN]
+            if domains is not None:
+                span.attributes["domains"] = list(domains)
+
+            sparse_vector = self.sparse_embeddings.query_embed(query)
+            names = [self.collection_name]
+            if self.shards:
+                names = self.collections if domains is None else list(
+                    dict.fromkeys(self._collection_of(domain) for domain in domains)
+                )
+                domains = None  # Each collection holds one domain
+
+            depth = self.prefetch.depth(limit)
+            points = self._search_collections(
+                names, dense_vector, sparse_vector, limit, depth, domains
+            )
+            if self.prefetch.should_widen([point.score for point in points], limit):
+                depth = self.prefetch.widened(limit)
+                points = self._search_collections(
+                    names, dense_vector, sparse_vector, limit, depth, domains
+                )
+                span.attributes["widened"] = True
+            span.attributes["prefetch"] = depth
+            span.attributes["results"] = len(points)
 
-        # Convert to RetrievalResult
+        # Convert to RetrievalResult; text kept in the text store is read
+        # once the final results are known
         retrieval_results = []
-        for point in results.points:
+        external: set[UUID] = set()
+        for point in points:
             payload = point.payload
+            chunk_id = UUID(str(point.id))
+            if "content" not in payload and self.text_store is not None:
+                external.add(chunk_id)
             chunk = DocumentChunk(
-                id=UUID(str(point.id)),
+                id=chunk_id,
                 document_id=UUID(payload.get("document_id", str(uuid4()))),
                 content=payload.get("content", ""),
                 chunk_index=payload.get("chunk_index", 0),
@@ -358,4 +778,281 @@ class LiteratureStore:
                 )
             )
 
+        if parent_sections:
+            retrieval_results = self._expand_to_parents(retrieval_results, top_k)
+        if external:
+            self._load_texts([r.chunk for r in retrieval_results if r.chunk.id in external])
+        if cache is not None:
+            cache.put(query, params, version, dense_vector, retrieval_results)
         return retrieval_results
+
+    def _search_collection(
+        self,
+        collection_name: str,
+        dense_vector: list[float],
+        sparse_vector: Any,
+        limit: int,
+        depth: int,
+        domains: list[str] | None = None,
+    ) -> list[Any]:
+        """Hybrid search of one collection with DBSF fusion in Qdrant."""
+        domain_filter = None
+        if domains is not None:
+            domain_filter = Filter(
+                must=[FieldCondition(key="domain", match=MatchAny(any=list(domains)))]
+            )
+        return self.client.query_points(
+            collection_name=collection_name,
+            prefetch=[
+                Prefetch(
+                    query=sparse_vector,
+                    using=self.SPARSE_VECTOR_NAME,
+                    filter=domain_filter,
+                    limit=depth,
+                ),
+                Prefetch(
+                    query=dense_vector,
+                    using=self.DENSE_VECTOR_NAME,
+                    filter=domain_filter,
+                    limit=depth,
+                    params=self.index_config.search_params(),
+                ),
+            ],
+            query=FusionQuery(fusion=Fusion.DBSF),
+            limit=limit,
+            with_payload=True,
+        ).points
+
+    def _search_collections(
+        self,
+        names: list[str],
+        dense_vector: list[float],
+        sparse_vector: Any,
+        limit: int,
+        depth: int,
+        domains: list[str] | None = None,
+    ) -> list[Any]:
+        """
+        Hybrid search of several collections in parallel, fused client-side.
+
+        Each collection returns its dense and sparse candidates in one batch
+        request. The candidates of each modality are pooled across
+        collections and fused with DBSF, as a single collection would.
+        """
+        if len(names) == 1:
+            return self._search_collection(
+                names[0], dense_vector, sparse_vector, limit, depth, domains
+            )
+        requests = [
+            QueryRequest(
+                query=dense_vector,
+                using=self.DENSE_VECTOR_NAME,
+                limit=depth,
+                params=self.index_config.search_params(),
+                with_payload=True,
+            ),
+            QueryRequest(
+                query=sparse_vector,
+                using=self.SPARSE_VECTOR_NAME,
+                limit=depth,
+                with_payload=True,
+            ),
+        ]
+        def search_batch(name: str) -> list[Any]:
+            return self.client.query_batch_points(collection_name=name, requests=requests)
+
+        responses = list(self._executor.map(search_batch, names))
+        dense = [point for response in responses for point in response[0].points]
+        sparse = [point for response in responses for point in response[1].points]
+        return dbsf_fuse([dense, sparse], limit)
+
+    def _route(self, dense_vector: list[float]) -> list[str] | None:
+        """Domains the router sends a query to, refitting its centroids after writes."""
+        if self._router_version != self.version:
+            version = self.version
+            vectors = {}
+            for domain in DOMAINS:
+                points, _ = self.client.scroll(
+                    collection_name=self._collection_of(domain),
+                    scroll_filter=Filter(
+                        must=[FieldCondition(key="domain", match=MatchValue(value=domain))]
+                    ),
+                    limit=self.ROUTER_SAMPLE,
+                    with_payload=False,
+                    with_vectors=[self.DENSE_VECTOR_NAME],
+                )
+                vectors[domain] = [point.vector[self.DENSE_VECTOR_NAME] for point in points]
+            self.router.fit(vectors)
+            self._router_version = version
+        return self.router.route(dense_vector)
+
+    def _load_texts(self, chunks: list[DocumentChunk]) -> None:
+        """Fill in the content of chunks whose text is in the text store."""
+        texts = self.text_store.get_many(chunk.id for chunk in chunks)
+        for chunk in chunks:
+            chunk.content = texts.get(chunk.id, "")
+
+    def _expand_to_parents(
+        self, results: list[RetrievalResult], top_k: int
+    ) -> list[RetrievalResult]:
+        """
+        Replace hits by their parent sections, keeping the best-scoring hit per section.
+
+        Sections are rebuilt from their stored chunks in document order;
+        overlapping windows are joined on their character offsets.
+        """
+        selected: list[tuple[RetrievalResult, str | None]] = []
+        seen = set()
+        for result in results:
+            metadata = result.chunk.metadata
+            parent_id = metadata.get("parent_id")
+            parent_tokens = metadata.get("parent_tokens", self.PARENT_MAX_TOKENS + 1)
+            if not parent_id or parent_tokens > self.PARENT_MAX_TOKENS:
+                parent_id = None
+            key = parent_id or str(result.chunk.id)
+            if key in seen:
+                continue
+            seen.add(key)
+            selected.append((result, parent_id))
+            if len(selected) == top_k:
+                break
+
+        # A section's chunks share the document, and so the collection, of its hit
+        by_collection: dict[str, list[str]] = {}
+        for result, parent_id in selected:
+            if parent_id:
+                name = self._collection_of(result.chunk.metadata.get("domain"))
+                by_collection.setdefault(name, []).append(parent_id)
+        members: dict[str, list[dict]] = {
+            parent_id: [] for parent_ids in by_collection.values() for parent_id in parent_ids
+        }
+        for name, parent_ids in by_collection.items():
+            points, _ = self.client.scroll(
+                collection_name=name,
+                scroll_filter=Filter(
+                    must=[FieldCondition(key="parent_id", match=MatchAny(any=parent_ids))]
+                ),
+                limit=10_000,
+                with_payload=["parent_id", "char_start", "char_end", "chunk_index", "content"],
+            )
+            texts = {}
+            if self.text_store is not None:
+                texts = self.text_store.get_many(
+                    UUID(str(point.id)) for point in points if "content" not in point.payload
+                )
+            for point in points:
+                payload = point.payload
+                if "content" not in payload:
+                    payload = {**payload, "content": texts.get(UUID(str(point.id)), "")}
+                members[payload["parent_id"]].append(payload)
+
+        expanded = []
+        for result, parent_id in selected:
+            if not parent_id or not members[parent_id]:
+                expanded.append(result)
+                continue
+
+            parts, cursor = [], -1
+            for payload in sorted(members[parent_id], key=lambda p: p["char_start"]):
+                start, end, content = payload["char_start"], payload["char_end"], payload["content"]
+                if start >= cursor:
+                    parts.append(content)
+                elif end > cursor:
+                    parts[-1] += content[cursor - start:]
+                cursor = max(cursor, end)
+
+            first = min(members[parent_id], key=lambda p: p["chunk_index"])
+            heading_path = result.chunk.metadata.get("heading_path", [])
+            expanded.append(
+                RetrievalResult(
+                    chunk=DocumentChunk(
+                        id=UUID(parent_id),
+                        document_id=result.chunk.document_id,
+                        content="\n\n".join(parts),
+                        chunk_index=first["chunk_index"],
+                        metadata={
+                            **result.chunk.metadata,
+                            "heading_path": heading_path[: self.PARENT_HEADING_DEPTH],
+                            "char_start": first["char_start"],
+                            "char_end": cursor,
+                        },
+                    ),
+                    score=result.score,
+                    document_title=result.document_title,
+                )
+            )
+
+        return expanded
+
+
+# Start of an H1 or H2 section; text before the last one is complete
+SECTION_BOUNDARY = re.compile(r"^#{1,2} ", re.MULTILINE)
+
+
+def completed_sections(text: str) -> str:
+    """Return ``text`` up to the start of its last (possibly unfinished) H1/H2 section."""
+    starts = [match.start() for match in SECTION_BOUNDARY.finditer(text)]
+    return text[: starts[-1]] if starts else ""
+
+
+@dataclass
+class IncrementalIngestor:
+    """
+    Ingests a document that is still being written, such as a report in progress.
+
+    Every ``update`` re-chunks the completed sections and upserts only the
+    chunks that are new or whose text changed. Chunk IDs derive from the
+    document ID and chunk position, so partial and final versions land on the
+    same points instead of duplicating each other. Chunks the current text no
+    longer has are deleted on every update, so a session that stops before its
+    final update leaves only the chunks of its last version behind.
+    """
+
+    store: LiteratureStore
+    document_id: UUID
+    source: str
+    metadata: dict = field(default_factory=dict)
+    _ingested: dict[UUID, str] = field(default_factory=dict, init=False)
+
+    @property
+    def chunk_count(self) -> int:
+        """Chunks currently stored for the document."""
+        return len(self._ingested)
+
+    def update(self, text: str, final: bool = False) -> int:
+        """
+        Ingest the current state of the document.
+
+        Args:
+            text: Full text written so far
+            final: Whether the text is complete (the last, possibly
+                unfinished, section is ingested too)
+
+        Returns:
+            Number of chunks upserted by this update
+        """
+        content = text if final else completed_sections(text)
+        title_match = re.search(r"^# (.+)$", text, re.MULTILINE)
+        document = Document(
+            id=self.document_id,
+            title=title_match.group(1) if title_match else self.source.split("/")[-1],
+            content=content,
+            source=self.source,
+            metadata=self.metadata,
+        )
+        chunks = self.store._chunk_markdown(document) if content.strip() else []
+
+        digests = {
+            chunk.id: hashlib.sha1(chunk.content.encode("utf-8")).hexdigest() for chunk in chunks
+        }
+        changed = [chunk for chunk in chunks if self._ingested.get(chunk.id) != digests[chunk.id]]
+        self.store.upsert_chunks(changed)
+        for chunk in changed:
+            self._ingested[chunk.id] = digests[chunk.id]
+
+        stale = [chunk_id for chunk_id in self._ingested if chunk_id not in digests]
+        self.store.delete_chunks(stale)
+        for chunk_id in stale:
+            del self._ingested[chunk_id]
+
+        return len(changed)
@@ -0,0 +1,163 @@
+"""
+Markdown structure for chunking.
+
+Splits markdown into blocks (headings, paragraphs, lists, tables, fenced
+code) with character offsets into the original text, and nests them into a
+tree of H1-H3 sections. The literature store packs whole blocks and whole
+sections into chunks, so chunks follow the document's structure instead of
+cutting through tables or subsections.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import re
+from dataclasses import dataclass, field
+
+# Headings deeper than this are kept inside their section as plain text
+MAX_SECTION_LEVEL = 3
+
+HEADING = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t#]*$")
+FENCE = re.compile(r"^[ \t]*(```|~~~)")
+LIST_ITEM = re.compile(r"^[ \t]*(?:[-*+]|\d+[.)])[ \t]+")
+TABLE_ROW = re.compile(r"^[ \t]*\|")
+
+
+@dataclass
+class Block:
+    """A run of markdown lines of one kind; ``start``/``end`` are offsets into the text."""
+
+    kind: str  # "heading" | "paragraph" | "list" | "table" | "code"
+    start: int
+    end: int
+    level: int = 0  # Heading level
+    title: str = ""  # Heading text
+    tokens: list[int] = field(default_factory=list)
+
+
+@dataclass
+class Section:
+    """A heading with its own blocks and nested subsections (the root has no heading)."""
+
+    level: int
+    path: list[str]
+    blocks: list[Block] = field(default_factory=list)
+    children: list["Section"] = field(default_factory=list)
+    token_count: int = 0
+
+    @property
+    def start(self) -> int:
+        return self.blocks[0].start if self.blocks else self.children[0].start
+
+    @property
+    def end(self) -> int:
+        return self.children[-1].end if self.children else self.blocks[-1].end
+
+    @property
+    def empty(self) -> bool:
+        return not self.blocks and not self.children
+
+
+def _kind(line: str) -> str:
+    if TABLE_ROW.match(line):
+        return "table"
+    if LIST_ITEM.match(line):
+        return "list"
+    return "paragraph"
+
+
+def parse_blocks(text: str) -> list[Block]:
+    """
+    Split markdown into blocks.
+
+    Blank lines end paragraphs, lists and tables; fenced code runs to its
+    closing fence; indented lines continue a list item. Block offsets exclude
+    trailing newlines.
+
+    Args:
+        text: Markdown text
+
+    Returns:
+        Blocks in document order
+    """
+    blocks: list[Block] = []
+    current: Block | None = None
+    lines = text.splitlines(keepends=True)
+    pos = 0
+    i = 0
+
+    while i < len(lines):
+        line = lines[i].rstrip("\r\n")
+        start, end = pos, pos + len(line)
+        pos += len(lines[i])
+        i += 1
+
+        if not line.strip():
+            current = None
+            continue
+
+        fence = FENCE.match(line)
+        if fence:
+            current = None
+            while i < len(lines):
+                closing = lines[i].rstrip("\r\n")
+                end = pos + len(closing)
+                pos += len(lines[i])
+                i += 1
+                if closing.strip().startswith(fence.group(1)):
+                    break
+            blocks.append(Block("code", start, end))
+            continue
+
+        heading = HEADING.match(line)
+        if heading and len(heading.group(1)) <= MAX_SECTION_LEVEL:
+            current = None
+            title = heading.group(2).strip()
+            blocks.append(Block("heading", start, end, level=len(heading.group(1)), title=title))
+            continue
+
+        kind = _kind(line)
+        continues_list = current is not None and current.kind == "list" and line[0] in " \t"
+        if current is not None and (current.kind == kind or continues_list):
+            current.end = end
+        else:
+            current = Block(kind, start, end)
+            blocks.append(current)
+
+    return blocks
+
+
+def build_sections(blocks: list[Block]) -> tuple[Section, dict[tuple[str, ...], Section]]:
+    """
+    Nest blocks under their headings.
+
+    Args:
+        blocks: Blocks with ``tokens`` filled in
+
+    Returns:
+        (root section, sections by heading path)
+    """
+    root = Section(level=0, path=[])
+    by_path = {(): root}
+    stack = [root]
+    for block in blocks:
+        if block.kind == "heading":
+            while stack[-1].level >= block.level:
+                stack.pop()
+            section = Section(
+                level=block.level, path=[*stack[-1].path, block.title], blocks=[block]
+            )
+            stack[-1].children.append(section)
+            stack.append(section)
+            by_path.setdefault(tuple(section.path), section)
+        else:
+            stack[-1].blocks.append(block)
+
+    def count(section: Section) -> int:
+        # One extra token per block for the blank line that separates it
+        section.token_count = sum(len(b.tokens) + 1 for b in section.blocks) + sum(
+            count(child) for child in section.children
+        )
+        return section.token_count
+
+    count(root)
+    return root, by_path
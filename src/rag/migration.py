@@ -0,0 +1,199 @@
+"""
+Dense vector dimension checks and migrations for Qdrant collections.
+
+Collections are created with the dense dimension of the embedding service
+in use. When the dimension changes (``EMBEDDING_DIMENSIONS``, or another
+backend or model), the stores refuse to open a collection of the old one. ``migrate_dense_vectors``
+then rebuilds it: every point's text is re-embedded into a new collection
+``<name>_d<dimension>``, with payloads, other (e.g. sparse) vectors, HNSW,
+quantization and payload indexes copied over. ``<name>`` becomes an alias of
+the new collection. Readers keep using ``<name>`` throughout, and later
+migrations only swap the alias.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import logging
+from typing import Any, Callable
+from uuid import UUID
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
+    HnswConfigDiff,
+    PointStruct,
+    VectorParams,
+)
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_BATCH_SIZE = 64
+
+
+class DimensionMismatchError(ValueError):
+    """An existing collection's dense vectors do not match the embedding dimension."""
+
+
+def vector_size(client: QdrantClient, collection: str, vector_name: str) -> int | None:
+    """Size of a named dense vector in an existing collection (or alias), if any."""
+    vectors = client.get_collection(collection).config.params.vectors
+    params = vectors.get(vector_name) if isinstance(vectors, dict) else vectors
+    return params.size if params is not None else None
+
+
+def check_dimension(
+    client: QdrantClient, collection: str, vector_name: str, dimension: int
+) -> None:
+    """
+    Raise if an existing collection was built for another dense dimension.
+
+    Raises:
+        DimensionMismatchError: With the command that migrates the collection
+    """
+    size = vector_size(client, collection, vector_name)
+    if size is not None and size != dimension:
+        raise DimensionMismatchError(
+            f"Collection {collection!r} has {size}-d {vector_name!r} vectors but the embedding "
+            f"service returns {dimension}-d vectors. Re-embed it with the current embedding "
+            f"settings using `python scripts/migrate_embeddings.py --collections {collection}`, "
+            f"or restore the settings it was built with."
+        )
+
+
+def resolve_alias(client: QdrantClient, name: str) -> str:
+    """The collection behind ``name`` (``name`` itself if it is not an alias)."""
+    for alias in client.get_aliases().aliases:
+        if alias.alias_name == name:
+            return alias.collection_name
+    return name
+
+
+def migrate_dense_vectors(
+    client: QdrantClient,
+    collection: str,
+    vector_name: str,
+    embeddings: Any,
+    text_field: str,
+    batch_size: int = MIGRATION_BATCH_SIZE,
+    progress: Callable[[int], None] | None = None,
+    force: bool = False,
+    text_store: Any = None,
+) -> str | None:
+    """
+    Re-embed a collection's dense vectors with ``embeddings``.
+
+    The first migration of a plain collection deletes it before creating
+    the alias, so ``collection`` is briefly missing. After that, alias
+    swaps are atomic.
+
+    Args:
+        client: Qdrant client
+        collection: Collection name (or alias) used by the store
+        vector_name: Dense vector to re-embed
+        embeddings: Dense embedding service with ``embed_batch`` and ``dimension``
+        text_field: Payload field holding each point's embedded text
+        batch_size: Points re-embedded per request
+        progress: Called with the number of points migrated so far
+        force: Re-embed even if the dimension matches (a new model of the same size)
+        text_store: Store with ``get_many`` holding the texts of points whose
+            payload has no ``text_field`` (see ``ChunkTextStore``)
+
+    Returns:
+        The new physical collection, or None if the dimension already matches
+        and ``force`` is not set
+    """
+    source = resolve_alias(client, collection)
+    info = client.get_collection(source)
+    vectors = dict(info.config.params.vectors)
+    old = vectors[vector_name]
+    dimension = embeddings.dimension
+    if old.size == dimension and not force:
+        return None
+
+    target = f"{collection}_d{dimension}"
+    if target == source:
+        target += "_2"
+    if client.collection_exists(target):
+        client.delete_collection(target)  # Left over from an interrupted migration
+    vectors[vector_name] = VectorParams(
+        size=dimension,
+        distance=old.distance,
+        on_disk=old.on_disk,
+        hnsw_config=old.hnsw_config,
+        quantization_config=old.quantization_config,
+        datatype=old.datatype,
+    )
+    client.create_collection(
+        collection_name=target,
+        vectors_config=vectors,
+        sparse_vectors_config=info.config.params.sparse_vectors,
+        hnsw_config=HnswConfigDiff(**info.config.hnsw_config.model_dump(exclude_none=True)),
+        quantization_config=info.config.quantization_config,
+        on_disk_payload=info.config.params.on_disk_payload,
+    )
+    for field_name, schema in (info.payload_schema or {}).items():
+        client.create_payload_index(
+            collection_name=target, field_name=field_name, field_schema=schema.data_type
+        )
+
+    kept_vectors = [name for name in vectors if name != vector_name]
+    kept_vectors += list(info.config.params.sparse_vectors or {})
+    migrated = 0
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=source,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=kept_vectors or False,
+        )
+        if points:
+            texts = {}
+            if text_store is not None:
+                texts = text_store.get_many(
+                    UUID(str(p.id)) for p in points if text_field not in p.payload
+                )
+            dense = embeddings.embed_batch([
+                point.payload.get(text_field) or texts.get(UUID(str(point.id)), "")
+                for point in points
+            ])
+            client.upsert(
+                collection_name=target,
+                points=[
+                    PointStruct(
+                        id=point.id,
+                        vector={**(point.vector or {}), vector_name: vector},
+                        payload=point.payload,
+                    )
+                    for point, vector in zip(points, dense)
+                ],
+                wait=True,
+            )
+            migrated += len(points)
+            if progress:
+                progress(migrated)
+        if offset is None:
+            break
+
+    create = CreateAliasOperation(
+        create_alias=CreateAlias(collection_name=target, alias_name=collection)
+    )
+    if source == collection:
+        client.delete_collection(source)
+        client.update_collection_aliases(change_aliases_operations=[create])
+    else:
+        client.update_collection_aliases(
+            change_aliases_operations=[
+                DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=collection)),
+                create,
+            ]
+        )
+        client.delete_collection(source)
+    logger.info(
+        f"Migrated {migrated} points of {collection!r} to {dimension}-d vectors in {target!r}"
+    )
+    return target
@@ -0,0 +1,211 @@
+"""
+Plan item store for nearest-neighbour pre-classification using Qdrant.
+
+Stores (requirement, solution) pairs that the LLM has already categorized,
+so that recurring plan items can be categorized locally in later runs.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+from dataclasses import dataclass
+from uuid import NAMESPACE_DNS, uuid5
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    Distance,
+    PayloadSchemaType,
+    PointStruct,
+    QueryRequest,
+    VectorParams,
+)
+
+from src.config import settings
+from src.rag.embeddings import EmbeddingService
+from src.rag.migration import check_dimension
+from src.rag.registry import registry
+
+
+@dataclass
+class LabeledPlanItem:
+    """A plan item with the category the LLM assigned to it."""
+
+    text: str
+    category: str
+    confidence: float
+    source: str
+    verification_type: str | None = None
+
+
+@dataclass
+class PlanItemNeighbor:
+    """A past plan item similar to the one being classified."""
+
+    item: LabeledPlanItem
+    score: float
+
+
+class PlanItemStore:
+    """
+    Vector store of past plan item categorizations.
+
+    Points are keyed by a hash of the item text, so re-labelling the same
+    item overwrites its previous label instead of adding a duplicate vote.
+    """
+
+    COLLECTION_NAME = "plan_items"
+    DENSE_VECTOR_NAME = "dense"
+
+    def __init__(
+        self,
+        client: QdrantClient | None = None,
+        embeddings: EmbeddingService | None = None,
+    ):
+        """
+        Initialize the plan item store.
+
+        Args:
+            client: Qdrant client (defaults to the shared one for ``VECTOR_BACKEND``)
+            embeddings: Dense embedding service (defaults to the shared one for
+                ``PLAN_ITEM_EMBEDDING_BACKEND``)
+        """
+        self.client = client if client is not None else registry.qdrant_client()
+        self.embeddings = embeddings or registry.dense_embeddings(
+            settings.plan_item_embedding_backend
+        )
+        self._ensure_collection()
+
+    def _ensure_collection(self) -> None:
+        """
+        Create the collection if it doesn't exist.
+
+        Raises:
+            DimensionMismatchError: If it exists with another dense dimension
+        """
+        if self.client.collection_exists(self.COLLECTION_NAME):
+            check_dimension(
+                self.client, self.COLLECTION_NAME, self.DENSE_VECTOR_NAME, self.embeddings.dimension
+            )
+        else:
+            self.client.create_collection(
+                collection_name=self.COLLECTION_NAME,
+                vectors_config={
+                    self.DENSE_VECTOR_NAME: VectorParams(
+                        size=self.embeddings.dimension,
+                        distance=Distance.COSINE,
+                    )
+                },
+            )
+            self.client.create_payload_index(
+                collection_name=self.COLLECTION_NAME,
+                field_name="category",
+                field_schema=PayloadSchemaType.KEYWORD,
+            )
+
+    def add_items(self, items: list[LabeledPlanItem]) -> None:
+        """
+        Add labeled items to the store.
+
+        Args:
+            items: Items categorized by the LLM
+        """
+        if not items:
+            return
+
+        embeddings = self.embeddings.embed_batch([item.text for item in items])
+
+        points = [
+            PointStruct(
+                id=str(uuid5(NAMESPACE_DNS, item.text)),
+                vector={self.DENSE_VECTOR_NAME: embeddings[i]},
+                payload={
+                    "text": item.text,
+                    "category": item.category,
+                    "confidence": item.confidence,
+                    "source": item.source,
+                    "verification_type": item.verification_type,
+                },
+            )
+            for i, item in enumerate(items)
+        ]
+
+        self.client.upsert(
+            collection_name=self.COLLECTION_NAME,
+            points=points,
+        )
+
+    def find_neighbors(
+        self,
+        text: str,
+        top_k: int = 7,
+        score_threshold: float = 0.0,
+    ) -> list[PlanItemNeighbor]:
+        """
+        Find past items similar to ``text``.
+
+        Args:
+            text: Item text (see ``PlanItemPreClassifier.item_text``)
+            top_k: Number of neighbours to return
+            score_threshold: Minimum cosine similarity
+
+        Returns:
+            Neighbours ordered by decreasing similarity
+        """
+        return self.find_neighbors_batch([text], top_k, score_threshold)[0]
+
+    def find_neighbors_batch(
+        self,
+        texts: list[str],
+        top_k: int = 7,
+        score_threshold: float = 0.0,
+    ) -> list[list[PlanItemNeighbor]]:
+        """
+        Find past items similar to each of ``texts``.
+
+        The texts are embedded in one batch and searched in one batch request.
+
+        Args:
+            texts: Item texts (see ``PlanItemPreClassifier.item_text``)
+            top_k: Number of neighbours to return per text
+            score_threshold: Minimum cosine similarity
+
+        Returns:
+            Neighbours of each text, ordered by decreasing similarity
+        """
+        if not texts:
+            return []
+
+        requests = [
+            QueryRequest(
+                query=vector,
+                using=self.DENSE_VECTOR_NAME,
+                limit=top_k,
+                with_payload=True,
+                score_threshold=score_threshold,
+            )
+            for vector in self.embeddings.embed_batch(texts)
+        ]
+        responses = self.client.query_batch_points(
+            collection_name=self.COLLECTION_NAME,
+            requests=requests,
+        )
+
+        return [
+            [
+                PlanItemNeighbor(
+                    item=LabeledPlanItem(
+                        text=point.payload["text"],
+                        category=point.payload["category"],
+                        confidence=point.payload["confidence"],
+                        source=point.payload["source"],
+                        verification_type=point.payload.get("verification_type"),
+                    ),
+                    score=point.score,
+                )
+                for point in response.points
+            ]
+            for response in responses
+        ]
+
+    def count(self) -> int:
+        """Number of stored items."""
+        return self.client.count(collection_name=self.COLLECTION_NAME).count
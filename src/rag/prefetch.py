@@ -0,0 +1,70 @@
+"""
+Prefetch depth for hybrid (dense + sparse) search with DBSF fusion.
+
+Fusion can only rank the candidates each modality prefetches, so the depth
+bounds recall, and it drives the cost of every search. The depth scales
+with the number of results requested: ``factor`` candidates per result, and
+at least ``minimum``.
+
+In adaptive mode a search whose fused scores are flat is repeated with
+``widen`` times the depth. Flat means the best and the last requested result
+are within ``flat_spread`` of each other on the DBSF scale, where each
+modality contributes 0..1. Such queries match many candidates about equally,
+so hits just below the prefetch cut could still place. Clear-cut queries
+keep the shallow depth.
+
+``scripts/evaluate_prefetch.py`` reports recall@k and latency per setting.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import math
+from dataclasses import dataclass
+
+from src.config import settings
+
+
+@dataclass
+class PrefetchConfig:
+    """Candidates fetched per modality before fusion."""
+
+    factor: float = 4.0  # Candidates per requested result
+    minimum: int = 10  # Lower bound of the depth
+    adaptive: bool = False  # Widen the prefetch of queries with flat fused scores
+    widen: float = 4.0  # Depth multiplier for flat queries
+    flat_spread: float = 0.1  # Fused score spread of the results below which a query is flat
+
+    @classmethod
+    def from_settings(cls) -> "PrefetchConfig":
+        """Build the literature store's prefetch configuration from settings."""
+        return cls(
+            factor=settings.literature_prefetch_factor,
+            minimum=settings.literature_prefetch_min,
+            adaptive=settings.literature_prefetch_adaptive,
+            widen=settings.literature_prefetch_widen,
+            flat_spread=settings.literature_prefetch_flat_spread,
+        )
+
+    @property
+    def label(self) -> str:
+        """Short description for benchmark tables and logs."""
+        label = f"x{self.factor:g} min={self.minimum}"
+        if self.adaptive:
+            label += f" adaptive x{self.widen:g}<{self.flat_spread:g}"
+        return label
+
+    def depth(self, limit: int) -> int:
+        """Prefetch depth for a search returning ``limit`` points."""
+        return max(self.minimum, math.ceil(self.factor * limit))
+
+    def widened(self, limit: int) -> int:
+        """Prefetch depth for a flat query."""
+        return math.ceil(self.depth(limit) * self.widen)
+
+    def should_widen(self, scores: list[float], limit: int) -> bool:
+        """Whether fused ``scores`` (best first) call for a wider prefetch."""
+        return (
+            self.adaptive
+            and len(scores) >= limit
+            and scores[0] - scores[limit - 1] < self.flat_spread
+        )
@@ -0,0 +1,111 @@
+"""
+Shared resource registry.
+
+Stores are expensive to build: each one loads the BM25 model and a
+tokenizer, and they all share one Qdrant client (an embedded storage
+directory can only be opened once per process). Agents fetch them from the registry instead of
+constructing their own, so a process running many hypotheses (``batch``,
+``serve``) pays that cost once.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+if TYPE_CHECKING:
+    from qdrant_client import QdrantClient
+
+    from src.rag.literature_store import LiteratureStore
+    from src.rag.plan_item_store import PlanItemStore
+    from src.rag.requirement_store import RequirementStore
+
+T = TypeVar("T")
+
+
+class ResourceRegistry:
+    """
+    Process-wide cache of lazily constructed, shareable resources.
+
+    Resources are keyed by name. Tests and benchmarks can pre-register
+    substitutes (e.g. an in-memory store) with ``register`` before any agent
+    is created.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._instances: dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: str, factory: Callable[[], T]) -> T:
+        """
+        Return the resource registered under ``key``, creating it if needed.
+
+        Args:
+            key: Resource name
+            factory: Zero-argument callable that builds the resource
+
+        Returns:
+            The shared resource instance
+        """
+        with self._lock:
+            if key not in self._instances:
+                self._instances[key] = factory()
+            return self._instances[key]
+
+    def register(self, key: str, instance: Any) -> None:
+        """Register (or replace) a resource instance."""
+        with self._lock:
+            self._instances[key] = instance
+
+    def clear(self) -> None:
+        """Drop all cached resources."""
+        with self._lock:
+            self._instances.clear()
+
+    def qdrant_client(self) -> "QdrantClient":
+        """Return the shared Qdrant client for ``settings.vector_backend``."""
+        from src.rag.vector_client import create_qdrant_client
+
+        return self.get("qdrant_client", create_qdrant_client)
+
+    def dense_embeddings(self, backend: str | None = None) -> Any:
+        """
+        Return the shared dense embedding service for a backend.
+
+        The default backend is registered as ``dense_embeddings`` (what
+        cassettes and benchmarks replace); others as ``dense_embeddings:<backend>``.
+
+        Args:
+            backend: "openai" or "fastembed" (default ``settings.dense_embedding_backend``)
+        """
+        from src.config import settings
+        from src.rag.embeddings import create_dense_embeddings
+
+        backend = backend or settings.dense_embedding_backend
+        key = "dense_embeddings"
+        if backend != settings.dense_embedding_backend:
+            key = f"dense_embeddings:{backend}"
+        return self.get(key, lambda: create_dense_embeddings(backend))
+
+    def literature_store(self) -> "LiteratureStore":
+        """Return the shared LiteratureStore."""
+        from src.rag.literature_store import LiteratureStore
+
+        return self.get("literature_store", LiteratureStore)
+
+    def requirement_store(self) -> "RequirementStore":
+        """Return the shared RequirementStore."""
+        from src.rag.requirement_store import RequirementStore
+
+        return self.get("requirement_store", RequirementStore)
+
+    def plan_item_store(self) -> "PlanItemStore":
+        """Return the shared PlanItemStore."""
+        from src.rag.plan_item_store import PlanItemStore
+
+        return self.get("plan_item_store", PlanItemStore)
+
+
+# Global registry instance
+registry = ResourceRegistry()
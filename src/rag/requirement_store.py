@@ -20,10 +20,13 @@ from qdrant_client.models import (
     FieldCondition,
     MatchValue,
     PayloadSchemaType,
+    FilterSelector,
 )
 
 from src.config import settings
 from src.rag.embeddings import EmbeddingService
+from src.rag.migration import vector_size
+from src.rag.registry import registry
 from src.models.requirement import Requirement
 
 
@@ -45,30 +48,45 @@ class RequirementStore:
     - Dense embeddings for semantic similarity
     - Level-based filtering (critical: only match same level)
     - Top-k candidate retrieval for LLM decision
+    - Session scoping so concurrent decompositions sharing one store
+      never match each other's nodes
     """
 
     COLLECTION_NAME = "requirements"
     DENSE_VECTOR_NAME = "dense"
 
-    def __init__(self):
-        """Initialize the requirement store."""
-        if settings.qdrant_url:
-            self.client = QdrantClient(
-                url=settings.qdrant_url,
-                api_key=settings.qdrant_api_key,
-            )
-        else:
-            self.client = QdrantClient(
-                host=settings.qdrant_host,
-                port=settings.qdrant_port,
-            )
-        self.embeddings = EmbeddingService()
+    def __init__(
+        self,
+        client: QdrantClient | None = None,
+        embeddings: EmbeddingService | None = None,
+    ):
+        """
+        Initialize the requirement store.
+
+        Args:
+            client: Qdrant client (defaults to the shared one for ``VECTOR_BACKEND``)
+            embeddings: Dense embedding service (defaults to the shared one for
+                ``REQUIREMENT_EMBEDDING_BACKEND``)
+        """
+        self.client = client if client is not None else registry.qdrant_client()
+        self.embeddings = embeddings or registry.dense_embeddings(
+            settings.requirement_embedding_backend
+        )
         self._ensure_collection()
 
     def _ensure_collection(self) -> None:
-        """Create the collection if it doesn't exist."""
-        collections = self.client.get_collections()
-        collection_exists = self.COLLECTION_NAME in [c.name for c in collections.collections]
+        """
+        Create the collection if it doesn't exist.
+
+        Requirements only live for a decomposition, so a collection built for
+        another dense dimension is dropped instead of migrated.
+        """
+        collection_exists = self.client.collection_exists(self.COLLECTION_NAME)
+        if collection_exists and vector_size(
+            self.client, self.COLLECTION_NAME, self.DENSE_VECTOR_NAME
+        ) != self.embeddings.dimension:
+            self.client.delete_collection(self.COLLECTION_NAME)
+            collection_exists = False
 
         if not collection_exists:
             self.client.create_collection(
@@ -87,6 +105,11 @@ class RequirementStore:
                 field_name="level",
                 field_schema=PayloadSchemaType.INTEGER,
             )
+            self.client.create_payload_index(
+                collection_name=self.COLLECTION_NAME,
+                field_name="session_id",
+                field_schema=PayloadSchemaType.KEYWORD,
+            )
 
     def clear(self) -> None:
         """Clear all requirements (for new decomposition session)."""
@@ -96,12 +119,36 @@ class RequirementStore:
             pass
         self._ensure_collection()
 
-    def add_requirement(self, requirement: Requirement) -> None:
+    def clear_session(self, session_id: str) -> None:
+        """
+        Remove the requirements of a single decomposition session.
+
+        Args:
+            session_id: Session whose requirements should be deleted
+        """
+        self.client.delete(
+            collection_name=self.COLLECTION_NAME,
+            points_selector=FilterSelector(
+                filter=Filter(
+                    must=[
+                        FieldCondition(
+                            key="session_id",
+                            match=MatchValue(value=session_id),
+                        )
+                    ]
+                )
+            ),
+        )
+
+    def add_requirement(
+        self, requirement: Requirement, session_id: str | None = None
+    ) -> None:
         """
         Add a requirement to the store.
 
         Args:
             requirement: Requirement to index
+            session_id: Optional decomposition session the requirement belongs to
         """
         embedding = self.embeddings.embed(requirement.content)
 
@@ -112,6 +159,7 @@ class RequirementStore:
                 "requirement_id": str(requirement.id),
                 "content": requirement.content,
                 "level": requirement.level,
+                "session_id": session_id,
             },
         )
 
@@ -120,12 +168,15 @@ class RequirementStore:
             points=[point],
         )
 
-    def add_requirements_batch(self, requirements: list[Requirement]) -> None:
+    def add_requirements_batch(
+        self, requirements: list[Requirement], session_id: str | None = None
+    ) -> None:
         """
         Add multiple requirements in batch.
 
         Args:
             requirements: List of requirements to index
+            session_id: Optional decomposition session the requirements belong to
         """
         if not requirements:
             return
@@ -141,6 +192,7 @@ class RequirementStore:
                     "requirement_id": str(req.id),
                     "content": req.content,
                     "level": req.level,
+                    "session_id": session_id,
                 },
             )
             for i, req in enumerate(requirements)
@@ -157,6 +209,7 @@ class RequirementStore:
         level: int,
         top_k: int = 5,
         score_threshold: float = 0.75,
+        session_id: str | None = None,
     ) -> list[RequirementCandidate]:
         """
         Find similar requirements at a specific level.
@@ -170,6 +223,7 @@ class RequirementStore:
             level: Level to search (MUST match target level for new requirement)
             top_k: Number of candidates to return
             score_threshold: Minimum similarity score
+            session_id: If given, only match requirements from this session
 
         Returns:
             List of candidate requirements for LLM decision
@@ -177,14 +231,20 @@ class RequirementStore:
         query_embedding = self.embeddings.embed(content)
 
         # Filter by level - critical constraint for crossover
-        level_filter = Filter(
-            must=[
+        conditions = [
+            FieldCondition(
+                key="level",
+                match=MatchValue(value=level),
+            )
+        ]
+        if session_id is not None:
+            conditions.append(
                 FieldCondition(
-                    key="level",
-                    match=MatchValue(value=level),
+                    key="session_id",
+                    match=MatchValue(value=session_id),
                 )
-            ]
-        )
+            )
+        level_filter = Filter(must=conditions)
 
         results = self.client.query_points(
             collection_name=self.COLLECTION_NAME,
@@ -0,0 +1,160 @@
+"""
+Query-result cache for literature search.
+
+One run retrieves for the same or nearly the same text many times: node
+text and its reformulations, gap queries, plan-forming queries built from
+the hypothesis. ``SearchCache`` keeps recent results keyed by the exact
+query and by its dense embedding. An exact repeat costs nothing, and a query
+within ``radius`` (cosine distance) of a cached one costs one embedding
+instead of a hybrid Qdrant query.
+
+Results are only valid for the collection contents they were computed on.
+Every entry carries the store's collection version, which ingestion raises
+(in any process: see ``LiteratureStore._check_version``), and the cache
+drops everything once it sees a newer version.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+import numpy as np
+
+from src.config import settings
+
+
+@dataclass
+class _Entry:
+    """Cached results of one query."""
+
+    vector: np.ndarray  # Unit-length dense query embedding
+    params: Hashable  # Search parameters the results depend on (top_k, ...)
+    results: list[Any]
+
+
+class SearchCache:
+    """
+    LRU cache of search results, matched by exact query or embedding proximity.
+
+    Thread-safe: stores are shared across concurrent agents and ingestion
+    threads.
+    """
+
+    def __init__(self, capacity: int = 256, radius: float = 0.05):
+        """
+        Initialize the cache.
+
+        Args:
+            capacity: Maximum number of cached queries
+            radius: Maximum cosine distance (1 - similarity) between a query
+                and a cached one for a semantic hit; 0 only serves exact repeats
+        """
+        self.capacity = capacity
+        self.radius = radius
+        self._entries: OrderedDict[tuple[str, Hashable], _Entry] = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "SearchCache | None":
+        """The literature search cache from settings, or None if disabled."""
+        if settings.literature_search_cache_size <= 0:
+            return None
+        return cls(
+            capacity=settings.literature_search_cache_size,
+            radius=settings.literature_search_cache_radius,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(query: str, params: Hashable) -> tuple[str, Hashable]:
+        return " ".join(query.split()), params
+
+    def _sync(self, version: int) -> bool:
+        """Adopt a newer collection version (dropping every entry); False for an older one."""
+        if version > self._version:
+            self._entries.clear()
+            self._version = version
+        return version == self._version
+
+    def get(self, query: str, params: Hashable, version: int) -> list[Any] | None:
+        """
+        Results cached for exactly this query (whitespace-normalized).
+
+        Args:
+            query: Search query
+            params: Search parameters the results depend on
+            version: Current collection version
+
+        Returns:
+            A copy of the cached result list, or None
+        """
+        key = self._key(query, params)
+        with self._lock:
+            if not self._sync(version) or key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return list(self._entries[key].results)
+
+    def nearest(self, vector: list[float], params: Hashable, version: int) -> list[Any] | None:
+        """
+        Results of the closest cached query within ``radius`` of ``vector``.
+
+        Args:
+            vector: Dense embedding of the query
+            params: Search parameters the results depend on
+            version: Current collection version
+
+        Returns:
+            A copy of the cached result list, or None
+        """
+        if self.radius <= 0:
+            return None
+        query = _unit(vector)
+        with self._lock:
+            if not self._sync(version):
+                return None
+            keys = [key for key, entry in self._entries.items()
+                    if entry.params == params and len(entry.vector) == len(query)]
+            if not keys:
+                return None
+            similarities = np.stack([self._entries[key].vector for key in keys]) @ query
+            best = int(np.argmax(similarities))
+            if 1.0 - similarities[best] > self.radius:
+                return None
+            self._entries.move_to_end(keys[best])
+            return list(self._entries[keys[best]].results)
+
+    def put(
+        self, query: str, params: Hashable, version: int, vector: list[float], results: list[Any]
+    ) -> None:
+        """
+        Cache the results of a query, evicting the least recently used entry if full.
+
+        Results computed on an older collection version are discarded.
+        """
+        key = self._key(query, params)
+        with self._lock:
+            if not self._sync(version):
+                return
+            self._entries[key] = _Entry(vector=_unit(vector), params=params, results=list(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+def _unit(vector: list[float]) -> np.ndarray:
+    """``vector`` as a unit-length float32 array."""
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
@@ -0,0 +1,90 @@
+"""
+Qdrant client construction for the vector stores.
+
+``VECTOR_BACKEND`` selects where the collections live:
+
+- ``server``: a Qdrant server at ``QDRANT_URL`` (with ``QDRANT_API_KEY``) or
+  ``QDRANT_HOST``:``QDRANT_PORT``, e.g. the one in ``docker-compose.yml``.
+- ``embedded``: qdrant-client's local mode, in-process and persisted under
+  ``QDRANT_PATH`` (``:memory:`` keeps everything in RAM). It runs the same
+  hybrid dense+sparse and filtered queries with exact search, without a
+  network hop or a separate service. It suits single-node deployments,
+  tests and benchmarks up to some 10^5 points per collection; HNSW and
+  quantization settings are accepted but have no effect.
+
+An embedded storage directory is locked by the client that opened it, so
+one process must share a single client; stores get theirs from
+``registry.qdrant_client()``. Local mode is not thread-safe, while
+ingestion runs in worker threads and sharded searches fan out over a
+thread pool, so embedded clients are wrapped in ``LockedQdrantClient``,
+which serializes every call.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import functools
+import threading
+from typing import Any
+
+from qdrant_client import QdrantClient
+
+from src.config import settings
+
+VECTOR_BACKENDS = ("server", "embedded")
+
+
+class LockedQdrantClient:
+    """
+    Proxy that serializes every method call of a local-mode QdrantClient.
+
+    Attributes that are not callable are passed through unchanged.
+    """
+
+    def __init__(self, client: QdrantClient):
+        self._client = client
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def locked(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+
+        return locked
+
+
+def create_qdrant_client(
+    backend: str | None = None, path: str | None = None
+) -> QdrantClient | LockedQdrantClient:
+    """
+    Build a Qdrant client for a vector backend.
+
+    Args:
+        backend: "server" or "embedded" (default ``settings.vector_backend``)
+        path: Embedded storage directory or ":memory:" (default ``settings.qdrant_path``)
+
+    Returns:
+        QdrantClient (server) or LockedQdrantClient (embedded)
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = backend or settings.vector_backend
+    if backend == "embedded":
+        path = path or settings.qdrant_path
+        if path == ":memory:":
+            return LockedQdrantClient(QdrantClient(":memory:"))
+        # The local SQLite storage must accept calls from threads other than
+        # its creator; the lock keeps them from running concurrently
+        return LockedQdrantClient(QdrantClient(path=path, force_disable_check_same_thread=True))
+    if backend == "server":
+        if settings.qdrant_url:
+            return QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key)
+        return QdrantClient(host=settings.qdrant_host, port=settings.qdrant_port)
+    raise ValueError(
+        f"Unknown vector backend {backend!r}; expected one of {', '.join(VECTOR_BACKENDS)}"
+    )
@@ -0,0 +1,121 @@
+"""
+Dense vector index configuration for Qdrant collections.
+
+Bundles the storage and ANN settings of a dense vector (quantization, on-disk
+storage, HNSW graph parameters and the search-time ``ef``) and translates them
+into Qdrant models for collection creation, updates and queries.
+
+Quantized vectors stay in RAM while the full-precision originals can live on
+disk; with ``rescore`` enabled Qdrant searches the quantized vectors for
+``limit * oversampling`` candidates and re-ranks them with the originals.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+from dataclasses import dataclass
+
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    HnswConfigDiff,
+    QuantizationConfig,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+)
+
+from src.config import settings
+
+QUANTIZATION_MODES = ("none", "scalar", "binary")
+
+# Bytes per dimension of the vectors searched in RAM, by quantization mode
+BYTES_PER_DIMENSION = {"none": 4.0, "scalar": 1.0, "binary": 1 / 8}
+
+
+@dataclass
+class VectorIndexConfig:
+    """Storage, quantization and HNSW settings for one dense vector."""
+
+    quantization: str = "none"  # "none" | "scalar" | "binary"
+    rescore: bool = True  # Re-rank quantized candidates with the original vectors
+    oversampling: float = 2.0  # Quantized candidates fetched per requested result
+    on_disk: bool = False  # Original vectors (and payloads) on disk
+    hnsw_m: int = 16  # Graph edges per node
+    hnsw_ef_construct: int = 100  # Candidate list size while building the graph
+    hnsw_ef: int | None = None  # Candidate list size while searching (None: Qdrant default)
+
+    def __post_init__(self):
+        if self.quantization not in QUANTIZATION_MODES:
+            raise ValueError(
+                f"Unknown quantization {self.quantization!r}; "
+                f"expected one of {', '.join(QUANTIZATION_MODES)}"
+            )
+
+    @classmethod
+    def from_settings(cls) -> "VectorIndexConfig":
+        """Build the literature collection's configuration from settings."""
+        return cls(
+            quantization=settings.literature_quantization,
+            rescore=settings.literature_quantization_rescore,
+            oversampling=settings.literature_quantization_oversampling,
+            on_disk=settings.literature_on_disk,
+            hnsw_m=settings.literature_hnsw_m,
+            hnsw_ef_construct=settings.literature_hnsw_ef_construct,
+            hnsw_ef=settings.literature_hnsw_ef,
+        )
+
+    @property
+    def label(self) -> str:
+        """Short description for benchmark tables and logs."""
+        parts = [self.quantization, f"m={self.hnsw_m}", f"efc={self.hnsw_ef_construct}"]
+        if self.on_disk:
+            parts.append("disk")
+        return " ".join(parts)
+
+    def hnsw_config(self) -> HnswConfigDiff:
+        """HNSW graph parameters."""
+        return HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def quantization_config(self) -> QuantizationConfig | None:
+        """Quantization for the collection, or None for full-precision search."""
+        if self.quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8, quantile=0.99, always_ram=True
+                )
+            )
+        if self.quantization == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def search_params(self, hnsw_ef: int | None = None, exact: bool = False) -> SearchParams | None:
+        """
+        Search-time parameters for a dense query.
+
+        Args:
+            hnsw_ef: Overrides the configured ``hnsw_ef``
+            exact: Brute-force search over the original vectors (ground truth)
+
+        Returns:
+            SearchParams, or None when every value is the Qdrant default
+        """
+        if exact:
+            return SearchParams(exact=True, quantization=QuantizationSearchParams(ignore=True))
+        ef = hnsw_ef or self.hnsw_ef
+        quantization = None
+        if self.quantization != "none":
+            quantization = QuantizationSearchParams(
+                rescore=self.rescore, oversampling=self.oversampling
+            )
+        if ef is None and quantization is None:
+            return None
+        return SearchParams(hnsw_ef=ef, quantization=quantization)
+
+    def ram_bytes(self, points: int, dimension: int) -> int:
+        """Estimated vector RAM for ``points`` points, excluding the HNSW graph and page cache."""
+        originals = 0 if self.on_disk else points * dimension * 4
+        if self.quantization == "none":
+            return originals
+        return int(points * dimension * BYTES_PER_DIMENSION[self.quantization]) + originals
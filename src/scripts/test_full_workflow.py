@@ -80,7 +80,7 @@ async def solve_atomic_requirements(
             solution = result.solution
 
         req.solution_id = solution.id
-        req.status = RequirementStatus.SOLVED
+        graph.set_status(req.id, RequirementStatus.SOLVED)
         return req.id, solution
 
     # Solve all unique requirements in parallel
@@ -147,14 +147,14 @@ async def aggregate_solutions(
         )
 
         node.solution_id = agg_result.solution.id
-        node.status = RequirementStatus.SOLVED
+        graph.set_status(node.id, RequirementStatus.SOLVED)
 
         return node.id, agg_result.solution, agg_result.gaps
 
     # Process level by level (must be sequential between levels)
     for level in range(graph.max_depth - 1, -1, -1):
         level_nodes = graph.get_level_nodes(level)
-        non_leaf_nodes = [n for n in level_nodes if graph.get_children(n.id)]
+        non_leaf_nodes = [n for n in level_nodes if graph.out_degree(n.id)]
 
         if not non_leaf_nodes:
             continue
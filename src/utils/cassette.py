@@ -0,0 +1,397 @@
+"""
+Record/replay cassette for LLM and embedding traffic.
+
+In record mode every chat call, Responses API call and dense embedding made
+through the shared clients is captured; in replay mode the same requests are
+answered from the cassette in microseconds, without network access or an API
+key. Requests are matched on normalized content (whitespace collapsed, UUIDs
+and timestamps masked), and repeated identical requests replay their recorded
+responses in order.
+
+File layout (``<path>``)::
+
+    MAGIC | (uint32 length | zlib(header JSON \\0 payload))*
+
+Chat and Responses payloads are UTF-8 text; embeddings are packed float32.
+A sidecar index (``<path>.idx``) maps request keys to record offsets; it is
+rebuilt by scanning the data file if missing or stale.
+
+Usage:
+    install_cassette("outputs/run.cassette", "record")   # before building agents
+    ...
+    close_cassette()
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import hashlib
+import json
+import mmap
+import re
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.utils.telemetry import tracer
+
+MAGIC = b"WGMCAS1\n"
+_LENGTH = struct.Struct("<I")
+
+_UUID = re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I)
+_TIMESTAMP = re.compile(r"\b\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class CassetteMissError(KeyError):
+    """A replayed request has no recording."""
+
+
+def normalize(text: str) -> str:
+    """Normalize request content so cosmetic differences still match."""
+    text = _UUID.sub("<uuid>", text)
+    text = _TIMESTAMP.sub("<timestamp>", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def request_key(kind: str, scope: str, content: str) -> str:
+    """Stable key for a request."""
+    digest = hashlib.sha1(f"{kind}\x1f{scope}\x1f{normalize(content)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class Cassette:
+    """
+    Append-only, indexed store of recorded responses.
+
+    Args:
+        path: Cassette data file
+        mode: "record" (truncate and capture) or "replay" (read only)
+    """
+
+    def __init__(self, path: str, mode: str):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self.mode = mode
+        self._index: dict[str, list[tuple[int, int]]] = {}
+        self._cursor: dict[str, int] = {}
+        self._decoded: dict[tuple[int, int], tuple[dict, bytes]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+        if mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "wb")
+            self._file.write(MAGIC)
+            self._offset = len(MAGIC)
+            self._map = None
+        else:
+            self._file = open(self.path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._map[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{self.path} is not a cassette file")
+            self._load_index()
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _load_index(self) -> None:
+        size = len(self._map)
+        if self.index_path.exists():
+            data = json.loads(self.index_path.read_text())
+            if data.get("size") == size:
+                self._index = {k: [tuple(e) for e in v] for k, v in data["entries"].items()}
+                return
+        # Missing or stale index (e.g. the recording process crashed): rescan
+        offset = len(MAGIC)
+        while offset + _LENGTH.size <= size:
+            (length,) = _LENGTH.unpack_from(self._map, offset)
+            header, _ = self._decode(offset, length)
+            self._index.setdefault(header["key"], []).append((offset, length))
+            offset += _LENGTH.size + length
+
+    def _write_index(self) -> None:
+        self.index_path.write_text(json.dumps({"size": self._offset, "entries": self._index}))
+
+    def _decode(self, offset: int, length: int) -> tuple[dict, bytes]:
+        cached = self._decoded.get((offset, length))
+        if cached is None:
+            start = offset + _LENGTH.size
+            blob = zlib.decompress(self._map[start : start + length])
+            header, _, payload = blob.partition(b"\0")
+            cached = (json.loads(header), payload)
+            self._decoded[(offset, length)] = cached
+        return cached
+
+    # ------------------------------------------------------------------
+    # Record / replay
+    # ------------------------------------------------------------------
+
+    def record(self, key: str, header: dict, payload: bytes) -> None:
+        """Append a recorded response."""
+        blob = zlib.compress(json.dumps({**header, "key": key}).encode("utf-8") + b"\0" + payload)
+        with self._lock:
+            self._file.write(_LENGTH.pack(len(blob)) + blob)
+            self._index.setdefault(key, []).append((self._offset, len(blob)))
+            self._offset += _LENGTH.size + len(blob)
+            self.recorded += 1
+
+    def replay(self, key: str, description: str) -> tuple[dict, bytes]:
+        """
+        Return the next recorded response for a request.
+
+        Raises:
+            CassetteMissError: If the request was never recorded
+        """
+        entries = self._index.get(key)
+        if not entries:
+            self.misses += 1
+            raise CassetteMissError(f"No recording for {description} in {self.path}")
+        with self._lock:
+            position = self._cursor.get(key, 0)
+            self._cursor[key] = position + 1
+        self.hits += 1
+        return self._decode(*entries[position % len(entries)])
+
+    def close(self) -> None:
+        """Flush the data file and write the index."""
+        if self.mode == "record":
+            self._file.close()
+            self._write_index()
+        else:
+            self._map.close()
+            self._file.close()
+
+
+# ----------------------------------------------------------------------
+# Client wrappers
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class ReplayUsage:
+    """Mirrors the framework's usage details."""
+
+    input_token_count: int
+    output_token_count: int
+
+
+@dataclass
+class ReplayRunResult:
+    """Mirrors the framework's agent run response."""
+
+    text: str
+    usage_details: ReplayUsage | None
+
+
+class _CassetteAgent:
+    def __init__(self, cassette: Cassette, name: str, inner: Any = None):
+        self._cassette = cassette
+        self._inner = inner
+        self.name = name
+
+    async def run(self, message: str, **kwargs) -> Any:
+        key = request_key("chat", self.name, message)
+        if self._inner is None:
+            header, payload = self._cassette.replay(key, f"chat call to '{self.name}'")
+            usage = None
+            if header.get("input_tokens") is not None:
+                usage = ReplayUsage(header["input_tokens"], header["output_tokens"])
+            return ReplayRunResult(text=payload.decode("utf-8"), usage_details=usage)
+
+        result = await self._inner.run(message, **kwargs)
+        usage = getattr(result, "usage_details", None)
+        self._cassette.record(
+            key,
+            {
+                "kind": "chat",
+                "scope": self.name,
+                "input_tokens": getattr(usage, "input_token_count", None),
+                "output_tokens": getattr(usage, "output_token_count", None),
+            },
+            (result.text or "").encode("utf-8"),
+        )
+        return result
+
+
+class CassetteChatClient:
+    """Chat client that records through ``inner`` or, without it, replays."""
+
+    def __init__(self, cassette: Cassette, inner: Any = None):
+        self._cassette = cassette
+        self._inner = inner
+        self.model_id = getattr(inner, "model_id", None) or "replay"
+
+    def create_agent(self, name: str, instructions: str, **kwargs) -> _CassetteAgent:
+        inner_agent = None
+        if self._inner is not None:
+            inner_agent = self._inner.create_agent(name=name, instructions=instructions, **kwargs)
+        return _CassetteAgent(self._cassette, name, inner_agent)
+
+
+@dataclass
+class ReplayResponsesUsage:
+    input_tokens: int
+    output_tokens: int
+
+
+@dataclass
+class ReplayResponse:
+    output_text: str
+    usage: ReplayResponsesUsage | None
+
+
+class _CassetteResponses:
+    def __init__(self, cassette: Cassette, inner: Any = None):
+        self._cassette = cassette
+        self._inner = inner
+
+    async def create(self, model: str, input: list[dict], **kwargs) -> Any:
+        content = "\n".join(f"{m['role']}: {m['content']}" for m in input)
+        key = request_key("responses", model, content)
+        if self._inner is None:
+            header, payload = self._cassette.replay(key, f"Responses call to '{model}'")
+            usage = None
+            if header.get("input_tokens") is not None:
+                usage = ReplayResponsesUsage(header["input_tokens"], header["output_tokens"])
+            return ReplayResponse(output_text=payload.decode("utf-8"), usage=usage)
+
+        response = await self._inner.responses.create(model=model, input=input, **kwargs)
+        usage = getattr(response, "usage", None)
+        self._cassette.record(
+            key,
+            {
+                "kind": "responses",
+                "scope": model,
+                "input_tokens": getattr(usage, "input_tokens", None),
+                "output_tokens": getattr(usage, "output_tokens", None),
+            },
+            response.output_text.encode("utf-8"),
+        )
+        return response
+
+
+class CassetteResponsesClient:
+    """Responses API client that records through ``inner`` or replays."""
+
+    def __init__(self, cassette: Cassette, inner: Any = None):
+        self.responses = _CassetteResponses(cassette, inner)
+
+
+class CassetteEmbeddingService:
+    """
+    Dense embedding service that records through ``inner`` or replays.
+
+    Each text is recorded separately, so replays match regardless of how
+    texts were batched.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        inner: Any = None,
+        model: str = "text-embedding-3-small",
+        dimension: int | None = None,
+    ):
+        from src.config import settings
+
+        self._cassette = cassette
+        self._inner = inner
+        self.model = getattr(inner, "model", model)
+        self.dimension = getattr(inner, "dimension", dimension or settings.embedding_dimensions)
+        # Shortened vectors are recorded separately; 1536-d keys stay as they were
+        self._scope = self.model if self.dimension == 1536 else f"{self.model}@{self.dimension}"
+
+    def _replay(self, text: str) -> list[float]:
+        _, payload = self._cassette.replay(
+            request_key("embedding", self._scope, text), f"embedding of {text[:60]!r}"
+        )
+        return np.frombuffer(payload, dtype=np.float32).tolist()
+
+    def _record(self, text: str, vector: list[float]) -> None:
+        self._cassette.record(
+            request_key("embedding", self._scope, text),
+            {"kind": "embedding", "scope": self._scope},
+            np.asarray(vector, dtype=np.float32).tobytes(),
+        )
+
+    def embed(self, text: str) -> list[float]:
+        if self._inner is None:
+            with tracer.span("embed:dense", "embedding", model=self.model, replay=True):
+                return self._replay(text)
+        vector = self._inner.embed(text)
+        self._record(text, vector)
+        return vector
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        if self._inner is None:
+            with tracer.span(
+                "embed:dense", "embedding", model=self.model, batch_size=len(texts), replay=True
+            ):
+                return [self._replay(text) for text in texts]
+        vectors = self._inner.embed_batch(texts)
+        for text, vector in zip(texts, vectors):
+            self._record(text, vector)
+        return vectors
+
+
+# ----------------------------------------------------------------------
+# Installation
+# ----------------------------------------------------------------------
+
+_active: Cassette | None = None
+
+
+def install_cassette(path: str, mode: str) -> Cassette:
+    """
+    Route the shared chat, Responses and embedding clients through a cassette.
+
+    Must be called before agents and stores are built, since they fetch their
+    clients from the resource registry at construction.
+
+    Args:
+        path: Cassette file
+        mode: "record" or "replay"
+
+    Returns:
+        The open Cassette
+    """
+    global _active
+    from src.rag.registry import registry
+
+    cassette = Cassette(path, mode)
+    if mode == "record":
+        from openai import AsyncOpenAI
+
+        from src.agents.base import create_chat_client
+        chat = create_chat_client()
+        responses = registry.get("responses_client", AsyncOpenAI)
+        embeddings = registry.dense_embeddings()
+    else:
+        chat = responses = embeddings = None
+
+    registry.register("chat_client", CassetteChatClient(cassette, chat))
+    registry.register("responses_client", CassetteResponsesClient(cassette, responses))
+    registry.register("dense_embeddings", CassetteEmbeddingService(cassette, embeddings))
+    _active = cassette
+    return cassette
+
+
+def close_cassette() -> Cassette | None:
+    """Close the installed cassette (writing its index) and return it."""
+    global _active
+    cassette, _active = _active, None
+    if cassette is not None:
+        cassette.close()
+    return cassette
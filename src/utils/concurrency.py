@@ -0,0 +1,69 @@
+"""
+Process-wide concurrency limits.
+
+Every LLM round trip in the platform goes through ``llm_limiter`` so that
+concurrent hypotheses, gap-filling fan-outs and batch runs share a single
+budget instead of each opening as many connections as they like.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from src.config import settings
+
+
+class ConcurrencyLimiter:
+    """
+    An asyncio semaphore that can be resized and survives event-loop changes.
+
+    The semaphore is created lazily on first use so the limiter can be
+    instantiated at import time, before any event loop exists.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Maximum number of concurrent holders
+        """
+        self.limit = max(1, limit)
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def set_limit(self, limit: int) -> None:
+        """Change the limit; takes effect for the next event loop or first acquire."""
+        self.limit = max(1, limit)
+        self._semaphore = None
+        self._loop = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.limit)
+            self._loop = loop
+        return self._semaphore
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one slot for the duration of the ``async with`` block."""
+        semaphore = self._get_semaphore()
+        async with semaphore:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+
+# Global limiter for LLM calls (chat agents and raw completions)
+llm_limiter = ConcurrencyLimiter(settings.max_concurrent_llm_calls)
+
+# Global limiter for deep-research CLI sessions (each is a Node process)
+deep_research_limiter = ConcurrencyLimiter(settings.max_concurrent_deep_research)
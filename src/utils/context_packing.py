@@ -0,0 +1,86 @@
+"""
+Token-budgeted context packing.
+
+Fits ranked pieces of context into a prompt budget: every piece gets a
+one-line digest if it fits, then the highest-priority pieces are upgraded
+to their full text while the budget lasts.
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+def default_tokenizer() -> Any:
+    """Return the shared cl100k_base tokenizer."""
+    import tiktoken
+
+    from src.rag.registry import registry
+
+    return registry.get("tokenizer", lambda: tiktoken.get_encoding("cl100k_base"))
+
+
+@dataclass
+class PackCandidate:
+    """A piece of context with its full and digest renderings."""
+
+    full: str
+    digest: str
+    priority: float
+    key: Any = None
+
+
+@dataclass
+class PackedContext:
+    """The pieces that fit, in priority order."""
+
+    full: list[PackCandidate] = field(default_factory=list)
+    digests: list[PackCandidate] = field(default_factory=list)
+    omitted: list[PackCandidate] = field(default_factory=list)
+    tokens: int = 0
+    budget: int = 0
+
+
+def pack_context(
+    candidates: list[PackCandidate],
+    budget: int,
+    count_tokens: Callable[[str], int],
+) -> PackedContext:
+    """
+    Pack candidates into a token budget.
+
+    Digests are admitted in priority order until the budget is spent (the
+    rest are omitted); admitted candidates are then upgraded to full text in
+    priority order wherever the extra tokens still fit.
+
+    Args:
+        candidates: Pieces of context
+        budget: Token budget for all packed text
+        count_tokens: Token counter
+
+    Returns:
+        PackedContext with full, digest and omitted candidates
+    """
+    ranked = sorted(candidates, key=lambda c: c.priority, reverse=True)
+    packed = PackedContext(budget=budget)
+
+    # One extra token per piece for the separator it is joined with
+    admitted = []
+    for candidate in ranked:
+        digest_tokens = count_tokens(candidate.digest) + 1
+        if packed.tokens + digest_tokens <= budget:
+            packed.tokens += digest_tokens
+            admitted.append((candidate, digest_tokens))
+        else:
+            packed.omitted.append(candidate)
+
+    for candidate, digest_tokens in admitted:
+        extra = count_tokens(candidate.full) + 1 - digest_tokens
+        if packed.tokens + extra <= budget:
+            packed.tokens += extra
+            packed.full.append(candidate)
+        else:
+            packed.digests.append(candidate)
+
+    return packed
@@ -0,0 +1,226 @@
+"""
+Asyncio-native driver for interactive programs running under a pty.
+
+The pty master is read with ``loop.add_reader`` and written with
+``loop.add_writer`` (no polling thread, no ``select`` loop). Output is
+echoed through a callback and kept in a bounded rolling buffer that prompt
+matchers inspect, so long sessions use constant memory and matching cost.
+
+Usage:
+    session = await PtySession.start(["npm", "start"], cwd=path)
+    try:
+        await session.expect(lambda tail: "question" in tail.lower(), timeout=60)
+        await session.send("How thick should the shield be?\\n")
+        await session.wait(timeout=1800)
+    finally:
+        await session.close()
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import asyncio
+import codecs
+import os
+import pty
+import sys
+from typing import Callable
+
+Matcher = Callable[[str], bool]
+
+
+def _echo(text: str) -> None:
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+class PtySession:
+    """
+    A child process attached to a pseudo-terminal.
+
+    Args:
+        process: The child process
+        master_fd: Master side of the pty
+        max_buffer: Characters of recent output kept for prompt matching
+        on_output: Called with every decoded chunk of output
+    """
+
+    def __init__(
+        self,
+        process: asyncio.subprocess.Process,
+        master_fd: int,
+        max_buffer: int = 16_384,
+        on_output: Callable[[str], None] | None = _echo,
+    ):
+        self.process = process
+        self.master_fd = master_fd
+        self.max_buffer = max_buffer
+        self.on_output = on_output
+        self.tail = ""
+        self.eof = False
+        self._loop = asyncio.get_running_loop()
+        self._data = asyncio.Event()
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._write_lock = asyncio.Lock()
+        self._closed = False
+        os.set_blocking(master_fd, False)
+        self._loop.add_reader(master_fd, self._on_readable)
+
+    @classmethod
+    async def start(
+        cls,
+        argv: list[str],
+        cwd: str | None = None,
+        env: dict[str, str] | None = None,
+        **kwargs,
+    ) -> "PtySession":
+        """
+        Spawn ``argv`` attached to a new pty.
+
+        Args:
+            argv: Program and arguments
+            cwd: Working directory
+            env: Environment (defaults to the current one)
+            **kwargs: Passed to the PtySession constructor
+
+        Returns:
+            The running session
+        """
+        master_fd, slave_fd = pty.openpty()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *argv,
+                cwd=cwd,
+                env=env,
+                stdin=slave_fd,
+                stdout=slave_fd,
+                stderr=slave_fd,
+                start_new_session=True,
+            )
+        except Exception:
+            os.close(master_fd)
+            raise
+        finally:
+            os.close(slave_fd)
+        return cls(process, master_fd, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def _on_readable(self) -> None:
+        try:
+            data = os.read(self.master_fd, 65_536)
+        except BlockingIOError:
+            return
+        except OSError:
+            # EIO: the child closed its side of the pty
+            data = b""
+
+        if not data:
+            self.eof = True
+            self._loop.remove_reader(self.master_fd)
+            self._data.set()
+            return
+
+        # Incremental decoding keeps multi-byte characters split across reads
+        text = self._decoder.decode(data)
+        if not text:
+            return
+        if self.on_output:
+            self.on_output(text)
+        self.tail = (self.tail + text)[-self.max_buffer:]
+        self._data.set()
+
+    def clear(self) -> None:
+        """Forget buffered output (e.g. after answering a prompt)."""
+        self.tail = ""
+
+    async def expect(self, matcher: Matcher, timeout: float | None = None) -> str:
+        """
+        Wait until ``matcher`` accepts the buffered output.
+
+        Args:
+            matcher: Predicate over the rolling buffer
+            timeout: Seconds to wait (None waits forever)
+
+        Returns:
+            The buffered output that matched
+
+        Raises:
+            TimeoutError: If nothing matched in time
+            EOFError: If the program closed its output first
+        """
+        async with asyncio.timeout(timeout):
+            while True:
+                if matcher(self.tail):
+                    return self.tail
+                if self.eof:
+                    raise EOFError("Program exited before the expected output")
+                self._data.clear()
+                await self._data.wait()
+
+    # ------------------------------------------------------------------
+    # Input / lifecycle
+    # ------------------------------------------------------------------
+
+    async def send(self, text: str | bytes) -> None:
+        """
+        Write to the program's terminal.
+
+        When the pty's input buffer is full (the program is not reading), waits
+        until it drains. Concurrent sends are written whole, in call order.
+        """
+        data = text.encode("utf-8") if isinstance(text, str) else text
+        async with self._write_lock:
+            while data:
+                try:
+                    written = os.write(self.master_fd, data)
+                except BlockingIOError:
+                    await self._writable()
+                    continue
+                data = data[written:]
+
+    async def _writable(self) -> None:
+        """Wait until the pty master accepts more input."""
+        writable = self._loop.create_future()
+
+        def on_writable() -> None:
+            if not writable.done():
+                writable.set_result(None)
+
+        self._loop.add_writer(self.master_fd, on_writable)
+        try:
+            await writable
+        finally:
+            self._loop.remove_writer(self.master_fd)
+
+    async def wait(self, timeout: float | None = None) -> int:
+        """
+        Wait for the program to exit.
+
+        Raises:
+            TimeoutError: If it is still running after ``timeout`` seconds
+        """
+        async with asyncio.timeout(timeout):
+            return await self.process.wait()
+
+    async def close(self, grace: float = 5.0) -> None:
+        """Stop the program (terminate, then kill after ``grace`` seconds) and free the pty."""
+        if self._closed:
+            return
+        self._closed = True
+        if not self.eof:
+            self._loop.remove_reader(self.master_fd)
+
+        if self.process.returncode is None:
+            try:
+                self.process.terminate()
+                async with asyncio.timeout(grace):
+                    await self.process.wait()
+            except ProcessLookupError:
+                pass
+            except TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+
+        os.close(self.master_fd)
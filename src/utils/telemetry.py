@@ -0,0 +1,300 @@
+"""
+Structured per-call telemetry.
+
+Records a span for every LLM call, embedding request and literature search
+with its phase, requirement node, model, token counts, estimated cost,
+latency and cache hits. Spans can be exported as JSONL (one span per line)
+and in Chrome trace format (open in chrome://tracing or ui.perfetto.dev) to
+see the critical path of a run.
+
+Usage:
+    tracer.enable()
+    with tracer.phase("decomposition"):
+        ...
+    tracer.export("outputs/telemetry")
+
+Owner: [ASSIGN TEAMMATE]
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from src.config import settings
+
+# Approximate USD prices per 1M tokens: (prompt, completion)
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-5": (1.25, 10.00),
+    "gpt-5-mini": (0.25, 2.00),
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.0),
+}
+
+_current_phase: ContextVar[str | None] = ContextVar("telemetry_phase", default=None)
+_current_node: ContextVar[str | None] = ContextVar("telemetry_node", default=None)
+_current_span: ContextVar[int | None] = ContextVar("telemetry_span", default=None)
+
+
+def estimate_cost(model: str | None, prompt_tokens: int, completion_tokens: int) -> float:
+    """
+    Estimate the USD cost of a call from the price table.
+
+    Unknown models cost 0.0 so they show up in reports without skewing totals.
+    """
+    if not model:
+        return 0.0
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        # Match dated snapshots such as "gpt-4o-mini-2024-07-18"
+        matches = [name for name in MODEL_PRICES if model.startswith(name)]
+        if not matches:
+            return 0.0
+        prices = MODEL_PRICES[max(matches, key=len)]
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+@dataclass
+class Span:
+    """A single timed operation."""
+
+    span_id: int
+    name: str
+    kind: str  # "phase" | "step" | "llm" | "embedding" | "search"
+    start_us: float
+    duration_us: float = 0.0
+    parent_id: int | None = None
+    phase: str | None = None
+    node_id: str | None = None
+    model: str | None = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    cache_hit: bool = False
+    error: str | None = None
+    lane: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def record_usage(
+        self, model: str | None, prompt_tokens: int | None, completion_tokens: int | None
+    ) -> None:
+        """Attach token usage and derived cost."""
+        if model:
+            self.model = model
+        self.prompt_tokens = prompt_tokens or 0
+        self.completion_tokens = completion_tokens or 0
+        self.cost_usd = estimate_cost(self.model, self.prompt_tokens, self.completion_tokens)
+
+
+class _NullSpan(Span):
+    """Span handed out while tracing is disabled; records nothing."""
+
+    def __init__(self):
+        super().__init__(span_id=0, name="", kind="", start_us=0.0)
+
+
+class Tracer:
+    """
+    Collects spans in memory and exports them.
+
+    Disabled by default (``settings.telemetry_enabled``); while disabled,
+    ``span`` yields a throwaway span and adds almost no overhead.
+    """
+
+    def __init__(self, enabled: bool = False, max_spans: int = 100_000):
+        """
+        Initialize the tracer.
+
+        Args:
+            enabled: Whether to record spans
+            max_spans: Oldest spans are dropped beyond this many
+        """
+        self.enabled = enabled
+        self.spans: deque[Span] = deque(maxlen=max_spans)
+        self._ids = itertools.count(1)
+        self._origin = time.perf_counter()
+        self._lanes: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """Start recording spans."""
+        self.enabled = True
+
+    def reset(self) -> None:
+        """Drop all recorded spans."""
+        with self._lock:
+            self.spans.clear()
+            self._lanes.clear()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def _lane(self) -> int:
+        """Small integer identifying the current asyncio task (or thread)."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = id(task) if task is not None else threading.get_ident()
+        with self._lock:
+            if key not in self._lanes:
+                self._lanes[key] = len(self._lanes) + 1
+            return self._lanes[key]
+
+    @contextmanager
+    def span(self, name: str, kind: str, **attributes: Any) -> Iterator[Span]:
+        """
+        Time the enclosed block as a span.
+
+        Args:
+            name: Span name (e.g. "agent:retriever")
+            kind: Span category
+            **attributes: Extra attributes (model=..., node_id=... are promoted)
+
+        Yields:
+            The Span, so callers can attach usage and cache hits
+        """
+        if not self.enabled:
+            yield _NullSpan()
+            return
+
+        span = Span(
+            span_id=next(self._ids),
+            name=name,
+            kind=kind,
+            start_us=self._now_us(),
+            parent_id=_current_span.get(),
+            phase=_current_phase.get(),
+            node_id=attributes.pop("node_id", None) or _current_node.get(),
+            model=attributes.pop("model", None),
+            lane=self._lane(),
+            attributes=attributes,
+        )
+        token = _current_span.set(span.span_id)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.duration_us = self._now_us() - span.start_us
+            with self._lock:
+                self.spans.append(span)
+
+    def mark(self, span: Span, key: str) -> None:
+        """Record milliseconds elapsed since the span started (e.g. time queued)."""
+        if self.enabled:
+            span.attributes[key] = round((self._now_us() - span.start_us) / 1000, 1)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Tag every span inside the block with a workflow phase."""
+        token = _current_phase.set(name)
+        try:
+            with self.span(name, "phase"):
+                yield
+        finally:
+            _current_phase.reset(token)
+
+    @contextmanager
+    def node(self, node_id: Any) -> Iterator[None]:
+        """Tag every span inside the block with a requirement node ID."""
+        token = _current_node.set(str(node_id))
+        try:
+            yield
+        finally:
+            _current_node.reset(token)
+
+    def summary(self) -> dict:
+        """Totals per phase over call spans (LLM, embedding and search)."""
+        by_phase: dict[str, dict] = {}
+        for span in list(self.spans):
+            if span.kind in ("phase", "step"):
+                continue
+            entry = by_phase.setdefault(
+                span.phase or "unscoped",
+                {"calls": 0, "seconds": 0.0, "prompt_tokens": 0,
+                 "completion_tokens": 0, "cost_usd": 0.0, "cache_hits": 0},
+            )
+            entry["calls"] += 1
+            entry["seconds"] += span.duration_us / 1_000_000
+            entry["prompt_tokens"] += span.prompt_tokens
+            entry["completion_tokens"] += span.completion_tokens
+            entry["cost_usd"] += span.cost_usd
+            entry["cache_hits"] += int(span.cache_hit)
+        return by_phase
+
+    def export_jsonl(self, file_path: str) -> None:
+        """Write one JSON span per line."""
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            for span in list(self.spans):
+                f.write(json.dumps(asdict(span)) + "\n")
+
+    def export_chrome_trace(self, file_path: str) -> None:
+        """Write spans in Chrome trace event format (one lane per asyncio task)."""
+        events = []
+        for span in list(self.spans):
+            args = {
+                "phase": span.phase,
+                "node_id": span.node_id,
+                "model": span.model,
+                "prompt_tokens": span.prompt_tokens,
+                "completion_tokens": span.completion_tokens,
+                "cost_usd": round(span.cost_usd, 6),
+                "cache_hit": span.cache_hit,
+                **span.attributes,
+            }
+            if span.error:
+                args["error"] = span.error
+            events.append({
+                "name": span.name,
+                "cat": span.kind,
+                "ph": "X",
+                "ts": round(span.start_us, 1),
+                "dur": round(span.duration_us, 1),
+                "pid": 1,
+                "tid": 0 if span.kind == "phase" else span.lane,
+                "args": {k: v for k, v in args.items() if v is not None},
+            })
+
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export(self, directory: str | None = None, prefix: str | None = None) -> tuple[Path, Path]:
+        """
+        Export both formats into a directory.
+
+        Args:
+            directory: Output directory (defaults to settings.telemetry_dir)
+            prefix: File name prefix (defaults to a timestamp)
+
+        Returns:
+            Paths of the JSONL file and the Chrome trace file
+        """
+        out_dir = Path(directory or settings.telemetry_dir)
+        prefix = prefix or time.strftime("trace-%Y%m%d-%H%M%S")
+        jsonl_path = out_dir / f"{prefix}.jsonl"
+        chrome_path = out_dir / f"{prefix}.chrome.json"
+        self.export_jsonl(str(jsonl_path))
+        self.export_chrome_trace(str(chrome_path))
+        return jsonl_path, chrome_path
+
+
+# Global tracer instance
+tracer = Tracer(enabled=settings.telemetry_enabled)
@@ -0,0 +1,51 @@
+"""
+Shared fixtures: literature stores on an in-memory Qdrant with hash embeddings.
+"""
+
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from qdrant_client import QdrantClient
+
+from src.benchmarks.fakes import HashEmbeddingService, HashSparseEmbeddingService, WordTokenizer
+from src.rag.literature_store import Document, LiteratureStore
+
+
+@pytest.fixture
+def literature_store():
+    """
+    Factory for literature stores that need no API key or Qdrant server.
+
+    ``documents`` maps source paths to markdown; each is ingested up front,
+    titled by its file name. With ``record_queries`` the keyword arguments of
+    every ``query_points`` call are appended to ``store.queries``. Other
+    options (``client``, ``dense_embeddings``, ...) go to LiteratureStore.
+    """
+
+    def make(
+        documents: dict[str, str] | None = None,
+        dimension: int = 32,
+        record_queries: bool = False,
+        **options,
+    ) -> LiteratureStore:
+        options.setdefault("client", QdrantClient(":memory:"))
+        options.setdefault("dense_embeddings", HashEmbeddingService(dimension))
+        store = LiteratureStore(
+            sparse_embeddings=HashSparseEmbeddingService(), tokenizer=WordTokenizer(), **options
+        )
+        for source, content in (documents or {}).items():
+            store.ingest_document(Document(uuid4(), Path(source).name, content, source, {}))
+
+        if record_queries:
+            store.queries = []
+            query_points = store.client.query_points
+
+            def recording_query_points(*args, **kwargs):
+                store.queries.append(kwargs)
+                return query_points(*args, **kwargs)
+
+            store.client.query_points = recording_query_points
+        return store
+
+    return make
@@ -0,0 +1,145 @@
+"""
+Tests for batch file parsing and the multi-hypothesis batch runner.
+
+A fake workflow stands in for ResearchWorkflow, so no LLM is called.
+"""
+
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from src.orchestration.batch import BatchItemResult, BatchReport, BatchRunner, load_batch_file
+
+
+class FakeWorkflow:
+    """Returns a one-line plan per hypothesis, fails on "fail", and records concurrency."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def run(self, hypothesis_text, show_progress=True, deep_research=True):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if hypothesis_text == "fail":
+                raise RuntimeError("no plan")
+            return SimpleNamespace(
+                plan_markdown=f"# {hypothesis_text}\n",
+                final_plan=SimpleNamespace(total_steps=len(hypothesis_text)),
+            )
+        finally:
+            self.in_flight -= 1
+
+
+def result(index: int, seconds: float, success: bool = True) -> BatchItemResult:
+    return BatchItemResult(index, f"{index:03d}", f"h{index}", success, seconds)
+
+
+class TestLoadBatchFile:
+    """Tests for the plain-text, JSONL and JSON batch formats."""
+
+    def test_plain_text_skips_blank_and_comment_lines(self, tmp_path):
+        path = tmp_path / "hypotheses.txt"
+        path.write_text("# Radiation\nShield the habitat\n\n  Grow food  \n", encoding="utf-8")
+
+        items = load_batch_file(str(path))
+
+        assert [(i.index, i.item_id, i.hypothesis) for i in items] == [
+            (0, "000", "Shield the habitat"),
+            (1, "001", "Grow food"),
+        ]
+
+    def test_jsonl_objects_and_strings(self, tmp_path):
+        path = tmp_path / "variants.jsonl"
+        path.write_text(
+            '{"id": "a", "hypothesis": "Shield"}\n# skipped\n"Grow food"\n{"hypothesis": "Dig"}\n',
+            encoding="utf-8",
+        )
+
+        items = load_batch_file(str(path))
+
+        assert [(i.item_id, i.hypothesis) for i in items] == [
+            ("a", "Shield"), ("001", "Grow food"), ("002", "Dig"),
+        ]
+
+    def test_json_array(self, tmp_path):
+        path = tmp_path / "variants.json"
+        path.write_text(json.dumps(["Shield", {"id": 7, "hypothesis": "Dig"}]), encoding="utf-8")
+
+        assert [(i.item_id, i.hypothesis) for i in load_batch_file(str(path))] == [
+            ("000", "Shield"), ("7", "Dig"),
+        ]
+
+    @pytest.mark.parametrize(("name", "content", "location"), [
+        ("bad.jsonl", '"ok"\n{"hypothesis": \n', "bad.jsonl:2"),
+        ("bad.jsonl", '{"id": "x"}\n', "bad.jsonl:1"),
+        ("bad.jsonl", '"ok"\n\n"  "\n', "bad.jsonl:3"),
+        ("bad.json", '{"hypothesis": "not an array"}', "bad.json"),
+        ("bad.json", '["ok", 3]', "bad.json[1]"),
+        ("bad.json", '["ok",', "bad.json"),
+    ])
+    def test_bad_entries_name_their_location(self, tmp_path, name, content, location):
+        path = tmp_path / name
+        path.write_text(content, encoding="utf-8")
+
+        with pytest.raises(ValueError, match=re.escape(location)):
+            load_batch_file(str(path))
+
+
+class TestBatchRunner:
+    """Tests for running hypotheses concurrently through one workflow."""
+
+    def test_failures_are_isolated_and_plans_written(self, tmp_path):
+        path = tmp_path / "hypotheses.txt"
+        path.write_text("Shield\nfail\nGrow food\nDig\n", encoding="utf-8")
+        workflow = FakeWorkflow()
+        runner = BatchRunner(concurrency=2, output_dir=str(tmp_path / "out"), workflow=workflow)
+
+        report = asyncio.run(runner.run(load_batch_file(str(path))))
+
+        assert [r.success for r in report.results] == [True, False, True, True]
+        assert report.results[1].error == "RuntimeError: no plan"
+        assert report.results[2].total_steps == len("Grow food")
+        assert (tmp_path / "out" / "000_PLAN.md").read_text(encoding="utf-8") == "# Shield\n"
+        assert not (tmp_path / "out" / "001_PLAN.md").exists()
+        assert workflow.peak == 2
+
+        saved = json.loads((tmp_path / "out" / "batch_report.json").read_text(encoding="utf-8"))
+        assert saved["summary"]["failed"] == 1 and len(saved["results"]) == 4
+
+
+class TestBatchReport:
+    """Tests for aggregate batch statistics."""
+
+    def test_summary_aggregates_successful_items(self):
+        report = BatchReport(
+            results=[result(0, 2.0), result(1, 4.0), result(2, 9.0, success=False), result(3, 6.0)],
+            wall_seconds=10.0,
+            concurrency=3,
+            peak_llm_calls_in_flight=5,
+        )
+
+        assert report.summary() == {
+            "total": 4,
+            "succeeded": 3,
+            "failed": 1,
+            "concurrency": 3,
+            "wall_seconds": 10.0,
+            "throughput_per_hour": 1080.0,
+            "speedup": 2.1,
+            "latency_mean_seconds": 4.0,
+            "latency_median_seconds": 4.0,
+            "latency_max_seconds": 6.0,
+            "peak_llm_calls_in_flight": 5,
+        }
+
+    def test_empty_report(self):
+        summary = BatchReport().summary()
+
+        assert summary["total"] == 0 and summary["throughput_per_hour"] == 0.0
+        assert summary["latency_mean_seconds"] is None
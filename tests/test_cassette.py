@@ -0,0 +1,98 @@
+"""
+Tests for the record/replay cassette.
+"""
+
+import asyncio
+
+import pytest
+
+from src.benchmarks.fakes import FakeChatClient, FakeResponsesClient, HashEmbeddingService
+from src.utils.cassette import (
+    Cassette,
+    CassetteChatClient,
+    CassetteEmbeddingService,
+    CassetteMissError,
+    CassetteResponsesClient,
+    normalize,
+    request_key,
+)
+
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    return tmp_path / "run.cassette"
+
+
+class TestNormalization:
+    """Tests for request matching."""
+
+    def test_whitespace_uuids_and_timestamps_are_ignored(self):
+        a = "Solve  requirement 3f2b8c1e-1111-4222-8333-944455556666\nat 2025-01-02 10:11:12"
+        b = "Solve requirement 0b0b0b0b-aaaa-4bbb-8ccc-dddddddddddd at 2026-10-19T08:00:00"
+        assert normalize(a) == normalize(b)
+        assert request_key("chat", "proposer", a) == request_key("chat", "proposer", b)
+
+    def test_scope_is_part_of_the_key(self):
+        assert request_key("chat", "proposer", "x") != request_key("chat", "aggregator", "x")
+
+
+class TestCassette:
+    """Tests for the cassette file."""
+
+    def test_repeated_requests_replay_in_order(self, cassette_path):
+        cassette = Cassette(str(cassette_path), "record")
+        cassette.record("k", {"kind": "chat"}, b"first")
+        cassette.record("k", {"kind": "chat"}, b"second")
+        cassette.close()
+
+        replay = Cassette(str(cassette_path), "replay")
+        assert replay.replay("k", "k")[1] == b"first"
+        assert replay.replay("k", "k")[1] == b"second"
+        assert replay.replay("k", "k")[1] == b"first"
+        with pytest.raises(CassetteMissError):
+            replay.replay("missing", "missing")
+        replay.close()
+
+    def test_index_is_rebuilt_when_missing(self, cassette_path):
+        cassette = Cassette(str(cassette_path), "record")
+        cassette.record("a", {"kind": "chat"}, b"alpha")
+        cassette.close()
+        cassette.index_path.unlink()
+
+        replay = Cassette(str(cassette_path), "replay")
+        assert replay.replay("a", "a")[1] == b"alpha"
+        replay.close()
+
+
+class TestClientWrappers:
+    """Record through fakes, then replay without them."""
+
+    def test_chat_responses_and_embeddings_round_trip(self, cassette_path):
+        async def calls(chat, responses):
+            agent = chat.create_agent(name="proposer", instructions="Propose.")
+            result = await agent.run("How thick should the shielding be?")
+            response = await responses.responses.create(
+                model="gpt-4o-mini",
+                input=[{"role": "user", "content": "Decompose this."}],
+            )
+            return result, response
+
+        cassette = Cassette(str(cassette_path), "record")
+        chat = CassetteChatClient(cassette, FakeChatClient({"proposer": lambda m: "10 cm"}))
+        responses = CassetteResponsesClient(cassette, FakeResponsesClient(lambda m: "{}"))
+        embeddings = CassetteEmbeddingService(cassette, HashEmbeddingService(dimension=8))
+        recorded, _ = asyncio.run(calls(chat, responses))
+        vectors = embeddings.embed_batch(["alpha", "beta"])
+        cassette.close()
+
+        cassette = Cassette(str(cassette_path), "replay")
+        replayed, response = asyncio.run(
+            calls(CassetteChatClient(cassette), CassetteResponsesClient(cassette))
+        )
+        replay_embeddings = CassetteEmbeddingService(cassette, model="hash-embedding", dimension=8)
+
+        assert replayed.text == recorded.text == "10 cm"
+        assert replayed.usage_details.input_token_count == recorded.usage_details.input_token_count
+        assert response.output_text == "{}"
+        assert replay_embeddings.embed("beta") == pytest.approx(vectors[1])
+        cassette.close()
@@ -0,0 +1,108 @@
+"""
+Tests for the external chunk text store and slim literature payloads.
+"""
+
+from uuid import uuid4
+
+import pytest
+
+from src.benchmarks.fakes import HashEmbeddingService
+from src.rag.chunk_text_store import ChunkTextStore
+from src.rag.literature_store import LiteratureStore
+from src.rag.migration import migrate_dense_vectors
+
+REPORT = """# Shielding
+
+## Regolith
+
+Regolith berms absorb radiation.
+
+## Water
+
+Water walls double as storage.
+"""
+
+
+@pytest.fixture
+def store(literature_store, tmp_path):
+    return literature_store(
+        {"shielding.md": REPORT}, dimension=16, text_store=ChunkTextStore(tmp_path / "texts")
+    )
+
+
+class TestChunkTextStore:
+    """Tests for the append-only text store."""
+
+    def test_replace_delete_and_reopen(self, tmp_path):
+        a, b, c = uuid4(), uuid4(), uuid4()
+        texts = ChunkTextStore(tmp_path)
+        texts.put_many([(a, "first"), (b, "zweite ✓"), (c, "third")])
+        texts.put_many([(a, "first, revised")])
+        texts.delete_many([c])
+
+        assert texts.get_many([a, b, c]) == {a: "first, revised", b: "zweite ✓"}
+        assert ChunkTextStore(tmp_path).get_many([a, b, c]) == {a: "first, revised", b: "zweite ✓"}
+
+        # Another instance (e.g. an ingestion process) appends; lookups pick it up
+        ChunkTextStore(tmp_path).put_many([(c, "third, again")])
+        assert texts.get_many([c]) == {c: "third, again"}
+
+    def test_compaction_keeps_live_texts(self, tmp_path):
+        texts = ChunkTextStore(tmp_path)
+        ids = [uuid4() for _ in range(10)]
+        texts.put_many((i, "old " * 50) for i in ids)
+        texts.put_many((i, f"new {n}") for n, i in enumerate(ids))
+        size = (tmp_path / ChunkTextStore.DATA_FILE).stat().st_size
+
+        assert texts.garbage_ratio() > 0.5
+        texts.compact()
+
+        assert (tmp_path / ChunkTextStore.DATA_FILE).stat().st_size < size / 5
+        assert texts.garbage_ratio() == 0
+        assert ChunkTextStore(tmp_path).get_many(ids) == {i: f"new {n}" for n, i in enumerate(ids)}
+
+
+    def test_compaction_by_another_handle_is_picked_up(self, tmp_path):
+        reader, writer = ChunkTextStore(tmp_path), ChunkTextStore(tmp_path)
+        old = [uuid4() for _ in range(30)]
+        writer.put_many((i, "stale " * 20) for i in old)
+        assert len(reader.get_many(old)) == 30  # Reader has mapped the original files
+
+        writer.delete_many(old[::2])
+        writer.compact()
+        new = [uuid4() for _ in range(30)]
+        writer.put_many((i, f"fresh {n}") for n, i in enumerate(new))
+
+        assert reader.get_many(new) == {i: f"fresh {n}" for n, i in enumerate(new)}
+        assert reader.get_many(old) == {i: "stale " * 20 for i in old[1::2]}
+        assert reader.garbage_ratio() == 0
+
+
+class TestSlimPayloads:
+    """Tests for the literature store with texts outside Qdrant."""
+
+    def test_search_reads_texts_from_the_text_store(self, store):
+        points, _ = store.client.scroll(store.collection_name, with_payload=True)
+
+        chunks = store.search("regolith berms", top_k=1)
+        sections = store.search("regolith berms", top_k=1, parent_sections=True)
+
+        assert points and all("content" not in point.payload for point in points)
+        assert "Regolith berms absorb radiation." in chunks[0].chunk.content
+        assert "Regolith berms absorb radiation." in sections[0].chunk.content
+
+        store.delete_chunks([point.id for point in points])
+        assert len(store.text_store) == 0
+
+    def test_migration_re_embeds_external_texts(self, store):
+        embedded = []
+        embeddings = HashEmbeddingService(8)
+        embed_batch = embeddings.embed_batch
+        embeddings.embed_batch = lambda texts: embedded.extend(texts) or embed_batch(texts)
+
+        migrate_dense_vectors(
+            store.client, "literature", LiteratureStore.DENSE_VECTOR_NAME, embeddings, "content",
+            text_store=store.text_store,
+        )
+
+        assert embedded and all(embedded)
@@ -0,0 +1,107 @@
+"""
+Tests for structure-aware markdown chunking and parent-section retrieval.
+
+Uses an in-memory Qdrant and the whitespace tokenizer, so no server or
+tokenizer download is needed.
+"""
+
+from uuid import uuid4
+
+import pytest
+from qdrant_client import QdrantClient
+
+from src.benchmarks.fakes import HashEmbeddingService, HashSparseEmbeddingService, WordTokenizer
+from src.rag.literature_store import Document, LiteratureStore
+
+
+@pytest.fixture
+def store():
+    return LiteratureStore(
+        client=QdrantClient(":memory:"),
+        dense_embeddings=HashEmbeddingService(32),
+        sparse_embeddings=HashSparseEmbeddingService(),
+        tokenizer=WordTokenizer(),
+    )
+
+
+def document(content: str) -> Document:
+    return Document(id=uuid4(), title="Doc", content=content, source="doc.md", metadata={})
+
+
+class TestChunking:
+    """Tests for structure-aware chunking and chunk counts."""
+
+    def test_tables_and_sections_are_not_cut(self, store):
+        rows = "\n".join(f"| Material {i} | {i} g/cm2 | {i * 3} mSv |" for i in range(30))
+        content = (
+            "# Shielding\n\nIntro paragraph.\n\n"
+            "## Materials\n\n| Material | Areal density | Dose |\n|---|---|---|\n" + rows + "\n\n"
+            "### Polyethylene\n\n" + "hydrogen rich " * 100 + "\n\n"
+            "## Operations\n\n- Storm shelter drill\n- Dosimeter readout\n"
+        )
+        doc = document(content)
+
+        chunks = store._chunk_markdown(doc, max_tokens=400)
+
+        table_chunks = [c for c in chunks if "| Material 0 |" in c.content]
+        assert len(table_chunks) == 1 and "| Material 29 |" in table_chunks[0].content
+        assert [c.metadata["heading_path"] for c in chunks] == [
+            ["Shielding"],
+            ["Shielding", "Materials"],
+            ["Shielding", "Materials", "Polyethylene"],
+            ["Shielding", "Operations"],
+        ]
+        for chunk in chunks:
+            assert content[chunk.metadata["char_start"]:chunk.metadata["char_end"]] == chunk.content
+
+    def test_oversized_table_splits_between_rows(self, store):
+        rows = "\n".join(f"| Material {i} | {i} g/cm2 |" for i in range(200))
+        chunks = store._chunk_markdown(document("# Data\n\n" + rows), max_tokens=100)
+
+        assert len(chunks) > 1
+        assert all(line.startswith("|") for c in chunks[1:] for line in c.content.splitlines())
+        assert chunks[0].content.startswith("# Data")
+
+    def test_windows_slice_multibyte_text(self, store):
+        content = "# Dosimetry\n\n" + " ".join(["µSv/h", "Ω", "β-radiation"] * 400)
+
+        chunks = store._chunk_markdown(document(content))
+
+        assert len(chunks) > 1
+        assert all("�" not in c.content for c in chunks)
+        assert chunks[0].content.startswith("# Dosimetry")
+
+    def test_ingestion_reports_chunk_count(self, store, tmp_path):
+        path = tmp_path / "spec.md"
+        path.write_text("# Spec\n\n" + "shielding " * 1200, encoding="utf-8")
+
+        doc = store.ingest_file(str(path))
+
+        assert doc.chunk_count == len(store._chunk_markdown(doc)) == 3
+        assert store.count_chunks(doc.id) == 3
+
+
+class TestParentSections:
+    """Tests for returning parent sections from search."""
+
+    def test_hits_expand_to_their_h2_section(self, store):
+        content = (
+            "# Dosimetry\n\n"
+            "## Instruments\n\n"
+            "### Tissue equivalent proportional counters\n\n"
+            + "tepc lineal energy spectra " * 100 + "\n\n"
+            "### Active personal dosimeters\n\n" + "silicon diode crew badge " * 100 + "\n\n"
+            "## Limits\n\n" + "career effective dose limit " * 20
+        )
+        doc = document(content)
+        store.ingest_document(doc)
+
+        chunks = store.search("silicon diode crew badge", top_k=1)
+        sections = store.search("silicon diode crew badge", top_k=2, parent_sections=True)
+
+        assert chunks[0].chunk.metadata["heading_path"][-1] == "Active personal dosimeters"
+        section = sections[0].chunk
+        assert section.metadata["heading_path"] == ["Dosimetry", "Instruments"]
+        assert "## Instruments" in section.content and "## Limits" not in section.content
+        assert "tepc lineal energy" in section.content and "silicon diode" in section.content
+        assert len({r.chunk.id for r in sections}) == len(sections)
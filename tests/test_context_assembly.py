@@ -0,0 +1,99 @@
+"""
+Tests for assembling retrieved chunks into budgeted prompt context.
+"""
+
+from uuid import uuid4
+
+import pytest
+from qdrant_client import QdrantClient
+
+from src.benchmarks.fakes import HashEmbeddingService, HashSparseEmbeddingService, WordTokenizer
+from src.rag.context_assembly import assemble_context, merge_adjacent
+from src.rag.literature_store import Document, DocumentChunk, LiteratureStore, RetrievalResult
+
+tokenizer = WordTokenizer()
+
+
+def count_tokens(text: str) -> int:
+    return len(tokenizer.encode(text))
+
+
+def result(document_id, index, content, score, title="Doc", **metadata) -> RetrievalResult:
+    chunk = DocumentChunk(uuid4(), document_id, content, index, metadata)
+    return RetrievalResult(chunk=chunk, score=score, document_title=title)
+
+
+@pytest.fixture
+def store():
+    return LiteratureStore(
+        client=QdrantClient(":memory:"),
+        dense_embeddings=HashEmbeddingService(32),
+        sparse_embeddings=HashSparseEmbeddingService(),
+        tokenizer=WordTokenizer(),
+    )
+
+
+class TestContextAssembly:
+    """Tests for merging, deduplication and the token budget."""
+
+    def test_overlapping_windows_are_stored_once(self, store):
+        words = [f"w{i}" for i in range(1200)]
+        content = "# Dose\n\n" + " ".join(words)
+        doc = Document(uuid4(), "Dose", content, "dose.md", {})
+        chunks = store._chunk_markdown(doc)
+        assert len(chunks) > 2
+        results = [RetrievalResult(c, 1.0 - i / 10, "Dose") for i, c in enumerate(chunks)]
+
+        context = assemble_context(results, budget=10_000, count_tokens=count_tokens)
+
+        assert len(context.spans) == 1
+        assert context.spans[0].content == content
+        assert context.text.startswith("[Source: Dose > Dose]\n# Dose")
+
+    def test_chunks_without_offsets_merge_by_index(self):
+        document_id = uuid4()
+        left = "alpha beta gamma delta epsilon zeta eta theta iota kappa"
+        right = "eta theta iota kappa lambda mu nu"
+        spans = merge_adjacent([
+            result(document_id, 1, right, 0.9),
+            result(document_id, 0, left, 0.5),
+            result(document_id, 3, "unrelated later chunk", 0.4),
+        ])
+
+        assert [s.content for s in spans] == [left + " lambda mu nu", "unrelated later chunk"]
+        assert spans[0].score == 0.9
+
+    def test_near_duplicates_keep_attribution(self):
+        sentence = "Polyethylene shielding cuts the cosmic ray dose equivalent by about a third. "
+        text = sentence * 3
+        context = assemble_context(
+            [
+                result(uuid4(), 0, text, 0.9, title="NASA report"),
+                result(uuid4(), 4, text + " Extra remark.", 0.8, title="ESA report"),
+                result(
+                    uuid4(), 2, "Regolith berms need excavation equipment.", 0.7, title="Regolith"
+                ),
+            ],
+            budget=10_000,
+            count_tokens=count_tokens,
+        )
+
+        assert [s.title for s in context.spans] == ["NASA report", "Regolith"]
+        assert context.sources == ["NASA report", "Regolith", "ESA report"]
+
+    def test_budget_keeps_best_ranked_spans(self):
+        results = [
+            result(
+                uuid4(), 0, f"Finding {i}. " + f"detail{i} " * 200, 1.0 - i / 10, title=f"Paper {i}"
+            )
+            for i in range(4)
+        ]
+
+        context = assemble_context(results, budget=450, count_tokens=count_tokens)
+
+        assert context.tokens <= 450
+        assert count_tokens(context.text) <= 450
+        assert "detail0 detail0" in context.text and "detail1 detail1" in context.text
+        assert "[Source: Paper 2]\nFinding 2..." in context.text
+        positions = [context.text.index(f"Paper {i}") for i in range(3)]
+        assert positions == sorted(positions)
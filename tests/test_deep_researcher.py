@@ -0,0 +1,185 @@
+"""
+Tests for parallel deep-research sessions, the report cache and streamed ingestion.
+
+A small Python program stands in for the deep-research CLI: it answers the
+same setup prompts and writes ``report.md`` into its working directory.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from uuid import uuid4
+
+import pytest
+from qdrant_client import QdrantClient
+
+from src.agents.deep_researcher import DeepResearcherAgent, ReportCache, report_cache_key
+from src.benchmarks.fakes import (
+    FakeChatClient,
+    HashEmbeddingService,
+    HashSparseEmbeddingService,
+    WordTokenizer,
+    canned_json,
+)
+from src.config import settings
+from src.rag.literature_store import Document, IncrementalIngestor, LiteratureStore
+from src.rag.registry import registry
+
+FAKE_CLI = """
+import time
+question = input("What would you like to research? ")
+breadth = input("Enter research breadth (default 4): ") or "4"
+depth = input("Enter research depth (default 2): ") or "2"
+input("Generate a long report or a specific answer? (report/answer, default report): ")
+time.sleep(0.5)
+with open("report.md", "w") as f:
+    f.write(f"Report on {question} (breadth {breadth}, depth {depth})")
+"""
+
+
+# Writes the report one section at a time
+STREAMING_CLI = FAKE_CLI.replace(
+    """time.sleep(0.5)
+with open("report.md", "w") as f:
+    f.write(f"Report on {question} (breadth {breadth}, depth {depth})")""",
+    """with open("report.md", "w") as f:
+    for section in ["# Report", "## Hazards", "## Dose limits", "## Shielding"]:
+        f.write(section + "\\n\\n" + " ".join([section.strip("# ").lower()] * 40) + "\\n\\n")
+        f.flush()
+        time.sleep(0.3)""",
+)
+
+
+@pytest.fixture
+def literature():
+    store = LiteratureStore(
+        client=QdrantClient(":memory:"),
+        dense_embeddings=HashEmbeddingService(64),
+        sparse_embeddings=HashSparseEmbeddingService(),
+        tokenizer=WordTokenizer(),
+    )
+    registry.register("literature_store", store)
+    return store
+
+
+@pytest.fixture
+def research_dir(tmp_path):
+    directory = tmp_path / "deep-research"
+    directory.mkdir()
+    (directory / "fake_cli.py").write_text(FAKE_CLI)
+    return directory
+
+
+@pytest.fixture
+def agent(research_dir, literature, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "deep_research_prompt_timeout", 10.0)
+    monkeypatch.setattr(settings, "deep_research_timeout", 30.0)
+    facets = {"questions": ["Shield mass budget?", "Regolith availability?"]}
+    registry.register(
+        "chat_client", FakeChatClient({"deep_researcher": lambda m: canned_json(facets)})
+    )
+    yield DeepResearcherAgent(
+        research_dir=research_dir,
+        command=[sys.executable, "fake_cli.py"],
+        cache=ReportCache(tmp_path / "cache"),
+    )
+    registry.clear()
+
+
+class TestDeepResearcher:
+    """Tests for session isolation, fan-out and caching."""
+
+    def test_cache_key_normalizes_question(self):
+        params = {"breadth": None, "depth": 2}
+        assert report_cache_key("Shield  mass?", params) == report_cache_key("shield mass", params)
+        wider = {"breadth": 3, "depth": 2}
+        assert report_cache_key("shield mass", params) != report_cache_key("shield mass", wider)
+
+    def test_facets_run_in_parallel_sessions(self, agent, research_dir, monkeypatch):
+        monkeypatch.setattr(settings, "deep_research_facets", 2)
+        monkeypatch.setattr(settings, "deep_research_depth", 3)
+
+        start = time.perf_counter()
+        hypothesis = asyncio.run(agent.execute("Shield a Mars habitat"))
+        elapsed = time.perf_counter() - start
+
+        report = open(hypothesis.report_path).read()
+        assert "Report on Shield mass budget? (breadth 4, depth 3)" in report
+        assert "Report on Regolith availability? (breadth 4, depth 3)" in report
+        # Each session sleeps 0.5 s; sequential sessions would take over 1 s
+        assert elapsed < 1.0
+        assert not any((research_dir / ".sessions").iterdir())
+        assert not (research_dir / "report.md").exists()
+
+    def test_identical_question_is_served_from_cache(self, agent, research_dir):
+        first = asyncio.run(agent.execute("Shield a Mars habitat"))
+        (research_dir / "fake_cli.py").unlink()
+
+        start = time.perf_counter()
+        second = asyncio.run(agent.execute("shield a  Mars habitat?"))
+
+        assert time.perf_counter() - start < 0.2
+        assert open(second.report_path).read() == open(first.report_path).read()
+        meta = json.loads(next((agent.cache.directory).glob("*.json")).read_text())
+        assert meta["question"] == "Shield a Mars habitat"
+
+
+class TestStreamedIngestion:
+    """Tests for incremental ingestion of reports in progress."""
+
+    def test_partial_and_final_versions_do_not_duplicate(self, literature):
+        ingestor = IncrementalIngestor(literature, uuid4(), source="report.md")
+        final = "# Report\n\n## A\n\n" + "alpha " * 30 + "\n\n## B\n\n" + "beta " * 30
+
+        assert ingestor.update(final[:12]) == 0  # no completed section yet
+        assert ingestor.update(final[: final.index("## B") + 10]) > 0
+        ingestor.update(final, final=True)
+
+        chunks = literature._chunk_markdown(
+            Document(ingestor.document_id, "Report", final, "report.md", {})
+        )
+        assert literature.count_chunks(ingestor.document_id) == len(chunks) == ingestor.chunk_count
+
+    def test_final_version_removes_stale_chunks(self, literature):
+        ingestor = IncrementalIngestor(literature, uuid4(), source="report.md")
+        ingestor.update("# Report\n\n" + "draft " * 1200 + "\n\n## Next\n")
+        assert literature.count_chunks(ingestor.document_id) > 1
+
+        ingestor.update("# Report\n\nShort final text.", final=True)
+        assert literature.count_chunks(ingestor.document_id) == 1
+
+    def test_partial_versions_remove_superseded_chunks(self, literature):
+        ingestor = IncrementalIngestor(literature, uuid4(), source="report.md")
+        ingestor.update("# Report\n\n" + "draft " * 1200 + "\n\n## Next\n")
+        ingestor.update("# Report\n\nRewritten intro.\n\n## Next\n")
+
+        # No final update, as when the session fails or is cancelled
+        assert literature.count_chunks(ingestor.document_id) == ingestor.chunk_count == 1
+
+    def test_sections_are_ingested_while_the_cli_runs(
+        self, agent, research_dir, literature, monkeypatch
+    ):
+        (research_dir / "fake_cli.py").write_text(STREAMING_CLI)
+        monkeypatch.setattr(agent, "REPORT_POLL_INTERVAL", 0.1)
+        updates = []
+        original = IncrementalIngestor.update
+
+        def record(self, text, final=False):
+            upserted = original(self, text, final)
+            updates.append((final, upserted))
+            return upserted
+
+        monkeypatch.setattr(IncrementalIngestor, "update", record)
+        hypothesis = asyncio.run(agent.execute("Radiation hazards"))
+
+        assert any(upserted for final, upserted in updates if not final)
+        assert updates[-1][0] is True
+        report = open(hypothesis.report_path).read()
+        document_ids = {result.chunk.document_id for result in literature.search("dose limits")}
+        assert len(document_ids) == 1
+        document_id = document_ids.pop()
+        chunks = literature._chunk_markdown(
+            Document(document_id, "Report", report, "report.md", {})
+        )
+        assert literature.count_chunks(document_id) == len(chunks)
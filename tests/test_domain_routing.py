@@ -0,0 +1,65 @@
+"""
+Tests for domain-tagged, routed and per-domain-collection literature search.
+
+Hash embeddings make a query identical to a chunk's text match that chunk
+exactly, while distinct texts are near orthogonal.
+"""
+
+import pytest
+
+from src.rag.domain_routing import GENERAL_DOMAIN, domain_collection, domain_of
+
+DOCUMENTS = {
+    "data/specs/dosimetry/badges.md": "# Badges\n\nCrew badges record the absorbed dose.",
+    "data/specs/radiation-shielding/berms.md": "# Berms\n\nRegolith berms absorb radiation.",
+    "data/specs/system-engineering/margins.md": "# Margins\n\nMass margins cover growth.",
+    "deep-research/report.md": "# Report\n\nSolar particle events peak within hours.",
+}
+
+
+class TestDomainRouting:
+    """Tests for domain filters, the router and per-domain collections."""
+
+    def test_domain_is_derived_from_the_source_path(self):
+        assert domain_of("data/specs/radiation-shielding/berms.md") == "radiation-shielding"
+        assert domain_of("/srv/kb/data/specs/dosimetry/a/b.md") == "dosimetry"
+        assert domain_of("deep-research/report.md") == GENERAL_DOMAIN
+        assert (
+            domain_collection("literature", "system-engineering") == "literature_system_engineering"
+        )
+        assert domain_collection("literature", GENERAL_DOMAIN) == "literature"
+
+    def test_search_is_restricted_to_the_given_domains(self, literature_store):
+        store = literature_store(DOCUMENTS, dimension=64, domain_routing=False)
+
+        results = store.search("Regolith berms absorb radiation.", top_k=10, domains=["dosimetry"])
+
+        assert results and {r.chunk.metadata["domain"] for r in results} == {"dosimetry"}
+
+    def test_router_sends_queries_to_the_closest_domain(self, literature_store):
+        store = literature_store(DOCUMENTS, dimension=64, domain_routing=True)
+
+        results = store.search("Regolith berms absorb radiation.", top_k=10)
+
+        assert results[0].document_title == "berms.md"
+        domains = {r.chunk.metadata["domain"] for r in results}
+        assert domains <= {"radiation-shielding", GENERAL_DOMAIN}
+
+    @pytest.mark.parametrize("parent_sections", [False, True])
+    def test_domain_collections_are_searched_and_fused(self, literature_store, parent_sections):
+        store = literature_store(DOCUMENTS, dimension=64, domain_collections=True)
+
+        counts = {name: store.client.count(name).count for name in store.collections}
+        results = store.search(
+            "Mass margins cover growth.", top_k=4, parent_sections=parent_sections
+        )
+
+        assert counts == {
+            "literature": 1,
+            "literature_dosimetry": 1,
+            "literature_radiation_shielding": 1,
+            "literature_system_engineering": 1,
+        }
+        assert results[0].document_title == "margins.md"
+        assert "Mass margins cover growth." in results[0].chunk.content
+        assert len({r.document_title for r in results}) == 4
@@ -0,0 +1,155 @@
+"""
+Tests for the local dense and sparse embedding backends and per-store
+backend selection.
+
+The FastEmbed models themselves are replaced by stubs, so no model is
+downloaded.
+"""
+
+import numpy as np
+import pytest
+from fastembed.sparse.sparse_embedding_base import SparseEmbedding
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct, SparseVectorParams
+
+from src.benchmarks.fakes import HashEmbeddingService, HashSparseEmbeddingService, WordTokenizer
+from src.config import settings
+from src.rag.embeddings import FastEmbedEmbeddingService, SparseEmbeddingService
+from src.rag.literature_store import LiteratureStore
+from src.rag.registry import registry
+from src.rag.requirement_store import RequirementStore
+
+
+class StubTextEmbedding:
+    """Records how FastEmbed would be called."""
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self.calls = []
+
+    def embed(self, documents, batch_size=256, parallel=None):
+        self.calls.append((len(documents), batch_size, parallel))
+        for text in documents:
+            yield np.full(self.dimension, len(text), dtype=np.float32)
+
+
+@pytest.fixture
+def service():
+    service = FastEmbedEmbeddingService(model="BAAI/bge-small-en-v1.5", batch_size=4, parallel=0)
+    service._embedder = StubTextEmbedding(service.dimension)
+    return service
+
+
+class StubSparseTextEmbedding:
+    """Records how FastEmbed BM25 would be called; words of distinct lengths are distinct terms."""
+
+    def __init__(self):
+        self.calls = []
+
+    def _embedding(self, text: str) -> SparseEmbedding:
+        words = sorted(set(text.split()), key=len)
+        return SparseEmbedding(
+            indices=np.array([len(word) for word in words], dtype=np.int32),
+            values=np.ones(len(words), dtype=np.float32),
+        )
+
+    def embed(self, documents, batch_size=256, parallel=None):
+        self.calls.append((len(documents), batch_size, parallel))
+        for text in documents:
+            yield self._embedding(text)
+
+    def query_embed(self, query):
+        self.calls.append(("query", query))
+        yield self._embedding(query)
+
+
+@pytest.fixture
+def sparse_service():
+    service = SparseEmbeddingService(batch_size=4, parallel=0, query_cache_size=2)
+    service._embedder = StubSparseTextEmbedding()
+    return service
+
+
+@pytest.fixture
+def clean_registry():
+    yield
+    registry.clear()
+
+
+class TestFastEmbedBackend:
+    """Tests for the FastEmbed dense embedding service."""
+
+    def test_dimension_is_known_without_loading_the_model(self):
+        service = FastEmbedEmbeddingService(model="sentence-transformers/all-MiniLM-L6-v2")
+
+        assert service.dimension == 384 and service._embedder is None
+        with pytest.raises(ValueError):
+            FastEmbedEmbeddingService(model="not-a-model")
+
+    def test_only_large_batches_use_worker_processes(self, service):
+        small = service.embed_batch(["a", "bb"])
+        large = service.embed_batch(["text"] * 10)
+        query = service.embed("query")
+
+        assert len(small) == 2 and small[1][0] == 2.0
+        assert len(large) == 10 and len(query) == service.dimension
+        assert service.embedder.calls == [(2, 4, None), (10, 4, 0), (1, 1, None)]
+
+
+class TestSparseEmbeddings:
+    """Tests for the BM25 sparse embedding service."""
+
+    def test_only_large_batches_use_worker_processes(self, sparse_service):
+        small = sparse_service.embed_batch(["a bb", "c"])
+        large = sparse_service.embed_batch(["text"] * 10)
+        single = sparse_service.embed("one two three")
+
+        assert small[0].indices == [1, 2] and small[0].values == [1.0, 1.0]
+        assert len(large) == 10 and len(single.indices) == 3
+        assert sparse_service.embedder.calls == [(2, 4, None), (10, 4, 0), (1, 4, None)]
+
+    def test_query_embeddings_are_cached(self, sparse_service):
+        first = sparse_service.query_embed("solar flare")
+        again = sparse_service.query_embed("solar flare")
+        sparse_service.query_embed("b")
+        sparse_service.query_embed("c")  # Evicts "solar flare"
+        sparse_service.query_embed("solar flare")
+
+        assert again is first
+        queries = [call[1] for call in sparse_service.embedder.calls]
+        assert queries == ["solar flare", "b", "c", "solar flare"]
+
+    def test_vectors_are_accepted_by_qdrant(self, sparse_service):
+        client = QdrantClient(":memory:")
+        sparse_config = {"bm25": SparseVectorParams()}
+        client.create_collection("sparse", vectors_config={}, sparse_vectors_config=sparse_config)
+        vectors = sparse_service.embed_batch(["regolith berm", "water"])
+        points = [PointStruct(id=i, vector={"bm25": v}, payload={}) for i, v in enumerate(vectors)]
+        client.upsert("sparse", points)
+
+        query = sparse_service.query_embed("regolith")
+        hits = client.query_points("sparse", query=query, using="bm25").points
+
+        assert [hit.id for hit in hits] == [0]
+
+
+class TestBackendSelection:
+    """Tests for choosing dense backends per store."""
+
+    def test_stores_use_their_configured_backend(self, monkeypatch, clean_registry):
+        monkeypatch.setattr(settings, "dense_embedding_backend", "openai")
+        monkeypatch.setattr(settings, "literature_embedding_backend", "fastembed")
+        registry.register("dense_embeddings", HashEmbeddingService(64))
+        registry.register("dense_embeddings:fastembed", HashEmbeddingService(384))
+        client = QdrantClient(":memory:")
+
+        literature = LiteratureStore(
+            client=client, sparse_embeddings=HashSparseEmbeddingService(), tokenizer=WordTokenizer()
+        )
+        requirements = RequirementStore(client=client)
+
+        assert literature.dense_embeddings.dimension == 384
+        assert requirements.embeddings.dimension == 64
+        dense = LiteratureStore.DENSE_VECTOR_NAME
+        assert client.get_collection("literature").config.params.vectors[dense].size == 384
+        assert client.get_collection("requirements").config.params.vectors[dense].size == 64
@@ -0,0 +1,89 @@
+"""
+Tests for configurable dense dimensions and collection migration.
+
+Uses an in-memory Qdrant and hash embeddings of different sizes.
+"""
+
+from uuid import uuid4
+
+import pytest
+from qdrant_client import QdrantClient
+
+from src.benchmarks.fakes import HashEmbeddingService, HashSparseEmbeddingService, WordTokenizer
+from src.config import settings
+from src.models.requirement import Requirement
+from src.rag.embeddings import EmbeddingService
+from src.rag.literature_store import Document, LiteratureStore
+from src.rag.migration import (
+    DimensionMismatchError,
+    migrate_dense_vectors,
+    resolve_alias,
+    vector_size,
+)
+from src.rag.requirement_store import RequirementStore
+
+
+def literature(client: QdrantClient, dimension: int) -> LiteratureStore:
+    return LiteratureStore(
+        client=client,
+        dense_embeddings=HashEmbeddingService(dimension),
+        sparse_embeddings=HashSparseEmbeddingService(),
+        tokenizer=WordTokenizer(),
+    )
+
+
+@pytest.fixture
+def client():
+    return QdrantClient(":memory:")
+
+
+class TestEmbeddingDimensions:
+    """Tests for the configured dense dimension and migrations between dimensions."""
+
+    def test_embedding_service_requests_shortened_vectors(self, monkeypatch):
+        monkeypatch.setattr(settings, "embedding_dimensions", 512)
+
+        assert EmbeddingService()._request_options == {"dimensions": 512}
+        assert EmbeddingService(dimension=1536)._request_options == {}
+        with pytest.raises(ValueError):
+            EmbeddingService(dimension=2048)
+
+    def test_store_refuses_collection_of_another_dimension(self, client):
+        literature(client, 16)
+
+        hint = "migrate_embeddings.py --collections literature"
+        with pytest.raises(DimensionMismatchError, match=hint):
+            literature(client, 8)
+
+    def test_migration_re_embeds_behind_an_alias(self, client):
+        store = literature(client, 16)
+        regolith = "# Regolith\n\nRegolith berms absorb radiation."
+        store.ingest_document(Document(uuid4(), "Regolith", regolith, "regolith.md", {}))
+        store.ingest_document(
+            Document(uuid4(), "Water", "# Water\n\nWater walls double as storage.", "water.md", {})
+        )
+
+        dense = LiteratureStore.DENSE_VECTOR_NAME
+        target = migrate_dense_vectors(
+            client, "literature", dense, HashEmbeddingService(8), "content"
+        )
+
+        assert target == "literature_d8" and resolve_alias(client, "literature") == target
+        migrated = literature(client, 8)
+        assert client.count("literature").count == 2
+        results = migrated.search("Regolith berms absorb radiation.")
+        assert results[0].document_title == "Regolith"
+
+        # A second migration only swaps the alias
+        migrate_dense_vectors(client, "literature", dense, HashEmbeddingService(4), "content")
+        assert resolve_alias(client, "literature") == "literature_d4"
+        assert not client.collection_exists("literature_d8")
+        assert vector_size(client, "literature", LiteratureStore.DENSE_VECTOR_NAME) == 4
+
+    def test_requirement_collection_is_recreated(self, client):
+        store = RequirementStore(client=client, embeddings=HashEmbeddingService(16))
+        store.add_requirement(Requirement(content="Shield the crew"), session_id="s")
+
+        RequirementStore(client=client, embeddings=HashEmbeddingService(8))
+
+        assert vector_size(client, "requirements", RequirementStore.DENSE_VECTOR_NAME) == 8
@@ -0,0 +1,86 @@
+"""
+Tests for batched categorization in PlanFormingAgent.
+"""
+
+import asyncio
+import json
+import re
+
+import pytest
+
+from src.agents.plan_forming import PlanFormingAgent, PlanFormingInput
+from src.benchmarks.fakes import FakeChatClient, canned_json
+from src.benchmarks.workflow_bench import BenchmarkConfig, GraphShape, install_fakes
+from src.models.hypothesis import Hypothesis
+from src.models.requirement import Requirement, RequirementGraph
+from src.models.solution import Solution, SolutionSource
+from src.rag.registry import registry
+
+
+def categorizer(calls: list[str]):
+    """Batch replies mark item 2 with an invalid category; single calls succeed."""
+
+    def respond(message: str) -> str:
+        calls.append(message)
+        numbers = [int(n) for n in re.findall(r"^### Item (\d+)$", message, re.MULTILINE)]
+        if not numbers:
+            return canned_json({"category": "needs_research", "reasoning": "single"})
+        return json.dumps([
+            {
+                "item": n,
+                "category": "bogus" if n == 2 else "implemented",
+                "reasoning": "batched",
+                "verification_type": None,
+                "research_questions": [],
+            }
+            for n in numbers
+        ])
+
+    return respond
+
+
+@pytest.fixture
+def calls():
+    install_fakes(GraphShape.for_nodes(3), BenchmarkConfig(corpus_documents=3))
+    calls: list[str] = []
+    registry.register("chat_client", FakeChatClient({"plan_former": categorizer(calls)}))
+    yield calls
+    registry.clear()
+
+
+def build_input(count: int) -> PlanFormingInput:
+    hypothesis = Hypothesis(original_text="Mars habitat shielding")
+    root = Requirement(content="Root", level=0)
+    graph = RequirementGraph(root_id=root.id)
+    graph.add_node(root)
+    solutions = {}
+    for i in range(count):
+        child = Requirement(content=f"Requirement {i}", level=1)
+        graph.add_child(root.id, child)
+        solutions[child.id] = Solution(
+            requirement_id=child.id,
+            content=f"Solution {i}",
+            confidence=0.9,
+            source=SolutionSource.EXISTING,
+        )
+    return PlanFormingInput(hypothesis=hypothesis, graph=graph, solutions=solutions)
+
+
+class TestBatchedCategorization:
+    """Tests for multi-item categorization with per-item fallback."""
+
+    def test_calls_scale_with_batches(self, calls):
+        agent = PlanFormingAgent(batch_size=10)
+        output = asyncio.run(agent.execute(build_input(25)))
+
+        # 3 batch calls plus one single-item retry per batch for item 2
+        assert len(calls) == 6
+        assert len(output.implemented) == 22
+        assert len(output.needs_research) == 3
+
+    def test_batch_size_one_uses_single_calls(self, calls):
+        agent = PlanFormingAgent(batch_size=1)
+        output = asyncio.run(agent.execute(build_input(4)))
+
+        assert len(calls) == 4
+        assert len(output.needs_research) == 4
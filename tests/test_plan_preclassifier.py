@@ -0,0 +1,114 @@
+"""
+Tests for the local plan item pre-classifier.
+
+Uses hash embeddings (identical texts match exactly, distinct texts are near
+orthogonal) and an in-memory Qdrant store.
+"""
+
+import asyncio
+
+import pytest
+from qdrant_client import QdrantClient
+
+from src.agents.plan_forming import PlanFormingAgent
+from src.agents.plan_preclassifier import PlanItemPreClassifier
+from src.benchmarks.fakes import FakeChatClient, HashEmbeddingService, canned_json
+from src.benchmarks.workflow_bench import BenchmarkConfig, GraphShape, install_fakes
+from src.models.requirement import Requirement
+from src.models.solution import Solution, SolutionSource
+from src.rag.plan_item_store import PlanItemStore
+from src.rag.registry import registry
+from tests.test_plan_forming import build_input
+
+
+@pytest.fixture
+def classifier():
+    store = PlanItemStore(client=QdrantClient(":memory:"), embeddings=HashEmbeddingService(64))
+    return PlanItemPreClassifier(store=store, min_neighbors=3, min_score=0.85, min_agreement=0.8)
+
+
+def pair(text: str, confidence: float = 0.9, source=SolutionSource.EXISTING):
+    requirement = Requirement(content=text)
+    solution = Solution(
+        requirement_id=requirement.id,
+        content=f"Solution for {text}",
+        confidence=confidence,
+        source=source,
+    )
+    return requirement, solution
+
+
+class TestPreClassifier:
+    """Tests for local decisions and escalation."""
+
+    def test_unseen_items_are_escalated(self, classifier):
+        assert classifier.classify(*pair("Never seen before")) is None
+
+    def test_repeated_items_are_decided_locally(self, classifier):
+        classifier.learn([(*pair("Known NASA protocol"), {"category": "implemented"})])
+        decision = classifier.classify(*pair("Known NASA protocol"))
+
+        assert decision is not None
+        assert decision.category == "implemented"
+
+    def test_low_confidence_novel_items_need_research(self, classifier):
+        decision = classifier.classify(*pair("Speculative", 0.1, SolutionSource.NOVEL))
+        assert decision.category == "needs_research"
+        assert "Speculative" in decision.as_categorization()["research_questions"][0]
+
+    def test_items_decided_by_neighbours_get_a_research_question(self, classifier):
+        classifier.learn([(*pair("Open problem"), {"category": "needs_research"})])
+        decision = classifier.classify(*pair("Open problem"))
+
+        assert decision.category == "needs_research"
+        assert decision.research_questions == [
+            classifier.research_question(Requirement(content="Open problem"))
+        ]
+
+    def test_uncertain_items_are_never_implemented_locally(self, classifier):
+        classifier.learn([(*pair("Borderline", 0.45), {"category": "implemented"})])
+        assert classifier.classify(*pair("Borderline", 0.45)) is None
+
+    def test_items_are_looked_up_in_one_batch(self, classifier, monkeypatch):
+        classifier.learn([(*pair("Known NASA protocol"), {"category": "implemented"})])
+        batches = []
+        embed_batch = classifier.store.embeddings.embed_batch
+        monkeypatch.setattr(
+            classifier.store.embeddings, "embed_batch",
+            lambda texts: batches.append(len(texts)) or embed_batch(texts),
+        )
+
+        decisions = classifier.classify_many([
+            pair("Known NASA protocol"),
+            pair("Speculative", 0.1, SolutionSource.NOVEL),
+            pair("Never seen before"),
+        ])
+
+        assert batches == [2]  # The rule-decided item is not embedded
+        assert [d and d.category for d in decisions] == ["implemented", "needs_research", None]
+
+
+class TestPlanFormingWithPreClassifier:
+    """Second runs over the same items skip the LLM."""
+
+    def test_repeated_run_makes_no_llm_calls(self, classifier):
+        install_fakes(GraphShape.for_nodes(3), BenchmarkConfig(corpus_documents=3))
+        calls = []
+
+        def respond(message: str) -> str:
+            calls.append(message)
+            return canned_json({"category": "needs_verification", "reasoning": "test"})
+
+        registry.register("chat_client", FakeChatClient({"plan_former": respond}))
+        try:
+            agent = PlanFormingAgent(batch_size=1, pre_classifier=classifier)
+            plan_input = build_input(5)
+            asyncio.run(agent.execute(plan_input))
+            first_run_calls = len(calls)
+            output = asyncio.run(agent.execute(plan_input))
+        finally:
+            registry.clear()
+
+        assert first_run_calls == 5
+        assert len(calls) == 5
+        assert len(output.needs_verification) == 5
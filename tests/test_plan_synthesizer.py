@@ -0,0 +1,140 @@
+"""
+Tests for PlanSynthesizerAgent gap filling and context packing.
+
+Run against the benchmark fakes, so no OpenAI or Qdrant server is needed.
+"""
+
+import asyncio
+
+import pytest
+
+from src.agents.plan_synthesizer import PlanSynthesizerAgent
+from src.agents.retriever import RetrieverAgentOutput
+from src.benchmarks.fakes import LatencyModel
+from src.benchmarks.workflow_bench import BenchmarkConfig, GraphShape, install_fakes
+from src.config import settings
+from src.models.hypothesis import Hypothesis
+from src.models.requirement import Requirement, RequirementGraph
+from src.models.research_plan import InformationGap
+from src.models.solution import Solution, SolutionSource
+from src.rag.registry import registry
+from src.utils.context_packing import PackCandidate, pack_context
+
+
+@pytest.fixture
+def synthesizer():
+    config = BenchmarkConfig(corpus_documents=3, latency=LatencyModel.parse("constant:0.05"))
+    install_fakes(GraphShape.for_nodes(5), config)
+    yield PlanSynthesizerAgent()
+    registry.clear()
+
+
+class FakeRetriever:
+    """Answers every query with its own text and records the queries and concurrency."""
+
+    def __init__(self):
+        self.queries: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def execute(self, input_data):
+        self.queries.append(input_data.query)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return RetrieverAgentOutput(
+                success=True, chunks=f"[Source: kb]\n{input_data.query}", sources=["kb"]
+            )
+        finally:
+            self.in_flight -= 1
+
+
+def gap(query: str) -> InformationGap:
+    return InformationGap(description=query, query_for_kb=query)
+
+
+class TestGapFilling:
+    """Tests for concurrent, merged gap retrieval."""
+
+    def test_near_identical_queries_are_merged(self, synthesizer):
+        gaps = [
+            gap("Polyethylene shielding attenuation of GCR protons"),
+            gap("polyethylene shielding attenuation of GCR protons?"),
+            gap("Regolith sintering temperature for habitat walls"),
+        ]
+        groups = synthesizer._merge_gap_queries(gaps)
+        assert [len(group) for group in groups] == [2, 1]
+
+    def test_gaps_are_filled_concurrently_up_to_the_limit(self, synthesizer, monkeypatch):
+        monkeypatch.setattr(settings, "max_concurrent_gap_retrievals", 3)
+        synthesizer.retriever = retriever = FakeRetriever()
+        gaps = [gap(f"distinct query number {i} about topic {i * 7}") for i in range(8)]
+
+        filled = asyncio.run(synthesizer._fill_gaps(gaps))
+
+        assert len(retriever.queries) == len(filled) == 8
+        assert retriever.peak == 3
+
+    def test_merged_gaps_share_results(self, synthesizer):
+        synthesizer.retriever = retriever = FakeRetriever()
+        gaps = [gap("radiation dose limits for crew"), gap("Radiation dose limits for crew.")]
+
+        filled = asyncio.run(synthesizer._fill_gaps(gaps))
+
+        assert retriever.queries == ["radiation dose limits for crew"]
+        assert filled[gaps[0].id] == filled[gaps[1].id] == gaps[1].filled_content
+        assert gaps[0].sources == gaps[1].sources == ["kb"]
+        assert gaps[0].filled and gaps[1].filled
+
+
+class TestContextPacking:
+    """Tests for the token-budgeted iteration-one prompt."""
+
+    def test_pack_context_prefers_high_priority_full_text(self):
+        candidates = [
+            PackCandidate(full="word " * 50, digest="low digest", priority=0.1),
+            PackCandidate(full="word " * 50, digest="high digest", priority=0.9),
+        ]
+        packed = pack_context(candidates, budget=60, count_tokens=lambda t: len(t.split()))
+
+        assert [c.priority for c in packed.full] == [0.9]
+        assert [c.priority for c in packed.digests] == [0.1]
+        assert packed.tokens <= 60
+
+    def test_prompt_stays_within_budget_as_graph_grows(self, synthesizer, monkeypatch):
+        monkeypatch.setattr(settings, "synthesis_context_tokens", 2000)
+        hypothesis = Hypothesis(original_text="Shield a Mars habitat")
+
+        sizes = []
+        for nodes in (20, 400):
+            graph, solutions = build_graph(nodes)
+            prompt, usage = synthesizer._format_iteration_one_input(hypothesis, graph, solutions)
+            sizes.append(usage.prompt_tokens)
+            assert usage.prompt_tokens <= 2000
+            assert (
+                usage.solutions_full + usage.solutions_digest + usage.solutions_omitted == nodes - 1
+            )
+
+        assert usage.graph_nodes_shown < usage.graph_nodes_total
+        assert sizes[1] <= 2000
+
+
+def build_graph(nodes: int) -> tuple[RequirementGraph, dict]:
+    """A two-level graph with a solution for every non-root node."""
+    root = Requirement(content="Shield a Mars habitat", level=0)
+    graph = RequirementGraph(root_id=root.id)
+    graph.add_node(root)
+    solutions = {}
+    for i in range(nodes - 1):
+        child = Requirement(
+            content=f"Sub-requirement {i} about regolith shielding layer {i}", level=1
+        )
+        graph.add_child(root.id, child)
+        solutions[child.id] = Solution(
+            requirement_id=child.id,
+            content=f"Use {i} cm of sintered regolith. " + "Supporting detail. " * 40,
+            confidence=(i % 10) / 10,
+            source=SolutionSource.EXISTING,
+        )
+    return graph, solutions
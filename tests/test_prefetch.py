@@ -0,0 +1,55 @@
+"""
+Tests for the prefetch depth of hybrid literature search.
+"""
+
+import pytest
+
+from src.rag.prefetch import PrefetchConfig
+
+
+@pytest.fixture
+def store(literature_store):
+    documents = {f"{i}.md": f"# Doc {i}\n\nShielding note {i}." for i in range(6)}
+    store = literature_store(documents, record_queries=True)
+    store.search_cache = None
+    return store
+
+
+def prefetch_limits(store) -> list[list[int]]:
+    """The prefetch limits of every Qdrant query so far."""
+    return [[prefetch.limit for prefetch in query["prefetch"]] for query in store.queries]
+
+
+class TestPrefetch:
+    """Tests for prefetch depth derived from top_k and adaptive widening."""
+
+    def test_depth_scales_with_requested_results(self):
+        config = PrefetchConfig(factor=4, minimum=10, widen=3)
+
+        assert config.depth(1) == 10
+        assert config.depth(5) == 20
+        assert config.widened(5) == 60
+        assert not config.should_widen([1.0, 1.0, 1.0], 3)  # Not adaptive
+
+    def test_only_flat_results_are_widened(self):
+        config = PrefetchConfig(adaptive=True, flat_spread=0.1)
+
+        assert config.should_widen([1.2, 1.15, 1.12], 3)
+        assert not config.should_widen([1.9, 1.2, 0.8], 3)
+        assert not config.should_widen([1.0, 1.0], 3)  # Fewer results than requested
+
+    def test_search_uses_the_configured_depths(self, store):
+        store.prefetch = PrefetchConfig(factor=3, minimum=4)
+        store.search("shielding note", top_k=2)
+        store.search("shielding note", top_k=2, parent_sections=True)
+
+        assert prefetch_limits(store) == [[6, 6], [18, 18]]
+
+    def test_flat_queries_are_searched_again_wider(self, store):
+        store.prefetch = PrefetchConfig(
+            factor=1, minimum=2, adaptive=True, widen=2, flat_spread=10.0
+        )
+        results = store.search("shielding note", top_k=2)
+
+        assert prefetch_limits(store) == [[2, 2], [4, 4]]
+        assert len(results) == 2
@@ -0,0 +1,99 @@
+"""
+Tests for the asyncio pty driver, using a small Python program as the CLI.
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from src.agents.deep_researcher import SETUP_PROMPTS, _awaiting_answer
+from src.utils.pty_session import PtySession
+
+PROMPTER = """
+question = input("What would you like to research? ")
+breadth = input("Enter research breadth (default 4): ")
+print("answer:" + question + "|" + (breadth or "4"))
+"""
+
+SLOW_READER = """
+import sys, time, tty
+tty.setraw(0)
+print("ready", flush=True)
+time.sleep(0.2)
+size = 0
+while size < 200000:
+    size += len(sys.stdin.buffer.raw.read(65536))
+print("read:%d" % size)
+"""
+
+
+async def start(script: str, **kwargs) -> PtySession:
+    return await PtySession.start([sys.executable, "-c", script], on_output=None, **kwargs)
+
+
+class TestPtySession:
+    """Tests for prompt matching, I/O and lifecycle."""
+
+    def test_prompts_are_answered_in_order(self):
+        async def scenario():
+            session = await start(PROMPTER)
+            try:
+                await session.expect(SETUP_PROMPTS[0][1], timeout=10)
+                session.clear()
+                await session.send("shielding\n")
+                await session.expect(SETUP_PROMPTS[1][1], timeout=10)
+                session.clear()
+                await session.send("\n")
+                tail = await session.expect(lambda t: "answer:" in t and "|" in t, timeout=10)
+                return tail, await session.wait(timeout=10)
+            finally:
+                await session.close()
+
+        tail, returncode = asyncio.run(scenario())
+        assert "answer:shielding|4" in tail
+        assert returncode == 0
+
+    def test_large_input_waits_for_the_program_to_read(self):
+        async def scenario():
+            session = await start(SLOW_READER)
+            try:
+                await session.expect(lambda t: "ready" in t, timeout=10)
+                await asyncio.wait_for(session.send(b"x" * 200_000), timeout=10)
+                tail = await session.expect(lambda t: "read:" in t, timeout=10)
+                return tail, await session.wait(timeout=10)
+            finally:
+                await session.close()
+
+        tail, returncode = asyncio.run(scenario())
+        assert "read:200000" in tail
+        assert returncode == 0
+
+    def test_buffer_is_bounded(self):
+        async def scenario():
+            session = await start("print('x' * 100000)", max_buffer=1000)
+            try:
+                await session.wait(timeout=10)
+                with pytest.raises(EOFError):
+                    await session.expect(lambda t: False, timeout=10)
+                return len(session.tail)
+            finally:
+                await session.close()
+
+        assert asyncio.run(scenario()) <= 1000
+
+    def test_timeout_and_close_stop_the_program(self):
+        async def scenario():
+            session = await start("import time; time.sleep(60)")
+            try:
+                with pytest.raises(TimeoutError):
+                    await session.expect(lambda t: "never" in t, timeout=0.2)
+            finally:
+                await session.close(grace=1.0)
+            return session.process.returncode
+
+        assert asyncio.run(scenario()) is not None
+
+    def test_follow_up_question_detection(self):
+        assert _awaiting_answer("Searching...\nWhat budget constraints apply?\n")
+        assert not _awaiting_answer("Researching sources\n")
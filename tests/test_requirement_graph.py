@@ -0,0 +1,86 @@
+"""
+Tests for the incrementally maintained indexes of RequirementGraph.
+"""
+
+import json
+
+import pytest
+
+from src.models.requirement import Requirement, RequirementGraph, RequirementStatus
+
+
+def build_graph() -> tuple[RequirementGraph, dict[str, Requirement]]:
+    """Root -> a, b; a -> c, d; b -> d (shared)."""
+    nodes = {name: Requirement(content=name, level=1 if name in "ab" else 2) for name in "abcd"}
+    nodes["root"] = Requirement(content="root")
+    graph = RequirementGraph(root_id=nodes["root"].id)
+    graph.add_node(nodes["root"])
+    graph.add_child(nodes["root"].id, nodes["a"])
+    graph.add_child(nodes["root"].id, nodes["b"])
+    graph.add_child(nodes["a"].id, nodes["c"])
+    graph.add_child(nodes["a"].id, nodes["d"])
+    graph.link_existing_child(nodes["b"].id, nodes["d"].id)
+    return graph, nodes
+
+
+def contents(requirements: list[Requirement]) -> list[str]:
+    return [r.content for r in requirements]
+
+
+class TestRequirementGraph:
+    """Tests for leaf, unsolved, degree and topological indexes."""
+
+    def test_leaves_follow_structural_changes(self):
+        graph, nodes = build_graph()
+
+        assert contents(graph.get_atomic_requirements()) == ["c", "d"]
+        assert graph.atomic_count == 2 and graph.is_atomic(nodes["d"].id)
+        assert not graph.is_atomic(nodes["b"].id)
+
+    def test_duplicate_links_are_ignored(self):
+        graph, nodes = build_graph()
+        graph.link_existing_child(nodes["b"].id, nodes["d"].id)
+        graph.link_existing_child(nodes["a"].id, nodes["d"].id)
+
+        assert graph.children_map[nodes["b"].id] == [nodes["d"].id]
+        assert contents(graph.get_children(nodes["a"].id)) == ["c", "d"]
+        assert graph.in_degree(nodes["d"].id) == 2 and graph.out_degree(nodes["a"].id) == 2
+        assert graph.shared_count == 1 and nodes["d"].is_shared
+
+    def test_unsolved_leaves_track_status_changes(self):
+        graph, nodes = build_graph()
+        graph.set_status(nodes["c"].id, RequirementStatus.SOLVED)
+        graph.set_status(nodes["a"].id, RequirementStatus.SOLVED)  # Not atomic
+
+        assert contents(graph.get_unsolved_atomic()) == ["d"]
+        graph.set_status(nodes["d"].id, RequirementStatus.SOLVED)
+        assert graph.get_unsolved_atomic() == []
+        graph.set_status(nodes["c"].id, RequirementStatus.FAILED)  # Reopened
+        assert contents(graph.get_unsolved_atomic()) == ["c"]
+
+    def test_topological_order_is_cached_until_the_graph_changes(self):
+        graph, nodes = build_graph()
+        order = graph.topological_order()
+
+        assert [graph.nodes[i].content for i in order] == ["root", "a", "b", "c", "d"]
+        assert graph.topological_order() is order
+        graph.add_child(nodes["c"].id, Requirement(content="e", level=3))
+        names = [graph.nodes[i].content for i in graph.topological_order()]
+        assert names == ["root", "a", "b", "c", "d", "e"]
+
+        graph.link_existing_child(nodes["d"].id, nodes["a"].id)
+        with pytest.raises(ValueError):
+            graph.topological_order()
+
+    def test_indexes_are_rebuilt_on_load(self, tmp_path):
+        graph, nodes = build_graph()
+        graph.set_status(nodes["c"].id, RequirementStatus.SOLVED)
+        path = tmp_path / "graph.json"
+        graph.save_to_file(str(path))
+
+        loaded = RequirementGraph.load_from_file(str(path))
+
+        assert "index" not in json.loads(path.read_text())
+        assert contents(loaded.get_unsolved_atomic()) == ["d"]
+        assert loaded.in_degree(nodes["d"].id) == 2
+        assert loaded.topological_order() == graph.topological_order()
@@ -0,0 +1,42 @@
+"""
+Tests for the retriever's relevance verdict.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents.retriever import RetrieverAgent
+
+
+class StubAgent:
+    """Answers every prompt with a fixed text."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    async def run(self, input_text: str):
+        return SimpleNamespace(text=self.text)
+
+
+def retriever_answering(text: str) -> RetrieverAgent:
+    retriever = RetrieverAgent.__new__(RetrieverAgent)  # No store or LLM client needed
+    retriever._relevance_agent = StubAgent(text)
+    return retriever
+
+
+class TestRelevanceCheck:
+    """Tests for parsing the relevance checker's answer."""
+
+    @pytest.mark.parametrize(("answer", "relevant"), [
+        ("RELEVANT", True),
+        ("relevant\n", True),
+        ("NOT_RELEVANT", False),
+        ("Not_relevant.", False),
+        ("unsure", False),
+    ])
+    def test_not_relevant_is_not_read_as_relevant(self, answer, relevant):
+        retriever = retriever_answering(answer)
+
+        assert asyncio.run(retriever._check_relevance("query", "chunks")) is relevant
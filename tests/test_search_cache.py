@@ -0,0 +1,95 @@
+"""
+Tests for the literature search result cache.
+"""
+
+from uuid import uuid4
+
+import pytest
+
+from src.benchmarks.fakes import HashEmbeddingService
+from src.rag.literature_store import Document
+from src.rag.search_cache import SearchCache
+
+
+class CaseInsensitiveEmbeddings(HashEmbeddingService):
+    """Hash embeddings that ignore case and trailing punctuation (paraphrases embed identically)."""
+
+    def _vector(self, text: str) -> list[float]:
+        return super()._vector(text.lower().rstrip("?!. "))
+
+
+@pytest.fixture
+def store(literature_store):
+    return literature_store(
+        {"regolith.md": "# Regolith\n\nRegolith berms absorb radiation."},
+        record_queries=True,
+        dense_embeddings=CaseInsensitiveEmbeddings(32),
+        search_cache=SearchCache(capacity=8, radius=0.05),
+    )
+
+
+def titles(results) -> set[str]:
+    return {r.document_title for r in results}
+
+
+class TestSearchCache:
+    """Tests for cached literature search."""
+
+    def test_repeated_and_nearby_queries_skip_qdrant(self, store):
+        first = store.search("regolith berms")
+        repeat = store.search("  regolith   berms ")
+        paraphrase = store.search("Regolith berms?")
+
+        assert len(store.queries) == 1
+        repeat_ids, paraphrase_ids, first_ids = (
+            [r.chunk.id for r in results] for results in (repeat, paraphrase, first)
+        )
+        assert repeat_ids == paraphrase_ids == first_ids
+
+    def test_search_parameters_are_part_of_the_key(self, store):
+        store.search("regolith berms", top_k=5)
+        store.search("regolith berms", top_k=3)
+
+        assert len(store.queries) == 2
+
+    def test_ingestion_invalidates_cached_results(self, store):
+        store.search("regolith berms")
+        berms = "# Berms\n\nRegolith berms are piled by rovers."
+        store.ingest_document(Document(uuid4(), "berms.md", berms, "berms.md", {}))
+        results = store.search("regolith berms")
+
+        assert len(store.queries) == 2
+        assert titles(results) == {"regolith.md", "berms.md"}
+
+    def test_ingestion_by_another_process_invalidates_cached_results(
+        self, store, literature_store
+    ):
+        store.search("regolith berms")
+        berms = {"berms.md": "# Berms\n\nRegolith berms are piled by rovers."}
+        literature_store(berms, client=store.client, dense_embeddings=store.dense_embeddings)
+
+        store.version_check_seconds = 3600
+        assert titles(store.search("regolith berms")) == {"regolith.md"}
+        store._version_checked_at = float("-inf")  # The interval has elapsed
+        assert titles(store.search("regolith berms")) == {"regolith.md", "berms.md"}
+        assert len(store.queries) == 2
+
+    def test_version_is_not_published_without_a_cache(self, store):
+        store.search_cache = None
+        updates = []
+        store.client.update_collection = lambda **kwargs: updates.append(kwargs)
+        berms = "# Berms\n\nRegolith berms are piled by rovers."
+        store.ingest_document(Document(uuid4(), "berms.md", berms, "berms.md", {}))
+
+        assert not updates and store.version > 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = SearchCache(capacity=2, radius=0.0)
+        for query in ("a", "b"):
+            cache.put(query, 5, 0, [1.0, 0.0], [query])
+        cache.get("a", 5, 0)
+        cache.put("c", 5, 0, [0.0, 1.0], ["c"])
+
+        assert cache.get("a", 5, 0) == ["a"]
+        assert cache.get("b", 5, 0) is None
+        assert cache.nearest([1.0, 0.0], 5, 0) is None  # radius 0: exact repeats only
@@ -0,0 +1,267 @@
+"""
+Tests for the research job service and its HTTP API.
+
+A fake workflow stands in for ResearchWorkflow: it reports the phases,
+blocks on a gate until the test releases it, and fails on request. The
+HTTP server listens on an ephemeral port.
+"""
+
+import asyncio
+import json
+
+from src.orchestration.http_api import ResearchHttpServer
+from src.orchestration.service import PHASES, JobStatus, ResearchService
+
+TIMEOUT = 5
+
+
+class FakePlan:
+    def __init__(self, hypothesis: str):
+        self.hypothesis = hypothesis
+
+    def model_dump(self, mode: str = "python") -> dict:
+        return {"hypothesis": self.hypothesis}
+
+
+class FakeOutput:
+    def __init__(self, hypothesis: str):
+        self.plan_markdown = f"# Plan for {hypothesis}"
+        self.final_plan = FakePlan(hypothesis)
+
+
+class FakeWorkflow:
+    """Records the order and concurrency of runs; each run waits for ``gate``."""
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.started: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def run(self, hypothesis_text, show_progress=True, deep_research=True,
+                  progress_callback=None):
+        self.started.append(hypothesis_text)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            for phase in PHASES:
+                progress_callback(phase, "started")
+                if phase == PHASES[0]:
+                    await self.gate.wait()
+                if hypothesis_text == "fail":
+                    raise RuntimeError("workflow broke")
+                progress_callback(phase, "completed")
+            return FakeOutput(hypothesis_text)
+        finally:
+            self.in_flight -= 1
+
+
+async def wait_for(condition) -> None:
+    """Yield to the loop until ``condition()`` holds."""
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.001)
+
+    await asyncio.wait_for(poll(), TIMEOUT)
+
+
+async def started_service(workers: int = 1) -> tuple[ResearchService, FakeWorkflow]:
+    workflow = FakeWorkflow()
+    service = ResearchService(workers=workers, workflow=workflow)
+    await service.start()
+    return service, workflow
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, TIMEOUT * 2))
+
+
+class TestResearchService:
+    """Tests for the priority queue, workers and job lifecycle."""
+
+    def test_higher_priorities_run_first(self):
+        async def scenario():
+            service, workflow = await started_service(workers=1)
+            await service.submit("first")
+            await wait_for(lambda: workflow.started)  # Occupies the only worker
+            for hypothesis, priority in [("low", 0), ("high", 5), ("mid", 1), ("low again", 0)]:
+                await service.submit(hypothesis, priority=priority)
+            workflow.gate.set()
+            await wait_for(lambda: len(workflow.started) == 5)
+            await service.stop()
+            return workflow.started
+
+        assert run(scenario()) == ["first", "high", "mid", "low", "low again"]
+
+    def test_workers_bound_concurrent_jobs(self):
+        async def scenario():
+            service, workflow = await started_service(workers=2)
+            jobs = [await service.submit(f"job {i}") for i in range(5)]
+            await wait_for(lambda: len(workflow.started) == 2)
+            await asyncio.sleep(0.01)
+            running = service.stats()["jobs"]["running"]
+            workflow.gate.set()
+            await wait_for(lambda: all(job.status == JobStatus.SUCCEEDED for job in jobs))
+            await service.stop()
+            return running, workflow.peak
+
+        assert run(scenario()) == (2, 2)
+
+    def test_job_status_phases_and_result(self):
+        async def scenario():
+            service, workflow = await started_service(workers=2)
+            workflow.gate.set()
+            good = await service.submit("shield the habitat", deep_research=False)
+            bad = await service.submit("fail")
+            await wait_for(lambda: good.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+                           and bad.status in (JobStatus.SUCCEEDED, JobStatus.FAILED))
+            await service.stop()
+            return good, bad
+
+        good, bad = run(scenario())
+
+        assert good.status == JobStatus.SUCCEEDED and not good.deep_research
+        assert all(good.phases[phase]["status"] == "completed" for phase in PHASES)
+        assert good.to_dict(include_result=True)["final_plan"]["hypothesis"] == "shield the habitat"
+        assert bad.status == JobStatus.FAILED and bad.error == "RuntimeError: workflow broke"
+        assert bad.phases[PHASES[0]]["status"] == "started"
+
+    def test_queued_and_running_jobs_can_be_cancelled(self):
+        async def scenario():
+            service, workflow = await started_service(workers=1)
+            running = await service.submit("running")
+            queued = await service.submit("queued")
+            await wait_for(lambda: running.status == JobStatus.RUNNING)
+
+            results = [await service.cancel(queued.id), await service.cancel(running.id)]
+            await wait_for(lambda: running.status == JobStatus.CANCELLED)
+            results += [await service.cancel(running.id), await service.cancel("unknown")]
+            await asyncio.sleep(0.01)
+            await service.stop()
+            return results, running, queued, workflow.started
+
+        results, running, queued, started = run(scenario())
+
+        assert results == [True, True, False, False]
+        assert queued.status == JobStatus.CANCELLED and started == ["running"]
+        assert [event["type"] for event in running.events][-1] == "cancelled"
+
+    def test_events_are_replayed_and_streamed_until_the_job_ends(self):
+        async def scenario():
+            service, workflow = await started_service(workers=1)
+            job = await service.submit("stream me")
+
+            async def collect():
+                return [event async for event in service.stream_events(job.id)]
+
+            stream = asyncio.create_task(collect())
+            await wait_for(lambda: job.status == JobStatus.RUNNING)
+            workflow.gate.set()
+            events = await stream
+            late = [event async for event in service.stream_events(job.id)]
+            await service.stop()
+            return events, late
+
+        events, late = run(scenario())
+
+        types = [event["type"] for event in events]
+        assert types[:2] == ["queued", "started"] and types[-1] == "succeeded"
+        assert types.count("phase") == 2 * len(PHASES)
+        assert [event["seq"] for event in events] == list(range(len(events)))
+        assert late == events
+
+
+async def request(port: int, method: str, path: str, body: bytes = b"") -> tuple[int, bytes]:
+    """Send one HTTP request; returns the status code and the raw body."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), payload
+
+
+async def started_server() -> tuple[ResearchHttpServer, FakeWorkflow, int]:
+    workflow = FakeWorkflow()
+    server = ResearchHttpServer(ResearchService(workers=1, workflow=workflow), port=0)
+    await server.start()
+    return server, workflow, server._server.sockets[0].getsockname()[1]
+
+
+async def stop_server(server: ResearchHttpServer) -> None:
+    server._server.close()
+    await server._server.wait_closed()
+    await server.service.stop()
+
+
+class TestHttpApi:
+    """Tests for routing, validation and event streaming over HTTP."""
+
+    def test_submit_poll_result_and_cancel(self):
+        async def scenario():
+            server, workflow, port = await started_server()
+            payload = b'{"hypothesis": "Shield", "priority": 2}'
+            status, body = await request(port, "POST", "/jobs", payload)
+            job_id = json.loads(body)["id"]
+            submitted = (status, json.loads(body)["priority"])
+            early = (await request(port, "GET", f"/jobs/{job_id}/result"))[0]
+
+            workflow.gate.set()
+            await wait_for(lambda: server.service.get_job(job_id).status == JobStatus.SUCCEEDED)
+            status, body = await request(port, "GET", f"/jobs/{job_id}")
+            polled = (status, json.loads(body)["status"])
+            status, body = await request(port, "GET", f"/jobs/{job_id}/result")
+            result = (status, json.loads(body)["plan_markdown"])
+            cancel = (await request(port, "DELETE", f"/jobs/{job_id}"))[0]
+            listed = json.loads((await request(port, "GET", "/jobs"))[1])["jobs"]
+            health = json.loads((await request(port, "GET", "/health"))[1])
+            await stop_server(server)
+            return submitted, early, polled, result, cancel, listed, health
+
+        submitted, early, polled, result, cancel, listed, health = run(scenario())
+
+        assert submitted == (202, 2) and early == 409
+        assert polled == (200, "succeeded") and result == (200, "# Plan for Shield")
+        assert cancel == 409  # Already finished
+        assert len(listed) == 1 and health["jobs"]["succeeded"] == 1
+
+    def test_errors_map_to_status_codes(self):
+        async def scenario():
+            server, _, port = await started_server()
+            statuses = [
+                (await request(port, "GET", "/jobs/unknown"))[0],
+                (await request(port, "GET", "/nowhere"))[0],
+                (await request(port, "PUT", "/jobs"))[0],
+                (await request(port, "POST", "/jobs", b"{not json"))[0],
+                (await request(port, "POST", "/jobs", b'{"hypothesis": " "}'))[0],
+                (await request(port, "POST", "/jobs", b'{"hypothesis": "x", "priority": "a"}'))[0],
+            ]
+            await stop_server(server)
+            return statuses
+
+        assert run(scenario()) == [404, 404, 405, 400, 400, 400]
+
+    def test_events_are_streamed_as_server_sent_events(self):
+        async def scenario():
+            server, workflow, port = await started_server()
+            body = (await request(port, "POST", "/jobs", b'{"hypothesis": "Stream"}'))[1]
+            job_id = json.loads(body)["id"]
+            stream = asyncio.create_task(request(port, "GET", f"/jobs/{job_id}/events"))
+            await wait_for(lambda: server.service.get_job(job_id).status == JobStatus.RUNNING)
+            workflow.gate.set()
+            status, payload = await stream
+            await stop_server(server)
+            return status, payload.decode()
+
+        status, payload = run(scenario())
+
+        messages = [m for m in payload.split("\n\n") if m]
+        names = [m.split("\n")[0] for m in messages]
+        data = [json.loads(m.split("\n")[1].removeprefix("data: ")) for m in messages]
+        assert status == 200
+        assert names[0] == "event: queued" and names[-1] == "event: succeeded"
+        assert [d["type"] for d in data] == [n.removeprefix("event: ") for n in names]
@@ -0,0 +1,118 @@
+"""
+Tests for the span tracer: context propagation, usage, summary and export.
+
+Each test uses its own Tracer, so the global one is left untouched.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.utils.telemetry import Tracer, estimate_cost
+
+
+@pytest.fixture
+def tracer():
+    return Tracer(enabled=True)
+
+
+def by_name(tracer: Tracer) -> dict:
+    return {span.name: span for span in tracer.spans}
+
+
+class TestTracer:
+    """Tests for span recording and aggregation."""
+
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer(enabled=False)
+        with tracer.span("llm:call", "llm", model="gpt-4o") as span:
+            span.record_usage("gpt-4o", 10, 5)
+
+        assert not tracer.spans
+
+    def test_spans_nest_across_asyncio_tasks(self, tracer):
+        async def call(name: str, node: str):
+            with tracer.node(node):
+                with tracer.span(name, "llm"):
+                    await asyncio.sleep(0.01)
+                    with tracer.span(f"{name}:embed", "embedding"):
+                        await asyncio.sleep(0)
+
+        async def workflow():
+            with tracer.phase("solving"):
+                with tracer.span("agent:solver", "step"):
+                    await asyncio.gather(call("a", "node-a"), call("b", "node-b"))
+            with tracer.span("after", "search"):
+                pass
+
+        asyncio.run(workflow())
+        spans = by_name(tracer)
+
+        step = spans["agent:solver"]
+        assert step.parent_id == spans["solving"].span_id
+        assert spans["a"].parent_id == spans["b"].parent_id == step.span_id
+        assert spans["a:embed"].parent_id == spans["a"].span_id
+        assert spans["b:embed"].parent_id == spans["b"].span_id
+        assert spans["a"].lane != spans["b"].lane  # Concurrent tasks get their own lanes
+        assert (spans["a:embed"].phase, spans["a:embed"].node_id) == ("solving", "node-a")
+        assert (spans["b"].phase, spans["b"].node_id) == ("solving", "node-b")
+        assert spans["after"].phase is None and spans["after"].parent_id is None
+
+    def test_explicit_attributes_and_errors(self, tracer):
+        with pytest.raises(ValueError):
+            with tracer.node("outer"):
+                with tracer.span("search", "search", node_id="inner", model="bm25", top_k=5):
+                    raise ValueError("boom")
+
+        span = tracer.spans[0]
+        assert (span.node_id, span.model, span.attributes) == ("inner", "bm25", {"top_k": 5})
+        assert span.error == "ValueError: boom" and span.duration_us > 0
+
+    def test_record_usage_prices_tokens(self, tracer):
+        with tracer.span("llm", "llm", model="gpt-4o-mini") as span:
+            span.record_usage("gpt-4o-mini-2024-07-18", 1_000_000, None)
+
+        assert span.model == "gpt-4o-mini-2024-07-18"
+        assert (span.prompt_tokens, span.completion_tokens) == (1_000_000, 0)
+        assert span.cost_usd == pytest.approx(0.15)
+        assert estimate_cost("gpt-4o", 1_000_000, 1_000_000) == pytest.approx(12.5)
+        assert estimate_cost("unknown-model", 1000, 1000) == 0.0
+
+    def test_summary_aggregates_call_spans_per_phase(self, tracer):
+        with tracer.phase("decomposition"):
+            with tracer.span("step", "step"):
+                for hit in (False, True):
+                    with tracer.span("llm", "llm") as span:
+                        span.record_usage("gpt-4o", 100, 10)
+                        span.cache_hit = hit
+        with tracer.span("search", "search"):
+            pass
+
+        summary = tracer.summary()
+
+        assert set(summary) == {"decomposition", "unscoped"}
+        decomposition = summary["decomposition"]
+        assert decomposition["calls"] == 2 and decomposition["cache_hits"] == 1
+        assert (decomposition["prompt_tokens"], decomposition["completion_tokens"]) == (200, 20)
+        assert decomposition["cost_usd"] == pytest.approx(2 * estimate_cost("gpt-4o", 100, 10))
+        assert summary["unscoped"]["calls"] == 1
+
+    def test_exports(self, tracer, tmp_path):
+        with tracer.phase("synthesis"):
+            with tracer.span("llm", "llm", model="gpt-4o", attempt=2) as span:
+                span.record_usage(None, 3, 4)
+
+        jsonl, chrome = tracer.export(str(tmp_path), prefix="run")
+
+        lines = [json.loads(line) for line in jsonl.read_text().splitlines()]
+        trace = json.loads(chrome.read_text())
+        events = {event["name"]: event for event in trace["traceEvents"]}
+        assert [line["name"] for line in lines] == ["llm", "synthesis"]
+        assert trace["displayTimeUnit"] == "ms"
+        llm = events["llm"]
+        assert (llm["cat"], llm["ph"], llm["pid"]) == ("llm", "X", 1)
+        assert llm["tid"] == tracer.spans[0].lane and events["synthesis"]["tid"] == 0
+        assert llm["ts"] >= events["synthesis"]["ts"] and llm["dur"] <= events["synthesis"]["dur"]
+        assert llm["args"]["phase"] == "synthesis" and llm["args"]["attempt"] == 2
+        assert llm["args"]["prompt_tokens"] == 3 and "node_id" not in llm["args"]
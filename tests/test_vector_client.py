@@ -0,0 +1,103 @@
+"""
+Tests for the embedded (in-process) Qdrant backend.
+"""
+
+import threading
+import warnings
+from uuid import uuid4
+
+import pytest
+
+from src.benchmarks.fakes import HashEmbeddingService, HashSparseEmbeddingService, WordTokenizer
+from src.config import settings
+from src.models.requirement import Requirement
+from src.rag.literature_store import Document, LiteratureStore
+from src.rag.registry import registry
+from src.rag.requirement_store import RequirementStore
+from src.rag.vector_client import create_qdrant_client
+
+
+@pytest.fixture(autouse=True)
+def quiet_local_mode():
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="Payload indexes have no effect")
+        yield
+
+
+def literature_store(client) -> LiteratureStore:
+    return LiteratureStore(
+        client=client,
+        dense_embeddings=HashEmbeddingService(32),
+        sparse_embeddings=HashSparseEmbeddingService(),
+        tokenizer=WordTokenizer(),
+    )
+
+
+class TestEmbeddedBackend:
+    """Tests for stores running on qdrant-client local mode."""
+
+    def test_collections_persist_across_clients(self, tmp_path):
+        client = create_qdrant_client("embedded", path=str(tmp_path))
+        content = "# Regolith\n\nRegolith berms absorb radiation."
+        literature_store(client).ingest_document(
+            Document(uuid4(), "Regolith", content, "regolith.md", {})
+        )
+        requirements = RequirementStore(client=client, embeddings=HashEmbeddingService(32))
+        requirements.add_requirements_batch([
+            Requirement(content="Shield the habitat", level=1),
+            Requirement(content="Shield the habitat", level=2),
+        ])
+        client.close()
+
+        reopened = create_qdrant_client("embedded", path=str(tmp_path))
+        results = literature_store(reopened).search("regolith berms")
+        candidates = RequirementStore(
+            client=reopened, embeddings=HashEmbeddingService(32)
+        ).find_similar("Shield the habitat", level=2)
+
+        assert results and results[0].document_title == "Regolith"
+        assert [candidate.level for candidate in candidates] == [2]
+        reopened.close()
+
+    def test_stores_share_the_registry_client(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "vector_backend", "embedded")
+        monkeypatch.setattr(settings, "qdrant_path", str(tmp_path))
+        registry.clear()
+        try:
+            registry.register("dense_embeddings", HashEmbeddingService(32))
+            requirements = RequirementStore()
+            literature = literature_store(None)
+
+            assert requirements.client is literature.client is registry.qdrant_client()
+            assert (tmp_path / "collection" / "literature").exists()
+        finally:
+            registry.qdrant_client().close()
+            registry.clear()
+
+    def test_searches_run_while_another_thread_ingests(self, tmp_path):
+        client = create_qdrant_client("embedded", path=str(tmp_path))
+        store = literature_store(client)
+        store.search_cache = None
+        store.ingest_document(Document(uuid4(), "Seed", "# Seed\n\nRegolith berms.", "seed.md", {}))
+        errors = []
+
+        def ingest():
+            try:
+                for i in range(200):
+                    content = f"# Doc {i}\n\nRegolith note {i}."
+                    store.ingest_document(Document(uuid4(), f"Doc {i}", content, f"{i}.md", {}))
+            except Exception as e:
+                errors.append(e)
+
+        writer = threading.Thread(target=ingest)
+        writer.start()
+        while writer.is_alive():
+            assert store.search("regolith note", top_k=5)
+        writer.join()
+        client.close()
+
+        assert not errors
+
+    def test_unknown_backend_is_rejected(self):
+        with pytest.raises(ValueError):
+            create_qdrant_client("faiss")
@@ -0,0 +1,55 @@
+"""
+Tests for the dense vector index configuration of the literature collection.
+"""
+
+
+import pytest
+
+from src.config import settings
+from src.rag.vector_index import VectorIndexConfig
+
+
+class TestVectorIndexConfig:
+    """Tests for translating index settings into Qdrant parameters."""
+
+    def test_defaults_leave_search_params_unset(self):
+        assert VectorIndexConfig().search_params() is None
+
+    def test_quantized_search_rescores_with_oversampling(self, monkeypatch):
+        monkeypatch.setattr(settings, "literature_quantization", "binary")
+        monkeypatch.setattr(settings, "literature_quantization_oversampling", 3.0)
+        monkeypatch.setattr(settings, "literature_hnsw_ef", 128)
+
+        config = VectorIndexConfig.from_settings()
+        params = config.search_params()
+
+        assert config.quantization_config().binary.always_ram
+        assert params.hnsw_ef == 128
+        assert params.quantization.rescore and params.quantization.oversampling == 3.0
+        assert config.search_params(exact=True).quantization.ignore
+
+    def test_unknown_quantization_is_rejected(self):
+        with pytest.raises(ValueError):
+            VectorIndexConfig(quantization="product")
+
+    def test_vector_ram_estimate(self):
+        points, dimension = 100_000, 1536
+        full = VectorIndexConfig().ram_bytes(points, dimension)
+        binary_on_disk = VectorIndexConfig(quantization="binary", on_disk=True)
+
+        assert full == points * dimension * 4
+        assert binary_on_disk.ram_bytes(points, dimension) == full // 32
+
+    def test_store_searches_a_quantized_collection(self, literature_store):
+        store = literature_store(
+            {"regolith.md": "# Regolith\n\nRegolith berms absorb radiation."},
+            collection_name="literature_quantized",
+            index_config=VectorIndexConfig(
+                quantization="scalar", on_disk=True, hnsw_m=32, hnsw_ef=64
+            ),
+        )
+
+        results = store.search("regolith berms")
+
+        assert results and results[0].document_title == "regolith.md"
+        assert store.client.collection_exists("literature_quantized")
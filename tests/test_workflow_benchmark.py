@@ -0,0 +1,82 @@
+"""
+Tests for the offline workflow benchmark.
+
+These run the full ResearchWorkflow against the deterministic fakes, so they
+need neither OpenAI nor a Qdrant server and can guard orchestration in CI.
+"""
+
+import asyncio
+
+import pytest
+
+from src.benchmarks.fakes import HashEmbeddingService, LatencyModel
+from src.benchmarks.workflow_bench import BenchmarkConfig, GraphShape, run_benchmark
+from src.rag.registry import registry
+from src.utils.telemetry import tracer
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state():
+    yield
+    registry.clear()
+    tracer.reset()
+    tracer.enabled = False
+
+
+class TestGraphShape:
+    """Tests for synthetic graph shapes."""
+
+    @pytest.mark.parametrize("nodes", [1, 10, 100, 1000, 10000])
+    def test_exact_node_count(self, nodes):
+        """Level sizes add up to the requested node count."""
+        shape = GraphShape.for_nodes(nodes, depth=3)
+        assert shape.total == nodes
+        assert shape.depth <= 3
+
+    def test_children_partition_next_level(self):
+        """Every node of the next level has exactly one parent."""
+        shape = GraphShape.for_nodes(100, depth=3)
+        for level in range(shape.depth):
+            children = [
+                child
+                for index in range(shape.level_sizes[level])
+                for child in shape.children(level, index)
+            ]
+            assert children == list(range(shape.level_sizes[level + 1]))
+
+
+class TestFakes:
+    """Tests for the deterministic stand-ins."""
+
+    def test_hash_embeddings_are_deterministic(self):
+        service = HashEmbeddingService(dimension=32)
+        assert service.embed("same text") == service.embed("same text")
+        assert service.embed("same text") != service.embed("other text")
+
+    def test_latency_is_keyed_on_content(self):
+        latency = LatencyModel.parse("lognormal:0.5:0.5")
+        assert latency.sample("a") == latency.sample("a")
+        assert LatencyModel.parse("zero").sample("a") == 0.0
+
+
+class TestWorkflowBenchmark:
+    """End-to-end runs through the full workflow."""
+
+    def test_small_graph(self):
+        """A 20-node graph is decomposed, solved and synthesized."""
+        result = asyncio.run(run_benchmark(20, BenchmarkConfig(corpus_documents=5)))
+
+        assert result.nodes == 20
+        assert result.plan_steps == 6
+        assert result.llm_calls > 0
+        assert {"decomposition", "solving", "synthesis"} <= set(result.calls_by_phase)
+        assert 0 < result.critical_path_seconds
+        assert result.scheduler_efficiency <= 1.0 + 1e-6
+
+    def test_shared_nodes_are_deduplicated(self):
+        """Duplicate sibling requirements are linked instead of re-created."""
+        config = BenchmarkConfig(corpus_documents=5, shared_ratio=0.3)
+        result = asyncio.run(run_benchmark(40, config))
+
+        assert result.shared_nodes > 0
+        assert result.nodes < 40